@@ -44,7 +44,7 @@
 
 
 class EdfFileDataSource(object):
-    def __init__(self,nameInput, fastedf=False):
+    def __init__(self,nameInput, fastedf=False, mmap=False):
         if type(nameInput) == list:
             nameList = nameInput
         else:
@@ -64,12 +64,15 @@ def __init__(self,nameInput, fastedf=False):
         self._fastedf = fastedf
         if fastedf:
             _logger.warning("fastedf is unsafe!")
+        self._mmap = mmap
         self.refresh()
 
     def refresh(self):
         self._sourceObjectList=[]
         for name in self.__sourceNameList:
-            self._sourceObjectList.append(EdfFile.EdfFile(name, access='rb', fastedf=self._fastedf))
+            self._sourceObjectList.append(EdfFile.EdfFile(name, access='rb',
+                                                           fastedf=self._fastedf,
+                                                           mmap=self._mmap))
         self.__lastKeyInfo = {}
 
     def getSourceInfo(self):
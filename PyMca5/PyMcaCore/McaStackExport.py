@@ -31,12 +31,20 @@
 __license__ = "MIT"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 import sys
+import zlib
 import numpy
 import posixpath
 import h5py
 import logging
+from PyMca5.PyMcaCore import McaStackView
+from PyMca5.PyMcaMisc import ExecutorUtils
 _logger = logging.getLogger(__name__)
 
+# target size of the storage chunks
+CHUNK_SIZE = (1, 'MB')
+# memory of the blocks of spectra copied at once
+BLOCK_SIZE = (16, 'MB')
+
 try:
     from PyMca5.PyMcaIO import NexusUtils
     HAS_NEXUS_UTILS = True
@@ -50,7 +58,13 @@
 else:
     strdtype = h5py.special_dtype(vlen=str)
 
-def exportStackList(stackList, filename, channels=None, calibration=None):
+def exportStackList(stackList, filename, channels=None, calibration=None,
+                    **kw):
+    """
+    Exports the stacks to a NeXus entry of an HDF5 file
+
+    :param kw: storage options (see exportStack)
+    """
     if hasattr(stackList, "data") and hasattr(stackList, "info"):
         stackList = [stackList]
     if isinstance(filename, h5py.File):
@@ -58,7 +72,8 @@ def exportStackList(stackList, filename, channels=None, calibration=None):
         _exportStackList(stackList,
                          h5,
                          channels=channels,
-                         calibration=calibration)
+                         calibration=calibration,
+                         **kw)
     else:
         h5 = h5py.File(filename, "w-")
         try:
@@ -67,11 +82,13 @@ def exportStackList(stackList, filename, channels=None, calibration=None):
             _exportStackList(stackList,
                              h5,
                              channels=channels,
-                             calibration=calibration)
+                             calibration=calibration,
+                             **kw)
         finally:
             h5.close()
 
-def _exportStackList(stackList, h5, path=None, channels=None, calibration=None):
+def _exportStackList(stackList, h5, path=None, channels=None, calibration=None,
+                     **kw):
     if path is None:
         # initialize the entry
         entryName = "stack"
@@ -108,7 +125,8 @@ def _exportStackList(stackList, h5, path=None, channels=None, calibration=None):
                     h5,
                     detectorPath,
                     channels=channels[i],
-                    calibration=calibration[i])
+                    calibration=calibration[i],
+                    **kw)
         dataPath = posixpath.join(detectorPath, "data")
         dataTargets.append(dataPath)
         i += 1
@@ -135,9 +153,163 @@ def _exportStackList(stackList, h5, path=None, channels=None, calibration=None):
     h5.flush()
     return entryName
 
-def exportStack(stack, h5object, path, channels=None, calibration=None):
+def spectrumChunks(shape, mcaAxis=-1, dtype=numpy.float64, size=None):
+    """
+    Storage chunk shape for reading spectra: whole spectra and as many
+    neighbouring spectra (along the last dimensions) as fit in `size`.
+
+    :param tuple shape:
+    :param int mcaAxis:
+    :param dtype:
+    :param tuple size: chunk memory, CHUNK_SIZE by default
+    :returns tuple:
+    """
+    ndim = len(shape)
+    mcaAxis = McaStackView.positive_index(mcaAxis, ndim)
+    if size is None:
+        size = CHUNK_SIZE
+    spectrumSize = max(shape[mcaAxis], 1) * numpy.dtype(dtype).itemsize
+    nSpectra = max(McaStackView._nBytes(size) // spectrumSize, 1)
+    chunks = [1] * ndim
+    chunks[mcaAxis] = max(shape[mcaAxis], 1)
+    for axis in range(ndim - 1, -1, -1):
+        if axis == mcaAxis:
+            continue
+        chunks[axis] = max(min(shape[axis], nSpectra), 1)
+        nSpectra = max(nSpectra // chunks[axis], 1)
+    return tuple(chunks)
+
+def _compressChunk(args):
+    """
+    Shuffle and deflate a storage chunk like the HDF5 filters would do.
+
+    :param tuple args: chunk offset, chunk data, shuffle, deflate level
+    :returns tuple: offset, compressed bytes
+    """
+    offset, chunk, shuffle, level = args
+    itemsize = chunk.dtype.itemsize
+    if shuffle and itemsize > 1:
+        buffer = chunk.reshape(-1).view(numpy.uint8)\
+                      .reshape(-1, itemsize).T.tobytes()
+    else:
+        buffer = chunk.tobytes()
+    return offset, zlib.compress(buffer, level)
+
+def _blockChunks(dataset, block, origin):
+    """
+    Split a block of the dataset in storage chunks (padded with zeros
+    at the dataset edges).
+
+    :param dataset: chunked h5py.Dataset
+    :param numpy.ndarray block: data with the layout of the dataset
+    :param tuple origin: position of the block in the dataset (a
+                         multiple of the chunk shape)
+    :yields tuple: offset of the chunk, chunk data
+    """
+    chunks = dataset.chunks
+    ranges = [range(0, n, c) for n, c in zip(block.shape, chunks)]
+    for start in numpy.ndindex(*[len(r) for r in ranges]):
+        start = [r[i] for r, i in zip(ranges, start)]
+        idx = tuple(slice(i, i + c) for i, c in zip(start, chunks))
+        sub = block[idx]
+        if sub.shape == tuple(chunks):
+            chunk = numpy.array(sub, copy=True)
+        else:
+            chunk = numpy.zeros(chunks, dtype=dataset.dtype)
+            chunk[tuple(slice(0, n) for n in sub.shape)] = sub
+        yield tuple(o + i for o, i in zip(origin, start)), chunk
+
+def _copyData(data, dataset, mcaAxis, nworkers=None):
+    """
+    Copy the data into the dataset block by block. Blocks of gzip
+    compressed datasets are shuffled and deflated by a pool of threads
+    while the next blocks are read and written as raw chunks.
+    """
+    ndim = len(data.shape)
+    if ndim < 2:
+        dataset[()] = data[()]
+        return
+    mcaAxis = McaStackView.positive_index(mcaAxis, ndim)
+    nativeChunks = dataset.chunks
+    view = McaStackView.FullView(data, mcaAxis=mcaAxis, nMca=BLOCK_SIZE,
+                                 nativeChunks=nativeChunks)
+    axes = [i for i in range(ndim) if i != mcaAxis]
+    # from the block layout (image dimensions, channels) to the data layout
+    itransposeAxes = list(range(ndim - 1))
+    itransposeAxes.insert(mcaAxis, ndim - 1)
+    direct = dataset.compression == "gzip" and \
+             hasattr(dataset.id, "write_direct_chunk")
+
+    def blocks():
+        for (idx, shape), chunk in view.items(keyType="select"):
+            block = chunk.reshape(tuple(shape) + (data.shape[mcaAxis],))
+            block = numpy.transpose(block, itransposeAxes)
+            index = [slice(None)] * ndim
+            for axis, slc in zip(axes, idx):
+                index[axis] = slc
+            yield tuple(index), block
+
+    if not direct:
+        for index, block in blocks():
+            dataset[index] = block
+        return
+
+    level = dataset.compression_opts
+    if level is None:
+        level = 4
+    shuffle = dataset.shuffle
+
+    def compressArguments():
+        for index, block in blocks():
+            origin = tuple(slc.indices(n)[0]
+                           for slc, n in zip(index, data.shape))
+            for offset, chunk in _blockChunks(dataset, block, origin):
+                yield offset, chunk, shuffle, level
+
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor="thread") as \
+            (executor, nworkers):
+        for offset, compressed in ExecutorUtils.orderedMap(_compressChunk,
+                                                           compressArguments(),
+                                                           executor=executor,
+                                                           nworkers=nworkers):
+            dataset.id.write_direct_chunk(offset, compressed)
+
+def _writeArray(group, name, values, compression=None, compression_opts=None):
+    """
+    Write an array with one value per spectrum (live time, positioners...)
+    in slices, with the compression of the data.
+    """
+    values = numpy.asarray(values)
+    if values.ndim == 0 or values.size < 2 ** 16:
+        group[name] = values
+        return
+    dataset = group.create_dataset(name, shape=values.shape,
+                                   dtype=values.dtype, chunks=True,
+                                   compression=compression,
+                                   compression_opts=compression_opts)
+    step = max(2 ** 20 // max(values[:1].nbytes, 1), 1)
+    for i in range(0, values.shape[0], step):
+        dataset[i:i + step] = values[i:i + step]
+
+def exportStack(stack, h5object, path, channels=None, calibration=None,
+                chunks=None, compression=None, compression_opts=None,
+                shuffle=False, nworkers=None):
     """
     Exports the stack to the given HDF5 file object and path
+
+    The data are copied block by block, so dynamically loaded stacks do not
+    need to fit in memory.
+
+    :param chunks: storage chunk shape. By default whole spectra and as many
+                   neighbouring spectra as fit in CHUNK_SIZE (see
+                   spectrumChunks). False for contiguous storage.
+    :param compression: None, "gzip" or any h5py compression filter
+    :param compression_opts: compression level for "gzip" (4 by default)
+    :param bool shuffle: byte shuffle before compression
+    :param int nworkers: number of threads compressing the gzip chunks
+                         ahead of writing (None or 1 means serial, 0 means
+                         one per CPU)
     """
     h5g = h5object.require_group(path)
 
@@ -157,21 +329,36 @@ def exportStack(stack, h5object, path, channels=None, calibration=None):
     else:
         raise TypeError("Unrecognized stack object received")
 
-    dataset = h5g.require_dataset("data",
-                                  shape=data.shape,
-                                  dtype=data.dtype)
-    dataset[:] = data
-
     # support a simple array of data
     if hasattr(stack, "info"):
         info = stack.info
     else:
         info = {}
-
-    # provide a hint for the data type
     mcaIndex = info.get('McaIndex', -1)
     if mcaIndex < 0:
         mcaIndex = len(data.shape) + mcaIndex
+
+    if compression == "gzip" and compression_opts is None:
+        compression_opts = 4
+    if chunks is None:
+        if len(data.shape) > 1:
+            chunks = spectrumChunks(data.shape, mcaIndex, data.dtype)
+        elif compression or shuffle:
+            chunks = True
+    if chunks is False:
+        if compression or shuffle:
+            raise ValueError("Compression requires chunked storage")
+        chunks = None
+    dataset = h5g.require_dataset("data",
+                                  shape=data.shape,
+                                  dtype=data.dtype,
+                                  chunks=chunks,
+                                  compression=compression,
+                                  compression_opts=compression_opts,
+                                  shuffle=shuffle)
+    _copyData(data, dataset, mcaIndex, nworkers=nworkers)
+
+    # provide a hint for the data type
     if len(data.shape) > 1:
         if mcaIndex == 0:
             if len(data.shape) == 3:
@@ -188,11 +375,15 @@ def exportStack(stack, h5object, path, channels=None, calibration=None):
     for key in ["McaLiveTime", "live_time"]:
         if key in info and info[key] is not None:
             # TODO: live time can actually be elapsed time!!!
-            h5g["live_time"] =  numpy.array(info[key], copy=False)
+            _writeArray(h5g, "live_time", info[key],
+                        compression=compression,
+                        compression_opts=compression_opts)
 
     for key in ["preset_time", "elapsed_time"]:
         if key in info and info[key] is not None:
-            h5g[key] =  numpy.array(info[key], copy=False)
+            _writeArray(h5g, key, info[key],
+                        compression=compression,
+                        compression_opts=compression_opts)
 
     # get the channels
     if channels is None:
@@ -214,7 +405,9 @@ def exportStack(stack, h5object, path, channels=None, calibration=None):
             posGroup.attrs[att] = u"NXcollection"
         for key in info[posKey]:
             if key not in posGroup:
-                posGroup[key] = numpy.array(info[posKey][key], copy=False)
+                _writeArray(posGroup, key, info[posKey][key],
+                            compression=compression,
+                            compression_opts=compression_opts)
 
     # the scales for the common rectangular map case
     if "xScale" in info and "yScale" in info:
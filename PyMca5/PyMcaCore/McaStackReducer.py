@@ -0,0 +1,222 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Sum, maximum and mean spectrum of a masked selection of an MCA stack.
+
+The image is split in blocks of consecutive rows. The blocks are read and
+reduced in one pass (in parallel when requested) and the partial results
+are kept together with the block mask, so that a new selection only needs
+to process the blocks whose mask changed.
+"""
+import logging
+import numpy
+from PyMca5.PyMcaCore import McaStackView
+from PyMca5.PyMcaMisc import ExecutorUtils
+
+_logger = logging.getLogger(__name__)
+
+
+def _reduceBlock(args):
+    """Reduce the selected spectra of one block of the stack
+
+    :param tuple args: data, index of the block bounding box, block mask,
+                       MCA axis, chunk size, calculate maximum
+    :returns tuple: sum (float64), maximum (float64 or None)
+    """
+    data, idx, mask, mcaAxis, nMca, mcamax = args
+    block = data[idx]
+    if not isinstance(block, numpy.ndarray):
+        block = numpy.asarray(block)
+    if mask.all():
+        mask = None
+    view = McaStackView.MaskedView(block, mask=mask, mcaAxis=mcaAxis,
+                                   nMca=nMca)
+    nChan = block.shape[mcaAxis]
+    blockSum = numpy.zeros((nChan,), dtype=numpy.float64)
+    blockMax = None
+    for key, chunk in view.items(keyType='select'):
+        blockSum += numpy.add.reduce(chunk, axis=0, dtype=numpy.float64)
+        if mcamax:
+            chunkMax = numpy.maximum.reduce(chunk, axis=0)
+            if blockMax is None:
+                blockMax = chunkMax.astype(numpy.float64)
+            else:
+                numpy.maximum(blockMax, chunkMax, out=blockMax)
+    return blockSum, blockMax
+
+
+class McaStackReducer(object):
+    """Calculates the sum, maximum and mean spectrum of the spectra
+    selected by an image mask.
+
+    The partial results of each block of image rows are cached, so the
+    reducer has to be discarded when the stack data change.
+    """
+
+    def __init__(self, data, mcaAxis=-1, blockSize=(32, 'MB'), nMca=(2, 'MB'),
+                 nworkers=None, executor=None):
+        """
+        :param array data: nD array (numpy.ndarray or h5py.Dataset)
+        :param int mcaAxis:
+        :param tuple blockSize: maximal memory of a block of image rows
+        :param num or tuple nMca: chunk size used to reduce a block
+                                  (see McaStackView.ChunkedView)
+        :param int nworkers: None or 1 means serial, 0 means one per CPU
+        :param executor: 'thread' (default) or concurrent.futures.Executor
+        """
+        self._data = data
+        ndim = len(data.shape)
+        if mcaAxis < 0:
+            mcaAxis += ndim
+        self._mcaAxis = mcaAxis
+        self._imageAxes = tuple(i for i in range(ndim) if i != mcaAxis)
+        self._nChan = data.shape[mcaAxis]
+        self.nMca = nMca
+        self.nworkers = nworkers
+        self.executor = executor
+        self._blocks = self._blockBoundaries(blockSize)
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def imageShape(self):
+        return tuple(self._data.shape[i] for i in self._imageAxes)
+
+    @property
+    def nBlocks(self):
+        return len(self._blocks)
+
+    def _blockBoundaries(self, blockSize):
+        imageShape = self.imageShape
+        n, unit = blockSize
+        p = ['b', 'kb', 'mb', 'gb'].index(unit.lower())
+        rowBytes = numpy.dtype(self._data.dtype).itemsize * self._nChan
+        for nPixels in imageShape[1:]:
+            rowBytes *= nPixels
+        nRows = max((n * 1024**p) // max(rowBytes, 1), 1)
+        return [(r, min(r + nRows, imageShape[0]))
+                for r in range(0, imageShape[0], nRows)]
+
+    def clear(self):
+        """Forget the cached partial results
+        """
+        self._cache = {}
+
+    def _blockArguments(self, mask, mcamax):
+        """Yields (block number, mask) and the _reduceBlock arguments
+        of the blocks that cannot be taken from the cache
+        """
+        for iBlock, (r0, r1) in enumerate(self._blocks):
+            blockMask = mask[r0:r1]
+            cached = self._cache.get(iBlock)
+            if cached is not None:
+                if numpy.array_equal(cached[0], blockMask) and \
+                   (cached[2] is not None or not cached[3] or not mcamax):
+                    self.hits += 1
+                    continue
+            self.misses += 1
+            if not blockMask.any():
+                self._cache[iBlock] = blockMask.copy(), \
+                                      numpy.zeros((self._nChan,), numpy.float64), \
+                                      None, 0
+                continue
+            # only read the bounding box of the selected pixels
+            imageIndex = []
+            for axis in range(blockMask.ndim):
+                other = tuple(i for i in range(blockMask.ndim) if i != axis)
+                selected = numpy.nonzero(blockMask.any(axis=other))[0]
+                imageIndex.append(slice(selected[0], selected[-1] + 1))
+            boxMask = blockMask[tuple(imageIndex)]
+            imageIndex[0] = slice(r0 + imageIndex[0].start,
+                                  r0 + imageIndex[0].stop)
+            idx = [slice(None)] * len(self._data.shape)
+            for axis, slc in zip(self._imageAxes, imageIndex):
+                idx[axis] = slc
+            yield (iBlock, blockMask), (self._data, tuple(idx), boxMask,
+                                        self._mcaAxis, self.nMca, mcamax)
+
+    def reduce(self, mask=None, mcamax=False, mean=False):
+        """
+        :param array mask: boolean image mask (all spectra when None)
+        :param bool mcamax: calculate the maximum spectrum
+        :param bool mean: calculate the mean spectrum
+        :returns dict: "sum", "max" (None when not requested or nothing
+                       selected), "mean" (when requested) and "npixels"
+        """
+        if mask is None:
+            mask = numpy.ones(self.imageShape, dtype=bool)
+        else:
+            mask = numpy.asarray(mask) > 0
+            if mask.shape != self.imageShape:
+                raise ValueError("Mask shape %s does not match image shape %s"
+                                 % (mask.shape, self.imageShape))
+        keys = []
+
+        def arguments():
+            for key, args in self._blockArguments(mask, mcamax):
+                keys.append(key)
+                yield args
+
+        with ExecutorUtils.executorContext(nworkers=self.nworkers,
+                                           executor=self.executor) as \
+                (executor, nworkers):
+            results = ExecutorUtils.orderedMap(_reduceBlock, arguments(),
+                                               executor=executor,
+                                               nworkers=nworkers)
+            for i, (blockSum, blockMax) in enumerate(results):
+                iBlock, blockMask = keys[i]
+                self._cache[iBlock] = blockMask.copy(), blockSum, blockMax, \
+                                      int(blockMask.sum())
+        _logger.debug("Reduced %d blocks (%d from cache)",
+                      self.nBlocks, self.nBlocks - len(keys))
+
+        mcaSum = numpy.zeros((self._nChan,), dtype=numpy.float64)
+        mcaMax = None
+        npixels = 0
+        for iBlock in range(self.nBlocks):
+            blockMask, blockSum, blockMax, n = self._cache[iBlock]
+            if not n:
+                continue
+            npixels += n
+            mcaSum += blockSum
+            if mcamax:
+                if mcaMax is None:
+                    mcaMax = blockMax.copy()
+                else:
+                    numpy.maximum(mcaMax, blockMax, out=mcaMax)
+        result = {"sum": mcaSum, "max": mcaMax, "npixels": npixels}
+        if mean:
+            if npixels:
+                result["mean"] = mcaSum / float(npixels)
+            else:
+                result["mean"] = mcaSum
+        return result
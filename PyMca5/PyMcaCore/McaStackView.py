@@ -209,12 +209,15 @@ def chunkIndexProduct(chunkIndex, chunkAxes, axesOrder):
         yield tuple(idxData), tuple(chunkShape), nChunks
 
 
-def fullChunkIndex(shape, nChunksMax, **kwargs):
+def fullChunkIndex(shape, nChunksMax, nativeChunks=None, **kwargs):
     """
     Returns a chunk index generator + chunk info
 
     :param tuple shape: array shape to be sliced
     :param int nChunksMax: maximal number of chunks
+    :param tuple nativeChunks: chunk shape of the data on disk (if any). Split
+                               dimensions are sliced in multiples of it, even
+                               when nChunksMax needs to be exceeded.
     :param **kwargs: see chunkIndexParameters
     :returns tuple: chunkIndexGenerator(generates tuples: (index(tuple), shape(tuple), nChunks(int))),
                     chunkAxes(tuple),
@@ -242,16 +245,27 @@ def fullChunkIndex(shape, nChunksMax, **kwargs):
             nBuffer *= nAxis
             #print('Axis {} (size={}): {}x{} chunks'.format(axis, nAxis, 1, nAxis))
         elif nItems > nChunksMax:
-            idxAxis = list(chunkIndexGen(0, nAxis, 1))
+            if nativeChunks:
+                # Read whole chunks from disk
+                step = min(nativeChunks[axis], nAxis)
+                nBuffer *= step
+            else:
+                step = 1
+            idxAxis = list(chunkIndexGen(0, nAxis, step))
             #print('Axis {} (size={}): {}x{} chunks'.format(axis, nAxis, len(idxAxis), 1))
         else:
             # Axis will be split in pieces with length "step"
             step = nChunksMax//nItems
-            # We have "n" such pieces (last piece can have smaller length)
-            n = (nAxis//step) + int(bool(nAxis % step))
-            # Maximize the length of the last piece
-            # example: nAxis=51 and step=40 -> step = 26
-            step = (nAxis//n) + int(bool(nAxis % n))
+            if nativeChunks:
+                # Read whole chunks from disk
+                nativeStep = nativeChunks[axis]
+                step = min(max(step - step % nativeStep, nativeStep), nAxis)
+            else:
+                # We have "n" such pieces (last piece can have smaller length)
+                n = (nAxis//step) + int(bool(nAxis % step))
+                # Maximize the length of the last piece
+                # example: nAxis=51 and step=40 -> step = 26
+                step = (nAxis//n) + int(bool(nAxis % n))
             nBuffer *= step
             idxAxis = list(chunkIndexGen(0, nAxis, step))
             #print('Axis {} (size={}): {}x{} chunks'.format(axis, nAxis, len(idxAxis), step))
@@ -303,6 +317,7 @@ def maskedChunkIndex(shape, nChunksMax, mask=None, **kwargs):
         full = mask.all()
     if full:
         return fullChunkIndex(shape, nChunksMax, **kwargs)
+    kwargs.pop('nativeChunks', None)
     kwargs['defaultOrder'] = 'F'
     nChunksMax, chunkAxes, axesOrder, chunkAxesSlice = chunkIndexParameters(shape, nChunksMax, **kwargs)
     if len(axesOrder) != mask.ndim:
@@ -361,16 +376,11 @@ def _next(it):
             yield ret
 
 
-def chunks_in_memory(shape, dtype, axis=-1, margin=0.01, maximal=None):
+def availableMemory():
     """
-    Number of chunks that fit into memory (with a margin)
+    Available physical memory
 
-    :param tuple shape: nD array
-    :param dtype:
-    :param axis: axes contibuting to one chunk
-    :param margin:
-    :param maximal:
-    :returns: number of slices that fit in memory
+    :returns int or None: number of bytes (None when unknown)
     """
     try:
         from psutil import virtual_memory
@@ -379,9 +389,23 @@ def chunks_in_memory(shape, dtype, axis=-1, margin=0.01, maximal=None):
             from PyMca5.PyMcaMisc.PhysicalMemory import getAvailablePhysicalMemoryOrNone as getMem
         except ImportError:
             from PyMca5.PyMcaMisc.PhysicalMemory import getPhysicalMemoryOrNone as getMem
-        nbytes_mem = getMem()
+        return getMem()
     else:
-        nbytes_mem = virtual_memory().available
+        return virtual_memory().available
+
+
+def chunks_in_memory(shape, dtype, axis=-1, margin=0.01, maximal=None):
+    """
+    Number of chunks that fit into memory (with a margin)
+
+    :param tuple shape: nD array
+    :param dtype:
+    :param axis: axes contibuting to one chunk
+    :param margin:
+    :param maximal:
+    :returns: number of slices that fit in memory
+    """
+    nbytes_mem = availableMemory()
     if nbytes_mem is None:
         return maximal
     shape_slice = list(shape)
@@ -402,19 +426,152 @@ def chunks_in_memory(shape, dtype, axis=-1, margin=0.01, maximal=None):
         return n_chunks
 
 
+def _nBytes(size):
+    """
+    :param tuple size: e.g. (100, 'MB')
+    :returns int:
+    """
+    n, unit = size
+    p = ['b', 'kb', 'mb', 'gb'].index(unit.lower())
+    return int(n*1024**p)
+
+
+def isCompressed(data):
+    """
+    Reading part of a storage chunk of this dataset requires decompressing
+    the entire chunk
+
+    :param data: numpy.ndarray or h5py.Dataset
+    :returns bool:
+    """
+    if isinstance(data, numpy.ndarray):
+        return False
+    if getattr(data, 'compression', None):
+        return True
+    filters = getattr(data, '_filters', None)
+    if filters:
+        return any(name not in ('shuffle', 'fletcher32')
+                   for name in filters)
+    return False
+
+
+def chunkPlan(data, mcaAxis=-1, mcaSlice=None, dtype=None, margin=0.01,
+              minimal=(1, 'MB'), maximal=(16, 'MB')):
+    """
+    Number of spectra to be read at once and the storage chunk shape to
+    which the blocks of spectra need to be aligned.
+
+    The memory of one block is a fraction of the available physical
+    memory (within limits). Blocks of compressed datasets always consist of
+    whole storage chunks, even when this exceeds the memory limit, because
+    partially read chunks are decompressed repeatedly. Blocks of
+    uncompressed chunked datasets are only aligned when the aligned block
+    fits in memory.
+
+    :param data: numpy.ndarray or h5py.Dataset
+    :param int mcaAxis:
+    :param slice mcaSlice:
+    :param dtype: dtype of the block buffer (data type by default)
+    :param num margin: fraction of the available memory
+    :param tuple minimal: minimal block memory
+    :param tuple maximal: maximal block memory
+    :returns tuple: number of spectra, storage chunks (None: no alignment)
+    """
+    shape = data.shape
+    mcaAxis = positive_index(mcaAxis, len(shape))
+    if mcaSlice is None:
+        mcaSlice = slice(None)
+    if dtype is None:
+        dtype = data.dtype
+    nBytesMca = numpy.dtype(dtype).itemsize*sliceLen(mcaSlice, shape[mcaAxis])
+    nBytes = availableMemory()
+    if nBytes is None:
+        nBytes = _nBytes(maximal)
+    else:
+        nBytes = int(nBytes*margin)
+    nBytes = min(max(nBytes, _nBytes(minimal)), _nBytes(maximal))
+    nMca = max(nBytes//max(nBytesMca, 1), 1)
+    if isinstance(data, numpy.ndarray):
+        nativeChunks = None
+    else:
+        nativeChunks = getattr(data, 'chunks', None)
+    if nativeChunks:
+        nAligned = fullChunkIndex(shape, nMca, chunkAxes=(mcaAxis,),
+                                  chunkAxesSlice=(mcaSlice,),
+                                  nativeChunks=nativeChunks)[3]
+        if nAligned > nMca and not isCompressed(data):
+            # partial reads of uncompressed chunks are cheap
+            nativeChunks = None
+    return nMca, nativeChunks
+
+
+def readAmplification(shape, chunkIndex, nativeChunks):
+    """
+    Ratio between the number of elements in the storage chunks which are
+    touched by the blocks and the number of elements in the blocks. Each
+    block is assumed to read (decompress) all storage chunks it overlaps.
+
+    :param tuple shape: data shape
+    :param chunkIndex: generator of block indices (see fullChunkIndex and
+                       maskedChunkIndex)
+    :param tuple nativeChunks: storage chunk shape (None: not chunked)
+    :returns float:
+    """
+    if not nativeChunks:
+        return 1.
+    nRead = 0
+    nUsed = 0
+    for idx, idxShape, nChunks in chunkIndex:
+        read = 1
+        used = 1
+        listAxes = []
+        for axis, ind in enumerate(idx):
+            if not isinstance(ind, slice):
+                listAxes.append(axis)
+                continue
+            rng = range(*ind.indices(shape[axis]))
+            if not len(rng):
+                used = 0
+                break
+            nc = nativeChunks[axis]
+            first = min(rng)//nc
+            last = max(rng)//nc
+            read *= min((last+1)*nc, shape[axis]) - first*nc
+            used *= len(rng)
+        if not used:
+            continue
+        if listAxes:
+            coord = numpy.stack([numpy.asarray(idx[axis])//nativeChunks[axis]
+                                 for axis in listAxes], axis=-1)
+            nTouched = len(numpy.unique(coord, axis=0))
+            read *= nTouched*int(numpy.prod([nativeChunks[axis]
+                                             for axis in listAxes]))
+            used *= len(idx[listAxes[0]])
+        nRead += read
+        nUsed += used
+    if not nUsed:
+        return 1.
+    return nRead/float(nUsed)
+
+
 class ChunkedView(object):
 
     def __init__(self, data, nMca=None, mcaAxis=None, mcaSlice=None,
-                 dtype=None, readonly=True):
+                 dtype=None, readonly=True, nativeChunks=None):
         """
         :param array data: nD array (numpy.ndarray or h5py.Dataset)
-        :param num or tuple nMca: maximal number of MCA spectra to be
-                                  buffered or maximal buffer memory (e.g. (100, 'mib'))
+        :param num or tuple or str nMca: maximal number of MCA spectra to be
+                                  buffered or maximal buffer memory (e.g. (100, 'mib')).
+                                  'auto': block size and alignment from chunkPlan.
         :param int mcaAxis:
         :param slice mcaSlice: slice along the MCA axis
         :param dtype:
         :param bool readonly:
+        :param tuple or bool nativeChunks: slice the data in multiples of this
+                                           chunk shape (True: chunk shape of
+                                           the h5py dataset)
         """
+        self._plan = None
         self.mcaAxis = mcaAxis
         self.mcaSlice = mcaSlice
         self.nMca = nMca
@@ -426,6 +583,27 @@ def __init__(self, data, nMca=None, mcaAxis=None, mcaSlice=None,
         self._data = data
         self.readonly = readonly
         self._isNdarray = isinstance(data, numpy.ndarray)
+        self._nativeChunks = nativeChunks
+
+    @property
+    def nativeChunks(self):
+        """Chunk shape used to slice the data (None when not aligned)
+        """
+        if self._nativeChunks is True:
+            return getattr(self._data, 'chunks', None)
+        if self._nativeChunks is None and self._nMca == 'auto':
+            return self.chunkPlan[1]
+        return self._nativeChunks
+
+    @property
+    def chunkPlan(self):
+        """
+        Number of spectra and storage chunk alignment (see chunkPlan)
+        """
+        if self._plan is None:
+            self._plan = chunkPlan(self._data, mcaAxis=self.mcaAxis,
+                                   mcaSlice=self.mcaSlice, dtype=self.dtype)
+        return self._plan
 
     @property
     def mcaAxis(self):
@@ -436,6 +614,7 @@ def mcaAxis(self, value):
         if value is None:
             value = -1
         self._mcaAxis = value
+        self._plan = None
 
     @property
     def mcaSlice(self):
@@ -446,6 +625,7 @@ def mcaSlice(self, value):
         if value is None:
             value = slice(None)
         self._mcaSlice = value
+        self._plan = None
 
     @property
     def nChan(self):
@@ -457,9 +637,11 @@ def nChanOrg(self):
 
     @property
     def nMca(self):
+        if self._nMca == 'auto':
+            return self.chunkPlan[0]
         try:
             n, unit = self._nMca
-        except TypeError:
+        except (TypeError, ValueError):
             return self._nMca
         p = ['b', 'kb', 'mb', 'gb'].index(unit.lower())
         nByteMca = numpy.array([0], self.dtype).itemsize*self.nChan
@@ -489,9 +671,24 @@ def idxFullComplement(self):
         idx[self.mcaAxis] = sliceComplement(self.mcaSlice, self.nChanOrg)
         return tuple(idx)
 
+    @property
+    def readAmplification(self):
+        """
+        Expected number of elements read from storage for every element
+        in the blocks of spectra (see readAmplification)
+        """
+        nativeChunks = None
+        if not self._isNdarray:
+            nativeChunks = getattr(self._data, 'chunks', None)
+        return readAmplification(self.shapeOrg, self.chunkInfo[0],
+                                 nativeChunks)
+
     def _prepareAccess(self):
         _logger.debug('Iterate MCA stack in chunks of {} spectra'
                       .format(self.nMca))
+        if _logger.isEnabledFor(logging.DEBUG) and not self._isNdarray:
+            _logger.debug('Expected read amplification: {:.2f}'
+                          .format(self.readAmplification))
         post_copy = not self.readonly
         if self._buffer is None:
             self._buffer = numpy.empty(self.shape, self.dtype)
@@ -562,7 +759,8 @@ def chunkInfo(self):
                                 mask=self._mask,
                                 chunkAxes=(self.mcaAxis,),
                                 chunkAxesSlice=(self.mcaSlice,),
-                                axesOrder=axesOrder)
+                                axesOrder=axesOrder,
+                                nativeChunks=self.nativeChunks)
 
     @property
     def axesOrder(self):
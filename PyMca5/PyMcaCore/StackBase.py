@@ -35,6 +35,8 @@
 
 """
 from PyMca5.PyMcaCore import DataObject
+from PyMca5.PyMcaCore import StackROIBatch
+from PyMca5.PyMcaCore import McaStackReducer
 import numpy
 import time
 import os
@@ -106,6 +108,11 @@ def __init__(self):
         # the sums.
         self._dynamicLimit = 5.0E6
         self._tryNumpy = True
+        # number of threads used to calculate the ROI images of dynamically
+        # loaded stacks (0 means one per CPU)
+        self._roiWorkers = 0
+        # partial sums of the selected spectra, reset when the stack changes
+        self._mcaReducer = None
 
     def setPluginDirectoryList(self, dirlist):
         for directory in dirlist:
@@ -252,6 +259,7 @@ def stackUpdated(self, positioners=None):
         """
         Recalculates the different images associated to the stack
         """
+        self._mcaReducer = None
         self._tryNumpy = True
         if hasattr(self._stack.data, "size"):
             if self._stack.data.size > self._dynamicLimit:
@@ -538,6 +546,14 @@ def getStackROIImagesAndNames(self):
     def getStackOriginalImage(self):
         return self._stackImageData
 
+    def _getMcaReducer(self):
+        if self._mcaReducer is None:
+            self._mcaReducer = McaStackReducer.McaStackReducer(
+                                            self._stack.data,
+                                            mcaAxis=self.mcaIndex,
+                                            nworkers=self._roiWorkers)
+        return self._mcaReducer
+
     def calculateMcaDataObject(self, normalize=False, mask=None, mcamax=False):
         #original ICR mca
         if self._stackImageData is None:
@@ -555,7 +571,7 @@ def calculateMcaDataObject(self, normalize=False, mask=None, mcamax=False):
                 # return the default maximum MCA spectrum
                 dataObject = copy.deepcopy(self._mcaData0)
                 dataObject.y = [self._mcaMax]
-                return DataObject
+                return dataObject
             elif normalize:
                 logger.debug("Case 1")
                 npixels = self._stackImageData.shape[0] *\
@@ -591,7 +607,7 @@ def calculateMcaDataObject(self, normalize=False, mask=None, mcamax=False):
                 # return the default maximum MCA spectrum
                 dataObject = copy.deepcopy(self._mcaData0)
                 dataObject.y = [self._mcaMax]
-                return DataObject
+                return dataObject
             elif normalize:
                 logger.debug("Case 3")
                 npixels = self._stackImageData.shape[0] * self._stackImageData.shape[1] * 1.0
@@ -623,178 +639,14 @@ def calculateMcaDataObject(self, normalize=False, mask=None, mcamax=False):
             arrayMask = (actualSelectionMask > 0)
 
         logger.debug("Reached MCA calculation")
-        cleanMask = numpy.nonzero(arrayMask)
-
         logger.debug("self.fileIndex, self.mcaIndex = %d , %d",
                      self.fileIndex, self.mcaIndex)
         t0 = time.time()
-        if len(cleanMask[0]) and len(cleanMask[1]):
+        if arrayMask.any():
             logger.debug("USING MASK")
-            cleanMask = numpy.array(cleanMask).transpose()
-            if self.fileIndex == 2:
-                if self.mcaIndex == 0:
-                    if isinstance(self._stack.data, numpy.ndarray):
-                        logger.debug("In memory case 0")
-                        for r, c in cleanMask:
-                            tmpData = self._stack.data[:, r, c]
-                            mcaData += tmpData
-                            if mcamax:
-                                if mcaMax is None:
-                                    mcaMax = tmpData
-                                else:
-                                    mcaMax = numpy.max([mcaMax, tmpData], axis=0)
-                    else:
-                        logger.debug("Dynamic loading case 0")
-                        #no other choice than to read all images
-                        #for the time being, one by one
-                        rMin = cleanMask[0][0]
-                        rMax = cleanMask[-1][0]
-                        cMin = cleanMask[:, 1].min()
-                        cMax = cleanMask[:, 1].max()
-                        #rMin, cMin = cleanMask.min(axis=0)
-                        #rMax, cMax = cleanMask.max(axis=0)
-                        tmpMask = arrayMask[rMin:(rMax+1),cMin:(cMax+1)]
-                        tmpData = numpy.zeros((1, rMax-rMin+1,cMax-cMin+1))
-                        mcaMax = numpy.zeros((self._stack.data.shape[0],), dtype=numpy.float64)
-                        for i in range(self._stack.data.shape[0]):
-                            tmpData[0:1,:,:] = self._stack.data[i:i+1,rMin:(rMax+1),cMin:(cMax+1)]
-                            #multiplication is faster than selection
-                            mcaData[i] = (tmpData[0]*tmpMask).sum(dtype=numpy.float64)
-                            if mcamax:
-                                mcaMax[i] = numpy.max(tmpData[0][tmpMask])
-                elif self.mcaIndex == 1:
-                    if isinstance(self._stack.data, numpy.ndarray):
-                        for r, c in cleanMask:
-                            tmpData = self._stack.data[r,:,c]
-                            mcaData += tmpData
-                            if mcamax:
-                                if mcaMax is None:
-                                    mcaMax = tmpData
-                                else:
-                                    mcaMax = numpy.max([mcaMax, tmpData], axis=0)
-                    else:
-                        raise IndexError("Dynamic loading case 1")
-                else:
-                    raise IndexError("Wrong combination of indices. Case 0")
-            elif self.fileIndex == 1:
-                if self.mcaIndex == 0:
-                    if isinstance(self._stack.data, numpy.ndarray):
-                        logger.debug("In memory case 2")
-                        for r, c in cleanMask:
-                            tmpData = self._stack.data[:, r, c]
-                            mcaData += tmpData
-                            if mcamax:
-                                if mcaMax is None:
-                                    mcaMax = tmpData
-                                else:
-                                    mcaMax = numpy.max([mcaMax, tmpData], axis=0)
-                    else:
-                        logger.debug("Dynamic loading case 2")
-                        #no other choice than to read all images
-                        #for the time being, one by one
-                        if 1:
-                            rMin = cleanMask[0][0]
-                            rMax = cleanMask[-1][0]
-                            cMin = cleanMask[:, 1].min()
-                            cMax = cleanMask[:, 1].max()
-                            #rMin, cMin = cleanMask.min(axis=0)
-                            #rMax, cMax = cleanMask.max(axis=0)
-                            tmpMask = arrayMask[rMin:(rMax + 1), cMin:(cMax + 1)]
-                            tmpData = numpy.zeros((1, rMax - rMin + 1, cMax - cMin + 1))
-                            mcaMax = numpy.zeros((self._stack.data.shape[0],), dtype=numpy.float64)
-                            for i in range(self._stack.data.shape[0]):
-                                tmpData[0:1, :, :] = self._stack.data[i:i + 1, rMin:(rMax + 1), cMin:(cMax + 1)]
-                                # multiplication is faster than selection
-                                mcaData[i] = (tmpData[0] * tmpMask).sum(dtype=numpy.float64)
-                                # Multiplication does not work with negative data
-                                # because zero it's already a maximum
-                                if mcamax:
-                                    mcaMax[i] = numpy.max(tmpData[0][tmpMask])
-                        if 0:
-                            tmpData = numpy.zeros((1, self._stack.data.shape[1], self._stack.data.shape[2]))
-                            for i in range(self._stack.data.shape[0]):
-                                tmpData[0:1, :, :] = self._stack.data[i:i + 1,:,:]
-                                #multiplication is faster than selection
-                                #tmpData[arrayMask].sum() in my machine
-                                mcaData[i] = (tmpData[0] * arrayMask).sum(dtype=numpy.float64)
-                elif self.mcaIndex == 2:
-                    if isinstance(self._stack.data, numpy.ndarray):
-                        logger.debug("In memory case 3")
-                        for r, c in cleanMask:
-                            tmpData = self._stack.data[r, c, :]
-                            mcaData += tmpData
-                            if mcamax:
-                                if mcaMax is None:
-                                    mcaMax = tmpData
-                                else:
-                                    mcaMax = numpy.max([mcaMax, tmpData], axis=0) 
-                    else:
-                        logger.debug("Dynamic loading case 3")
-                        #try to minimize access to the file
-                        row_list = []
-                        row_dict = {}
-                        for r, c in cleanMask:
-                            if mcaMax is None:
-                                self._stack.data[r, c, :]
-                            if r not in row_list:
-                                row_list.append(r)
-                                row_dict[r] = []
-                            row_dict[r].append(c)
-                        for r in row_list:
-                            tmpMcaData = self._stack.data[r:r + 1, row_dict[r], :]
-                            tmpMcaData.shape = -1, mcaData.shape[0]
-                            mcaData += numpy.sum(tmpMcaData, axis=0, dtype=numpy.float64)
-                            if mcamax:
-                                mcaMax = numpy.max([mcaMax, numpy.max(tmpMcaData, axis=0)], axis=0)
-                else:
-                    raise IndexError("Wrong combination of indices. Case 1")
-            elif self.fileIndex == 0:
-                if self.mcaIndex == 1:
-                    if isinstance(self._stack.data, numpy.ndarray):
-                        logger.debug("In memory case 4")
-                        for r, c in cleanMask:
-                            tmpData = self._stack.data[r, :, c]
-                            mcaData += tmpData
-                            if mcamax:
-                                if mcaMax is None:
-                                    mcaMax = tmpData
-                                else:
-                                    mcaMax = numpy.max([mcaMax, tmpData], axis=0)
-                    else:
-                        raise IndexError("Dynamic loading case 4")
-                elif self.mcaIndex in [2, -1]:
-                    if isinstance(self._stack.data, numpy.ndarray):
-                        logger.debug("In memory case 5")
-                        for r, c in cleanMask:
-                            tmpData = self._stack.data[r, c, :]
-                            mcaData += tmpData
-                            if mcamax:
-                                if mcaMax is None:
-                                    mcaMax = tmpData
-                                else:
-                                    mcaMax = numpy.max([mcaMax, tmpData], axis=0) 
-                    else:
-                        logger.debug("Dynamic loading case 5")
-                        #try to minimize access to the file
-                        row_list = []
-                        row_dict = {}
-                        for r, c in cleanMask:
-                            if mcaMax is None:
-                                mcaMax = self._stack.data[r, c, :]
-                            if r not in row_list:
-                                row_list.append(r)
-                                row_dict[r] = []
-                            row_dict[r].append(c)
-                        for r in row_list:
-                            tmpMcaData = self._stack.data[r:r + 1, row_dict[r], :]
-                            tmpMcaData.shape = -1, mcaData.shape[0]
-                            mcaData += tmpMcaData.sum(axis=0, dtype=numpy.float64)
-                            if mcamax:
-                                mcaMax = numpy.max([mcaMax, numpy.max(tmpMcaData, axis=0)], axis=0)
-                else:
-                    raise IndexError("Wrong combination of indices. Case 2")
-            else:
-                raise IndexError("File index undefined")
+            result = self._getMcaReducer().reduce(arrayMask, mcamax=mcamax)
+            mcaData = result["sum"]
+            mcaMax = result["max"]
         else:
             logger.debug("NOT USING MASK !")
 
@@ -885,29 +737,9 @@ def calculateROIImages(self, index1, index2, imiddle=None, energy=None):
                     logger.debug("Case 1 ROI image calculation elapsed = %f ",
                                  time.time() - t0)
                 else:
-                    shape = self._stack.data.shape
-                    roiImage = numpy.zeros(self._stackImageData.shape,
-                                           numpy.float64)
-                    background = roiImage * 1
-                    leftImage = roiImage * 1
-                    middleImage = roiImage * 1
-                    rightImage = roiImage * 1
-                    maxImage = numpy.zeros(self._stackImageData.shape,
-                                           numpy.uint)
-                    minImage = numpy.zeros(self._stackImageData.shape,
-                                           numpy.uint)
-                    step = 1
-                    for i in range(shape[0]):
-                        tmpData = self._stack.data[i:i+step,:, i1:i2] * 1
-                        numpy.add(roiImage[i:i+step,:],
-                              numpy.sum(tmpData, axis=2,dtype=numpy.float64),
-                              roiImage[i:i+step,:])
-                        
-                        minImage[i:i + step,:] = i1 + numpy.argmin(tmpData, axis=2)
-                        maxImage[i:i + step, :] =  i1 + numpy.argmax(tmpData, axis=2)
-                        leftImage[i:i + step, :] += tmpData[:, :, 0]
-                        middleImage[i:i + step, :] += tmpData[:, :, imiddle - i1]
-                        rightImage[i:i + step, :] += tmpData[:, :, -1]
+                    roiImage, minImage, maxImage, leftImage, middleImage, \
+                        rightImage = self._calculateChunkedROIImages(i1, i2,
+                                                        imiddle, "position")
                     background = 0.5 * (i2 - i1) * (leftImage + rightImage)
                     isUsingSuppliedEnergyAxis = True
                     minImage = energy[minImage]
@@ -1014,30 +846,9 @@ def calculateROIImages(self, index1, index2, imiddle=None, energy=None):
                     logger.debug("Case 5 ROI Image elapsed = %f",
                                  time.time() - t0)
                 else:
-                    shape = self._stack.data.shape
-                    roiImage = numpy.zeros(self._stackImageData.shape,
-                                           numpy.float64)
-                    background = roiImage * 1
-                    leftImage = roiImage * 1
-                    middleImage = roiImage * 1
-                    rightImage = roiImage * 1
-                    maxImage = roiImage * 1
-                    minImage = roiImage * 1
-                    step = 1
-                    for i in range(shape[0]):
-                        tmpData = self._stack.data[i:i+step,:, i1:i2] * 1
-                        numpy.add(roiImage[i:i+step,:],
-                              numpy.sum(tmpData, axis=2, dtype=numpy.float64),
-                              roiImage[i:i+step,:])
-                        numpy.add(minImage[i:i+step,:],
-                                  numpy.min(tmpData, 2),
-                                  minImage[i:i+step,:])
-                        numpy.add(maxImage[i:i+step,:],
-                                  numpy.max(tmpData, 2),
-                                  maxImage[i:i+step,:])
-                        leftImage[i:i+step, :]   += tmpData[:, :, 0]
-                        middleImage[i:i+step, :] += tmpData[:, :, imiddle-i1]
-                        rightImage[i:i+step, :]  += tmpData[:, :,-1]
+                    roiImage, minImage, maxImage, leftImage, middleImage, \
+                        rightImage = self._calculateChunkedROIImages(i1, i2,
+                                                        imiddle, "value")
                     background = 0.5*(i2-i1)*(leftImage+rightImage)
                     logger.debug("Case 6 Dynamic ROI image calculation elapsed = %f",
                                  time.time() - t0)
@@ -1080,6 +891,40 @@ def calculateROIImages(self, index1, index2, imiddle=None, energy=None):
         logger.debug("ROI images calculated")
         return imageDict
 
+    def _calculateChunkedROIImages(self, i1, i2, imiddle, minMax):
+        """
+        ROI images of a stack of spectra (last axis) read chunk by chunk
+
+        :param str minMax: 'position' or 'value' of the extrema
+        :returns tuple: ROI sum, minimum, maximum, left, middle and right
+                        images
+        """
+        shape = self._stackImageData.shape
+        roiImage = numpy.zeros(shape, numpy.float64)
+        leftImage = numpy.zeros(shape, numpy.float64)
+        middleImage = numpy.zeros(shape, numpy.float64)
+        rightImage = numpy.zeros(shape, numpy.float64)
+        if minMax == "position":
+            dtype = numpy.intp
+        else:
+            dtype = numpy.float64
+        minImage = numpy.zeros(shape, dtype)
+        maxImage = numpy.zeros(shape, dtype)
+        chunkItems = StackROIBatch.roiChunkItems(self._stack.data,
+                                                 [slice(i1, i2)],
+                                                 mcaAxis=self.mcaIndex,
+                                                 minMax=minMax,
+                                                 channels=[i1, imiddle, i2 - 1],
+                                                 nworkers=self._roiWorkers)
+        for (idx, idxShape), ddict in chunkItems:
+            roiImage[idx] = ddict["sum"][0].reshape(idxShape)
+            minImage[idx] = ddict["min"][0].reshape(idxShape)
+            maxImage[idx] = ddict["max"][0].reshape(idxShape)
+            leftImage[idx] = ddict["channels"][0].reshape(idxShape)
+            middleImage[idx] = ddict["channels"][1].reshape(idxShape)
+            rightImage[idx] = ddict["channels"][2].reshape(idxShape)
+        return roiImage, minImage, maxImage, leftImage, middleImage, rightImage
+
     def setSelectionMask(self, mask):
         logger.debug("setSelectionMask called")
         goodData = numpy.isfinite(self._mcaData0.y[0].sum())
@@ -40,6 +40,7 @@
 from PyMca5.PyMcaIO import ConfigDict
 from PyMca5.PyMcaIO.OutputBuffer import OutputBuffer as OutputBufferBase
 from PyMca5.PyMcaCore import McaStackView
+from PyMca5.PyMcaMisc import ExecutorUtils
 
 
 _logger = logging.getLogger(__name__)
@@ -73,6 +74,7 @@ def setConfigurationFile(self, ffile):
     def batchROIMultipleSpectra(self, x=None, y=None, configuration=None,
                                 net=True, xAtMinMax=False, index=None,
                                 xLabel=None, outbuffer=None, save=True,
+                                nworkers=None, executor=None,
                                 **outbufferinitargs):
         """
         This method performs the actual fit. The y keyword is the only mandatory input argument.
@@ -86,6 +88,10 @@ def batchROIMultipleSpectra(self, x=None, y=None, configuration=None,
         :param xLabel: Type of ROI to be used.
         :param outbuffer:
         :param save: set to False to postpone saving the in-memory buffers
+        :param int nworkers: number of chunks processed in parallel
+                             (None or 1: serial, 0: one per CPU)
+        :param executor: 'thread' (default), 'process' or
+                         concurrent.futures.Executor
         :return OutputBuffer:
         """
         data, x, index = self._parseData(x=x, y=y, index=index)
@@ -101,11 +107,14 @@ def batchROIMultipleSpectra(self, x=None, y=None, configuration=None,
                               roiList=roiList,
                               roiDict=config["ROI"]["roidict"],
                               outbuffer=outbuffer,
-                              xAtMinMax=xAtMinMax)
+                              xAtMinMax=xAtMinMax,
+                              nworkers=nworkers,
+                              executor=executor)
         return outbuffer
 
     def _extractRois(self, data, x, mcaAxis, roiList=None, roiDict=None,
-                     outbuffer=None, xAtMinMax=False):
+                     outbuffer=None, xAtMinMax=False, nworkers=None,
+                     executor=None):
         nRois = len(roiList)
         nRows = data.shape[0]
         nColumns = data.shape[1]
@@ -158,23 +167,33 @@ def idxmin(i): return i + 3 * nRois
                                            groupAttrs={'default': True},
                                            memtype='ram')
 
-        # Allocate memory of partial result
-        nMca = 2, 'MB'
-        _logger.debug('Process spectra in chunks of {}'.format(nMca))
-        datastack = McaStackView.FullView(data, mcaAxis=mcaAxis, nMca=nMca)
-        for (resultidx, resultshape), chunk in datastack.items(keyType='select'):
+        # Channels of each ROI (slices when contiguous) and the channels
+        # needed for the linear background
+        rois = [_roiChannels(idx[j]) if xw[j] is not None else slice(0, 0)
+                for j in range(nRois)]
+        channels = []
+        for j in range(nRois):
+            if xw[j] is not None:
+                channels.append(idx[j][iXMinList[j]])
+                channels.append(idx[j][iXMaxList[j]])
+        chunkItems = roiChunkItems(data, rois, mcaAxis=mcaAxis,
+                                   minMax="position" if xAtMinMax else None,
+                                   channels=channels, nworkers=nworkers,
+                                   executor=executor)
+        for (resultidx, resultshape), ddict in chunkItems:
+            iChannel = 0
             for j, roi in enumerate(roiList):
                 # Calculate ROI sum
                 if xw[j] is None:
-                    # no points in the ROI       
+                    # no points in the ROI
                     rawSum = 0.0
                     netSum = 0.0
                 else:
-                    roichunk = numpy.array(chunk[:, idx[j]], copy=False, dtype=numpy.float64)
-                    rawSum = roichunk.sum(axis=1, dtype=numpy.float64)
+                    rawSum = ddict["sum"][j]
                     deltaX = xw[j][iXMaxList[j]] - xw[j][iXMinList[j]]
-                    left = roichunk[:, iXMinList[j]]
-                    right = roichunk[:, iXMaxList[j]]
+                    left = ddict["channels"][iChannel]
+                    right = ddict["channels"][iChannel + 1]
+                    iChannel += 2
                     deltaY = right - left
                     if abs(deltaX) > 0.0:
                         slope = deltaY / float(deltaX)
@@ -193,9 +212,9 @@ def idxmin(i): return i + 3 * nRois
                         # what can be the Min and the Max when there is nothing in the ROI?
                         _logger.warning("No Min. Max for ROI <%s>. Empty ROI" % roi)
                     else:
-                        maxImage = xw[j][numpy.argmax(roichunk, axis=1)]
+                        maxImage = x[ddict["max"][j]]
                         results[idxmax(j)][resultidx] = maxImage.reshape(resultshape)
-                        minImage = xw[j][numpy.argmin(roichunk, axis=1)]
+                        minImage = x[ddict["min"][j]]
                         results[idxmin(j)][resultidx] = minImage.reshape(resultshape)
 
     def _parseData(self, x=None, y=None, index=None):
@@ -277,6 +296,162 @@ def _prepareRoiList(self, configuration=None, xLabel=None):
         return roiList, config
 
 
+def _roiChannels(idx):
+    """
+    :param array idx: increasing channel indices of a ROI
+    :returns slice or array: slice when the channels are contiguous
+    """
+    if len(idx) and (idx[-1] - idx[0] + 1) == len(idx):
+        return slice(int(idx[0]), int(idx[-1]) + 1)
+    return idx
+
+
+def roiChunkItems(data, rois, mcaAxis=-1, minMax=None, channels=None,
+                  nMca=(2, 'MB'), nworkers=None, executor=None):
+    """
+    Calculate ROI sums of a stack of spectra chunk by chunk.
+
+    Only the channels spanned by the ROIs are read. When the ROIs cover
+    more channels than their span (many or overlapping ROIs), the sums are
+    derived from the cumulative sum of each chunk, so every ROI costs two
+    subtractions per spectrum. The extrema are taken from contiguous
+    slices of the chunk.
+
+    :param array data: nD array (numpy.ndarray or h5py.Dataset)
+    :param list rois: channels of each ROI (slice or increasing indices)
+    :param int mcaAxis:
+    :param str minMax: None, 'position' (channel of the extrema) or 'value'
+    :param list channels: channels for which the values are returned
+    :param nMca: chunk size (see McaStackView)
+    :param int nworkers: number of chunks processed in parallel
+                         (None or 1: serial, 0: one per CPU)
+    :param executor: 'thread' (default), 'process' or
+                     concurrent.futures.Executor
+    :yields tuple: (idx, idxShape), dictionary with the arrays
+                   "sum" and, if requested, "min" and "max" (nRois, nSpectra)
+                   and "channels" (nChannels, nSpectra)
+    """
+    if channels is None:
+        channels = []
+    nChannels = data.shape[mcaAxis]
+    # channel range to be read
+    first, last = nChannels, 0
+    width = 0
+    for roi in rois:
+        if isinstance(roi, slice):
+            if roi.stop > roi.start:
+                first = min(first, roi.start)
+                last = max(last, roi.stop)
+                width += roi.stop - roi.start
+        elif len(roi):
+            first = min(first, roi[0])
+            last = max(last, roi[-1] + 1)
+            width += len(roi)
+    for channel in channels:
+        first = min(first, channel)
+        last = max(last, channel + 1)
+    if last <= first:
+        first, last = 0, 0
+    # channels relative to the channel range
+    shifted = []
+    for roi in rois:
+        if isinstance(roi, slice):
+            start = max(roi.start - first, 0)
+            shifted.append(slice(start, max(roi.stop - first, start)))
+        else:
+            shifted.append(numpy.asarray(roi) - first)
+    channels = [channel - first for channel in channels]
+    cumulative = width > (last - first) and len(rois) > 1
+
+    datastack = McaStackView.FullView(data, mcaAxis=mcaAxis, nMca=nMca,
+                                      mcaSlice=slice(first, last))
+    dataItems = datastack.items(keyType='select')
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor=executor) as (executor, nworkers):
+        if executor is None:
+            for key, chunk in dataItems:
+                yield key, _roiChunk(chunk, shifted, channels, minMax,
+                                     cumulative, first)
+            return
+        # the chunk buffer is reused by the view
+        arguments = ((key, (chunk.copy(), shifted, channels, minMax,
+                            cumulative, first))
+                     for key, chunk in dataItems)
+        for item in ExecutorUtils.orderedMap(_roiChunkArgs, arguments,
+                                             executor=executor,
+                                             nworkers=nworkers):
+            yield item
+
+
+def _roiChunkArgs(item):
+    key, args = item
+    return key, _roiChunk(*args)
+
+
+def _roiChunk(chunk, rois, channels, minMax, cumulative, offset):
+    """
+    :param array chunk: nSpectra x nChannels
+    :param list rois: slice or channel indices of each ROI
+    :param list channels:
+    :param str minMax: None, 'position' or 'value'
+    :param bool cumulative: use the cumulative sum of the chunk
+    :param int offset: channel offset of the chunk (for the positions)
+    :returns dict:
+    """
+    nSpectra = chunk.shape[0]
+    nRois = len(rois)
+    ddict = {}
+    sums = numpy.zeros((nRois, nSpectra), dtype=numpy.float64)
+    if cumulative:
+        cumsum = numpy.zeros((nSpectra, chunk.shape[1] + 1),
+                             dtype=numpy.float64)
+        numpy.cumsum(chunk, axis=1, dtype=numpy.float64, out=cumsum[:, 1:])
+    for j, roi in enumerate(rois):
+        if isinstance(roi, slice):
+            if roi.stop <= roi.start:
+                continue
+            if cumulative:
+                numpy.subtract(cumsum[:, roi.stop], cumsum[:, roi.start],
+                               out=sums[j])
+            else:
+                sums[j] = chunk[:, roi].sum(axis=1, dtype=numpy.float64)
+        elif len(roi):
+            sums[j] = chunk[:, roi].sum(axis=1, dtype=numpy.float64)
+    ddict["sum"] = sums
+    if minMax:
+        if minMax == "position":
+            dtype = numpy.intp
+        else:
+            dtype = numpy.float64
+        ddict["min"] = numpy.zeros((nRois, nSpectra), dtype=dtype)
+        ddict["max"] = numpy.zeros((nRois, nSpectra), dtype=dtype)
+        for j, roi in enumerate(rois):
+            if isinstance(roi, slice):
+                if roi.stop <= roi.start:
+                    continue
+                roichunk = chunk[:, roi]
+                start = roi.start
+            elif len(roi):
+                roichunk = chunk[:, roi]
+                start = 0
+            else:
+                continue
+            if minMax == "position":
+                imin = numpy.argmin(roichunk, axis=1)
+                imax = numpy.argmax(roichunk, axis=1)
+                if isinstance(roi, slice):
+                    ddict["min"][j] = imin + start + offset
+                    ddict["max"][j] = imax + start + offset
+                else:
+                    ddict["min"][j] = roi[imin] + offset
+                    ddict["max"][j] = roi[imax] + offset
+            else:
+                ddict["min"][j] = roichunk.min(axis=1)
+                ddict["max"][j] = roichunk.max(axis=1)
+    ddict["channels"] = numpy.array(chunk[:, channels].T, dtype=numpy.float64)
+    return ddict
+
+
 def getFileListFromPattern(pattern, begin, end, increment=None):
     if type(begin) == type(1):
         begin = [begin]
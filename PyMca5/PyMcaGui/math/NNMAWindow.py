@@ -63,7 +63,7 @@ def __init__(self, parent=None, options=[1, 2, 3, 4, 5, 10], regions=False):
             "ALS",
             "FastHALS",
             "GDCLS",
-        ]
+        ] + NNMAModule.chunked_function_list
         self.methodOptions.mainLayout = qt.QGridLayout(self.methodOptions)
         self.methodOptions.mainLayout.setContentsMargins(0, 0, 0, 0)
         self.methodOptions.mainLayout.setSpacing(2)
@@ -73,7 +73,7 @@ def __init__(self, parent=None, options=[1, 2, 3, 4, 5, 10], regions=False):
             rButton = qt.QRadioButton(self.methodOptions)
             self.methodOptions.mainLayout.addWidget(rButton, 0, i)
             # self.l.setAlignment(rButton, qt.Qt.AlignHCenter)
-            if i == 1:
+            if item == "FNMAI":
                 rButton.setChecked(True)
             rButton.setText(item)
             self.buttonGroup.addButton(rButton)
@@ -313,7 +313,8 @@ def getParameters(self):
         maxcount = self._maxIterations.value()
         ddict["binning"] = int(self.binningCombo.currentText())
         ddict["npc"] = self.nPC.value()
-        ddict["kw"] = {"eps": eps, "maxcount": maxcount}
+        ddict["kw"] = {"eps": eps, "maxcount": maxcount,
+                       "function": self.methods[i]}
         mask = None
         if self.__regions:
             regions = self.regionsWidget.getRegions()
@@ -69,6 +69,7 @@ def __init__(
             "Expectation Max.",
             "Cov. Multiple Arrays",
             "Corr. Multiple Arrays",
+            "Randomized SVD",
         ]
         self._multipleIndex = [3, 4]
         self.functions = [
@@ -77,6 +78,7 @@ def __init__(
             PCAModule.expectationMaximizationPCA,
             PCAModule.multipleArrayCovariancePCA,
             PCAModule.multipleArrayCorrelationPCA,
+            PCAModule.randomizedPCA,
         ]
         self.methodOptions.mainLayout = qt.QGridLayout(self.methodOptions)
         self.methodOptions.mainLayout.setContentsMargins(0, 0, 0, 0)
@@ -1435,7 +1435,14 @@ def _runInProcessMonitored(self, cmd):
         processList = []
         nFiles = len(self.fileList)
         nBatches = self._nProcesses
-        if nBatches > 1:
+        if nBatches > 1 and not isinstance(self.configFile, list) and \
+           not (cmd.fitfiles or cmd.html):
+            # One process with a pool of workers: no partial results
+            # to be merged afterwards
+            cmd.addOption('nproc', value=nBatches, format="{:d}")
+            self._runInProcess(cmd, blocking=False,
+                               processList=processList)
+        elif nBatches > 1:
             def launch(cmd):
                 self._runInProcess(cmd, blocking=False,
                                    processList=processList)
@@ -2177,7 +2184,8 @@ def main():
                               filebeginoffset=filebeginoffset,fileendoffset=fileendoffset,
                               mcaoffset=mcaoffset, chunk=chunk, selection=selection,
                               diagnostics=diagnostics, multipage=multipage,
-                              tif=tif, edf=edf, csv=csv, h5=h5, dat=dat)
+                              tif=tif, edf=edf, csv=csv, h5=h5, dat=dat,
+                              nworkers=nproc if nproc > 1 else None)
         except Exception:
             if exitonend:
                 _logger.warning("Error: ", sys.exc_info()[1])
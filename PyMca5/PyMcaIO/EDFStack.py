@@ -32,12 +32,15 @@
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 from PyMca5.PyMcaCore import DataObject
 from PyMca5.PyMcaIO import EdfFile
+from PyMca5.PyMcaIO import FileSeriesReader
 from PyMca5.PyMcaCore import EdfFileDataSource
 from PyMca5.PyMcaMisc import PhysicalMemory
 import numpy
 import sys
 import os
 import logging
+import threading
+import collections
 
 # Offer automatic conversion to HDF5 in case of lacking
 # memory to hold the Stack.
@@ -57,8 +60,153 @@
 Y_AXIS=1
 Z_AXIS=2
 
+
+class VirtualImageStack(object):
+    """
+    Read-only 3D stack of equally shaped images, each of them stored
+    uncompressed in a file. The images are memory mapped on access, so
+    only the requested part of the stack is read and the operating system
+    page cache handles the memory. Slicing returns numpy arrays like
+    slicing an h5py dataset does.
+    """
+    def __init__(self, layouts, axis=0, dtype=None, maxOpen=128):
+        """
+        :param list layouts: (filename, offset, dtype, shape) of each image
+        :param int axis: stack axis along which the images are placed
+        :param dtype: dtype of the returned data (native image dtype
+                      by default)
+        :param int maxOpen: maximal number of files kept mapped
+        """
+        if not layouts:
+            raise ValueError("No image to stack")
+        self._layouts = list(layouts)
+        self._imageShape = tuple(layouts[0][3])
+        self._imageDtype = numpy.dtype(layouts[0][2])
+        for layout in self._layouts:
+            if tuple(layout[3]) != self._imageShape or \
+               numpy.dtype(layout[2]) != self._imageDtype:
+                raise ValueError("Images of different shape or type")
+        if len(self._imageShape) != 2:
+            raise ValueError("Only 2D images can be stacked")
+        if dtype is None:
+            dtype = self._imageDtype.newbyteorder("=")
+        self.dtype = numpy.dtype(dtype)
+        self._axis = axis
+        shape = list(self._imageShape)
+        shape.insert(axis, len(self._layouts))
+        self.shape = tuple(shape)
+        # each image is a storage chunk (for McaStackView)
+        chunks = list(self._imageShape)
+        chunks.insert(axis, 1)
+        self.chunks = tuple(chunks)
+        self._maxOpen = maxOpen
+        self._maps = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(numpy.prod(self.shape, dtype=numpy.int64))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None):
+        data = self[()]
+        if dtype is not None:
+            data = data.astype(dtype, copy=False)
+        return data
+
+    def image(self, index):
+        """Read-only memory map of one image (file byte order)
+        """
+        with self._lock:
+            data = self._maps.get(index)
+            if data is not None:
+                self._maps.move_to_end(index)
+                return data
+        filename, offset, dtype, shape = self._layouts[index]
+        data = numpy.memmap(filename, dtype=dtype, mode="r",
+                            offset=offset, shape=tuple(shape))
+        with self._lock:
+            self._maps[index] = data
+            while len(self._maps) > self._maxOpen:
+                self._maps.popitem(last=False)
+        return data
+
+    def close(self):
+        with self._lock:
+            self._maps.clear()
+
+    def _normalizeKey(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = [k is Ellipsis for k in key].index(True)
+            n = self.ndim - len(key) + 1
+            key = key[:i] + (slice(None),) * n + key[i + 1:]
+        if len(key) > self.ndim:
+            raise IndexError("Too many indices")
+        return key + (slice(None),) * (self.ndim - len(key))
+
+    def __getitem__(self, key):
+        key = self._normalizeKey(key)
+        axis = self._axis
+        imageKey = key[:axis] + key[axis + 1:]
+        indices = numpy.arange(self.shape[axis])[key[axis]]
+        if indices.ndim == 0:
+            return numpy.array(self.image(int(indices))[imageKey],
+                               dtype=self.dtype)
+        scalar = (int, numpy.integer)
+        fileList = not isinstance(key[axis], slice)
+        advanced = any(not isinstance(k, (slice,) + scalar)
+                       for k in imageKey)
+        if fileList:
+            advanced |= indices.ndim > 1 or \
+                        any(isinstance(k, scalar) for k in imageKey)
+        if advanced:
+            # let numpy place the axes of the advanced indices
+            data = numpy.stack([self.image(int(i)) for i in indices.ravel()],
+                               axis=axis)
+            if fileList:
+                fileKey = numpy.arange(indices.size).reshape(indices.shape)
+            else:
+                fileKey = slice(None)
+            key = key[:axis] + (fileKey,) + key[axis + 1:]
+            return numpy.array(data[key], dtype=self.dtype)
+        # integer indices before the stack axis remove a dimension
+        outAxis = axis - sum(1 for k in key[:axis] if isinstance(k, scalar))
+        shape = list(numpy.empty(self._imageShape,
+                                 dtype=numpy.uint8)[imageKey].shape)
+        shape.insert(outAxis, len(indices))
+        data = numpy.empty(shape, dtype=self.dtype)
+        index = [slice(None)] * len(shape)
+        for j, i in enumerate(indices):
+            index[outAxis] = j
+            data[tuple(index)] = self.image(int(i))[imageKey]
+        return data
+
+
 class EDFStack(DataObject.DataObject):
-    def __init__(self, filelist = None, imagestack=None, dtype=None):
+    def __init__(self, filelist = None, imagestack=None, dtype=None,
+                 mmap=False, nworkers=None):
+        """
+        :param filelist: EDF file name(s)
+        :param bool imagestack: images are the first stack axis
+        :param dtype: data type of the stack
+        :param bool mmap: memory map uncompressed EDF files instead of
+                          reading them into memory. A stack of single
+                          image files is a VirtualImageStack.
+        :param int nworkers: number of threads reading the files
+                             (see FileSeriesReader.readFileSeries)
+        """
         DataObject.DataObject.__init__(self)
         self.incrProgressBar=0
         self.__keyList = []
@@ -67,6 +215,8 @@ def __init__(self, filelist = None, imagestack=None, dtype=None):
         else:
             self.__imageStack = imagestack
         self.__dtype = dtype
+        self.__mmap = mmap
+        self.nworkers = nworkers
         if filelist is not None:
             if type(filelist) != type([]):
                 filelist = [filelist]
@@ -88,7 +238,8 @@ def loadFileList(self, filelist, fileindex=0):
 
         #read first edf file
         #get information
-        tempEdf=EdfFileDataSource.EdfFileDataSource(filelist[0])
+        tempEdf=EdfFileDataSource.EdfFileDataSource(filelist[0],
+                                                    mmap=self.__mmap)
         keylist = tempEdf.getSourceInfo()['KeyList']
         nImages = len(keylist)
         dataObject = tempEdf.getDataObject(keylist[0])
@@ -110,7 +261,11 @@ def loadFileList(self, filelist, fileindex=0):
             return
         arrRet = dataObject.data
         if self.__dtype is None:
-            self.__dtype = arrRet.dtype
+            self.__dtype = arrRet.dtype.newbyteorder("=")
+        if self.__mmap and nImages == 1 and len(arrRet.shape) == 2 and \
+           "_sample_" not in filelist[0]:
+            if self._loadVirtualStack(filelist, fileindex):
+                return
 
         self.onBegin(self.nbFiles)
         singleImageShape = arrRet.shape
@@ -177,13 +332,13 @@ def loadFileList(self, filelist, fileindex=0):
                                                      arrRet.shape[0],
                                                      arrRet.shape[1]),
                                                      self.__dtype)
-                            self.incrProgressBar=0
-                            for tempEdfFileName in filelist:
+                            data = self.data
+
+                            def readFile(i, tempEdfFileName):
                                 tempEdf=EdfFile.EdfFile(tempEdfFileName, 'rb')
-                                pieceOfStack=tempEdf.GetData(0)
-                                self.data[self.incrProgressBar] = pieceOfStack
-                                self.incrProgressBar += 1
-                                self.onProgress(self.incrProgressBar)
+                                data[i] = tempEdf.GetData(0)
+
+                            self._readFileSeries(filelist, readFile)
                             actualImageStack = True
                         else:
                             self.data = numpy.zeros((arrRet.shape[0],
@@ -318,15 +473,15 @@ def loadFileList(self, filelist, fileindex=0):
                                                arrRet.shape[0],
                                                arrRet.shape[1]),
                                                self.__dtype)
-                        self.incrProgressBar=0
-                        for tempEdfFileName in filelist:
+                        data = self.data
+
+                        def readFile(n, tempEdfFileName):
                             tempEdf=EdfFile.EdfFile(tempEdfFileName, 'rb')
                             for i in range(nImages):
                                 pieceOfStack=tempEdf.GetData(i)
-                                self.data[nImages*self.incrProgressBar+i,
-                                          :,:] = pieceOfStack[:,:]
-                            self.incrProgressBar += 1
-                            self.onProgress(self.incrProgressBar)
+                                data[nImages*n+i, :,:] = pieceOfStack[:,:]
+
+                        self._readFileSeries(filelist, readFile)
                     self.onEnd()
                 else:
                     if fileindex == 1:
@@ -428,14 +583,15 @@ def loadFileList(self, filelist, fileindex=0):
                     filelist = filelist[::fileSampling]
                     self.sourceName = self.sourceName[::fileSampling]
                     self.nbFiles = len(filelist)
-                    self.incrProgressBar=0
+                    data = self.data
                     if fileindex == 1:
-                        for tempEdfFileName in filelist:
+                        def readFile(i, tempEdfFileName):
                             tempEdf=EdfFile.EdfFile(tempEdfFileName, 'rb')
                             pieceOfStack=tempEdf.GetData(0)
-                            self.data[:,self.incrProgressBar,:] = pieceOfStack[:,:]
-                            self.incrProgressBar += 1
-                            self.onProgress(self.incrProgressBar * fileSampling)
+                            data[:,i,:] = pieceOfStack[:,:]
+
+                        self._readFileSeries(filelist, readFile,
+                                             progressStep=fileSampling)
                     else:
                         # test for ID24 map
                         ID24 = False
@@ -448,7 +604,6 @@ def loadFileList(self, filelist, fileindex=0):
                             i0StartFile = filelist[0].replace("_sample_", "_I0start_")
                             if os.path.exists(i0StartFile):
                                 ID24 = True
-                                id24idx = 0
                                 i0Start = EdfFile.EdfFile(i0StartFile, 'rb').GetData(0).astype(numpy.float64)
                                 i0Start -= bckData
                                 i0EndFile = filelist[0].replace("_sample_", "_I0end_")
@@ -464,16 +619,16 @@ def loadFileList(self, filelist, fileindex=0):
                                     motorName = positionersEdf.GetHeader(i).get("Title", "Motor_%02d" % i)
                                     motorValue = positionersEdf.GetData(i)
                                     self.info["positioners"][motorName] = motorValue
-                        for tempEdfFileName in filelist:
+
+                        def readFile(i, tempEdfFileName):
                             tempEdf=EdfFile.EdfFile(tempEdfFileName, 'rb')
                             if ID24:
-                                pieceOfStack=-numpy.log((tempEdf.GetData(0) - bckData)/(i0Start[0,:] + id24idx * i0Slope))
+                                pieceOfStack=-numpy.log((tempEdf.GetData(0) - bckData)/(i0Start[0,:] + i * i0Slope))
                                 pieceOfStack[numpy.isfinite(pieceOfStack) == False] = 1
-                                id24idx += 1
                             else:
                                 pieceOfStack=tempEdf.GetData(0)
                             try:
-                                self.data[self.incrProgressBar, :,:] = pieceOfStack[::mcaSampling,:]
+                                data[i, :,:] = pieceOfStack[::mcaSampling,:]
                             except Exception:
                                 if pieceOfStack.shape[1] != arrRet.shape[1]:
                                     _logger.warning(" ERROR on file %s", tempEdfFileName)
@@ -481,11 +636,12 @@ def loadFileList(self, filelist, fileindex=0):
                                 if pieceOfStack.shape[0] != arrRet.shape[0]:
                                     _logger.warning(" ERROR on file %s", tempEdfFileName)
                                     _logger.warning(" DIM 0 error Assuming missing data were at the end!!!")
-                                self.data[self.incrProgressBar,
-                                          :pieceOfStack.shape[0],
-                                          :pieceOfStack.shape[1]] = pieceOfStack[:, :]
-                            self.incrProgressBar += 1
-                            self.onProgress(self.incrProgressBar * fileSampling)
+                                data[i,
+                                     :pieceOfStack.shape[0],
+                                     :pieceOfStack.shape[1]] = pieceOfStack[:, :]
+
+                        self._readFileSeries(filelist, readFile,
+                                             progressStep=fileSampling)
                     self.onEnd()
         self.__nFiles = self.incrProgressBar
         self.__nImagesPerFile = nImages
@@ -542,6 +698,69 @@ def loadFileList(self, filelist, fileindex=0):
                 self.info["xScale"] = (originX, deltaX)
                 self.info["yScale"] = (originY, deltaY)
 
+    def _loadVirtualStack(self, filelist, fileindex):
+        """Assemble a VirtualImageStack from single image files
+
+        :returns bool: False when the files cannot be memory mapped
+        """
+        self.onBegin(self.nbFiles)
+        layouts = []
+        try:
+            for i, filename in enumerate(filelist):
+                edf = EdfFile.EdfFile(filename, 'rb')
+                if edf.GetNumImages() != 1:
+                    _logger.info("%s: not a single image", filename)
+                    return False
+                layout = edf.GetDataLayout(0)
+                if layout is None:
+                    _logger.info("%s cannot be memory mapped", filename)
+                    return False
+                layouts.append((filename,) + layout)
+                self.onProgress(i + 1)
+            if (fileindex == 2) or self.__imageStack:
+                self.__imageStack = True
+                axis = 0
+            elif fileindex == 1:
+                axis = 1
+            else:
+                axis = 0
+            try:
+                self.data = VirtualImageStack(layouts, axis=axis,
+                                              dtype=self.__dtype)
+            except ValueError as e:
+                _logger.info("Cannot stack the images (%s)", e)
+                return False
+        finally:
+            self.onEnd()
+        self.__nFiles = self.nbFiles
+        self.__nImagesPerFile = 1
+        self.incrProgressBar = self.nbFiles
+        shape = self.data.shape
+        for i in range(len(shape)):
+            key = 'Dim_%d' % (i+1,)
+            self.info[key] = shape[i]
+        self.info["SourceType"] = SOURCE_TYPE
+        if self.__imageStack:
+            self.info["McaIndex"] = 0
+            self.info["FileIndex"] = 1
+        else:
+            self.info["FileIndex"] = fileindex
+        self.info["SourceName"] = self.sourceName
+        self.info["NumberOfFiles"] = self.__nFiles
+        self.info["Size"] = self.__nFiles
+        return True
+
+    def _readFileSeries(self, filelist, readFile, progressStep=1):
+        """Call readFile(index, filename) for each file with a pool of
+        threads, reporting the progress in file order.
+        """
+        self.incrProgressBar = 0
+        for i, result in FileSeriesReader.readFileSeries(
+                                        filelist, readFile,
+                                        nworkers=self.nworkers):
+            self.incrProgressBar += 1
+            self.onProgress(self.incrProgressBar * progressStep)
+
     def onBegin(self, n):
         pass
 
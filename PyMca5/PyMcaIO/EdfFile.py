@@ -37,9 +37,11 @@
     Interface:
     ===========================
     class EdfFile:
-        __init__(self,FileName)
+        __init__(self,FileName,access=None,fastedf=None,mmap=False)
         GetNumImages(self)
         def GetData(self,Index, DataType="",Pos=None,Size=None):
+        GetDataLayout(self,Index)
+        GetMemmap(self,Index,Pos=None,Size=None)
         GetPixel(self,Index,Position)
         GetHeader(self,Index)
         GetStaticHeader(self,Index)
@@ -177,7 +179,7 @@ class  EdfFile(object):
     """
     ############################################################################
     #Interface
-    def __init__(self, FileName, access=None, fastedf=None):
+    def __init__(self, FileName, access=None, fastedf=None, mmap=None):
         """ Constructor
 
         @param  FileName:   Name of the file (either existing or to be created)
@@ -187,6 +189,9 @@ def __init__(self, FileName, access=None, fastedf=None):
         @type access: string
         @type fastedf= True to use the fastedf module
         @param fastedf= boolean
+        @param mmap: GetData returns read-only memory maps of uncompressed
+                     EDF images instead of reading them (see GetMemmap)
+        @type mmap: boolean
         """
         self.Images = []
         self.NumImages = 0
@@ -195,6 +200,7 @@ def __init__(self, FileName, access=None, fastedf=None):
         if fastedf is None:
             fastedf = 0
         self.fastedf = fastedf
+        self.mmap = bool(mmap)
         self.ADSC = False
         self.MARCCD = False
         self.TIFF = False
@@ -581,12 +587,92 @@ def GetNumImages(self):
         return self.NumImages
 
     def GetData(self, *var, **kw):
+        if self.mmap:
+            Data = self._GetMemmap(*var, **kw)
+            if Data is not None:
+                return Data
         try:
             self.__makeSureFileIsOpen()
             return self._GetData(*var, **kw)
         finally:
             self.__makeSureFileIsClosed()
 
+    def GetDataLayout(self, Index):
+        """ Returns the location of the image data in the file as a tuple
+            (offset, dtype, shape) where the dtype has the byte order of
+            the file, or None when the data cannot be mapped (compressed
+            files, file objects and non EDF formats).
+        """
+        if Index < 0 or Index >= self.NumImages:
+            raise ValueError("EdfFile: Index out of limit")
+        if not self.__ownedOpen or self.ADSC or self.MARCCD or self.TIFF or\
+           self.PILATUS_CBF or self.SPE:
+            return None
+        image = self.Images[Index]
+        if image.NumDim == 3:
+            shape = (image.Dim3, image.Dim2, image.Dim1)
+        elif image.NumDim == 2:
+            shape = (image.Dim2, image.Dim1)
+        else:
+            shape = (image.Dim1,)
+        dtype = numpy.dtype(self.__GetDefaultNumpyType__(image.DataType,
+                                                          index=Index))
+        if image.ByteOrder.upper() == "HIGHBYTEFIRST":
+            dtype = dtype.newbyteorder(">")
+        else:
+            dtype = dtype.newbyteorder("<")
+        nbytes = dtype.itemsize
+        for n in shape:
+            nbytes *= n
+        try:
+            fileSize = os.path.getsize(self.FileName)
+        except OSError:
+            return None
+        if image.DataPosition + nbytes > fileSize:
+            _logger.debug("Image %d of %s is truncated", Index, self.FileName)
+            return None
+        return image.DataPosition, dtype, shape
+
+    def GetMemmap(self, Index, Pos=None, Size=None):
+        """ Returns a read-only numpy.memmap of the image data (no copy)
+            Index:          The zero-based index of the image in the file
+            Pos, Size:      Region of the image as in GetData
+
+            Contrary to GetData, the byte order is the one of the file.
+            Raises IOError when the data cannot be mapped.
+        """
+        Data = self._GetMemmap(Index, Pos=Pos, Size=Size)
+        if Data is None:
+            raise IOError("EdfFile: Image %d cannot be memory mapped" % Index)
+        return Data
+
+    def _GetMemmap(self, Index, DataType="", Pos=None, Size=None):
+        layout = self.GetDataLayout(Index)
+        if layout is None:
+            return None
+        offset, dtype, shape = layout
+        if DataType != "" and \
+           numpy.dtype(GetDefaultNumpyType(DataType)) != dtype.newbyteorder("="):
+            return None
+        Data = numpy.memmap(self.FileName, dtype=dtype, mode="r",
+                            offset=offset, shape=shape)
+        if Pos is None and Size is None:
+            return Data
+        # Pos and Size are given in (x, y, z) order
+        ndim = len(shape)
+        if Pos is None:
+            Pos = (0,) * ndim
+        if Size is None:
+            Size = (0,) * ndim
+        region = []
+        for i in range(ndim):
+            n = shape[ndim - 1 - i]
+            size = Size[i]
+            if size == 0:
+                size = n - Pos[i]
+            region.insert(0, slice(Pos[i], Pos[i] + size))
+        return Data[tuple(region)]
+
     def _GetData(self, Index, DataType="", Pos=None, Size=None):
         """ Returns numpy array with image data
             Index:          The zero-based index of the image in the file
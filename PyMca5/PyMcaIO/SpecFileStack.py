@@ -37,6 +37,7 @@
 from PyMca5.PyMcaCore import DataObject
 from PyMca5.PyMcaIO import specfilewrapper as specfile
 from PyMca5.PyMcaCore import SpecFileDataSource
+from PyMca5.PyMcaIO import FileSeriesReader
 
 HDF5 = False
 try:
@@ -54,10 +55,16 @@
 
 
 class SpecFileStack(DataObject.DataObject):
-    def __init__(self, filelist=None):
+    def __init__(self, filelist=None, nworkers=None):
+        """
+        :param filelist: file name(s)
+        :param int nworkers: number of threads reading the files
+                             (see FileSeriesReader.readFileSeries)
+        """
         DataObject.DataObject.__init__(self)
         self.incrProgressBar = 0
         self.__keyList = []
+        self.nworkers = nworkers
         if filelist is not None:
             if type(filelist) != type([]):
                 filelist = [filelist]
@@ -205,8 +212,9 @@ def loadFileList(self, filelist, fileindex=0, shape=None):
                                          numberofmca // numberofdetectors,
                                          arrRet.shape[0]),
                                          arrRet.dtype.char)
-                filecounter = 0
-                for tempFileName in filelist:
+                data = self.data
+
+                def readFile(filecounter, tempFileName):
                     tempInstance = specfile.Specfile(tempFileName)
                     # it can only be here if there is one scan per file
                     # prevent problems if the scan number is different
@@ -214,12 +222,15 @@ def loadFileList(self, filelist, fileindex=0, shape=None):
                     scan = tempInstance[-1]
                     for i in iterlist:
                         # mcadata = scan_obj.mca(i)
-                        self.data[filecounter,
-                                  0,
-                                  :] = scan.mca(i)[:]
-                        self.incrProgressBar += 1
-                        self.onProgress(self.incrProgressBar)
-                    filecounter += 1
+                        data[filecounter,
+                             0,
+                             :] = scan.mca(i)[:]
+
+                for _ in FileSeriesReader.readFileSeries(filelist, readFile,
+                                                        nworkers=self.nworkers):
+                    self.incrProgressBar += len(iterlist)
+                    self.onProgress(self.incrProgressBar)
+                filecounter = len(filelist)
             except MemoryError:
                 qtflag = False
                 if ('PyQt4.QtCore' in sys.modules) or \
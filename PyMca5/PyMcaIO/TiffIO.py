@@ -34,14 +34,24 @@
 
 import sys
 import os
+import zlib
 import struct
 import numpy
 import logging
+from PyMca5.PyMcaMisc import ExecutorUtils
 
 logger = logging.getLogger(__name__)
 
 ALLOW_MULTIPLE_STRIPS = False
 
+# Maximal memory used by the decoded images kept by a TiffIO instance
+DEFAULT_CACHE_SIZE = 128 * 1024 * 1024
+
+# Compressed images of at least this size are decoded by DECODE_NWORKERS
+# threads (zlib releases the GIL)
+PARALLEL_DECODE_SIZE = 4 * 1024 * 1024
+DECODE_NWORKERS = min(4, os.cpu_count() or 1)
+
 TAG_ID  = { 256:"NumberOfColumns",           # S or L ImageWidth
             257:"NumberOfRows",              # S or L ImageHeight
             258:"BitsPerSample",             # S Number of bits per component
@@ -55,11 +65,15 @@
             279:"StripByteCounts",           # S or L, The number of bytes in the strip AFTER any compression
             305:"Software",                  # ASCII
             306:"Date",                      # ASCII
+            317:"Predictor",                 # SHORT (1 - No prediction, 2 - Horizontal differencing)
             320:"Colormap",                  # Colormap of Palette-color Images
+            322:"TileWidth",                 # S or L, number of columns in each tile
+            323:"TileLength",                # S or L, number of rows in each tile
+            324:"TileOffsets",               # L, for each tile, the byte offset of the tile
+            325:"TileByteCounts",            # S or L, The number of bytes in the tile AFTER any compression
             339:"SampleFormat",              # SHORT Interpretation of data in each pixel
             }
 
-# TILES ARE TO BE SUPPORTED TOO
 TAG_NUMBER_OF_COLUMNS  = 256
 TAG_NUMBER_OF_ROWS     = 257
 TAG_BITS_PER_SAMPLE    = 258
@@ -73,9 +87,24 @@
 TAG_STRIP_BYTE_COUNTS  = 279
 TAG_SOFTWARE           = 305
 TAG_DATE               = 306
+TAG_PREDICTOR          = 317
 TAG_COLORMAP           = 320
+TAG_TILE_WIDTH         = 322
+TAG_TILE_LENGTH        = 323
+TAG_TILE_OFFSETS       = 324
+TAG_TILE_BYTE_COUNTS   = 325
 TAG_SAMPLE_FORMAT      = 339
 
+# compression schemes
+COMPRESSION_NONE          = 1
+COMPRESSION_LZW           = 5
+COMPRESSION_ADOBE_DEFLATE = 8
+COMPRESSION_DEFLATE       = 32946
+COMPRESSION_PACKBITS      = 32773
+SUPPORTED_COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_LZW,
+                          COMPRESSION_ADOBE_DEFLATE, COMPRESSION_DEFLATE,
+                          COMPRESSION_PACKBITS)
+
 FIELD_TYPE  = {1:('BYTE', "B"),
                2:('ASCII', "s"), # string ending with binary zero
                3:('SHORT', "H"),
@@ -110,9 +139,125 @@
 SAMPLE_FORMAT_COMPLEXIEEEFP = 6
 
 
+def _unpackBits(data):
+    """Decode PackBits compressed bytes"""
+    output = bytearray()
+    n = len(data)
+    i = 0
+    while i < n:
+        header = data[i]
+        i += 1
+        if header < 128:
+            output += data[i:i + header + 1]
+            i += header + 1
+        elif header > 128:
+            output += data[i:i + 1] * (257 - header)
+            i += 1
+        # 128 is a no-operation
+    return bytes(output)
+
+
+def _lzwDecode(data):
+    """Decode TIFF LZW compressed bytes (MSB first codes with early change)
+    """
+    if len(data) > 1 and data[0] == 0 and (data[1] & 0x1):
+        raise IOError("Old-style (LSB first) LZW compression not supported")
+    nBitsTotal = 8 * len(data)
+    data = bytes(data) + b"\x00\x00\x00"
+    table = [bytes((i,)) for i in range(256)]
+    table.extend((b"", b""))
+    output = bytearray()
+    previous = None
+    nbits = 9
+    mask = 0x1ff
+    pos = 0
+    while pos + nbits <= nBitsTotal:
+        p = pos >> 3
+        code = (((data[p] << 16) | (data[p + 1] << 8) | data[p + 2]) >>
+                (24 - nbits - (pos & 7))) & mask
+        pos += nbits
+        if code == 256:
+            # clear code
+            del table[258:]
+            nbits = 9
+            mask = 0x1ff
+            previous = None
+            continue
+        if code == 257:
+            # end of information
+            break
+        if previous is None:
+            entry = table[code]
+        else:
+            if code < len(table):
+                entry = table[code]
+                table.append(previous + entry[:1])
+            else:
+                entry = previous + previous[:1]
+                table.append(entry)
+            if len(table) >= (1 << nbits) - 1 and nbits < 12:
+                nbits += 1
+                mask = (1 << nbits) - 1
+        output += entry
+        previous = entry
+    return bytes(output)
+
+
+def _decompress(data, compression_type):
+    if compression_type == COMPRESSION_NONE:
+        return data
+    if compression_type in (COMPRESSION_ADOBE_DEFLATE, COMPRESSION_DEFLATE):
+        return zlib.decompress(data)
+    if compression_type == COMPRESSION_LZW:
+        return _lzwDecode(data)
+    if compression_type == COMPRESSION_PACKBITS:
+        return _unpackBits(data)
+    raise IOError("Unsupported TIFF compression %d" % compression_type)
+
+
+def _decodeSegment(data, compression_type, dtype, shape, predictor):
+    """Decode a strip or a tile
+
+    :param bytes data: bytes as stored in the file
+    :param int compression_type:
+    :param dtype: data type with the byte order of the file
+    :param tuple shape: (rows, columns[, samples]) of the segment
+    :param int predictor:
+    :returns numpy.ndarray: (may be a read-only view of the buffer)
+    """
+    buffer = _decompress(data, compression_type)
+    dtype = numpy.dtype(dtype)
+    count = 1
+    for n in shape:
+        count *= n
+    rowSize = count // shape[0]
+    available = len(buffer) // dtype.itemsize
+    if available < count:
+        # truncated segment: keep the complete rows
+        nRows = available // rowSize
+        shape = (nRows,) + tuple(shape[1:])
+        count = nRows * rowSize
+    segment = numpy.frombuffer(buffer, dtype, count=count).reshape(shape)
+    if predictor == 2:
+        # horizontal differencing
+        segment = numpy.cumsum(segment, axis=1,
+                               dtype=dtype.newbyteorder("="))
+    elif predictor not in (None, 1):
+        raise IOError("Unsupported TIFF predictor %d" % predictor)
+    return segment
+
 
 class TiffIO(object):
-    def __init__(self, filename, mode=None, cache_length=20, mono_output=False):
+    def __init__(self, filename, mode=None, cache_length=20, mono_output=False,
+                 cache_size=None):
+        """
+        :param filename: file name or file object
+        :param str mode:
+        :param int cache_length: maximal number of images kept in memory
+        :param bool mono_output: color images are converted to monochrome
+        :param int cache_size: maximal size in bytes of the images kept in
+                               memory (DEFAULT_CACHE_SIZE by default)
+        """
         if mode is None:
             mode = 'rb'
         if 'b' not in mode:
@@ -134,6 +279,9 @@ def __init__(self, filename, mode=None, cache_length=20, mono_output=False):
 
         self._initInternalVariables(fd)
         self._maxImageCacheLength = cache_length
+        if cache_size is None:
+            cache_size = DEFAULT_CACHE_SIZE
+        self._maxImageCacheSize = cache_size
         self._forceMonoOutput = mono_output
 
     def _initInternalVariables(self, fd=None):
@@ -175,6 +323,7 @@ def _initInternalVariables(self, fd=None):
         self._IFD = []
         self._imageDataCacheIndex = []
         self._imageDataCache = []
+        self._imageDataCacheSize = 0
         self._imageInfoCacheIndex = []
         self._imageInfoCache = []
         self.getImageFileDirectories(fd)
@@ -470,12 +619,34 @@ def _readInfo(self, nImage, close=True):
         else:
             date = "Unknown Date"
 
-        stripOffsets = self._readIFDEntry(TAG_STRIP_OFFSETS,
-                                          tagIDList,
-                                          fieldTypeList,
-                                          nValuesList,
-                                          valueOffsetList)
-        if TAG_ROWS_PER_STRIP in tagIDList:
+        if TAG_PREDICTOR in tagIDList:
+            predictor = valueOffsetList[tagIDList.index(TAG_PREDICTOR)]
+        else:
+            predictor = 1
+
+        tiles = None
+        if TAG_TILE_OFFSETS in tagIDList:
+            tileOffsets = self._readIFDEntry(TAG_TILE_OFFSETS,
+                        tagIDList, fieldTypeList, nValuesList, valueOffsetList)
+            tileByteCounts = self._readIFDEntry(TAG_TILE_BYTE_COUNTS,
+                        tagIDList, fieldTypeList, nValuesList, valueOffsetList)
+            tileWidth = valueOffsetList[tagIDList.index(TAG_TILE_WIDTH)]
+            tileLength = valueOffsetList[tagIDList.index(TAG_TILE_LENGTH)]
+            tiles = {"tileWidth": tileWidth,
+                     "tileLength": tileLength,
+                     "tileOffsets": tileOffsets,
+                     "tileByteCounts": tileByteCounts}
+            stripOffsets = []
+        else:
+            stripOffsets = self._readIFDEntry(TAG_STRIP_OFFSETS,
+                                              tagIDList,
+                                              fieldTypeList,
+                                              nValuesList,
+                                              valueOffsetList)
+        if tiles is not None:
+            rowsPerStrip = nRows
+            stripByteCounts = []
+        elif TAG_ROWS_PER_STRIP in tagIDList:
             rowsPerStrip = self._readIFDEntry(TAG_ROWS_PER_STRIP,
                         tagIDList, fieldTypeList, nValuesList, valueOffsetList)[0]
         else:
@@ -519,7 +690,9 @@ def _readInfo(self, nImage, close=True):
         info["imageDescription"] = imageDescription
         info["stripOffsets"] = stripOffsets  # This contains the file offsets to the data positions
         info["rowsPerStrip"] = rowsPerStrip
-        info["stripByteCounts"] = stripByteCounts  # bytes in strip since I do not support compression
+        info["stripByteCounts"] = stripByteCounts  # bytes in strip after compression
+        info["predictor"] = predictor
+        info["tiles"] = tiles  # None for images stored in strips
         info["software"] = software
         info["date"] = date
         info["colormap"] = colormap
@@ -583,12 +756,9 @@ def _readImage(self, nImage, **kw):
             raise
         compression = info['compression']
         compression_type = info['compression_type']
-        if compression:
-            if compression_type != 32773:
-                raise IOError("Compressed TIFF images not supported except packbits")
-            else:
-                # PackBits compression
-                logger.debug("Using PackBits compression")
+        if compression_type not in SUPPORTED_COMPRESSIONS:
+            raise IOError("Unsupported TIFF compression %d" % compression_type)
+        logger.debug("Compression type %d", compression_type)
 
         interpretation = info["photometricInterpretation"]
         if interpretation == 2:
@@ -671,13 +841,12 @@ def _readImage(self, nImage, **kw):
             image = numpy.zeros((nRows, nColumns), dtype=dtype)
 
         fd = self.fd
-        st = self._structChar
         stripOffsets = info["stripOffsets"] # This contains the file offsets to the data positions
         rowsPerStrip = info["rowsPerStrip"]
-        stripByteCounts = info["stripByteCounts"] # bytes in strip since I do not support compression
+        stripByteCounts = info["stripByteCounts"] # bytes in strip after compression
 
-        rowStart = 0
-        if len(stripOffsets) == 1:
+        if len(stripOffsets) == 1 and not compression and \
+           info["predictor"] in [None, 1]:
             bytesPerRow = int(stripByteCounts[0] / rowsPerStrip)
             nBytes = stripByteCounts[0]
             if nRows == rowsPerStrip:
@@ -700,87 +869,7 @@ def _readImage(self, nImage, **kw):
                 readout.shape = -1, nColumns
             image[rowMin:rowMax + 1, :] = readout
         else:
-            for i in range(len(stripOffsets)):
-                # the amount of rows
-                nRowsToRead = rowsPerStrip
-                rowEnd = int(min(rowStart + nRowsToRead, nRows))
-                if rowEnd < rowMin:
-                    rowStart += nRowsToRead
-                    continue
-                if (rowStart > rowMax):
-                    break
-                # we are in position
-                fd.seek(stripOffsets[i])
-                # the amount of bytes to read
-                nBytes = stripByteCounts[i]
-                if compression_type == 32773:
-                    try:
-                        bufferBytes = bytes()
-                    except Exception:
-                        # python 2.5 ...
-                        bufferBytes = ""
-                    # packBits
-                    readBytes = 0
-                    # intermediate buffer
-                    tmpBuffer = fd.read(nBytes)
-                    while readBytes < nBytes:
-                        n = struct.unpack('b',
-                                        tmpBuffer[readBytes:(readBytes + 1)])[0]
-                        readBytes += 1
-                        if n >= 0:
-                            # should I prevent reading more than the
-                            # length of the chain? Let's python raise
-                            # the exception...
-                            bufferBytes +=  tmpBuffer[readBytes:\
-                                                      readBytes + (n + 1)]
-                            readBytes += (n + 1)
-                        elif n > -128:
-                            bufferBytes += (-n + 1) * \
-                                           tmpBuffer[readBytes:(readBytes + 1)]
-                            readBytes += 1
-                        else:
-                            # if read -128 ignore the byte
-                            continue
-                    if self._swap:
-                        readout = numpy.array(numpy.frombuffer(bufferBytes, dtype)).byteswap()
-                    else:
-                        readout = numpy.array(numpy.frombuffer(bufferBytes, dtype))
-                    if hasattr(nBits, 'index'):
-                        readout.shape = -1, nColumns, len(nBits)
-                    elif info['colormap'] is not None:
-                        readout = colormap[readout]
-                        readout.shape = -1, nColumns, 3
-                    else:
-                        readout.shape = -1, nColumns
-                    image[rowStart:rowEnd, :] = readout
-                else:
-                    if 1:
-                        # use numpy
-                        if self._swap:
-                            readout = numpy.array(numpy.frombuffer(fd.read(nBytes), dtype)).byteswap()
-                        else:
-                            readout = numpy.array(numpy.frombuffer(fd.read(nBytes), dtype))
-                        if hasattr(nBits, 'index'):
-                            readout.shape = -1, nColumns, len(nBits)
-                        elif colormap is not None:
-                            readout = colormap[readout]
-                            readout.shape = -1, nColumns, 3
-                        else:
-                            readout.shape = -1, nColumns
-                        image[rowStart:rowEnd, :] = readout
-                    else:
-                        # using struct
-                        readout = numpy.array(struct.unpack(st+"%df" % int(nBytes/4), fd.read(nBytes)),
-                                              dtype=dtype)
-                        if hasattr(nBits, 'index'):
-                            readout.shape = -1, nColumns, len(nBits)
-                        elif colormap is not None:
-                            readout = colormap[readout]
-                            readout.shape = -1, nColumns, 3
-                        else:
-                            readout.shape = -1, nColumns
-                        image[rowStart:rowEnd, :] = readout
-                rowStart += nRowsToRead
+            self._readSegments(image, info, dtype, rowMin, rowMax)
         if close:
             self.__makeSureFileIsClosed()
 
@@ -792,15 +881,101 @@ def _readImage(self, nImage, **kw):
                          image[:, :, 1] * 0.587 + \
                          image[:, :, 2] * 0.299).astype(numpy.float32)
 
-        if (rowMin == 0) and (rowMax == (nRows - 1)):
+        if (rowMin == 0) and (rowMax == (nRows - 1)) and \
+           image.nbytes <= self._maxImageCacheSize:
             self._imageDataCacheIndex.insert(0, nImage)
             self._imageDataCache.insert(0, image)
-            if len(self._imageDataCacheIndex) > self._maxImageCacheLength:
-                self._imageDataCacheIndex = self._imageDataCacheIndex[:self._maxImageCacheLength]
-                self._imageDataCache = self._imageDataCache[:self._maxImageCacheLength]
+            self._imageDataCacheSize += image.nbytes
+            while (len(self._imageDataCacheIndex) > self._maxImageCacheLength) or \
+                  (self._imageDataCacheSize > self._maxImageCacheSize):
+                self._imageDataCacheIndex.pop()
+                self._imageDataCacheSize -= self._imageDataCache.pop().nbytes
 
         return image
 
+    def _readSegments(self, image, info, dtype, rowMin, rowMax):
+        """Read the strips or the tiles containing the rows rowMin to rowMax
+        into the image.
+        """
+        nRows = info["nRows"]
+        nColumns = info["nColumns"]
+        nBits = info["nBits"]
+        colormap = info["colormap"]
+        compression_type = info["compression_type"]
+        predictor = info["predictor"]
+        tiles = info["tiles"]
+        # data type of the file
+        fileDtype = numpy.dtype(dtype).newbyteorder(self._structChar)
+        if hasattr(nBits, 'index'):
+            samples = (len(nBits),)
+        else:
+            samples = ()
+
+        # (offset, nBytes, first row, first column, rows, columns)
+        segments = []
+        if tiles is None:
+            rowsPerStrip = info["rowsPerStrip"]
+            for i, (offset, nBytes) in enumerate(zip(info["stripOffsets"],
+                                                     info["stripByteCounts"])):
+                row0 = i * rowsPerStrip
+                if row0 > rowMax:
+                    break
+                if row0 + rowsPerStrip <= rowMin:
+                    continue
+                segments.append((offset, nBytes, row0, 0,
+                                 min(rowsPerStrip, nRows - row0), nColumns))
+        else:
+            tileWidth = tiles["tileWidth"]
+            tileLength = tiles["tileLength"]
+            nTilesAcross = (nColumns + tileWidth - 1) // tileWidth
+            for i, (offset, nBytes) in enumerate(zip(tiles["tileOffsets"],
+                                                     tiles["tileByteCounts"])):
+                row0 = (i // nTilesAcross) * tileLength
+                col0 = (i % nTilesAcross) * tileWidth
+                if row0 > rowMax or row0 + tileLength <= rowMin:
+                    continue
+                segments.append((offset, nBytes, row0, col0,
+                                 tileLength, tileWidth))
+
+        fd = self.fd
+        if compression_type == COMPRESSION_NONE and tiles is None and \
+           colormap is None and predictor in [None, 1]:
+            # read directly into the image
+            for offset, nBytes, row0, col0, nr, nc in segments:
+                view = image[row0:row0 + nr]
+                fd.seek(offset)
+                fd.readinto(memoryview(view).cast("B")[:nBytes])
+                if self._swap:
+                    view.byteswap(inplace=True)
+            return
+
+        def read():
+            for offset, nBytes, row0, col0, nr, nc in segments:
+                fd.seek(offset)
+                yield fd.read(nBytes), row0, col0, nr, nc
+
+        def decode(item):
+            data, row0, col0, nr, nc = item
+            segment = _decodeSegment(data, compression_type, fileDtype,
+                                     (nr, nc) + samples, predictor)
+            nr = min(segment.shape[0], nRows - row0)
+            nc = min(nc, nColumns - col0)
+            segment = segment[:nr, :nc]
+            if colormap is not None:
+                segment = colormap[segment]
+            image[row0:row0 + nr, col0:col0 + nc] = segment
+
+        nworkers = 1
+        if compression_type != COMPRESSION_NONE and len(segments) > 1 and \
+           image.nbytes >= PARALLEL_DECODE_SIZE:
+            nworkers = DECODE_NWORKERS
+        with ExecutorUtils.executorContext(nworkers=nworkers,
+                                           executor="thread") as (executor, n):
+            for result in ExecutorUtils.orderedMap(decode, read(),
+                                                   executor=executor,
+                                                   nworkers=n):
+                pass
+
     def writeImage(self, image0, info=None, software=None, date=None):
         if software is None:
             software = 'PyMca.TiffIO'
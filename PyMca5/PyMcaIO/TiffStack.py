@@ -35,6 +35,7 @@
 import numpy
 from PyMca5 import DataObject
 from PyMca5.PyMcaIO import TiffIO
+from PyMca5.PyMcaIO import FileSeriesReader
 if sys.version > '2.9':
     long = int
 
@@ -185,7 +186,15 @@ def getSize(self):
     size = property(getSize)
 
 class TiffStack(DataObject.DataObject):
-    def __init__(self, filelist=None, imagestack=None, dtype=None):
+    def __init__(self, filelist=None, imagestack=None, dtype=None,
+                 nworkers=None):
+        """
+        :param filelist: TIFF file name(s)
+        :param bool imagestack: images are the first stack axis
+        :param dtype: data type of the stack
+        :param int nworkers: number of threads reading the files
+                             (see FileSeriesReader.readFileSeries)
+        """
         DataObject.DataObject.__init__(self)
         self.sourceType = SOURCE_TYPE
         if imagestack is None:
@@ -193,6 +202,7 @@ def __init__(self, filelist=None, imagestack=None, dtype=None):
         else:
             self.__imageStack = imagestack
         self.__dtype = dtype
+        self.nworkers = nworkers
         if filelist is not None:
             if type(filelist) != type([]):
                 filelist = [filelist]
@@ -238,20 +248,28 @@ def loadFileList(self, filelist, dynamic=False, fileindex=0):
             except (MemoryError, ValueError):
                 dynamic = True
         if not dynamic:
-            imageIndex = 0
-            self.onBegin(nbFiles * nImagesPerFile)
-            for i in range(nbFiles):
-                tmpInstance =TiffIO.TiffIO(filelist[i])
+            imageStack = self.__imageStack
+
+            def readFile(i, filename):
+                tmpInstance = TiffIO.TiffIO(filename)
                 for j in range(nImagesPerFile):
+                    imageIndex = i * nImagesPerFile + j
                     tmpImage = tmpInstance.getImage(j)
-                    if self.__imageStack:
+                    if imageStack:
                         data[imageIndex,:,:] = tmpImage
                     else:
                         data[:,:,imageIndex] = tmpImage
-                    imageIndex += 1
+
+            self.onBegin(nbFiles * nImagesPerFile)
+            try:
+                for i, result in FileSeriesReader.readFileSeries(
+                                            filelist, readFile,
+                                            nworkers=self.nworkers):
+                    imageIndex = (i + 1) * nImagesPerFile
                     self.incrProgressBar = imageIndex
                     self.onProgress(imageIndex)
-            self.onEnd()
+            finally:
+                self.onEnd()
 
         if dynamic:
             data = TiffArray(filelist,
@@ -33,8 +33,10 @@
 __author__ = "Uwe Schitt"
 __copyright__ = "Uwe Schmitt"
 __license__ = "MIT"
+import functools
 import numpy
 from numpy.linalg import solve
+from PyMca5.PyMcaCore import McaStackFilter
 
 ODD_SIGN = 1.0
 __LAST_COEFF = None
@@ -115,40 +117,53 @@ def getSavitzkyGolay(spectrum, npoints=3, degree=1, order=0):
     result[N:-N] = numpy.convolve(spectrum, coeff, mode='valid')
     return result
 
-def replaceStackWithSavitzkyGolay(stack, npoints=3, degree=1, order=0):
+def _savitzkyGolayBlock(spectra, coeff, order=0):
+    """
+    Apply the filter coefficients to a block of spectra
+
+    :param array spectra: 2D array with one spectrum per row
+    :returns array: spectra (modified in place)
+    """
+    N = numpy.size(coeff - 1) // 2
+    nValid = spectra.shape[1] - 2 * N
+    if (N < 1) or (nValid < 1):
+        if N < 1:
+            spectra *= coeff[0]
+        return spectra
+    # convolution in mode 'valid' of all the spectra at once
+    reversedCoeff = coeff[::-1]
+    smoothed = reversedCoeff[0] * spectra[:, 0:nValid]
+    for i in range(1, reversedCoeff.size):
+        smoothed += reversedCoeff[i] * spectra[:, i:i + nValid]
+    spectra[:, N:-N] = smoothed
+    if order > 0:
+        spectra[:, :N] = spectra[:, N:N + 1]
+        spectra[:, -N:] = spectra[:, -(N + 1):-N]
+    return spectra
+
+def replaceStackWithSavitzkyGolay(stack, npoints=3, degree=1, order=0,
+                                  output=None, nworkers=None, executor=None):
+    """
+    Replace all the spectra of a stack by their Savitzky-Golay filtered
+    version.
+
+    Numpy arrays are modified in place unless an output is given, other
+    arrays (e.g. HDF5 datasets) are processed in blocks and written to a
+    new HDF5 dataset which replaces the data of the stack object.
+
+    :param stack: array or object with the data and info attributes
+    :param output: array with the shape of the stack data (see
+                   McaStackFilter.filterStack)
+    :param int nworkers: None or 1 means serial, 0 means one per CPU
+    :param executor: 'thread' (default), 'process' or concurrent.futures.Executor
+    :returns: the processed data
+    """
     coeff = calc_coeff(npoints, degree, order)
-    N = numpy.size(coeff-1) // 2
-    convolve = numpy.convolve
-    mcaIndex = -1
-    if hasattr(stack, "info") and hasattr(stack, "data"):
-        actualData = stack.data
-        mcaIndex = stack.info.get('McaIndex', -1)
-    else:
-        actualData = stack
-    if not isinstance(actualData, numpy.ndarray):
-        raise TypeError("This Plugin only supports numpy arrays")
-    # take a view
-    data = actualData[:]
-    oldShape = data.shape
-    if mcaIndex in [-1, len(data.shape)-1]:
-        data.shape = -1, oldShape[-1]
-        for i in range(data.shape[0]):
-            data[i,N:-N] = convolve(data[i,:],coeff, mode='valid')
-            if order > 0:
-                data[i, :N]  = data[i, N]
-                data[i, -N:] = data[i,-(N+1)]
-        data.shape = oldShape
-    elif mcaIndex == 0:
-        data.shape = oldShape[0], -1
-        for i in range(data.shape[-1]):
-            data[N:-N, i] = convolve(data[:, i],coeff, mode='valid')
-            if order > 0:
-                data[:N, i] = data[N, i]
-                data[-N:, i] = data[-(N+1), i]
-        data.shape = oldShape
-    else:
-        raise ValueError("Invalid 1D index %d" % mcaIndex)
-    return
+    function = functools.partial(_savitzkyGolayBlock, coeff=coeff,
+                                 order=order)
+    return McaStackFilter.filterStackObject(stack, function, output=output,
+                                            nworkers=nworkers,
+                                            executor=executor)
 
 if getSavitzkyGolay(10*numpy.arange(10.), npoints=3, degree=1,order=1)[5] < 0:
     ODD_SIGN = -1
@@ -30,11 +30,14 @@
 __contact__ = "sole@esrf.fr"
 __license__ = "MIT"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import functools
 import numpy
 from .fitting import SpecfitFuns
+from PyMca5.PyMcaCore import McaStackFilter
 
 snip1d = SpecfitFuns.snip1d
 snip2d = SpecfitFuns.snip2d
+snipbackground = SpecfitFuns.snipbackground
 
 
 def getSpectrumBackground(spectrum, width, roi_min=None, roi_max=None, smoothing=1):
@@ -48,79 +51,72 @@ def getSpectrumBackground(spectrum, width, roi_min=None, roi_max=None, smoothing
 
 getSnip1DBackground = getSpectrumBackground
 
-def subtractSnip1DBackgroundFromStack(stack, width, roi_min=None, roi_max=None,  smoothing=1):
-    mcaIndex = -1
-    if hasattr(stack, "info") and hasattr(stack, "data"):
-        data = stack.data
-        mcaIndex = stack.info.get('McaIndex', -1)
-    else:
-        data = stack
-    if not isinstance(data, numpy.ndarray):
-        raise TypeError("This Plugin only supports numpy arrays")
-
-    if roi_min is None:
-        roi_min = 0
-    if roi_max is None:
-        roi_max = data.shape[mcaIndex]
+def _snip1DBackgroundBlock(spectra, width, roi_min, roi_max, smoothing,
+                           subtract=True):
+    """
+    Subtract or replace by the background a block of spectra
 
-    oldShape = data.shape
-    if mcaIndex in [-1, len(data.shape)-1]:
-        data.shape = -1, oldShape[-1]
-        if roi_min > 0:
-            data[:, 0:roi_min] = 0
-        if roi_max < oldShape[-1]:
-            data[:, roi_max:] = 0
-        for i in range(data.shape[0]):
-            data[i,roi_min:roi_max] -= snip1d(data[i,roi_min:roi_max],
-                                              width, smoothing)
-        data.shape = oldShape
-
-    elif mcaIndex == 0:
-        data.shape = oldShape[0], -1
-        for i in range(data.shape[-1]):
-            data[roi_min:roi_max, i] -= snip1d(data[roi_min:roi_max, i],
-                                               width, smoothing)
-        data.shape = oldShape
+    :param array spectra: 2D array with one spectrum per row
+    :returns array: spectra (modified in place)
+    """
+    if roi_min > 0:
+        spectra[:, 0:roi_min] = 0
+    spectra[:, roi_max:] = 0
+    block = spectra[:, roi_min:roi_max]
+    background = snipbackground(block, width, 0, None, smoothing)
+    if subtract:
+        block -= background
     else:
-        raise ValueError("Invalid 1D index %d" % mcaIndex)
-    return
+        block[()] = background
+    return spectra
 
-def replaceStackWithSnip1DBackground(stack, width, roi_min=None, roi_max=None,  smoothing=1):
-    mcaIndex = -1
+def _snip1DStack(stack, width, roi_min, roi_max, smoothing, subtract,
+                 output, nworkers, executor):
     if hasattr(stack, "info") and hasattr(stack, "data"):
         data = stack.data
         mcaIndex = stack.info.get('McaIndex', -1)
     else:
         data = stack
-    if not isinstance(data, numpy.ndarray):
-        raise TypeError("This Plugin only supports numpy arrays")
-
+        mcaIndex = -1
     if roi_min is None:
         roi_min = 0
     if roi_max is None:
         roi_max = data.shape[mcaIndex]
+    function = functools.partial(_snip1DBackgroundBlock, width=width,
+                                 roi_min=roi_min, roi_max=roi_max,
+                                 smoothing=smoothing, subtract=subtract)
+    return McaStackFilter.filterStackObject(stack, function, mcaAxis=mcaIndex,
+                                            output=output, nworkers=nworkers,
+                                            executor=executor)
+
+def subtractSnip1DBackgroundFromStack(stack, width, roi_min=None, roi_max=None,  smoothing=1,
+                                      output=None, nworkers=None, executor=None):
+    """
+    Subtract the SNIP background from all the spectra of a stack.
+    Channels outside the region of interest are set to zero.
+
+    Numpy arrays are modified in place unless an output is given, other
+    arrays (e.g. HDF5 datasets) are processed in blocks and written to a
+    new HDF5 dataset which replaces the data of the stack object.
+
+    :param stack: array or object with the data and info attributes
+    :param output: array with the shape of the stack data (see
+                   McaStackFilter.filterStack)
+    :param int nworkers: None or 1 means serial, 0 means one per CPU
+    :param executor: 'thread' (default), 'process' or concurrent.futures.Executor
+    :returns: the processed data
+    """
+    return _snip1DStack(stack, width, roi_min, roi_max, smoothing, True,
+                        output, nworkers, executor)
 
-    oldShape = data.shape
-    if mcaIndex in [-1, len(data.shape)-1]:
-        data.shape = -1, oldShape[-1]
-        if roi_min > 0:
-            data[:, 0:roi_min] = 0
-        if roi_max < oldShape[-1]:
-            data[:, roi_max:] = 0
-        for i in range(data.shape[0]):
-            data[i,roi_min:roi_max] = snip1d(data[i,roi_min:roi_max],
-                                              width, smoothing)
-        data.shape = oldShape
-
-    elif mcaIndex == 0:
-        data.shape = oldShape[0], -1
-        for i in range(data.shape[-1]):
-            data[roi_min:roi_max, i] = snip1d(data[roi_min:roi_max, i],
-                                               width, smoothing)
-        data.shape = oldShape
-    else:
-        raise ValueError("Invalid 1D index %d" % mcaIndex)
-    return
+def replaceStackWithSnip1DBackground(stack, width, roi_min=None, roi_max=None,  smoothing=1,
+                                     output=None, nworkers=None, executor=None):
+    """
+    Replace all the spectra of a stack by their SNIP background.
+    See subtractSnip1DBackgroundFromStack for the parameters.
+    """
+    return _snip1DStack(stack, width, roi_min, roi_max, smoothing, False,
+                        output, nworkers, executor)
 
 
 def getImageBackground(image, width, roi_min=None, roi_max=None, smoothing=1):
@@ -137,9 +133,37 @@ def getImageBackground(image, width, roi_min=None, roi_max=None, smoothing=1):
 
 getSnip2DBackground = getImageBackground
 
-def subtractSnip2DBackgroundFromStack(stack, width, roi_min=None, roi_max=None,  smoothing=1, index=None):
+def _snip2DBackgroundBlock(images, width, roi_min, roi_max, smoothing):
+    """
+    Subtract the background from a block of images
+
+    :param array images: 3D array with the images along the first dimension
+    :returns array: images (modified in place)
+    """
+    shape = images.shape[1:]
+    if (roi_min[0] > 0) or (roi_min[1] > 0):
+        images[:, 0:roi_min[0], 0:roi_min[1]] = 0
+    if roi_max[0] < (shape[0]-1):
+        if roi_max[1] < (shape[1]-1):
+            images[:, roi_max[0]:, roi_max[1]:] = 0
+        else:
+            images[:, roi_max[0]:, :] = 0
+    else:
+        if roi_max[1] < (shape[1]-1):
+            images[:, :, roi_max[1]:] = 0
+    for image in images:
+        image[roi_min[0]:roi_max[0], roi_min[1]:roi_max[1]] -=\
+            snip2d(image[roi_min[0]:roi_max[0], roi_min[1]:roi_max[1]], width, smoothing)
+    return images
+
+def subtractSnip2DBackgroundFromStack(stack, width, roi_min=None, roi_max=None,  smoothing=1, index=None,
+                                      output=None, nworkers=None, executor=None):
     """
     index is the dimension used to index the images
+
+    Numpy arrays are modified in place unless an output is given, other
+    arrays are processed in blocks of images and written to a new HDF5
+    dataset (see subtractSnip1DBackgroundFromStack).
     """
     if hasattr(stack, "info") and hasattr(stack, "data"):
         data = stack.data
@@ -149,57 +173,17 @@ def subtractSnip2DBackgroundFromStack(stack, width, roi_min=None, roi_max=None,
         data = stack
     if index is None:
         index = 2
-    if not isinstance(data, numpy.ndarray):
-        raise TypeError("This Plugin only supports numpy arrays")
+    if index not in [0, 1, 2]:
+        raise ValueError("Invalid image index %d" % index)
 
     if roi_min is None:
         roi_min = (0, 0)
     if roi_max is None:
         roi_max = tuple(data.shape[i] for i in range(3) if i != index)
-
-    shape = data.shape
-    if index == 0:
-        if (roi_min[0] > 0) or (roi_min[1] > 0):
-            data[:, 0:roi_min[0], 0:roi_min[1]] = 0
-        if roi_max[0] < (shape[1]-1):
-            if roi_max[1] < (shape[2]-1):
-                data[:, roi_max[0]:, roi_max[1]:] = 0
-            else:
-                data[:, roi_max[0]:, :] = 0
-        else:
-            if roi_max[1] < (shape[2]-1):
-                data[:, :, roi_max[1]:] = 0
-        for i in range(shape[index]):
-            data[i,roi_min[0]:roi_max[0],roi_min[1]:roi_max[1]] -=\
-                snip2d(data[i,roi_min[0]:roi_max[0],roi_min[1]:roi_max[1]], width, smoothing)
-        return
-    if index == 1:
-        if (roi_min[0] > 0) or (roi_min[1] > 0):
-            data[0:roi_min[0], :, 0:roi_min[1]] = 0
-        if roi_max[0] < (shape[0]-1):
-            if roi_max[1] < (shape[2]-1):
-                data[roi_max[0]:, :, roi_max[1]:] = 0
-            else:
-                data[roi_max[0]:, :, :] = 0
-        else:
-            if roi_max[1] < (shape[2]-1):
-                data[:, :, roi_max[1]:] = 0
-        for i in range(shape[index]):
-            data[roi_min[0]:roi_max[0], i, roi_min[1]:roi_max[1]] -=\
-                snip2d(data[roi_min[0]:roi_max[0], i, roi_min[1]:roi_max[1]], width, smoothing)
-        return
-    if index == 2:
-        if (roi_min[0] > 0) or (roi_min[1] > 0):
-            data[0:roi_min[0], 0:roi_min[1],:] = 0
-        if roi_max[0] < (shape[0]-1):
-            if roi_max[1] < (shape[1]-1):
-                data[roi_max[0]:, roi_max[1]:, :] = 0
-            else:
-                data[roi_max[0]:, :, :] = 0
-        else:
-            if roi_max[1] < (shape[2]-1):
-                data[:, roi_max[1]:, :] = 0
-        for i in range(shape[index]):
-            data[roi_min[0]:roi_max[0],roi_min[1]:roi_max[1], i] -=\
-                snip2d(data[roi_min[0]:roi_max[0],roi_min[1]:roi_max[1], i], width, smoothing)
-        return
+    function = functools.partial(_snip2DBackgroundBlock, width=width,
+                                 roi_min=roi_min, roi_max=roi_max,
+                                 smoothing=smoothing)
+    return McaStackFilter.filterStackObject(stack, function, mcaAxis=index,
+                                            output=output, images=True,
+                                            nworkers=nworkers,
+                                            executor=executor)
@@ -95,6 +95,9 @@ def LeastSquaresFit(model, parameters0, data=None, maxiter = 100,constrains=None
                       It will be called as model_deriv(parameters, index, x) where parameters are the current values
                       of the fitting parameters, index is the fitting parameter index of which the the derivative has
                       to be provided in the supplied array of x points.
+                      When model_deriv has an attribute `batched` which is true, it will be called once as
+                      model_deriv(parameters, indices, x) with the list of fitting parameter indices and it has to
+                      return an array of shape (len(indices), len(x)).
 
         linear - Flag to indicate a linear fit instead of a non-linear. Default is non-linear fit (=false)
 
@@ -525,9 +528,10 @@ def ChisqAlphaBeta(model0, parameters, x,y,weight, constrains,model_deriv=None,l
     newpar = numpy.take(newpar,noigno)
     if n_free == 0:
         raise ValueError("No free parameters to fit")
-    for i in range(n_free):
-        if model_deriv is None:
-            #pwork = parameters.__copy__()
+    # Jacobian of the model with respect to the free parameters
+    deriv = numpy.empty((n_free, nr), numpy.float64)
+    if model_deriv is None:
+        for i in range(n_free):
             pwork [free_index[i]] = fitparam [i] + delta [i]
             newpar = getparameters(pwork.tolist(),constrains)
             newpar=numpy.take(newpar,noigno)
@@ -536,52 +540,31 @@ def ChisqAlphaBeta(model0, parameters, x,y,weight, constrains,model_deriv=None,l
             newpar = getparameters(pwork.tolist(),constrains)
             newpar=numpy.take(newpar,noigno)
             f2 = model(newpar, x)
-            help0 = (f1-f2) / (2.0 * delta [i])
-            help0 = help0 * derivfactor[i]
+            deriv[i] = (f1-f2) / (2.0 * delta [i])
             pwork [free_index[i]] = fitparam [i]
-            #removed I resize outside the loop:
-            #help0 = numpy.resize(help0,(1,nr))
-        else:
-            help0=model_deriv(pwork,free_index[i],x)
-            help0 = help0 * derivfactor[i]
-
-        if i == 0 :
-            deriv = help0
-        else:
-            deriv = numpy.concatenate((deriv,help0), 0)
-    #line added to resize outside the loop
-    deriv=numpy.resize(deriv,(n_free,nr))
+    elif getattr(model_deriv, "batched", False):
+        # all derivatives in one call
+        deriv[:] = numpy.reshape(model_deriv(pwork, free_index, x),
+                                 (n_free, nr))
+    else:
+        for i in range(n_free):
+            deriv[i] = numpy.ravel(model_deriv(pwork,free_index[i],x))
+    deriv *= numpy.array(derivfactor, numpy.float64)[:, numpy.newaxis]
+    # Normal equations: alpha = J.W.J^T and beta = J.W.(y - yfit)
+    alpha = numpy.dot(deriv * weight, deriv.T)
     if linear:
-        pseudobetahelp = weight * y
+        beta = numpy.dot(deriv, weight * y)
+        #not used
+        chisq = 0.0
     else:
         newpar = getparameters(pwork.tolist(),constrains)
         newpar = numpy.take(newpar,noigno)
         yfit = model(newpar, x)
         deltay = y - yfit
         help0 = weight * deltay
-    for i in range(n_free):
-        derivi = numpy.resize(deriv [i,:], (1,nr))
-        if linear:
-            if i==0:
-                beta = numpy.resize(numpy.sum((pseudobetahelp * derivi),1),(1,1))
-            else:
-                beta = numpy.concatenate((beta, numpy.resize(numpy.sum((pseudobetahelp * derivi),1),(1,1))), 1)
-        else:
-            help1 = numpy.resize(numpy.sum((help0 * derivi),1),(1,1))
-            if i == 0:
-                beta = help1
-            else:
-                beta = numpy.concatenate((beta, help1), 1)
-        help1 = numpy.inner(deriv,weight*derivi)
-        if i == 0:
-            alpha = help1
-        else:
-            alpha = numpy.concatenate((alpha, help1),1)
-    if linear:
-        #not used
-        chisq = 0.0
-    else:
+        beta = numpy.dot(deriv, help0)
         chisq = (help0 * deltay).sum()
+    beta = beta.reshape((1, n_free))
     return chisq, alpha, beta, \
            n_free, free_index, noigno, fitparam, derivfactor
 
@@ -60,8 +60,6 @@ static struct module_state _state;
 #define erf myerf
 #define erfc myerfc
 #endif
-#define MAX_SAVITSKY_GOLAY_WIDTH 101
-#define MIN_SAVITSKY_GOLAY_WIDTH 3
 
 /* SNIP related functions */
 void lls(double *data, int size);
@@ -74,6 +72,11 @@ void lsdf(double *data, int size, int fwhm, double f, double A, double M, double
 void smooth1d(double *data, int size);
 void smooth2d(double *data, int size0, int size1);
 void smooth3d(double *data, int size0, int size1, int size2);
+int savitsky_golay(double *output, int n, int npoints, double *buffer);
+int snip_background_multiple(double *data, int n_channels, int n_spectra,
+                             int snip_width, int sg_width,
+                             int smooth_iterations,
+                             int *anchors, int n_anchors);
 /* end of SNIP related functions */
 
 /* --------------------------------------------------------------------- */
@@ -128,7 +131,9 @@ SpecfitFuns_snip1d(PyObject *self, PyObject *args)
     }
 
 
+    Py_BEGIN_ALLOW_THREADS
     snip1d_multiple((double *) PyArray_DATA(ret), n_channels, width, n_spectra);
+    Py_END_ALLOW_THREADS
 
     for (n = 0; n < n_spectra; n++)
     {
@@ -142,6 +147,79 @@ SpecfitFuns_snip1d(PyObject *self, PyObject *args)
     return PyArray_Return(ret);
 }
 
+static PyObject *
+SpecfitFuns_snipbackground(PyObject *self, PyObject *args)
+{
+    /* snipbackground(data, snip_width, sg_width=0, anchors=None, smooth_iterations=0)
+
+       Background of one spectrum (1D) or of a set of spectra (2D, one spectrum
+       per row): Savitsky-Golay smoothing, simple smoothing iterations and SNIP
+       applied between consecutive anchor channels. The calculation is done
+       without holding the GIL. */
+    PyObject *input;
+    PyObject *anchorsInput = NULL;
+    double width0 = 50.;
+    double sg_width0 = 0.;
+    int smooth_iterations = 0;
+    PyArrayObject *ret;
+    PyArrayObject *anchors = NULL;
+    int *anchorsPointer = NULL;
+    int n_anchors = 0;
+    int n_channels, n_spectra, status;
+
+    if (!PyArg_ParseTuple(args, "Od|dOi", &input, &width0, &sg_width0,
+                          &anchorsInput, &smooth_iterations))
+        return NULL;
+
+    ret = (PyArrayObject *)
+             PyArray_FROMANY(input, NPY_DOUBLE, 1, 2,
+                             NPY_ARRAY_ENSURECOPY | NPY_ARRAY_C_CONTIGUOUS);
+    if (ret == NULL){
+        printf("Cannot create 1D or 2D array from input\n");
+        return NULL;
+    }
+
+    if ((anchorsInput != NULL) && (anchorsInput != Py_None))
+    {
+        anchors = (PyArrayObject *)
+             PyArray_FROMANY(anchorsInput, NPY_INT, 0, 1,
+                             NPY_ARRAY_C_CONTIGUOUS | NPY_ARRAY_FORCECAST);
+        if (anchors == NULL){
+            Py_DECREF(ret);
+            return NULL;
+        }
+        n_anchors = (int) PyArray_SIZE(anchors);
+        anchorsPointer = (int *) PyArray_DATA(anchors);
+    }
+
+    if(PyArray_NDIM(ret) == 1)
+    {
+        n_spectra = 1;
+        n_channels = (int) (PyArray_DIMS(ret)[0]);
+    }
+    else
+    {
+        n_spectra = (int) (PyArray_DIMS(ret)[0]);
+        n_channels = (int) (PyArray_DIMS(ret)[1]);
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    status = snip_background_multiple((double *) PyArray_DATA(ret),
+                                      n_channels, n_spectra,
+                                      (int) width0, (int) sg_width0,
+                                      smooth_iterations,
+                                      anchorsPointer, n_anchors);
+    Py_END_ALLOW_THREADS
+
+    Py_XDECREF(anchors);
+    if (status < 0)
+    {
+        Py_DECREF(ret);
+        return PyErr_NoMemory();
+    }
+    return PyArray_Return(ret);
+}
+
 static PyObject *
 SpecfitFuns_snip2d(PyObject *self, PyObject *args)
 {
@@ -173,6 +251,7 @@ SpecfitFuns_snip2d(PyObject *self, PyObject *args)
 
     width = (int )width0;
 
+    Py_BEGIN_ALLOW_THREADS
     for (i=0; i<smooth_iterations; i++)
     {
         smooth2d((double *) PyArray_DATA(ret), nrows, ncolumns);
@@ -189,6 +268,7 @@ SpecfitFuns_snip2d(PyObject *self, PyObject *args)
     {
         lls_inv((double *) PyArray_DATA(ret), size);
     }
+    Py_END_ALLOW_THREADS
 
     return PyArray_Return(ret);
 }
@@ -4055,11 +4135,7 @@ SpecfitFuns_SavitskyGolay(PyObject *self, PyObject *args)
     PyArrayObject *ret;
     int n, npoints;
     double dpoints = 5.;
-    double coeff[MAX_SAVITSKY_GOLAY_WIDTH];
-    int i, j, m;
-    double  dhelp, den;
     double  *data;
-    double  *output;
 
     if (!PyArg_ParseTuple(args, "O|d", &input, &dpoints))
         return NULL;
@@ -4072,53 +4148,20 @@ SpecfitFuns_SavitskyGolay(PyObject *self, PyObject *args)
         return NULL;
     }
     npoints = (int )  dpoints;
-    if (!(npoints % 2)) npoints +=1;
-
     n = (int) PyArray_DIMS(ret)[0];
 
-    if((npoints < MIN_SAVITSKY_GOLAY_WIDTH) ||  (n < npoints))
-    {
-        /* do not smooth data */
-        return PyArray_Return(ret);
-    }
-
-    /* calculate the coefficients */
-    m     = (int) (npoints/2);
-    den = (double) ((2*m-1) * (2*m+1) * (2*m + 3));
-    for (i=0; i<= m; i++){
-        coeff[m+i] = (double) (3 * (3*m*m + 3*m - 1 - 5*i*i ));
-        coeff[m-i] = coeff[m+i];
+    /*one does not need the whole spectrum buffer, but code is clearer */
+    data = (double *) malloc(MAX(n, 1) * sizeof(double));
+    if (data == NULL){
+        Py_DECREF(ret);
+        return PyErr_NoMemory();
     }
 
     /* do the job */
-    output = (double *) PyArray_DATA(ret);
+    Py_BEGIN_ALLOW_THREADS
+    savitsky_golay((double *) PyArray_DATA(ret), n, npoints, data);
+    Py_END_ALLOW_THREADS
 
-    /* simple smoothing at the beginning */
-    for (j=0; j<=(int)(npoints/3); j++)
-    {
-        smooth1d(output, m);
-    }
-
-    /* simple smoothing at the end */
-    for (j=0; j<=(int)(npoints/3); j++)
-    {
-        smooth1d((output+n-m-1), m);
-    }
-
-    /*one does not need the whole spectrum buffer, but code is clearer */
-    data = (double *) malloc(n * sizeof(double));
-    memcpy(data, output, n * sizeof(double));
-
-    /* the actual SG smoothing in the middle */
-    for (i=m; i<(n-m); i++){
-        dhelp = 0;
-        for (j=-m;j<=m;j++) {
-            dhelp += coeff[m+j] * (*(data+i+j));
-        }
-        if(dhelp > 0.0){
-            *(output+i) = dhelp / den;
-        }
-    }
     free(data);
     return PyArray_Return(ret);
 
@@ -4128,6 +4171,7 @@ SpecfitFuns_SavitskyGolay(PyObject *self, PyObject *args)
 
 static PyMethodDef SpecfitFuns_methods[] = {
     {"snip1d",      SpecfitFuns_snip1d,     METH_VARARGS},
+    {"snipbackground", SpecfitFuns_snipbackground, METH_VARARGS},
     {"snip2d",      SpecfitFuns_snip2d,     METH_VARARGS},
     {"snip3d",      SpecfitFuns_snip3d,     METH_VARARGS},
     {"subacold",    SpecfitFuns_subacold,   METH_VARARGS},
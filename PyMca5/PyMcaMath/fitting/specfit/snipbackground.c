@@ -0,0 +1,143 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF by the Software group.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+/*
+   Background of a set of spectra: Savitsky-Golay smoothing followed by SNIP
+   applied between consecutive anchor channels.
+
+   None of these functions uses the Python API so they can be called without
+   holding the GIL.
+*/
+#include <stdlib.h>
+#include <string.h>
+#include <math.h>
+#define MAX_SAVITSKY_GOLAY_WIDTH 101
+#define MIN_SAVITSKY_GOLAY_WIDTH 3
+
+void smooth1d(double *data, int size);
+void snip1d(double *data, int n_channels, int snip_width);
+int savitsky_golay(double *output, int n, int npoints, double *buffer);
+int snip_background_multiple(double *data, int n_channels, int n_spectra,
+                             int snip_width, int sg_width,
+                             int smooth_iterations,
+                             int *anchors, int n_anchors);
+
+/* In-place Savitsky-Golay smoothing. The buffer must hold n doubles.
+   Returns 1 when the data were smoothed. */
+int savitsky_golay(double *output, int n, int npoints, double *buffer)
+{
+	double coeff[MAX_SAVITSKY_GOLAY_WIDTH];
+	int i, j, m;
+	double dhelp, den;
+
+	if (!(npoints % 2)) npoints +=1;
+
+	if((npoints < MIN_SAVITSKY_GOLAY_WIDTH) || (npoints > MAX_SAVITSKY_GOLAY_WIDTH) || (n < npoints))
+	{
+		/* do not smooth data */
+		return 0;
+	}
+
+	/* calculate the coefficients */
+	m = (int) (npoints/2);
+	den = (double) ((2*m-1) * (2*m+1) * (2*m + 3));
+	for (i=0; i<= m; i++){
+		coeff[m+i] = (double) (3 * (3*m*m + 3*m - 1 - 5*i*i ));
+		coeff[m-i] = coeff[m+i];
+	}
+
+	/* simple smoothing at the beginning */
+	for (j=0; j<=(int)(npoints/3); j++)
+	{
+		smooth1d(output, m);
+	}
+
+	/* simple smoothing at the end */
+	for (j=0; j<=(int)(npoints/3); j++)
+	{
+		smooth1d((output+n-m-1), m);
+	}
+
+	memcpy(buffer, output, n * sizeof(double));
+
+	/* the actual SG smoothing in the middle */
+	for (i=m; i<(n-m); i++){
+		dhelp = 0;
+		for (j=-m;j<=m;j++) {
+			dhelp += coeff[m+j] * (*(buffer+i+j));
+		}
+		if(dhelp > 0.0){
+			*(output+i) = dhelp / den;
+		}
+	}
+	return 1;
+}
+
+/* Replace each spectrum (stored contiguously) by its background.
+   The anchors are channel indices splitting the spectrum in segments
+   on which SNIP is applied independently. Returns -1 on memory error. */
+int snip_background_multiple(double *data, int n_channels, int n_spectra,
+                             int snip_width, int sg_width,
+                             int smooth_iterations,
+                             int *anchors, int n_anchors)
+{
+	int i, k, anchor, last_anchor;
+	double *spectrum;
+	double *buffer;
+
+	buffer = (double *) malloc((n_channels > 0 ? n_channels : 1) * sizeof(double));
+	if (buffer == NULL)
+	{
+		return -1;
+	}
+	for (k=0; k < n_spectra; k++)
+	{
+		spectrum = data + ((size_t) k) * n_channels;
+		savitsky_golay(spectrum, n_channels, sg_width, buffer);
+		for (i=0; i < smooth_iterations; i++)
+		{
+			smooth1d(spectrum, n_channels);
+		}
+		last_anchor = 0;
+		for (i=0; i < n_anchors; i++)
+		{
+			anchor = anchors[i];
+			if ((anchor > last_anchor) && (anchor < n_channels))
+			{
+				snip1d(spectrum + last_anchor, anchor - last_anchor, snip_width);
+				last_anchor = anchor;
+			}
+		}
+		if (last_anchor < n_channels)
+		{
+			snip1d(spectrum + last_anchor, n_channels - last_anchor, snip_width);
+		}
+	}
+	free(buffer);
+	return 0;
+}
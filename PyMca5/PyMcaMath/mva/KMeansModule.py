@@ -34,6 +34,8 @@
 import sys
 import numpy
 import logging
+from PyMca5.PyMcaMath.mva import PCATools
+from PyMca5.PyMcaMisc import ExecutorUtils
 
 _logger = logging.getLogger(__name__)
 
@@ -102,8 +104,11 @@ def kmeans(x, k, method=None, normalize=True):
     """
     x is a 2D array [n_samples, n_features]
     k is the desired number of clusters
+    method "minibatch" does not copy the data (see miniBatchKMeans)
     """
     assert len(x.shape) == 2
+    if method == "minibatch":
+        return miniBatchKMeans(x, k, mcaAxis=-1, normalize=normalize)
     # collapse the information to deal with inf and NaNs
     raws = x.sum(axis=1, dtype=numpy.float64)
     good = numpy.isfinite(raws)
@@ -136,3 +141,233 @@ def kmeans(x, k, method=None, normalize=True):
 
 def label(*var, **kw):
     return kmeans(*var, **kw)["labels"]
+
+
+def _finiteRows(block):
+    return numpy.isfinite(block.sum(axis=1))
+
+
+def _normalizedBlocks(data, mcaAxis, datamin, deltas):
+    """
+    Read the data in blocks of finite and normalized samples (the next
+    block is read while the current one is processed).
+
+    :yields tuple: index of the block in the image dimensions, mask of the
+                   finite samples of the block, normalized samples
+    """
+    for idx, block in ExecutorUtils.prefetch(PCATools._spectraBlocks(data,
+                                                                     mcaAxis)):
+        good = _finiteRows(block)
+        if not good.all():
+            block = block[good]
+        if datamin is not None:
+            block -= datamin
+            block /= deltas
+        yield idx, good, block
+
+
+def _squaredDistances(x, means, meansNorm):
+    # |x - m|^2 without the |x|^2 term (it does not change the nearest mean)
+    return meansNorm - 2 * numpy.dot(x, means.T)
+
+
+def _labelBlock(args):
+    """
+    Nearest mean of each sample of a block.
+
+    :param tuple args: index of the block, finite samples, normalized
+                       samples, means, squared norm of the means
+    :returns tuple: index, finite samples, labels, sum of squared distances
+    """
+    idx, good, block, means, meansNorm = args
+    if not block.shape[0]:
+        return idx, good, numpy.zeros((0,), dtype=numpy.int32), 0.0
+    distances = _squaredDistances(block, means, meansNorm)
+    labels = numpy.argmin(distances, axis=1)
+    inertia = distances[numpy.arange(block.shape[0]), labels].sum() + \
+              (block * block).sum()
+    return idx, good, labels.astype(numpy.int32), inertia
+
+
+def _kmeansPlusPlus(x, k, random):
+    """
+    Initial means chosen among the samples x by k-means++.
+    """
+    means = numpy.empty((k, x.shape[1]), dtype=numpy.float64)
+    means[0] = x[random.randint(x.shape[0])]
+    distances = ((x - means[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        total = distances.sum()
+        if total > 0:
+            j = random.choice(x.shape[0], p=distances / total)
+        else:
+            j = random.randint(x.shape[0])
+        means[i] = x[j]
+        distances = numpy.minimum(distances, ((x - means[i]) ** 2).sum(axis=1))
+    return means
+
+
+def _initialMeans(sample, k, random, n_init, max_iter=100):
+    """
+    Best of n_init runs of k-means (k-means++ initialization followed by
+    Lloyd iterations) on an in-memory sample.
+    """
+    sampleNorm = (sample * sample).sum(axis=1).sum()
+    best = None
+    for i in range(n_init):
+        means = _kmeansPlusPlus(sample, k, random)
+        labels = None
+        for j in range(max_iter):
+            distances = _squaredDistances(sample, means,
+                                          (means * means).sum(axis=1))
+            newLabels = numpy.argmin(distances, axis=1)
+            if labels is not None and numpy.array_equal(labels, newLabels):
+                break
+            labels = newLabels
+            for c in range(k):
+                members = labels == c
+                if members.any():
+                    means[c] = sample[members].mean(axis=0)
+        inertia = distances[numpy.arange(sample.shape[0]), labels].sum() + \
+                  sampleNorm
+        if best is None or inertia < best[0]:
+            best = inertia, means
+    return best[1]
+
+
+def miniBatchKMeans(x, k, mcaAxis=-1, normalize=True, batch_size=1024,
+                    max_iter=10, tol=1.0e-4, init_size=None, n_init=3,
+                    seed=None, nworkers=None):
+    """
+    Mini-batch K-means (D. Sculley, Web-scale k-means clustering, WWW 2010)
+    reading the data in blocks.
+
+    The data are never copied as a whole, so HDF5 datasets or stacks larger
+    than the available memory can be clustered. The first pass over the
+    data calculates the minimum and maximum of each feature (used to
+    normalize the blocks on the fly) and draws a random sample of
+    init_size samples. The initial means are the best of n_init k-means
+    runs on that sample (k-means++ initialization). Each following
+    pass updates the means with every mini-batch of samples, with a
+    learning rate decreasing as the inverse of the number of samples
+    assigned to each mean. The last pass labels all the samples.
+
+    :param x: array with the features along mcaAxis (e.g. [n_samples,
+              n_features] or a stack of spectra, as numpy.ndarray or
+              h5py.Dataset)
+    :param int k: number of clusters
+    :param int mcaAxis: features axis
+    :param bool normalize: scale each feature to the [0, 1] range
+    :param int batch_size: number of samples per mini-batch
+    :param int max_iter: maximum number of passes updating the means
+    :param float tol: convergence when the means move less than tol
+    :param int init_size: number of samples used for the initialization
+                          (default 3 * batch_size or 10 * k if larger)
+    :param int n_init: number of initializations
+    :param int seed: seed of the random generator
+    :param int nworkers: workers labelling the blocks (None or 1 means
+                         serial, 0 means one per CPU)
+    :returns dict: labels (one per sample in the order of the flattened
+                   image dimensions, -1 for samples with inf or NaNs),
+                   means (normalized units), iterations, converged, inertia
+    """
+    shape = x.shape
+    ndim = len(shape)
+    if mcaAxis < 0:
+        mcaAxis += ndim
+    imageShape = tuple(n for i, n in enumerate(shape) if i != mcaAxis)
+    nSamples = int(numpy.prod(imageShape))
+    nFeatures = shape[mcaAxis]
+    data = x
+    random = numpy.random.RandomState(seed)
+    if init_size is None:
+        init_size = max(3 * batch_size, 10 * k)
+
+    # first pass: limits and initialization sample (reservoir sampling
+    # keeping the samples with the smallest random keys)
+    datamin = None
+    datamax = None
+    nGood = 0
+    sample = numpy.zeros((0, nFeatures), dtype=numpy.float64)
+    keys = numpy.zeros((0,), dtype=numpy.float64)
+    for idx, good, block in _normalizedBlocks(data, mcaAxis, None, None):
+        if not block.shape[0]:
+            continue
+        nGood += block.shape[0]
+        if datamin is None:
+            datamin = block.min(axis=0)
+            datamax = block.max(axis=0)
+        else:
+            numpy.minimum(datamin, block.min(axis=0), out=datamin)
+            numpy.maximum(datamax, block.max(axis=0), out=datamax)
+        keys = numpy.concatenate((keys, random.random_sample(block.shape[0])))
+        sample = numpy.concatenate((sample, block))
+        if keys.size > init_size:
+            keep = numpy.argsort(keys)[:init_size]
+            keys = keys[keep]
+            sample = sample[keep]
+    if nGood < k:
+        raise ValueError("Not enough finite samples for %d clusters" % k)
+    if normalize:
+        deltas = datamax - datamin
+        deltas[deltas < 1.0e-200] = 1
+        sample -= datamin
+        sample /= deltas
+    else:
+        datamin = None
+        deltas = None
+    means = _initialMeans(sample, k, random, n_init)
+    del sample
+
+    # mini-batch updates
+    counts = numpy.zeros((k,), dtype=numpy.float64)
+    converged = False
+    iterations = 0
+    while iterations < max_iter and not converged:
+        iterations += 1
+        previous = means.copy()
+        for idx, good, block in _normalizedBlocks(data, mcaAxis, datamin,
+                                                  deltas):
+            for i in range(0, block.shape[0], batch_size):
+                batch = block[i:i + batch_size]
+                meansNorm = (means * means).sum(axis=1)
+                labels = numpy.argmin(_squaredDistances(batch, means,
+                                                        meansNorm), axis=1)
+                members = numpy.zeros((k, batch.shape[0]))
+                members[labels, numpy.arange(batch.shape[0])] = 1
+                batchCounts = members.sum(axis=1)
+                batchSums = numpy.dot(members, batch)
+                updated = batchCounts > 0
+                counts[updated] += batchCounts[updated]
+                means[updated] += (batchSums[updated] -
+                                   batchCounts[updated, None] *
+                                   means[updated]) / counts[updated, None]
+        shift = numpy.sqrt(((means - previous) ** 2).sum(axis=1)).max()
+        _logger.debug("Mini-batch K-means pass %d shift = %g",
+                      iterations, shift)
+        converged = shift < tol
+
+    # labels
+    labels = -numpy.ones((nSamples,), dtype=numpy.int32)
+    inertia = 0.0
+    meansNorm = (means * means).sum(axis=1)
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor="thread") as (executor, n):
+        blocks = ((idx, good, block, means, meansNorm)
+                  for idx, good, block in _normalizedBlocks(data, mcaAxis,
+                                                            datamin, deltas))
+        for idx, good, blockLabels, blockInertia in \
+                ExecutorUtils.orderedMap(_labelBlock, blocks,
+                                         executor=executor, nworkers=n):
+            pixels = PCATools._blockPixels(idx, imageShape)
+            labels[pixels[good]] = blockLabels
+            inertia += blockInertia
+    if nGood < nSamples:
+        _logger.info("Data contains inf or NaNs")
+    return {
+        "labels": labels,
+        "means": means,
+        "iterations": iterations,
+        "converged": converged,
+        "inertia": inertia,
+    }
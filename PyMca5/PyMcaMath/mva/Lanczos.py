@@ -558,7 +558,7 @@ def converged(self, m):
             for i in range(m-j):
                 if abs(self.eval[i]) < abs(self.eval[i+1]):
                     self.eval[i],self.eval[i+1]=self.eval[i+1],self.eval[i]
-                    self.evect[i:i+2]= numpy.array(self.evect[i+1],self.evect[i])
+                    self.evect[i:i+2]= numpy.array([self.evect[i+1],self.evect[i]])
 
 
         # print "eval", self.eval[0:m]
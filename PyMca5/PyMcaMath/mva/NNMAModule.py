@@ -183,9 +183,16 @@
 (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
+import time
 import numpy
 import logging
 from . import py_nnma
+from . import PCATools
+from PyMca5.PyMcaMisc import ExecutorUtils
+try:
+    import h5py
+except ImportError:
+    h5py = None
 
 
 _logger = logging.getLogger(__name__)
@@ -204,6 +211,8 @@
                  "FastHALS": py_nnma.FastHALS,
                  "SNMF": py_nnma.SNMF,
                  }
+# functions which do not need the whole stack in memory
+chunked_function_list = ['ChunkedNMF']
 
 VERBOSE = _logger.getEffectiveLevel() == logging.DEBUG
 
@@ -214,6 +223,10 @@ def nnma(stack, ncomponents, binning=None,
          maxcount=1000, kmeans=False):
     if kmeans:
         raise ValueError("K Means not supported by this module")
+    if function in chunked_function_list:
+        return chunkedNMF(stack, ncomponents, binning=binning, mask=mask,
+                          spectral_mask=spectral_mask, eps=eps,
+                          verbose=verbose, maxcount=maxcount, nworkers=0)
     #I take the defaults for the other parameters
     param = dict(alpha=.1, tau=2, regul=1e-2, sparse_par=1e-1, psi=1e-3)
     if function is None:
@@ -395,6 +408,181 @@ def nnma(stack, ncomponents, binning=None,
     new_images.shape = ncomponents, r, c
     return new_images, values, new_vectors
 
+def _chunkedNMFBlock(args):
+    """
+    Multiplicative update of the rows of A corresponding to a block of
+    spectra and contribution of the block to the update of X.
+
+    :param tuple args: pixels of the block, spectra, spatial mask of the
+                       block (or None), spectral weights, binning, number of
+                       binned channels, rows of A, X, X X.T
+    :returns tuple: pixels, updated rows of A, A.T Y, A.T A
+    """
+    pixels, block, mask, weights, binning, nChannels, A, X, XXt = args
+    if mask is not None:
+        block = block[mask]
+    Y = PCATools._weightAndBin(block, weights, binning, nChannels)
+    A = A * numpy.dot(Y, X.T) / (numpy.dot(A, XXt) + 1.0e-30)
+    return pixels, A, numpy.dot(A.T, Y), numpy.dot(A.T, A)
+
+
+def chunkedNMF(stack, ncomponents, binning=None, mask=None,
+               spectral_mask=None, eps=5e-5, verbose=VERBOSE, maxcount=1000,
+               seed=None, nworkers=None, output=None, **kw):
+    """
+    Non-negative matrix factorization Y = A X minimizing || Y - A X ||_fro
+    by the multiplicative updates of Lee and Seung, reading the stack
+    block by block.
+
+    Each iteration is a single pass over the data: the rows of A (the
+    component images) of each block are updated with the current X and
+    the products A.T Y and A.T A are accumulated to update X (the component
+    spectra) at the end of the pass. Only A, which is ncomponents times
+    smaller than an image of the stack, is kept in memory, so stacks in
+    HDF5 files can be decomposed without loading them.
+
+    :param stack: 3D or 2D array (or object with data and info attributes)
+    :param int ncomponents:
+    :param int binning: spectral binning (channels are summed)
+    :param mask: spatial mask of the spectra to be used
+    :param spectral_mask: channels to be used (original or binned channels)
+    :param float eps: convergence when the relative decrease of the
+                      objective function is lower than eps
+    :param int maxcount: maximum number of iterations
+    :param int seed: seed of the random starting matrices
+    :param int nworkers: None or 1 means serial, 0 means one per CPU
+    :param output: h5py.Group in which the images are written as the
+                   "images" dataset (returned instead of a numpy array)
+                   together with the "values" and "vectors" datasets
+    :returns tuple: images, values, vectors as returned by nnma
+    """
+    if binning is None:
+        binning = 1
+    if hasattr(stack, "info") and hasattr(stack, "data"):
+        data = stack.data
+        index = stack.info.get('McaIndex', -1)
+    else:
+        data = stack
+        index = kw.get("index", -1)
+    shape = data.shape
+    if index < 0:
+        index += len(shape)
+    imageShape = tuple(n for i, n in enumerate(shape) if i != index)
+    nPixels = int(numpy.prod(imageShape))
+    N = shape[index] // binning
+    if mask is not None:
+        mask = numpy.asarray(mask).reshape(imageShape) > 0
+    weights = None
+    if spectral_mask is not None:
+        weights = (numpy.asarray(spectral_mask).reshape(-1) > 0)\
+                  .astype(numpy.float64)
+
+    def blocks():
+        # pixels of the block, spectra and spatial mask of the block
+        for idx, block in PCATools._spectraBlocks(data, index):
+            pixels = PCATools._blockPixels(idx, imageShape)
+            if mask is None:
+                yield pixels, block, None
+            else:
+                blockMask = mask[idx].reshape(-1)
+                yield pixels[blockMask], block, blockMask
+
+    # intensity of the data and random start
+    t0 = time.time()
+    normY = 0.0
+    sumY = 0.0
+    nSpectra = 0
+    for pixels, block, blockMask in blocks():
+        if blockMask is not None:
+            block = block[blockMask]
+        Y = PCATools._weightAndBin(block, weights, binning, N)
+        normY += (Y * Y).sum()
+        sumY += Y.sum()
+        nSpectra += Y.shape[0]
+    if not nSpectra:
+        raise ValueError("No spectra selected")
+    random = numpy.random.RandomState(seed)
+    scale = numpy.sqrt(max(sumY / (nSpectra * N), 1.0e-30) /
+                       (0.25 * ncomponents))
+    A = numpy.zeros((nPixels, ncomponents), numpy.float32)
+    if mask is None:
+        A[:] = scale * random.random_sample((nPixels, ncomponents))
+    else:
+        A[mask.reshape(-1)] = scale * \
+                              random.random_sample((nSpectra, ncomponents))
+    X = scale * random.random_sample((ncomponents, N))
+    if weights is not None:
+        if weights.size == N:
+            X *= weights
+        else:
+            X *= weights[:N * binning].reshape(N, binning).sum(axis=1) > 0
+
+    obj = None
+    converged = False
+    count = 0
+    while count < maxcount:
+        count += 1
+        XXt = numpy.dot(X, X.T)
+        AtY = numpy.zeros((ncomponents, N))
+        AtA = numpy.zeros((ncomponents, ncomponents))
+        with ExecutorUtils.executorContext(nworkers=nworkers,
+                                           executor="thread") as \
+                (executor, n):
+            arguments = ((pixels, block, blockMask, weights, binning, N,
+                          A[pixels].astype(numpy.float64), X, XXt)
+                         for pixels, block, blockMask in blocks())
+            for pixels, rows, blockAtY, blockAtA in \
+                    ExecutorUtils.orderedMap(_chunkedNMFBlock, arguments,
+                                             executor=executor,
+                                             nworkers=n):
+                A[pixels] = rows
+                AtY += blockAtY
+                AtA += blockAtA
+        X = X * AtY / (numpy.dot(AtA, X) + 1.0e-30)
+        lastObj = obj
+        obj = normY - 2 * (AtY * X).sum() + (AtA * numpy.dot(X, X.T)).sum()
+        if verbose:
+            _logger.info("ChunkedNMF iteration %d objective %g", count, obj)
+        if lastObj is not None:
+            if (lastObj - obj) <= eps * abs(lastObj):
+                converged = True
+                break
+    if not converged:
+        _logger.warning("ChunkedNMF: possible problems converging")
+    _logger.debug("ChunkedNMF %d iterations elapsed = %s",
+                  count, time.time() - t0)
+
+    # order and scale images as nnma does
+    norm_factor = A.max(axis=0).astype(numpy.float64)
+    norm_factor[norm_factor <= 0] = 1.0
+    X *= norm_factor[:, None]
+    intensity = A.sum(axis=0, dtype=numpy.float64) / norm_factor * \
+                X.sum(axis=1)
+    sorted_idx = numpy.argsort(intensity)[::-1]
+    values = (100. * intensity[sorted_idx] / sumY).astype(numpy.float32)
+    vectors = X[sorted_idx].astype(numpy.float32)
+    if output is None:
+        images = (A[:, sorted_idx] / norm_factor[sorted_idx]).T\
+                 .astype(numpy.float32)
+        images.shape = (ncomponents,) + imageShape
+        return images, values, vectors
+    images = output.create_dataset("images",
+                                   shape=(ncomponents,) + imageShape,
+                                   dtype=numpy.float32,
+                                   chunks=True)
+    # A is in the order of the flattened image
+    rowSize = nPixels // max(imageShape[0], 1)
+    step = max((1024 * 1024) // max(rowSize * ncomponents, 1), 1)
+    for i in range(0, imageShape[0], step):
+        rows = A[i * rowSize:(i + step) * rowSize, sorted_idx]
+        rows = (rows / norm_factor[sorted_idx]).T
+        images[:, i:i + step] = rows.reshape((ncomponents, -1) +
+                                             imageShape[1:])
+    output["values"] = values
+    output["vectors"] = vectors
+    return images, values, vectors
+
+
 if __name__ == "__main__":
     from PyMca.PyMcaIO import EDFStack
     from PyMca.PyMcaIO import EdfFile
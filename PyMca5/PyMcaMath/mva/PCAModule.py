@@ -51,6 +51,7 @@
 
 from . import Lanczos
 from . import PCATools
+from PyMca5.PyMcaMisc import ExecutorUtils
 
 
 _logger = logging.getLogger(__name__)
@@ -506,7 +507,8 @@ def numpyCovariancePCA(stack, ncomponents=10, binning=None, legacy=True, **kw):
                     scale=False,
                     mask=mask,
                     spectral_mask=spectral_mask,
-                    force=force)
+                    force=force,
+                    nworkers=kw.get("nworkers", None))
 
 def numpyCorrelationPCA(stack, ncomponents=10, binning=None, legacy=True, **kw):
     mask = kw.get("mask", None)
@@ -520,7 +522,8 @@ def numpyCorrelationPCA(stack, ncomponents=10, binning=None, legacy=True, **kw):
                     scale=True,
                     mask=mask,
                     spectral_mask=spectral_mask,
-                    force=force)
+                    force=force,
+                    nworkers=kw.get("nworkers", None))
 
 def numpyPCA(stack, ncomponents=10, binning=None, legacy=True,
                      center=True, scale=False, mask=None, spectral_mask=None, force=True, **kw):
@@ -544,7 +547,164 @@ def numpyPCA(stack, ncomponents=10, binning=None, legacy=True,
                              scale=scale,
                              mask=mask,
                              spectral_mask=spectral_mask,
-                             force=force)
+                             force=force,
+                             nworkers=kw.get("nworkers", None))
+
+def _randomizedBlockProducts(args):
+    """
+    Contribution of a block of spectra to the product of the covariance
+    matrix by a set of vectors.
+
+    :param tuple args: spectra, spatial mask of the block (or None),
+                       weights, binning, number of binned channels,
+                       shift spectrum, vectors (nChannels, l)
+    :returns tuple: number of spectra, sum of the shifted spectra, sum of
+                    their squares, X.T X Q of the shifted spectra
+    """
+    block, mask, weights, binning, nChannels, shift, vectors = args
+    if mask is not None:
+        mask = mask.reshape(-1)
+        if not mask.all():
+            block = block[mask]
+    block = PCATools._weightAndBin(block, weights, binning, nChannels)
+    if not block.shape[0]:
+        return 0, 0.0, 0.0, 0.0
+    block = block - shift
+    return block.shape[0], block.sum(axis=0), (block * block).sum(), \
+           dotblas.dot(block.T, dotblas.dot(block, vectors))
+
+
+def randomizedPCA(stack, ncomponents=10, binning=None, legacy=True,
+                  mask=None, spectral_mask=None, oversampling=10,
+                  iterations=3, seed=None, nworkers=None, **kw):
+    """
+    Truncated PCA of the covariance matrix by randomized range finding
+    with power iterations (Halko, Martinsson and Tropp, SIAM Review 53,
+    2011).
+
+    The stack is read in blocks (it can be an HDF5 dataset) once per
+    power iteration plus two more times: to find the initial range and to
+    calculate the scores. Besides the blocks, only matrices of
+    nChannels x (ncomponents + oversampling) elements are kept in memory.
+    The eigenvalues correspond to the covariance matrix as calculated by
+    numpyCovariancePCA.
+
+    :param int oversampling: number of additional random vectors
+    :param int iterations: number of power iterations
+    :param int seed: seed of the random vectors (None for a random seed)
+    :param int nworkers: None or 1 means serial, 0 means one per CPU
+    """
+    _logger.debug("randomizedPCA")
+    if binning is None:
+        binning = 1
+    if hasattr(stack, "info") and hasattr(stack, "data"):
+        data = stack.data
+        index = stack.info.get('McaIndex', -1)
+    else:
+        data = stack
+        index = kw.get("index", -1)
+    shape = data.shape
+    if index < 0:
+        index += len(shape)
+    data = PCATools._h5pyWorkaround(data, index)
+    imageShape = tuple(n for i, n in enumerate(shape) if i != index)
+    N = shape[index] // binning
+    if ncomponents > N:
+        raise ValueError("Number of components too high.")
+    if mask is not None:
+        mask = numpy.asarray(mask).reshape(imageShape) > 0
+    weights = spectral_mask
+    if weights is not None:
+        weights = numpy.asarray(weights, dtype=numpy.float64).reshape(-1)
+    nvectors = min(ncomponents + oversampling, N)
+
+    # the spectra are shifted by the mean spectrum of the first block
+    # to avoid the loss of precision of X.T X - n * mean.T mean
+    shift = [None]
+
+    def arguments(vectors):
+        for idx, block in PCATools._spectraBlocks(data, index):
+            blockMask = None if mask is None else mask[idx]
+            if shift[0] is None:
+                first = PCATools._weightAndBin(block if blockMask is None else
+                                               block[blockMask.reshape(-1)],
+                                               weights, binning, N)
+                if not first.shape[0]:
+                    continue
+                shift[0] = first.mean(axis=0)
+            yield block, blockMask, weights, binning, N, shift[0], vectors
+
+    def covarianceProduct(vectors):
+        # one pass over the data
+        npixels = 0
+        sumSpectrum = 0.0
+        sumSquares = 0.0
+        product = 0.0
+        with ExecutorUtils.executorContext(nworkers=nworkers,
+                                           executor="thread") as \
+                (executor, n):
+            for result in ExecutorUtils.orderedMap(_randomizedBlockProducts,
+                                                   arguments(vectors),
+                                                   executor=executor,
+                                                   nworkers=n):
+                npixels += result[0]
+                sumSpectrum = sumSpectrum + result[1]
+                sumSquares += result[2]
+                product = product + result[3]
+        if npixels < 2:
+            raise ValueError("Not enough spectra selected")
+        product -= numpy.outer(sumSpectrum,
+                               dotblas.dot(sumSpectrum, vectors) / npixels)
+        product /= npixels - 1
+        variance = (sumSquares - dotblas.dot(sumSpectrum, sumSpectrum) /
+                    npixels) / (npixels - 1)
+        avg = shift[0] + sumSpectrum / npixels
+        return product, npixels, avg, variance
+
+    t0 = time.time()
+    random = numpy.random.RandomState(seed)
+    vectors = numpy.linalg.qr(random.standard_normal((N, nvectors)))[0]
+    for i in range(iterations + 1):
+        product, npixels, avg, totalVariance = covarianceProduct(vectors)
+        if i < iterations:
+            vectors = numpy.linalg.qr(product)[0]
+    # Rayleigh-Ritz on the subspace
+    evalues, evectors = numpy.linalg.eigh(dotblas.dot(vectors.T, product))
+    order = numpy.argsort(evalues)[::-1][:ncomponents]
+    eigenvalues = evalues[order].astype(numpy.float32)
+    eigenvectors = dotblas.dot(vectors, evectors[:, order]).T\
+                   .astype(numpy.float32)
+    _logger.debug("Randomized decomposition elapsed = %s", time.time() - t0)
+    _logger.info("Total explained variance = %.2f %% ",
+                 100. * eigenvalues.sum() / totalVariance)
+    if avg.sum() > 0:
+        for i in range(ncomponents):
+            if eigenvectors[i].sum() < 0.0:
+                eigenvectors[i] *= -1
+
+    # the scores
+    images = numpy.zeros((ncomponents, int(numpy.prod(imageShape))),
+                         numpy.float32)
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor="thread") as (executor, n):
+        blocks = ((idx, block, eigenvectors, binning, N, None)
+                  for idx, block in PCATools._spectraBlocks(data, index))
+        for idx, scores in ExecutorUtils.orderedMap(PCATools._projectBlock,
+                                                    blocks,
+                                                    executor=executor,
+                                                    nworkers=n):
+            images[:, PCATools._blockPixels(idx, imageShape)] = scores
+    images.shape = (ncomponents,) + imageShape
+    if legacy:
+        return images, eigenvalues, eigenvectors
+    else:
+        return {"scores": images,
+                "eigenvalues": eigenvalues,
+                "eigenvectors": eigenvectors,
+                "average": avg,
+                "pixels": npixels,
+                "variance": totalVariance}
+
 
 def mdpPCASVDFloat32(stack, ncomponents=10, binning=None,
                      mask=None, spectral_mask=None, legacy=True, **kw):
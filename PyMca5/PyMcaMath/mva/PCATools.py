@@ -35,6 +35,8 @@
 import time
 import numpy
 import numpy.linalg
+from PyMca5.PyMcaCore import McaStackView
+from PyMca5.PyMcaMisc import ExecutorUtils
 try:
     # make a explicit import to warn about missing optimized libraries
     import numpy.core._dotblas as dotblas
@@ -53,7 +55,8 @@ def getCovarianceMatrix(stack,
                         force=True,
                         center=True,
                         weights=None,
-                        spatial_mask=None):
+                        spatial_mask=None,
+                        nworkers=None):
     """
     Calculate the covariance matrix of input data (stack) array. The input array is to be
     understood as a set of observables (spectra) taken at different instances (for instance
@@ -64,15 +67,16 @@ def getCovarianceMatrix(stack,
     :param index: Integer specifying the array dimension containing the "observables". Only the first
     the first (index = 0) or the last dimension (index = -1 or index = (ndimensions - 1)) supported. 
     :type index: Integer (default is -1 to indicate it is the last dimension of input array)
-    :param binning: Current implementation corresponds to a sampling of the spectral data and not to
-    an actual binning. This may change in future versions.
+    :param binning: Number of consecutive channels summed together. Trailing channels not filling
+    a complete bin are ignored.
     :type binning: Positive integer (default 1)
     :param dtype: Keyword indicating the data type of the returned covariance matrix.
     :type dtype: A valid numpy data type (default numpy.float64)
     :param force: Indicate how to calculate the covariance matrix:
 
             - False : Perform the product data.T * data in one call 
-            - True  : Perform the product data.T * data progressively (smaller memory footprint)
+            - True  : Accumulate the means and the centered products of blocks of spectra
+                      read with McaStackView (smaller memory footprint)
 
     :type force: Boolean (default True)
     :param center: Indicate if the mean is to be subtracted from the observables.
@@ -83,6 +87,8 @@ def getCovarianceMatrix(stack,
     :spatial_mask: Array of size n where n is the number of measurement instances. In mapping
     experiments, n would be equal to the number of pixels.
     :type spatial_mask: Numpy array of unsigned bytes (numpy.uint8) or None (default).
+    :param nworkers: Number of threads processing the blocks when force is True.
+    :type nworkers: None or 1 means serial, 0 means one per CPU (default None)
     :returns: The covMatrix, the average spectrum and the number of used pixels.
     """
     # the 1D mask = weights should correspond to the values, before or after
@@ -123,41 +129,27 @@ def getCovarianceMatrix(stack,
         if i != actualIndex:
             nPixels *= oldShape[i]
 
-    # remove inf or nan
-    #image_data = data.sum(axis=actualIndex)
-    #spatial_mask = numpy.isfinite(image_data)
-    #
-
     # the starting number of channels or of images
     N = oldShape[actualIndex]
 
-    # our binning (better said sampling) is spectral, in order not to
-    # affect the spatial resolution
+    # our binning is spectral, in order not to affect the spatial resolution
     if binning is None:
         binning = 1
+    nChannels = int(N / binning)
 
     if spatial_mask is not None:
-        cleanMask = spatial_mask[:].reshape(nPixels)
-        usedPixels = cleanMask.sum()
-        badMask = numpy.array(spatial_mask < 1, dtype=cleanMask.dtype)
-        badMask.shape = nPixels
+        cleanMask = numpy.asarray(spatial_mask[:]).reshape(nPixels) > 0
+        usedPixels = int(cleanMask.sum())
     else:
         cleanMask = None
         usedPixels = nPixels
 
-    nChannels = int(N / binning)
-
-    if weights is None:
-        weights = numpy.ones(N, numpy.float64)
-
-    if weights.size == nChannels:
-        # binning was taken into account
-        cleanWeights = weights[:]
-    else:
-        cleanWeights = weights[::binning]
-        
+    if weights is not None:
+        weights = numpy.asarray(weights, dtype=numpy.float64).reshape(-1)
+        if weights.size not in [N, nChannels]:
+            raise ValueError("Expected %d or %d weights, got %d" % \
+                             (N, nChannels, weights.size))
     # end of checking part
-    eigenvectorLength = nChannels
 
     if (not force)and isinstance(data, numpy.ndarray):
         _logger.debug("Memory consuming calculation")
@@ -167,52 +159,92 @@ def getCovarianceMatrix(stack,
         if index in [0]:
             #reshape the view to allow the matrix multiplication
             dataView.shape = -1, nPixels
-            cleanWeights.shape = -1, 1
-            dataView = dataView[::binning] * cleanWeights
-            if cleanMask is not None:
-                dataView[:, badMask] = 0
-            sumSpectrum = dataView.sum(axis=1, dtype=numpy.float64)
-            #and return the standard covariance matrix as a matrix product
-            covMatrix = dotblas.dot(dataView, dataView.T)\
-                / float(usedPixels - 1)
+            dataView = _weightAndBin(dataView.T, weights, binning, nChannels)
         else:
             #the last index
             dataView.shape = nPixels, -1
-            cleanWeights.shape = 1, -1
-            dataView = dataView[:, ::binning] * cleanWeights
-            if cleanMask is not None:
-                cleanMask.shape = -1
-                if 0:
-                    for i in range(dataView.shape[-1]):
-                        dataView[badMask, i] = 0
-                else:
-                    dataView[badMask] = 0
-            sumSpectrum = dataView.sum(axis=0, dtype=numpy.float64)
-            #and return the standard covariance matrix as a matrix product
-            covMatrix = dotblas.dot(dataView.T, dataView )\
-                / float(usedPixels - 1)
+            dataView = _weightAndBin(dataView, weights, binning, nChannels)
+        if numpy.may_share_memory(dataView, data):
+            # do not modify the input data
+            dataView = numpy.array(dataView, dtype=numpy.float64)
+        else:
+            dataView = numpy.asarray(dataView, dtype=numpy.float64)
+        if cleanMask is not None:
+            dataView[~cleanMask] = 0
+        sumSpectrum = dataView.sum(axis=0, dtype=numpy.float64)
+        #and return the standard covariance matrix as a matrix product
+        covMatrix = dotblas.dot(dataView.T, dataView )\
+            / float(usedPixels - 1)
         if center:
             averageMatrix = numpy.outer(sumSpectrum, sumSpectrum)\
                 / (usedPixels * (usedPixels - 1))
             covMatrix -= averageMatrix
             averageMatrix = None
-        return covMatrix, sumSpectrum / usedPixels, usedPixels
+        return covMatrix.astype(dtype, copy=False), \
+               sumSpectrum / usedPixels, usedPixels
 
     # we are dealing with dynamically loaded data
     _logger.debug("DYNAMICALLY LOADED DATA")
-    #create the needed storage space for the covariance matrix
-    try:
-        covMatrix = numpy.zeros((eigenvectorLength, eigenvectorLength),
-                                dtype=dtype)
-        sumSpectrum = numpy.zeros((eigenvectorLength,), numpy.float64)
-    except:
-        #make sure no reference to the original input data is kept
-        cleanWeights = None
-        covMatrix = None
-        averageMatrix = None
-        data = None
-        raise
+    data = _h5pyWorkaround(data, actualIndex)
+
+    # pairwise merge of the number of spectra, mean spectrum and centered
+    # Gram matrix of the blocks
+    merged = []
+    if cleanMask is not None:
+        cleanMask.shape = tuple(n for i, n in enumerate(oldShape)
+                                if i != actualIndex)
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor="thread") as \
+            (executor, nworkers):
+        arguments = ((block, cleanMask if cleanMask is None else cleanMask[idx],
+                      weights, binning, nChannels)
+                     for idx, block in _spectraBlocks(data, actualIndex))
+        for moments in ExecutorUtils.orderedMap(_blockMoments, arguments,
+                                                executor=executor,
+                                                nworkers=nworkers):
+            if not moments[0]:
+                continue
+            level = 0
+            while merged and merged[-1][0] == level:
+                moments = _mergeMoments(merged.pop()[1], moments)
+                level += 1
+            merged.append((level, moments))
+    if not merged:
+        raise ValueError("No spectra selected")
+    n, mean, covMatrix = merged.pop()[1]
+    while merged:
+        n, mean, covMatrix = _mergeMoments(merged.pop()[1],
+                                           (n, mean, covMatrix))
+    if not center:
+        covMatrix += n * numpy.outer(mean, mean)
+    # the n-1 is used both for the centered and non-centered cases
+    covMatrix /= usedPixels - 1
+    return covMatrix.astype(dtype, copy=False), mean, usedPixels
+
+
+def _weightAndBin(spectra, weights, binning, nChannels):
+    """
+    Apply the spectral weights and sum groups of binning channels.
 
+    :param array spectra: 2D array, one spectrum per row
+    :param array weights: None or weights of the original or of the
+                          binned channels
+    :returns array: nChannels binned spectra (a view when possible)
+    """
+    if (weights is not None) and (weights.size != nChannels):
+        # weights of the original channels
+        spectra = spectra * weights
+        weights = None
+    if binning > 1:
+        spectra = spectra[:, :nChannels * binning]\
+                  .reshape(spectra.shape[0], nChannels, binning)\
+                  .sum(axis=2, dtype=numpy.float64)
+    if weights is not None:
+        spectra = spectra * weights
+    return spectra
+
+
+def _h5pyWorkaround(data, actualIndex):
     # workaround a problem with h5py
     try:
         if actualIndex in [0]:
@@ -230,311 +262,91 @@ def getCovarianceMatrix(stack,
             data = h5py.Dataset(data.id)
         else:
             raise
+    return data
 
-    if actualIndex in [0]:
-        # divider is used to decide the fraction of images to keep in memory
-        # in order to limit file access on dynamically loaded data.
-        # Since two chunks of the same size are used, the amount of memory
-        # needed is twice the data size divided by the divider.
-        # For instance, divider = 10 implies the data to be read 5.5 times
-        # from disk while having a memory footprint of about one fifth of
-        # the dataset size.
-        step = 0
-        divider = 10
-        while step < 1:
-            step = int(oldShape[index] / divider)
-            divider -= 2
-            if divider <= 0:
-                step = oldShape[index]
-                break
-        _logger.debug("Reading chunks of %d images", step)
-        nImagesRead = 0
-        if (binning == 1) and oldShape[index] >= step:
-            chunk1 = numpy.zeros((step, nPixels), numpy.float64)
-            chunk2 = numpy.zeros((nPixels, step), numpy.float64)
-            if spatial_mask is not None:
-                badMask.shape = -1
-                cleanMask.shape = -1
-            i = 0
-            while i < N:
-                iToRead = min(step, N - i)
-                #get step images for the first chunk
-                chunk1[0:iToRead] = data[i:i + iToRead].reshape(iToRead, -1)
-                if spatial_mask is not None:
-                    chunk1[0:iToRead, badMask] = 0
-                sumSpectrum[i:i + iToRead] = chunk1[0:iToRead].sum(axis=1)
-                if center:
-                    average = sumSpectrum[i:i + iToRead] / usedPixels
-                    average.shape = iToRead, 1
-                    chunk1[0:iToRead] -= average
-                if spatial_mask is not None:
-                    chunk1[0:iToRead, badMask] = 0
-                nImagesRead += iToRead
-                j = 0
-                while j <= i:
-                    #get step images for the second chunk
-                    if j == i:
-                        jToRead = iToRead
-                        if 0:
-                            for k in range(0, jToRead):
-                                chunk2[:, k] = chunk1[k]
-                        else:
-                            chunk2[:, 0:jToRead] = chunk1[0:jToRead, :].T
-                    else:
-                        #get step images for the second chunk
-                        jToRead = min(step, nChannels - j)
-
-                        # with loop:
-                        #for k in range(0, jToRead):
-                        #    chunk2[:,k] = data[(j+k):(j+k+1)].reshape(1,-1)
-                        #    if spatial_mask is not None:
-                        #        chunk2[badMask[(j+k):(j+k+1),k]] = 0
-                        # equivalent without loop:
-                        chunk2[:, 0:jToRead] =\
-                            data[j:(j + jToRead)].reshape(jToRead, -1).T
-                        if spatial_mask is not None:
-                            chunk2[badMask, 0:jToRead] = 0
-                        nImagesRead += jToRead
-                        if center:
-                            average = \
-                                chunk2[:, 0:jToRead].sum(axis=0) / usedPixels
-                            average.shape = 1, jToRead
-                            chunk2[:, 0:jToRead] -= average
-                            if spatial_mask is not None:
-                                chunk2[badMask, 0:jToRead] = 0
-
-                    # dot product
-                    if (iToRead != step) or (jToRead != step):
-                        covMatrix[i: (i + iToRead), j: (j + jToRead)] =\
-                                        dotblas.dot(chunk1[:iToRead, :nPixels],
-                                                    chunk2[:nPixels, :jToRead])
-                    else:
-                        covMatrix[i: (i + iToRead), j: (j + jToRead)] =\
-                                        dotblas.dot(chunk1, chunk2)
-
-                    if i != j:
-                        covMatrix[j: (j + jToRead), i: (i + iToRead)] =\
-                                covMatrix[i: (i + iToRead), j: (j + jToRead)].T
-
-                    # increment j
-                    j += jToRead
-                i += iToRead
-            chunk1 = None
-            chunk2 = None
-            _logger.debug("totalImages Read = %s", nImagesRead)
-        elif (binning > 1) and (oldShape[index] >= step):
-            chunk1 = numpy.zeros((step, nPixels), numpy.float64)
-            chunk2 = numpy.zeros((nPixels, step), numpy.float64)
-            #one by one reading till we fill the chunks
-            imagesToRead = numpy.arange(0, oldShape[index], binning)
-            i = int(imagesToRead[weights > 0][0])
-            spectrumIndex = 0
-            nImagesRead = 0
-            while i < N:
-                # fill chunk1
-                jj = 0
-                for iToRead in range(0, int(min(step * binning, N - i)),
-                                     binning):
-                    chunk1[jj] = data[i + iToRead].reshape(1, -1) * \
-                                 weights[i + iToRead]
-                    jj += 1
-                sumSpectrum[spectrumIndex:(spectrumIndex + jj)] = \
-                                                    chunk1[0:jj].sum(axis=1)
-                if center:
-                    average = \
-                        sumSpectrum[spectrumIndex:(spectrumIndex + jj)] / nPixels
-                    average.shape = jj, 1
-                    chunk1[0:jj] -= average
-                nImagesRead += jj
-                iToRead = jj
-                j = 0
-                while j <= i:
-                    # get step images for the second chunk
-                    if j == i:
-                        jToRead = iToRead
-                        chunk2[:, 0:jToRead] = chunk1[0:jToRead, :].T
-                    else:
-                        # get step images for the second chunk
-                        jj = 0
-                        for jToRead in range(0,
-                                             int(min(step * binning, N - j)),
-                                             binning):
-                            chunk2[:, jj] =\
-                                data[j + jToRead].reshape(1, -1)\
-                                * weights[j + jToRead]
-                            jj += 1
-                        nImagesRead += jj
-                        if center:
-                            average = chunk2[:, 0:jj].sum(axis=0) / nPixels
-                            average.shape = 1, jj
-                            chunk2 -= average
-                        jToRead = jj
-                    # dot product
-                    if (iToRead != step) or (jToRead != step):
-                        covMatrix[i:(i + iToRead), j:(j + jToRead)] =\
-                                dotblas.dot(chunk1[:iToRead, :nPixels],
-                                            chunk2[:nPixels, :jToRead])
-                    else:
-                        covMatrix[i:(i + iToRead), j:(j + jToRead)] =\
-                                dotblas.dot(chunk1, chunk2)
-
-                    if i != j:
-                        covMatrix[j:(j + jToRead), i:(i + iToRead)] =\
-                                covMatrix[i:(i + iToRead), j:(j + jToRead)].T
-
-                    # increment j
-                    j += jToRead * step
-                i += iToRead * step
-            chunk1 = None
-            chunk2 = None
-        else:
-            raise ValueError("PCATools.getCovarianceMatrix: Unhandled case")
 
-        # should one divide by N or by N-1 ??  if we use images, we
-        # assume the observables are the images, not the spectra!!!
-        # so, covMatrix /= nChannels is wrong and one has to use:
-        covMatrix /= usedPixels
-    else:
-        # the data are already arranged as (nPixels, nChannels) and we
-        # basically have to return data.T * data to get back the covariance
-        # matrix as (nChannels, nChannels)
-        # if someone had the bad idea to store the data in HDF5 with a chunk
-        # size based on the pixels and not on the spectra a loop based on
-        # reading spectrum per spectrum can be very slow
-        step = 0
-        divider = 10
-        while step < 1:
-            step = int(nPixels / divider)
-            divider -= 1
-            if divider <= 0:
-                step = nPixels
-                break
-        step = nPixels
-        _logger.debug("Reading chunks of %d spectra", step)
-
-        cleanWeights.shape = 1, -1
-        if len(data.shape) == 2:
-            if cleanMask is not None:
-                badMask.shape = -1
-            tmpData = numpy.zeros((step, nChannels), numpy.float64)
-            k = 0
-            while k < nPixels:
-                kToRead = min(step, nPixels - k)
-                tmpData[0:kToRead] = data[k: k + kToRead, ::binning]
-                if cleanMask is not None:
-                    tmpData[badMask[k: k + kToRead]] = 0
-                a = tmpData[0:kToRead] * cleanWeights
-                sumSpectrum += a.sum(axis=0)
-                covMatrix += dotblas.dot(a.T, a)
-                a = None
-                k += kToRead
-            tmpData = None
-        elif len(data.shape) == 3:
-            if oldShape[0] == 1:
-                #close to the previous case
-                tmpData = numpy.zeros((step, nChannels), numpy.float64)
-                if cleanMask is not None:
-                    badMask.shape = data.shape[0], data.shape[1]
-                for i in range(oldShape[0]):
-                    k = 0
-                    while k < oldShape[1]:
-                        kToRead = min(step, oldShape[1] - k)
-                        tmpData[0:kToRead] = data[i, k:k + kToRead, ::binning]\
-                                             * cleanWeights
-                        if cleanMask is not None:
-                            tmpData[0:kToRead][badMask[i, k: k + kToRead]] = 0
-                        a = tmpData[0:kToRead]
-                        sumSpectrum += a.sum(axis=0)
-                        covMatrix += dotblas.dot(a.T, a)
-                        a = None
-                        k += kToRead
-                tmpData = None
-            elif oldShape[1] == 1:
-                # almost identical to the previous case
-                tmpData = numpy.zeros((step, nChannels), numpy.float64)
-                if cleanMask is not None:
-                    badMask.shape = data.shape[0], data.shape[1]
-                for i in range(oldShape[1]):
-                    k = 0
-                    while k < oldShape[0]:
-                        kToRead = min(step, oldShape[0] - k)
-                        tmpData[0:kToRead] = data[k: k + kToRead, i, ::binning]\
-                                             * cleanWeights
-                        if cleanMask is not None:
-                            tmpData[0:kToRead][badMask[k: k + kToRead, i]] = 0
-                        a = tmpData[0:kToRead]
-                        sumSpectrum += a.sum(axis=0)
-                        covMatrix += dotblas.dot(a.T, a)
-                        a = None
-                        k += kToRead
-                tmpData = None
-            elif oldShape[0] < 21:
-                if step > oldShape[1]:
-                    step = oldShape[1]
-                tmpData = numpy.zeros((step, nChannels), numpy.float64)
-                if cleanMask is not None:
-                    badMask.shape = data.shape[0], data.shape[1]
-                for i in range(oldShape[0]):
-                    k = 0
-                    while k < oldShape[1]:
-                        kToRead = min(step, oldShape[1] - k)
-                        tmpData[0:kToRead] = data[i, k: k + kToRead, ::binning]\
-                                             * cleanWeights
-                        if cleanMask is not None:
-                            tmpData[0:kToRead][badMask[i, k: k + kToRead]] = 0
-                        a = tmpData[0:kToRead]
-                        sumSpectrum += a.sum(axis=0)
-                        covMatrix += dotblas.dot(a.T, a)
-                        a = None
-                        k += kToRead
-                tmpData = None
-            else:
-                # I should choose the sizes in terms of the size
-                # of the dataset
-                if oldShape[0] < 41:
-                    # divide by 10
-                    deltaRow = 4
-                elif oldShape[0] < 101:
-                    # divide by 10
-                    deltaRow = 10
-                else:
-                    # take pieces of one tenth
-                    deltaRow = int(oldShape[0] / 10)
-                deltaCol = oldShape[1]
-                tmpData = numpy.zeros((deltaRow, deltaCol, nChannels),
-                                      numpy.float64)
-                if cleanMask is not None:
-                    badMask.shape = data.shape[0], data.shape[1]
-                i = 0
-                while i < oldShape[0]:
-                    iToRead = min(deltaRow, oldShape[0] - i)
-                    kToRead = iToRead * oldShape[1]
-                    tmpData[:iToRead] = data[i:(i + iToRead), :, ::binning]
-                    if cleanMask is not None:
-                        tmpData[0:iToRead][badMask[i:(i + iToRead), :]] = 0
-                    a = tmpData[:iToRead]
-                    a.shape = kToRead, nChannels
-                    a *= cleanWeights
-                    if 0:
-                        #weight each spectrum
-                        a /= (a.sum(axis=1).reshape(-1, 1))
-                    sumSpectrum += a.sum(axis=0)
-                    covMatrix += dotblas.dot(a.T, a)
-                    a = None
-                    i += iToRead
-        # should one divide by N or by N-1 ??
-        covMatrix /= usedPixels - 1
-        if center:
-            # the n-1 appears again here
-            averageMatrix = numpy.outer(sumSpectrum, sumSpectrum)\
-                            / (usedPixels * (usedPixels - 1))
-            covMatrix -= averageMatrix
-            averageMatrix = None
-    return covMatrix, sumSpectrum / usedPixels, usedPixels
+def _spectraBlocks(data, mcaAxis):
+    """
+    Read the data in blocks of spectra aligned to the storage chunks.
+
+    :yields tuple: index of the block in the image dimensions,
+                   float64 spectra (one per row)
+    """
+    view = McaStackView.FullView(data, mcaAxis=mcaAxis, nMca="auto",
+                                 dtype=numpy.float64)
+    for (idx, shape), chunk in view.items(keyType="select"):
+        # the view reuses its buffer
+        yield idx, numpy.array(chunk, copy=True)
+
+
+def _blockPixels(idx, imageShape):
+    """
+    Indices of the spectra of a block in the flattened image.
+
+    :param tuple idx: slices of the block in the image dimensions
+    :param tuple imageShape:
+    :returns array:
+    """
+    pixels = [numpy.arange(*slc.indices(n))
+              for slc, n in zip(idx, imageShape)]
+    return numpy.ravel_multi_index(numpy.ix_(*pixels), imageShape).reshape(-1)
+
+
+def _blockMoments(args):
+    """
+    Number of spectra, mean spectrum and centered Gram matrix of a block.
+
+    :param tuple args: spectra, spatial mask of the block (or None),
+                       weights, binning, number of binned channels
+    :returns tuple: n, mean, (X - mean).T (X - mean)
+    """
+    block, mask, weights, binning, nChannels = args
+    if mask is not None:
+        mask = mask.reshape(-1)
+        if not mask.all():
+            block = block[mask]
+    block = _weightAndBin(block, weights, binning, nChannels)
+    n = block.shape[0]
+    if not n:
+        return 0, None, None
+    mean = block.sum(axis=0) / n
+    block = block - mean
+    return n, mean, dotblas.dot(block.T, block)
+
+
+def _projectBlock(args):
+    """
+    Scores of a block of spectra.
+
+    :param tuple args: index of the block, spectra, eigenvectors, binning,
+                       number of binned channels, None or (average,
+                       standard deviation)
+    :returns tuple: index of the block, scores (ncomponents, nSpectra)
+    """
+    idx, block, eigenvectors, binning, nChannels, normalization = args
+    block = _weightAndBin(block, None, binning, nChannels)
+    if normalization is not None:
+        block = (block - normalization[0]) / normalization[1]
+    return idx, dotblas.dot(eigenvectors, block.T)
+
+
+def _mergeMoments(a, b):
+    """
+    Merge the moments of two sets of spectra (Chan et al.).
+    """
+    na, meanA, gramA = a
+    nb, meanB, gramB = b
+    n = na + nb
+    delta = meanB - meanA
+    mean = meanA + delta * (nb / float(n))
+    gramA += gramB
+    gramA += numpy.outer(delta, delta) * (na * nb / float(n))
+    return n, mean, gramA
 
 
 def numpyPCA(stack, index=-1, ncomponents=10, binning=None,
-                center=True, scale=True, mask=None, spectral_mask=None, legacy=True, force=True):
+                center=True, scale=True, mask=None, spectral_mask=None, legacy=True, force=True,
+                nworkers=None):
     _logger.debug("PCATools.numpyPCA")
     _logger.debug("index = %d", index)
     _logger.debug("center = %s", center)
@@ -557,23 +369,7 @@ def numpyPCA(stack, index=-1, ncomponents=10, binning=None,
     else:
         actualIndex = index
 
-    # workaround a problem with h5py
-    try:
-        if actualIndex in [0]:
-            testException = data[0:1]
-        else:
-            if len(data.shape) == 2:
-                testException = data[0:1,-1]
-            elif len(data.shape) == 3:
-                testException = data[0:1,0:1,-1]
-    except AttributeError:
-        txt = "%s" % type(data)
-        if 'h5py' in txt:
-            _logger.warning("Implementing h5py workaround")
-            import h5py
-            data = h5py.Dataset(data.id)
-        else:
-            raise
+    data = _h5pyWorkaround(data, actualIndex)
 
     # the number of spatial pixels
     nPixels = 1
@@ -598,7 +394,8 @@ def numpyPCA(stack, index=-1, ncomponents=10, binning=None,
                                                              force=force,
                                                              center=center,
                                                              spatial_mask=mask,
-                                                             weights=spectral_mask)
+                                                             weights=spectral_mask,
+                                                             nworkers=nworkers)
 
     # the total variance is the sum of the elements of the diagonal
     totalVariance = numpy.array(numpy.diag(cov), copy=True)
@@ -671,46 +468,22 @@ def numpyPCA(stack, index=-1, ncomponents=10, binning=None,
     # Clearly the user should have control about subtracting the average or not and
     # normalizing to the standard deviation or not.
     subtractAndNormalize = False
-    if actualIndex in [0]:
-        for i in range(oldShape[actualIndex]):
-            if subtractAndNormalize:
-                tmpData = (data[i].reshape(1, -1) - avgSpectrum[i]) / standardDeviation[i]
-            else:
-                tmpData = data[i].reshape(1, -1)
-            for j in range(ncomponents):
-                images[j:j + 1, :] += tmpData * eigenvectors[j, i]
-        if len(oldShape) == 3:
-            # reshape the images
-            images.shape = ncomponents, oldShape[1], oldShape[2]
+    if subtractAndNormalize:
+        normalization = avgSpectrum, standardDeviation
     else:
-        # array of spectra
-        if len(oldShape) == 2:
-            for i in range(nPixels):
-                tmpData = data[i, :]
-                tmpData.shape = 1, nChannels
-                if subtractAndNormalize:
-                    tmpData = (tmpData[:, ::binning] - avgSpectrum) / standardDeviation
-                else:
-                    tmpData = tmpData[:, ::binning]
-                for j in range(ncomponents):
-                    images[j, i] = numpy.dot(tmpData, eigenvectors[j])
-            # reshape the images
-            images.shape = ncomponents, nPixels
-        elif len(oldShape) == 3:
-            i = 0
-            for r in range(oldShape[0]):
-                for c in range(oldShape[1]):
-                    tmpData = data[r, c, :]
-                    tmpData.shape = 1, nChannels
-                    if subtractAndNormalize:
-                        tmpData = (tmpData[:, ::binning] - avgSpectrum) / standardDeviation
-                    else:
-                        tmpData = tmpData[:, ::binning]
-                    for j in range(ncomponents):
-                        images[j, i] = numpy.dot(tmpData, eigenvectors[j])
-                    i += 1
-            # reshape the images
-            images.shape = ncomponents, oldShape[0], oldShape[1]
+        normalization = None
+    imageShape = tuple(n for i, n in enumerate(oldShape) if i != actualIndex)
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor="thread") as \
+            (executor, nworkers):
+        arguments = ((idx, block, eigenvectors, binning, N, normalization)
+                     for idx, block in _spectraBlocks(data, actualIndex))
+        for idx, scores in ExecutorUtils.orderedMap(_projectBlock, arguments,
+                                                    executor=executor,
+                                                    nworkers=nworkers):
+            images[:, _blockPixels(idx, imageShape)] = scores
+    # reshape the images
+    images.shape = (ncomponents,) + imageShape
     if legacy:
         return images, eigenvalues, eigenvectors
     else:
@@ -0,0 +1,308 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Content addressed cache of numpy arrays on disk.
+
+The key of an entry is a hash of the objects it was calculated from. Each
+entry is one compressed .npz file, written to a temporary file first and
+renamed afterwards, so that several processes can share a cache directory.
+
+Nested dictionaries of tables (for example physical data indexed by element)
+are stored uncompressed, which is faster to read back than parsing the text
+files they come from. This cache is only used when the environment variable
+PYMCA_CACHE_DIR gives its directory.
+"""
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import numpy
+
+_logger = logging.getLogger(__name__)
+
+
+def _updateHash(h, obj):
+    if isinstance(obj, dict):
+        h.update(b"{")
+        for key in sorted(obj.keys(), key=str):
+            _updateHash(h, key)
+            _updateHash(h, obj[key])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            _updateHash(h, item)
+        h.update(b"]")
+    elif isinstance(obj, numpy.ndarray):
+        obj = numpy.ascontiguousarray(obj)
+        h.update(("%s%s" % (obj.dtype.str, obj.shape)).encode())
+        h.update(obj.tobytes())
+    elif isinstance(obj, bytes):
+        h.update(b"b" + obj)
+    else:
+        h.update(("%s:%r" % (type(obj).__name__, obj)).encode())
+    h.update(b";")
+
+
+def hashKey(*objects):
+    """Hash of nested dictionaries, sequences, numpy arrays and scalars
+
+    :returns str: hexadecimal digest
+    """
+    h = hashlib.sha1()
+    for obj in objects:
+        _updateHash(h, obj)
+    return h.hexdigest()
+
+
+def fileChecksum(*filenames):
+    """Hash of the content of files
+
+    :returns str: hexadecimal digest
+    """
+    h = hashlib.sha1()
+    for filename in filenames:
+        with open(filename, "rb") as f:
+            content = f.read()
+        _updateHash(h, os.path.basename(filename))
+        _updateHash(h, content)
+    return h.hexdigest()
+
+
+def defaultDirectory():
+    """Cache directory for data shared by all processes of a user
+
+    :returns str or None: None when PYMCA_CACHE_DIR is not set or empty
+    """
+    directory = os.getenv("PYMCA_CACHE_DIR")
+    if directory:
+        return directory
+    return None
+
+
+_INDEX = "__index__"
+# changes with the layout of the files written by DiskCache.saveTables
+_TABLES_FORMAT = 2
+
+
+def _jsonDefault(obj):
+    if isinstance(obj, numpy.generic):
+        return obj.item()
+    raise TypeError("%r cannot be stored in a table" % (obj,))
+
+
+def _packTables(tables):
+    """One member per data type and a single index, so that the file is
+    read with few accesses. Non numeric values are kept in the index.
+    """
+    index = []
+    packed = {}
+    sizes = {}
+    for top, value in tables.items():
+        leaves = []
+        _leaves(value, [str(top)], leaves)
+        for path, leaf in leaves:
+            kind = "list" if isinstance(leaf, list) else "array"
+            array = numpy.asarray(leaf)
+            if array.dtype.kind in "biufc":
+                name = array.dtype.name
+                offset = sizes.get(name, 0)
+                packed.setdefault(name, []).append(array.ravel())
+                sizes[name] = offset + array.size
+                index.append([path, kind, name, list(array.shape), offset])
+            else:
+                if isinstance(leaf, numpy.ndarray):
+                    leaf = leaf.tolist()
+                elif kind != "list":
+                    kind = "value"
+                index.append([path, kind, None, None, leaf])
+    result = dict((name, numpy.concatenate(arrays))
+                  for name, arrays in packed.items())
+    result[_INDEX] = numpy.array(json.dumps(index, default=_jsonDefault))
+    return result
+
+
+def _leaves(value, path, leaves):
+    if isinstance(value, dict):
+        for key, subvalue in value.items():
+            _leaves(subvalue, path + [str(key)], leaves)
+    else:
+        leaves.append((path, value))
+
+
+def _unpackTables(npz):
+    """Nested dictionaries written by _packTables"""
+    index = json.loads(npz[_INDEX].item())
+    packed = dict((name, npz[name]) for name in npz.files if name != _INDEX)
+    tables = {}
+    for path, kind, name, shape, offset in index:
+        if name is None:
+            value = offset
+            if kind == "array":
+                value = numpy.array(value)
+        else:
+            size = int(numpy.prod(shape))
+            array = packed[name][offset:offset + size].reshape(shape)
+            if kind == "list":
+                value = array.tolist()
+            elif array.ndim == 0:
+                value = array.item()
+            else:
+                value = array
+        ddict = tables
+        for subkey in path[:-1]:
+            ddict = ddict.setdefault(subkey, {})
+        ddict[path[-1]] = value
+    return tables
+
+
+class DiskCache(object):
+    """Dictionaries of numpy arrays stored in a directory
+    """
+
+    def __init__(self, directory, prefix=""):
+        """
+        :param str directory: created when it does not exist
+        :param str prefix: file name prefix of the entries
+        """
+        self.directory = directory
+        self.prefix = prefix
+
+    def filename(self, key):
+        return os.path.join(self.directory, self.prefix + key + ".npz")
+
+    def __contains__(self, key):
+        return os.path.exists(self.filename(key))
+
+    def load(self, key):
+        """
+        :param str key:
+        :returns dict or None: None when missing or unreadable
+        """
+        filename = self.filename(key)
+        if not os.path.exists(filename):
+            return None
+        try:
+            with numpy.load(filename, allow_pickle=False) as npz:
+                return {name: npz[name] for name in npz.files}
+        except Exception as e:
+            _logger.warning("Ignoring corrupted cache file %s (%s)",
+                            filename, e)
+            return None
+
+    def save(self, key, ddict):
+        """
+        :param str key:
+        :param dict ddict: numpy arrays (or objects convertible to them)
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                numpy.savez_compressed(f, **ddict)
+            os.replace(tmpname, self.filename(key))
+        except Exception:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+            raise
+
+    def loadTables(self, key):
+        """
+        :param str key:
+        :returns dict or None: None when missing or unreadable
+        """
+        filename = self.filename(key)
+        if not os.path.exists(filename):
+            return None
+        try:
+            with numpy.load(filename, allow_pickle=False) as npz:
+                return _unpackTables(npz)
+        except Exception as e:
+            _logger.warning("Ignoring corrupted cache file %s (%s)",
+                            filename, e)
+            return None
+
+    def saveTables(self, key, tables):
+        """
+        :param str key:
+        :param dict tables: nested dictionaries of numpy arrays, scalars
+                            and lists
+        """
+        ddict = _packTables(tables)
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                numpy.savez(f, **ddict)
+            os.replace(tmpname, self.filename(key))
+        except Exception:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+            raise
+
+
+def cachedTables(prefix, filenames, build, version=0, factory=None):
+    """Tables calculated from data files, stored in the default directory
+    and rebuilt whenever the content of the files changes.
+
+    :param str prefix: name of the cache entry
+    :param list filenames: source files
+    :param callable build: returns the nested dictionaries of tables
+    :param version: changes with the layout of the tables
+    :param callable factory: returns an empty mapping of the type returned
+                             by build, filled with the cached tables
+                             (dict by default)
+    :returns Mapping: of the same type whether the cache is used or not
+    """
+    directory = defaultDirectory()
+    if directory is None:
+        return build()
+    cache = DiskCache(directory, prefix=prefix + "_")
+    try:
+        key = hashKey(_TABLES_FORMAT, version, fileChecksum(*filenames))
+    except Exception as e:
+        _logger.warning("Cannot checksum %s data (%s)", prefix, e)
+        return build()
+    tables = cache.loadTables(key)
+    if tables is None:
+        tables = build()
+        try:
+            cache.saveTables(key, tables)
+        except Exception as e:
+            _logger.warning("Cannot cache %s data in %s (%s)",
+                            prefix, directory, e)
+        return tables
+    result = {} if factory is None else factory()
+    result.update(tables)
+    return result
@@ -0,0 +1,232 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Bounded memoization of expensive functions.
+
+Results are kept pickled, so that every call returns an independent copy and
+the memory used by the cache is known. The least recently used results are
+evicted first. Results can also be stored in a DiskCache directory to be
+reused by other processes.
+"""
+import pickle
+import logging
+import hashlib
+import functools
+import threading
+import collections
+import numpy
+from PyMca5.PyMcaMisc import DiskCache
+
+_logger = logging.getLogger(__name__)
+
+
+class LRUCache(object):
+    """Pickled objects indexed by hash keys"""
+
+    def __init__(self, maxsize=1024, maxbytes=64 * 1024 * 1024,
+                 directory=None):
+        """
+        :param int maxsize: maximal number of entries in memory
+        :param int maxbytes: maximal size of the entries in memory
+        :param str directory: optional persistence of the entries
+        """
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self._nbytes = 0
+        self._disk = None
+        self.enabled = True
+        self.configure(maxsize=maxsize, maxbytes=maxbytes,
+                       directory=directory)
+        self.resetCounters()
+
+    def configure(self, maxsize=None, maxbytes=None, directory=None):
+        """Parameters which are None are not changed. An empty directory
+        disables the persistence.
+        """
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if maxbytes is not None:
+                self.maxbytes = maxbytes
+            if directory is not None:
+                if directory:
+                    self._disk = DiskCache.DiskCache(directory,
+                                                     prefix="memo_")
+                else:
+                    self._disk = None
+            self._evict()
+
+    @property
+    def directory(self):
+        if self._disk is None:
+            return None
+        return self._disk.directory
+
+    def resetCounters(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.diskhits = 0
+            self.evictions = 0
+
+    def info(self):
+        """
+        :returns dict: counters, number of entries and their size in bytes
+        """
+        with self._lock:
+            return {"hits": self.hits,
+                    "misses": self.misses,
+                    "diskhits": self.diskhits,
+                    "evictions": self.evictions,
+                    "entries": len(self._entries),
+                    "nbytes": self._nbytes}
+
+    def clear(self):
+        """Remove the entries in memory (not those on disk)"""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        :param str key:
+        :returns tuple: (found, value)
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if data is None:
+            data = self._load(key)
+            if data is None:
+                with self._lock:
+                    self.misses += 1
+                return False, None
+            with self._lock:
+                self.diskhits += 1
+                self._insert(key, data)
+        return True, pickle.loads(data)
+
+    def put(self, key, value):
+        """
+        :param str key:
+        :param value: any object that can be pickled
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._insert(key, data)
+        self._save(key, data)
+
+    def _insert(self, key, data):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._nbytes -= len(previous)
+        self._entries[key] = data
+        self._nbytes += len(data)
+        self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.maxsize or
+                                 self._nbytes > self.maxbytes):
+            key, data = self._entries.popitem(last=False)
+            self._nbytes -= len(data)
+            self.evictions += 1
+
+    def _load(self, key):
+        disk = self._disk
+        if disk is None:
+            return None
+        ddict = disk.load(key)
+        if ddict is None or "pickle" not in ddict:
+            return None
+        return ddict["pickle"].tobytes()
+
+    def _save(self, key, data):
+        disk = self._disk
+        if disk is None:
+            return
+        try:
+            disk.save(key, {"pickle": numpy.frombuffer(data,
+                                                       dtype=numpy.uint8)})
+        except Exception as e:
+            _logger.warning("Cannot write cache file in %s (%s)",
+                            disk.directory, e)
+
+
+def memoized(cache, key=None, condition=None):
+    """Decorator storing the results of a function in a LRUCache.
+
+    The key is a digest of the pickled arguments, so they must be
+    picklable and equal arguments must pickle identically (dictionaries
+    with the same items inserted in a different order give a miss).
+    The function is simply called when the cache is disabled or when the
+    arguments cannot be pickled.
+
+    :param LRUCache cache:
+    :param callable key: optional function of the arguments returning
+                         additional objects the result depends on
+    :param callable condition: optional function of the arguments returning
+                               False for calls too cheap to be worth the
+                               key calculation
+    """
+    def decorator(func):
+        name = func.__module__ + "." + func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not cache.enabled:
+                return func(*args, **kwargs)
+            if condition is not None and not condition(*args, **kwargs):
+                return func(*args, **kwargs)
+            objects = [name, args, sorted(kwargs.items())]
+            if key is not None:
+                objects.append(key(*args, **kwargs))
+            try:
+                data = pickle.dumps(objects, protocol=4)
+            except Exception:
+                _logger.debug("%s: arguments cannot be pickled", name)
+                return func(*args, **kwargs)
+            hkey = hashlib.sha1(data).hexdigest()
+            found, result = cache.get(hkey)
+            if not found:
+                result = func(*args, **kwargs)
+                cache.put(hkey, result)
+            return result
+        wrapper.cache = cache
+        return wrapper
+    return decorator
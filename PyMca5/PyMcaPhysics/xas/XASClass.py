@@ -35,8 +35,10 @@
 __license__ = "MIT"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 import copy
+import collections
 import logging
 import numpy
+import threading
 import time
 from PyMca5.PyMca import XASNormalization
 from PyMca5.PyMca import linalg
@@ -395,38 +397,14 @@ def polspl_test():
     return
 
 
-def postEdge(set2,kmin=None,kmax=None,polDegree=[3,3,3],knots=None, full=False):
+def _postEdgeIntervals(k, kmin=None, kmax=None, polDegree=[3,3,3], knots=None):
     r"""
-        postEdge(set2,kmin=None,kmax=None,polDegree=[3,3,3],knots=None)
-
-     PURPOSE:
-    	This procedure calculates the post edge fit of a xafs spectrum
-
-     INPUTS:
-    	set2: input set of data
-
-     KEYWORD PARAMETERS:
-        kmin the bottom limit for the fit (defaults kmin=0)
-        kmax the upper limit for the fit (defaults max)
-
-     OUTPUTS:
-    	a set with the fit
-
-     MODIFICATION HISTORY:
-     	Written by:	Manuel Sanchez del Rio. ESRF
-    	February, 1993
-        1996-08-13 MSR (srio@esrf.fr) changes wmenu->wmenu2 and
-                   xtext->widget_message
-    	1998-10-01 srio@esrf.fr adapts for delia.
-    	2000-02-12 MSR (srio@esrf.fr) adds Dialog_Parent keyword
-    	2014-12-04 srio@esrf.eu Translated to python
+    Intervals of the post edge spline as used by polspl (1-based arrays)
 
+    :return: xl, xh, nc, nr, xrange1
     """
-    #Note that in/out arrays are numpy way: numpy.array((npoints,2))
-
     xl = numpy.zeros(10)
     xh = numpy.zeros(10)
-    c = numpy.zeros(36)
     nc = numpy.zeros(10, numpy.int32)
     if len(polDegree) > 10:
         _logger.warning("Error: Maximum number of intervals is 10")
@@ -434,7 +412,7 @@ def postEdge(set2,kmin=None,kmax=None,polDegree=[3,3,3],knots=None, full=False):
         polDegree = polDegree[0:9]
 
     x1 = 0.0 # set2[:,0].min()
-    x2 = set2[:,0].max()
+    x2 = numpy.max(k)
 
     if kmin != None:
         x1 = kmin
@@ -480,6 +458,41 @@ def postEdge(set2,kmin=None,kmax=None,polDegree=[3,3,3],knots=None, full=False):
             xl[i+1] = knots[i]
             xh[i]   = xl[i+1]
 
+    return xl, xh, nc, nr, xrange1
+
+def postEdge(set2,kmin=None,kmax=None,polDegree=[3,3,3],knots=None, full=False):
+    r"""
+        postEdge(set2,kmin=None,kmax=None,polDegree=[3,3,3],knots=None)
+
+     PURPOSE:
+    	This procedure calculates the post edge fit of a xafs spectrum
+
+     INPUTS:
+    	set2: input set of data
+
+     KEYWORD PARAMETERS:
+        kmin the bottom limit for the fit (defaults kmin=0)
+        kmax the upper limit for the fit (defaults max)
+
+     OUTPUTS:
+    	a set with the fit
+
+     MODIFICATION HISTORY:
+     	Written by:	Manuel Sanchez del Rio. ESRF
+    	February, 1993
+        1996-08-13 MSR (srio@esrf.fr) changes wmenu->wmenu2 and
+                   xtext->widget_message
+    	1998-10-01 srio@esrf.fr adapts for delia.
+    	2000-02-12 MSR (srio@esrf.fr) adds Dialog_Parent keyword
+    	2014-12-04 srio@esrf.eu Translated to python
+
+    """
+    #Note that in/out arrays are numpy way: numpy.array((npoints,2))
+    xl, xh, nc, nr, xrange1 = _postEdgeIntervals(set2[:, 0], kmin=kmin,
+                                                 kmax=kmax,
+                                                 polDegree=polDegree,
+                                                 knots=knots)
+
     #
     # select only points in selected interval
     #
@@ -540,6 +553,163 @@ def postEdge0(k, mu, kmin=None, kmax=None, degrees=(3, 3, 3), knots=None, full=F
     set0[:, 1] = mu
     return postEdge(set0, kmin, kmax, degrees, knots=knots, full=full)
 
+def _polsplMatrices(x, xl, xh, nr, nc):
+    r"""
+    Linear operator equivalent to polspl with uniform weights: the
+    coefficients fitted to any ordinate y are c[1:] = numpy.dot(p, y)
+
+    The normal equations of each interval and the knot constraints
+    (continuity of the function and of its first derivative) are assembled
+    as in polspl. The Lagrange system is solved once for all the possible
+    ordinates.
+
+    :param x: abscissas (0-based)
+    :return: p array (ncoefficients, npoints)
+    """
+    xl = numpy.array(xl, dtype=numpy.float64)
+    xh = numpy.array(xh, dtype=numpy.float64)
+    swap = xl[1:nr+1] > xh[1:nr+1]
+    xl[1:nr+1][swap], xh[1:nr+1][swap] = xh[1:nr+1][swap], xl[1:nr+1][swap]
+    xl[nr+1] = 0.
+    xh[nr+1] = 0.
+    nc = [int(nc[i]) for i in range(nr+1)]
+    nbs = numpy.cumsum([0] + nc[1:])
+    ncoef = nbs[-1]
+    nconstraints = 2 * (nr - 1)
+    n = ncoef + nconstraints
+    powers = numpy.ones((max(nc), x.size))
+    for i in range(1, powers.shape[0]):
+        powers[i] = powers[i-1] * x
+    a = numpy.zeros((n, n))
+    rhs = numpy.zeros((n, x.size))
+    xk = numpy.zeros(nr+1)
+    for ibl in range(1, nr+1):
+        xk[ibl] = .5 * (xh[ibl] + xl[ibl+1])
+        if (xl[ibl] > xl[ibl+1]):
+            xk[ibl] = .5 * (xl[ibl] + xh[ibl+1])
+        ns, ne = nbs[ibl-1], nbs[ibl]
+        idx = (x >= xl[ibl]) & (x <= xh[ibl])
+        df = powers[:nc[ibl], idx]
+        a[ns:ne, ns:ne] = numpy.dot(df, df.T)
+        rhs[ns:ne, idx] = df
+    for ik in range(1, nr):
+        ncol = ncoef + 2 * (ik - 1)
+        for ibl, sign in [(ik, -1.0), (ik + 1, 1.0)]:
+            ns = nbs[ibl-1]
+            for i in range(nc[ibl]):
+                # function
+                a[ns+i, ncol] = sign * pow(xk[ik], i)
+                # first derivative
+                if i:
+                    a[ns+i, ncol+1] = sign * i * pow(xk[ik], i - 1)
+        a[ncol:ncol+2, :ncoef] = a[:ncoef, ncol:ncol+2].T
+    return numpy.linalg.solve(a, rhs)[:ncoef]
+
+def _polsplEvaluationMatrix(x, xl, xh, nr, nc):
+    r"""
+    Matrix e (npoints, ncoefficients) such that numpy.dot(e, c[1:]) is the
+    spline evaluated as in polspl_evaluate, as well as the mask of the
+    evaluated points.
+    """
+    xl = numpy.array(xl, dtype=numpy.float64)
+    xh = numpy.array(xh, dtype=numpy.float64)
+    xl[1] = numpy.min(x)
+    xh[nr] = numpy.max(x)
+    nc = [int(nc[i]) for i in range(nr+1)]
+    nbs = numpy.cumsum([0] + nc[1:])
+    e = numpy.zeros((x.size, nbs[-1]))
+    evaluated = numpy.zeros(x.size, dtype=bool)
+    evaluated[0] = True
+    for i in range(nc[1]):
+        e[0, i] = pow(x[0], i)
+    for j in range(1, nr+1):
+        idx = (x > xl[j]) & (x <= xh[j])
+        e[idx] = 0.0
+        for i in range(nc[j]):
+            e[idx, nbs[j-1] + i] = pow(x[idx], i)
+        evaluated |= idx
+    return e, evaluated
+
+_POST_EDGE_CACHE = collections.OrderedDict()
+_POST_EDGE_CACHE_SIZE = 16
+_POST_EDGE_CACHE_LOCK = threading.Lock()
+
+def _postEdgeOperators(k, kmin=None, kmax=None, polDegree=[3,3,3], knots=None):
+    r"""
+    Cached linear operators of the post edge spline fit on the abscissas k
+
+    :return: dictionary with the fit operator "Fit" (npoints, nfitpoints),
+             the indices of the fitted points "Fitted", the mask of the
+             evaluated points "Evaluated", the knots abscissas "KnotsX"
+             and their operator "KnotsY" (nknots, nfitpoints)
+    """
+    k = numpy.asarray(k, dtype=numpy.float64)
+    key = (k.tobytes(), kmin, kmax, tuple(polDegree),
+           None if knots is None else tuple(knots))
+    with _POST_EDGE_CACHE_LOCK:
+        ddict = _POST_EDGE_CACHE.get(key)
+        if ddict is not None:
+            _POST_EDGE_CACHE.move_to_end(key)
+            return ddict
+    xl, xh, nc, nr, xrange1 = _postEdgeIntervals(k, kmin=kmin, kmax=kmax,
+                                                 polDegree=polDegree,
+                                                 knots=knots)
+    fitted = numpy.nonzero((k >= xrange1[0]) & (k <= xrange1[1]))[0]
+    p = _polsplMatrices(k[fitted], xl, xh, nr, nc)
+    e, evaluated = _polsplEvaluationMatrix(k, xl, xh, nr, nc)
+    xNodes = numpy.array(xh[1:nr], dtype=numpy.float32)
+    # the knots are evaluated with the polynomial of their lower interval
+    nodes = numpy.zeros((nr - 1, p.shape[0]))
+    nbs = numpy.cumsum([0] + [int(x) for x in nc[1:nr+1]])
+    for j in range(1, nr):
+        for i in range(nc[j]):
+            nodes[j-1, nbs[j-1] + i] = pow(xh[j], i)
+    ddict = {"Fit": numpy.dot(e, p),
+             "Fitted": fitted,
+             "Evaluated": evaluated,
+             "KnotsX": xNodes,
+             "KnotsY": numpy.dot(nodes, p)}
+    # the operators are calculated outside the lock: threads missing the
+    # same key at once store equal results
+    with _POST_EDGE_CACHE_LOCK:
+        _POST_EDGE_CACHE[key] = ddict
+        while len(_POST_EDGE_CACHE) > _POST_EDGE_CACHE_SIZE:
+            _POST_EDGE_CACHE.popitem(last=False)
+    return ddict
+
+def postEdgeMultiple(k, mu, kmin=None, kmax=None, polDegree=[3,3,3],
+                     knots=None, full=False):
+    r"""
+    Post edge fit of several spectra sharing the same k values.
+
+    The constrained spline fit is linear in the data, so the fitting
+    operator is calculated once (and cached) for the k grid, the limits
+    and the knots. The result is equivalent to calling postEdge for each
+    spectrum.
+
+    :param k: 1D array of k values
+    :param mu: 2D array (nspectra, npoints) or 1D array of spectra
+    :param kmin: the bottom limit for the fit (defaults kmin=0)
+    :param kmax: the upper limit for the fit (defaults max)
+    :param polDegree: degrees of the polynomials
+    :param knots: knots between the polynomials
+    :param full: also return the knots
+    :return: fit (nspectra, npoints) and, if full, the knot abscissas
+             (nknots,) and ordinates (nspectra, nknots)
+    """
+    operators = _postEdgeOperators(k, kmin=kmin, kmax=kmax,
+                                   polDegree=polDegree, knots=knots)
+    mu = numpy.asarray(mu, dtype=numpy.float64)
+    fitted = numpy.take(mu, operators["Fitted"], axis=-1)
+    fit = numpy.dot(fitted, operators["Fit"].T)
+    if not operators["Evaluated"].all():
+        fit[..., ~operators["Evaluated"]] = 0.0
+    if full:
+        yNodes = numpy.dot(fitted, operators["KnotsY"].T).astype(numpy.float32)
+        return fit, operators["KnotsX"], yNodes
+    else:
+        return fit
+
 def getFTWindowWeights(tk, window="Gaussian", windpar=0.2, wrange=None):
 
     r"""
@@ -681,59 +851,96 @@ def getFT(k, exafs, npoints=2048, rrange=(0.0, 7.0),
         setFT = exex.fastftr(set3,npoint=npoints,rrange=[0.,7.],kstep=0.02)
 
 
+    interpolatedDataX, interpolatedDataY = getFTSignal(k, exafs,
+                                                       npoints=npoints,
+                                                       kstep=kstep,
+                                                       kweight=kweight,
+                                                       wweights=wweights)
+    fourier = getFTMultiple(interpolatedDataY, npoints=npoints,
+                            rrange=rrange, kstep=kstep)[0]
+    f10 = fourier[:, 0]
+    f11 = fourier[:, 1]
+    f12 = fourier[:, 2]
+    f13 = fourier[:, 3]
+    #print("OK = ", numpy.allclose(fourier, setFT))
+    ddict = {}
+    ddict["Set"] = fourier
+    ddict["InterpolatedK"] = interpolatedDataX
+    ddict["InterpolatedSignal"] = interpolatedDataY
+    ddict["KWeight"] = kweight
+    ddict["K"] = k
+    ddict["WindowWeight"] = wweights
+    ddict["FTRadius"] = f10
+    ddict["FTIntensity"] = f11
+    ddict["FTReal"] = f12
+    ddict["FTImaginary"] = f13
+    return ddict
+
+def getFTSignal(k, exafs, npoints=2048, kstep=0.02, kweight=0, wweights=1.0):
+    r"""
+    Interpolate the weighted EXAFS signal on the regular k grid used by
+    the fast Fourier transform.
+
+    :param k: k values of the signal
+    :param exafs: EXAFS signal
+    :param npoints: Number of points of the k grid
+    :param kstep: Step of the k grid
+    :param kweight: k weight applied to the signal
+    :param wweights: Window weights (see getFTWindowWeights)
+    :return: Interpolated k grid and interpolated signal
+    """
     # ;
     # ; creates the input interpolated values
     # ;
     interpolatedDataX = numpy.linspace(0.0, npoints-1, npoints) * kstep
     interpolatedDataY = numpy.interp( interpolatedDataX , k, wweights * exafs * pow(k, kweight),
                                       left=0.0, right=0.0)
+    return interpolatedDataX, interpolatedDataY
 
+def getFTMultiple(signals, npoints=2048, rrange=(0.0, 7.0), kstep=0.02):
+    r"""
+    Fast Fourier transform of several interpolated signals at once.
+
+    :param signals: Array (nsignals, npoints) or (npoints,) of signals
+                    as returned by getFTSignal
+    :param npoints: Number of points of the k grid
+    :param rrange: Interval in r of the results
+    :param kstep: Step of the k grid
+    :return: Array (nsignals, nr, 4) with r, modulus, real and imaginary part
+    """
+    signals = numpy.asarray(signals)
+    if len(signals.shape) == 1:
+        signals = signals.reshape(1, -1)
     # ; calculates the fft and generates the conjugated variable (rr)
 
-    ff = numpy.fft.ifft(interpolatedDataY)
+    ff = numpy.fft.ifft(signals, axis=-1)
     rstep = numpy.pi / npoints / kstep
     rr = numpy.linspace(0.0, npoints-1, npoints) * rstep
 
-
     # ;
     # ; prepare the results
     # ;
 
     coef = npoints * kstep / numpy.sqrt(numpy.pi) * numpy.sqrt(2.)
-    f12 = coef*numpy.real(ff)             # real part of fft
-    f13 = coef*numpy.imag(ff)*(-1.)       # imaginary part of fft
 
     # ;
     # ; cut the results to the selected interval in r (rrange)
     # ;
 
     goodi = (rr  >= rrange[0]) & (rr  <= rrange[1])
-    f13 = f13[goodi]
-    f12 = f12[goodi]
-    f10 = rr[goodi]
-    f11 = numpy.sqrt( f12*f12 + f13*f13)
+    ff = ff[:, goodi]
+    f12 = coef*numpy.real(ff)             # real part of fft
+    f13 = coef*numpy.imag(ff)*(-1.)       # imaginary part of fft
 
     # ;
     # ; define the result array
     # ;
-    fourier = numpy.zeros((len(f10),4))
-    fourier[:,0] = f10
-    fourier[:,1] = f11
-    fourier[:,2] = f12
-    fourier[:,3] = f13
-    #print("OK = ", numpy.allclose(fourier, setFT))
-    ddict = {}
-    ddict["Set"] = fourier
-    ddict["InterpolatedK"] = interpolatedDataX
-    ddict["InterpolatedSignal"] = interpolatedDataY
-    ddict["KWeight"] = kweight
-    ddict["K"] = k
-    ddict["WindowWeight"] = wweights
-    ddict["FTRadius"] = f10
-    ddict["FTIntensity"] = f11
-    ddict["FTReal"] = f12
-    ddict["FTImaginary"] = f13
-    return ddict
+    fourier = numpy.zeros((signals.shape[0], f12.shape[1], 4))
+    fourier[:, :, 0] = rr[goodi]
+    fourier[:, :, 1] = numpy.sqrt( f12*f12 + f13*f13)
+    fourier[:, :, 2] = f12
+    fourier[:, :, 3] = f13
+    return fourier
 
 def getBackFT(fourier,npoint=4096,krange=[2.0,12.0],rstep=None,rmin=None,rmax=None):
     r"""
@@ -1079,7 +1286,57 @@ def setSpectrum(self, energy, mu, units=None, sanitize=True):
         self._units = units
         self._equidistant = equidistant
 
-    def processSpectrum(self):
+    def processSpectrum(self, fourierTransform=True):
+        """
+        :param bool fourierTransform: when False, ddict["FT"] only contains
+                                      the interpolated signal to be
+                                      transformed (see getFTMultiple)
+        """
+        ddict = self._processUntilPostEdge()
+        ddict.update(self.postEdge(ddict["EXAFSKValues"],
+                                   ddict["EXAFSSignal"]))
+        return self._processFromPostEdge(ddict,
+                                         fourierTransform=fourierTransform)
+
+    def processMultipleSpectra(self, energy, spectra, fourierTransform=True):
+        """
+        Process several spectra sharing the same energy values. The post
+        edge of spectra with the same k values (same edge energy) is
+        fitted at once (see postEdgeMultiple).
+
+        :param energy: 1D array
+        :param spectra: 2D array (nspectra, npoints)
+        :param bool fourierTransform: see processSpectrum
+        :return list: dictionary of each spectrum as returned by
+                      processSpectrum
+        """
+        results = []
+        for mu in spectra:
+            self.setSpectrum(energy, mu)
+            results.append(self._processUntilPostEdge())
+        groups = collections.OrderedDict()
+        for ddict in results:
+            key = ddict["EXAFSKValues"].tobytes()
+            groups.setdefault(key, []).append(ddict)
+        for group in groups.values():
+            k = group[0]["EXAFSKValues"]
+            if len(group) == 1:
+                group[0].update(self.postEdge(k, group[0]["EXAFSSignal"]))
+                continue
+            mu = numpy.array([ddict["EXAFSSignal"] for ddict in group])
+            postEdge = self.postEdgeMultiple(k, mu)
+            for i, ddict in enumerate(group):
+                ddict.update(postEdge)
+                ddict["PostEdgeK"] = k
+                ddict["PostEdgeB"] = postEdge["PostEdgeB"][i]
+                ddict["KnotsY"] = postEdge["KnotsY"][i]
+        return [self._processFromPostEdge(ddict,
+                                          fourierTransform=fourierTransform)
+                for ddict in results]
+
+    def _processUntilPostEdge(self):
+        """Normalization and k values of the current spectrum
+        """
         e0 = self.calculateE0()
         ddict = self.normalize()
         """
@@ -1091,9 +1348,15 @@ def processSpectrum(self):
         """
         ddict["Energy"] = self._energy
         ddict["Mu"] = self._mu
-        cleanMu = self._mu - ddict["NormalizedBackground"]
-        kValues = e2k(self._energy - e0)
-        ddict.update(self.postEdge(kValues, cleanMu))
+        ddict["EXAFSSignal"] = self._mu - ddict["NormalizedBackground"]
+        ddict["EXAFSKValues"] = e2k(self._energy - e0)
+        return ddict
+
+    def _processFromPostEdge(self, ddict, fourierTransform=True):
+        """EXAFS signal and Fourier transform once the post edge is known
+        """
+        cleanMu = ddict["EXAFSSignal"]
+        kValues = ddict["EXAFSKValues"]
 
         dataSet = numpy.zeros((cleanMu.size, 2), numpy.float64)
         dataSet[:, 0] = kValues
@@ -1102,8 +1365,6 @@ def processSpectrum(self):
         # normalization
         exafs = (cleanMu - ddict["PostEdgeB"]) / ddict["PostEdgeB"]
         ddict["EXAFSEnergy"] = k2e(kValues)
-        ddict["EXAFSKValues"] = kValues
-        ddict["EXAFSSignal"] = cleanMu
         if ddict["KWeight"]:
             exafs *= pow(kValues, ddict["KWeight"])
         ddict["EXAFSNormalized"] = exafs
@@ -1127,7 +1388,9 @@ def processSpectrum(self):
             #setFT = getFT(set2[:,0], set2[:, 1], npoints=2048,
             #                    krange=(ddict["KMin"], ddict["KMax"]),\
             #                    rrange=[0.,7.],kstep=0.02)
-            setFT = self.fourierTransform(set2[:,0], set2[:, 1], kMin=ddict["KMin"], kMax=ddict["KMax"])
+            setFT = self.fourierTransform(set2[:,0], set2[:, 1],
+                                          kMin=ddict["KMin"], kMax=ddict["KMax"],
+                                          transform=fourierTransform)
         ddict["FT"] = setFT
 
         if 0:
@@ -1137,7 +1400,8 @@ def processSpectrum(self):
         return ddict
 
 
-    def fourierTransform(self, k, mu, kMin=None, kMax=None, backend=None):
+    def fourierTransform(self, k, mu, kMin=None, kMax=None, backend=None,
+                         transform=True):
         if backend not in [None, "Default", "DefaultBackend"]:
             raise ValueError("Only default backend implemented")
         else:
@@ -1152,14 +1416,73 @@ def fourierTransform(self, k, mu, kMin=None, kMax=None, backend=None):
             kRange = [kMin, kMax]
         else:
             kRange = [max(kRange[0], kMin), min(kRange[1], kMax)]
-        return getFT(k, mu, npoints=config["Points"],
-                     krange=kRange,\
-                     window=config.get("Window", "Gaussian"),
-                     apodization=config.get("WindowApodization", 0.02),
-                     rrange=config["Range"],
-                     kstep=config["KStep"])
+        if transform:
+            return getFT(k, mu, npoints=config["Points"],
+                         krange=kRange,\
+                         window=config.get("Window", "Gaussian"),
+                         apodization=config.get("WindowApodization", 0.02),
+                         rrange=config["Range"],
+                         kstep=config["KStep"])
+        # only the signal to be transformed by getFTMultiple
+        idx = (k >= kRange[0]) & (k <= kRange[1])
+        k = k[idx]
+        wweights = getFTWindowWeights(k,
+                                      window=config.get("Window", "Gaussian"),
+                                      windpar=config.get("WindowApodization", 0.02),
+                                      wrange=kRange)
+        interpolatedDataX, interpolatedDataY = getFTSignal(k, mu[idx],
+                                                npoints=config["Points"],
+                                                kstep=config["KStep"],
+                                                wweights=wweights)
+        ddict = {}
+        ddict["InterpolatedK"] = interpolatedDataX
+        ddict["InterpolatedSignal"] = interpolatedDataY
+        ddict["KWeight"] = 0
+        ddict["K"] = k
+        ddict["WindowWeight"] = wweights
+        return ddict
 
     def postEdge(self, k, mu, backend=None):
+        kMin, kMax, kWeight, orders, knots = \
+                            self._postEdgeParameters(k, backend=backend)
+        fit0, xNodes, yNodes = postEdge0(k, mu, kMin, kMax,
+                         orders,
+                         knots=knots, full=True)
+        ddict = {}
+        ddict["PostEdgeK"] = fit0[:, 0]
+        ddict["PostEdgeB"] = fit0[:, 1]
+        ddict["KnotsX"] = xNodes
+        ddict["KnotsY"] = yNodes
+        ddict["KMin"] = kMin
+        ddict["KMax"] = kMax
+        ddict["KWeight"] = kWeight
+        # TODO: add polynomials?
+        return ddict
+
+    def postEdgeMultiple(self, k, mu, backend=None):
+        """
+        Post edge of several spectra sharing the same k values
+
+        :param k: 1D array of k values
+        :param mu: 2D array (nspectra, npoints)
+        :return: dictionary as returned by postEdge with PostEdgeB and
+                 KnotsY of shape (nspectra, ...)
+        """
+        kMin, kMax, kWeight, orders, knots = \
+                            self._postEdgeParameters(k, backend=backend)
+        fit, xNodes, yNodes = postEdgeMultiple(k, mu, kMin, kMax, orders,
+                                               knots=knots, full=True)
+        ddict = {}
+        ddict["PostEdgeK"] = k
+        ddict["PostEdgeB"] = fit
+        ddict["KnotsX"] = xNodes
+        ddict["KnotsY"] = yNodes
+        ddict["KMin"] = kMin
+        ddict["KMax"] = kMax
+        ddict["KWeight"] = kWeight
+        return ddict
+
+    def _postEdgeParameters(self, k, backend=None):
         if backend not in [None, "Default", "DefaultBackend"]:
             raise ValueError("Only default backend implemented")
         else:
@@ -1185,19 +1508,7 @@ def postEdge(self, k, mu, backend=None):
             knots = config["Knots"]["Values"]
             if not hasattr(knots, "__len__"):
                 knots = [knots]
-        fit0, xNodes, yNodes = postEdge0(k, mu, kMin, kMax,
-                         config["Knots"]["Orders"],
-                         knots=knots, full=True)
-        ddict = {}
-        ddict["PostEdgeK"] = fit0[:, 0]
-        ddict["PostEdgeB"] = fit0[:, 1]
-        ddict["KnotsX"] = xNodes
-        ddict["KnotsY"] = yNodes
-        ddict["KMin"] = kMin
-        ddict["KMax"] = kMax
-        ddict["KWeight"] = kWeight
-        # TODO: add polynomials?
-        return ddict
+        return kMin, kMax, kWeight, config["Knots"]["Orders"], knots
 
     def calculateE0(self, energy=None, mu=None, backend=None):
         self._lastE0CalculationDict = None
@@ -40,6 +40,7 @@
 import logging
 from PyMca5.PyMca import XASClass
 from PyMca5.PyMcaIO import ConfigDict
+from PyMca5.PyMcaMisc import ExecutorUtils
 import time
 
 
@@ -47,6 +48,9 @@
 
 
 class XASStackBatch(object):
+    # approximate number of spectra processed as a block
+    _blockSpectra = 1000
+
     def __init__(self, analyzer=None):
         if analyzer is None:
             analyzer = XASClass.XASClass()
@@ -74,13 +78,25 @@ def processMultipleSpectra(self, x, y,
                                mask=None,
                                directory=None,
                                name=None,
-                               entry=None):
+                               entry=None,
+                               nworkers=None,
+                               executor=None,
+                               compression=None):
         """
         This method performs the actual work.
 
+        The spectra are processed in blocks of rows. The Fourier transforms
+        of a block are calculated at once and each block is written to the
+        (chunked) output datasets in a single operation.
+
         :param x: 1D array containing the x axis (usually the channels) of the spectra.
         :param y: 3D array containing the spectra as [nrows, ncolumns, nchannels]
         :param weight: 0 Means no weight, 1 Use an average weight, 2 Individual weights (slow)
+        :param int nworkers: number of blocks processed in parallel
+                             (None or 1: serial, 0: one per CPU)
+        :param executor: 'process' (default), 'thread' or
+                         concurrent.futures.Executor (not shut down afterwards)
+        :param compression: compression of the output datasets (e.g. "gzip")
         :return: A dictionary with the results as keys.
         """
 
@@ -102,7 +118,7 @@ def processMultipleSpectra(self, x, y,
         #weightPolicy = 2 # individual pixel weights (slow)
         if hasattr(x, "value"):
             # hdf5 dataset
-            x = x.value
+            x = x[()]
 
         if hasattr(y, "info") and hasattr(y, "data"):
             data = y.data
@@ -196,62 +212,62 @@ def processMultipleSpectra(self, x, y,
         e0 = out.require_dataset(e0Path,
                                  shape=data.shape[:-1],
                                  dtype=numpy.float32,
-                                 chunks=None,
-                                 compression=None)
+                                 chunks=True,
+                                 compression=compression)
         jump = out.require_dataset(jumpPath,
                                    shape=data.shape[:-1],
                                    dtype=numpy.float32,
-                                   chunks=None,
-                                   compression=None)
+                                   chunks=True,
+                                   compression=compression)
         shape = list(data.shape[:-1]) + [usedEnergy.size]
         spectrumX = out.require_dataset(spectrumXPath,
                                    shape=[usedEnergy.size],
                                    dtype=numpy.float32,
-                                   chunks=None,
-                                   compression=None)
+                                   chunks=True,
+                                   compression=compression)
         spectrumY = out.require_dataset(spectrumYPath,
                                    shape=shape,
                                    dtype=numpy.float32,
-                                   chunks=None,
-                                   compression=None)
+                                   chunks=True,
+                                   compression=compression)
         shape = list(data.shape[:-1]) + [normalizedSpectrumX.size]
         normalizedX = out.require_dataset(normalizedXPath,
                                    shape=[normalizedSpectrumX.size],
                                    dtype=numpy.float32,
-                                   chunks=None,
-                                   compression=None)
+                                   chunks=True,
+                                   compression=compression)
         normalizedY = out.require_dataset(normalizedYPath,
                                    shape=shape,
                                    dtype=numpy.float32,
-                                   chunks=None,
-                                   compression=None)
+                                   chunks=True,
+                                   compression=compression)
         shape = list(data.shape[:-1]) + [exafsSpectrumX.size]
         exafsX = out.require_dataset(exafsXPath,
                                      shape=[exafsSpectrumX.size],
                                      dtype=numpy.float32,
-                                     chunks=None,
-                                     compression=None)
+                                     chunks=True,
+                                     compression=compression)
         exafsY = out.require_dataset(exafsYPath,
                                      shape=shape,
                                      dtype=numpy.float32,
-                                     chunks=None,
-                                     compression=None)
+                                     chunks=True,
+                                     compression=compression)
         shape = list(data.shape[:-1]) + [xFT.size]
         ftX = out.require_dataset(ftXPath,
                                      shape=[xFT.size],
                                      dtype=numpy.float32,
-                                     chunks=None,
-                                     compression=None)
+                                     chunks=True,
+                                     compression=compression)
         ftY = out.require_dataset(ftYPath,
                                      shape=shape,
                                      dtype=numpy.float32,
-                                     chunks=None,
-                                     compression=None)
+                                     chunks=True,
+                                     compression=compression)
         ftImaginary = out.require_dataset(ftImaginaryPath,
                                      shape=shape,
                                      dtype=numpy.float32,
-                                     chunks=None,
-                                     compression=None)
+                                     chunks=True,
+                                     compression=compression)
         spectrumX[:] = ddict["Energy"]
         normalizedX[:] = ddict["NormalizedEnergy"][normalizedIdx]
         exafsX[:] = ddict["EXAFSKValues"][exafsIdx]
@@ -259,66 +275,120 @@ def processMultipleSpectra(self, x, y,
 
         t0 = time.time()
         totalSpectra = data.shape[0] * data.shape[1]
-        jStep = min(100, data.shape[1])
-        if weightPolicy == 2:
-            SVD = False
-            sigma_b = None
-        elif weightPolicy == 1:
-            # the +1 is to prevent misbehavior due to weights less than 1.0
-            sigma_b = 1 + numpy.sqrt(dummySpectrum)/nPixels
-            SVD = True
-        else:
-            SVD = True
-            sigma_b = None
-        last_svd = None
-        #for i in range(10):
-        for i in range(0, data.shape[0]):
-            #print(i)
-            #chunks of nColumns spectra
-            if i == 0:
-                chunk = numpy.zeros((jStep,
-                                     iXMax-iXMin+1),
-                                     numpy.float64)
-            jStart = 0
-            j = 0
-            while jStart < data.shape[1]:
-                jEnd = min(jStart + jStep, data.shape[1])
-                #chunk[:,:(jEnd - jStart)] = data[i, jStart:jEnd, iXMin:iXMax+1].T
-                spectra  = data[i, jStart:jEnd, iXMin:iXMax+1]
-                nSpectra = spectra.shape[0]
-                for spectrumNumber in range(nSpectra):
-                    if mask is not None:
-                        if mask[i, j] == 0:
-                            continue
-                    self._analyzer.setSpectrum(x, spectra[spectrumNumber])
-                    ddict = self._analyzer.processSpectrum()
-                    spectrumY[i, j] = ddict["Mu"]
-                    e0[i, j] = ddict["Edge"]
-                    jump[i, j] = ddict["Jump"]
-                    #normalizedX[i, j] = ddict["NormalizedEnergy"][normalizedIdx]
-                    normalizedY[i, j] = ddict["NormalizedMu"][normalizedIdx]
-                    #exafsX[i, j] = ddict["EXAFSKValues"][exafsIdx]
-                    exafsY[i, j] = ddict["EXAFSNormalized"][exafsIdx]
-                    #ftX[i, j] = ddict["FT"]["FTRadius"]
-                    ftY[i, j] = ddict["FT"]["FTIntensity"]
-                    ftImaginary[i, j] = ddict["FT"]["FTImaginary"]
-                    j +=1
-                jStart = jEnd
+        rowStep = max(1, self._blockSpectra // data.shape[1])
+        if executor is None:
+            # the processing of a spectrum is mostly python code
+            executor = "process"
+
+        def blocks():
+            for i in range(0, data.shape[0], rowStep):
+                iEnd = min(i + rowStep, data.shape[0])
+                if mask is None:
+                    blockMask = None
+                else:
+                    blockMask = numpy.array(mask[i:iEnd], copy=True)
+                spectra = numpy.array(data[i:iEnd, :, iXMin:iXMax+1],
+                                      dtype=numpy.float64, copy=True)
+                yield (config, x, spectra, blockMask,
+                       normalizedIdx, exafsIdx)
+
+        processedSpectra = 0
+        i = 0
+        with ExecutorUtils.executorContext(nworkers=nworkers,
+                                           executor=executor) as (executor, nworkers):
+            for result in ExecutorUtils.orderedMap(_processBlock, blocks(),
+                                                   executor=executor,
+                                                   nworkers=nworkers):
+                iEnd = i + result["Rows"]
+                processedSpectra += result["Processed"]
+                if not result["Processed"]:
+                    # all spectra masked
+                    i = iEnd
+                    continue
+                spectrumY[i:iEnd] = result["Mu"]
+                e0[i:iEnd] = result["Edge"]
+                jump[i:iEnd] = result["Jump"]
+                normalizedY[i:iEnd] = result["NormalizedMu"]
+                exafsY[i:iEnd] = result["EXAFSNormalized"]
+                ftY[i:iEnd] = result["FTIntensity"]
+                ftImaginary[i:iEnd] = result["FTImaginary"]
+                i = iEnd
         outputDict = {}
         outputDict["names"] = ["Jump", "Edge"]
         output = numpy.zeros((2, e0.shape[0], e0.shape[1]), dtype = e0.dtype)
-        output[0, :] = jump.value
-        output[1, :] = e0.value
+        output[0, :] = jump[()]
+        output[1, :] = e0[()]
         outputDict["images"] = output
         out.flush()
         out.close()
 
         t = time.time() - t0
-        _logger.debug("First fit elapsed = %f", t)
-        _logger.debug("Spectra per second = %f", data.shape[0]*data.shape[1]/float(t))
-        t0 = time.time()
+        if t > 0:
+            _logger.info("Processed %d spectra in %.2f s (%.1f spectra/s)",
+                         processedSpectra, t, processedSpectra / t)
+        outputDict["elapsed"] = t
+        outputDict["spectra"] = processedSpectra
         return outputDict
 
+
+def _processBlock(args):
+    """
+    Process a block of spectra (module level so it can be executed by a
+    process pool).
+
+    :param tuple args: configuration, x, spectra (nRows, nColumns, nChannels),
+                       mask (nRows, nColumns) or None, normalizedIdx, exafsIdx
+    :return dict: output arrays of the block, number of rows and number
+                  of processed spectra
+    """
+    config, x, spectra, mask, normalizedIdx, exafsIdx = args
+    analyzer = XASClass.XASClass()
+    analyzer.setConfiguration(config)
+    ftConfig = analyzer.getConfiguration()["FT"]
+    shape = spectra.shape[:2]
+    nSpectra = shape[0] * shape[1]
+    spectra = spectra.reshape(nSpectra, -1)
+    if mask is None:
+        indices = range(nSpectra)
+    else:
+        indices = numpy.nonzero(mask.reshape(-1))[0]
+    result = {}
+    signals = None
+    # the post edge of spectra with the same edge energy is fitted at once
+    processed = analyzer.processMultipleSpectra(x, spectra[indices],
+                                                fourierTransform=False)
+    for n, (spectrumIndex, ddict) in enumerate(zip(indices, processed)):
+        if signals is None:
+            signals = numpy.zeros((len(indices),
+                                   ddict["FT"]["InterpolatedSignal"].size))
+            for key, size in [("Mu", ddict["Mu"].size),
+                              ("NormalizedMu", normalizedIdx.sum()),
+                              ("EXAFSNormalized", exafsIdx.sum())]:
+                result[key] = numpy.zeros((nSpectra, size), numpy.float32)
+            result["Edge"] = numpy.zeros((nSpectra,), numpy.float32)
+            result["Jump"] = numpy.zeros((nSpectra,), numpy.float32)
+        result["Mu"][spectrumIndex] = ddict["Mu"]
+        result["Edge"][spectrumIndex] = ddict["Edge"]
+        result["Jump"][spectrumIndex] = ddict["Jump"]
+        result["NormalizedMu"][spectrumIndex] = ddict["NormalizedMu"][normalizedIdx]
+        result["EXAFSNormalized"][spectrumIndex] = ddict["EXAFSNormalized"][exafsIdx]
+        signals[n] = ddict["FT"]["InterpolatedSignal"]
+    if signals is None:
+        # all spectra masked
+        return {"Rows": shape[0], "Processed": 0}
+    fourier = XASClass.getFTMultiple(signals,
+                                     npoints=ftConfig["Points"],
+                                     rrange=ftConfig["Range"],
+                                     kstep=ftConfig["KStep"])
+    for key, column in [("FTIntensity", 1), ("FTImaginary", 3)]:
+        result[key] = numpy.zeros((nSpectra, fourier.shape[1]), numpy.float32)
+        result[key][indices] = fourier[:, :, column]
+    for key in result:
+        result[key] = result[key].reshape(shape + result[key].shape[1:])
+    result["Rows"] = shape[0]
+    result["Processed"] = len(indices)
+    return result
+
 if __name__ == "__main__":
     _logger.setLevel(logging.DEBUG)
     analyzer = XASClass.XASClass()
@@ -50,6 +50,85 @@
 CONTINUUM_LIST = [None,'Constant','Linear','Parabolic','Linear Polynomial','Exp. Polynomial']
 OLDESCAPE = 0
 MAX_ATTENUATION = 1.0E-300
+# FWHM**2 = noise**2 + fano * FANO_FACTOR * energy
+FANO_FACTOR = 2.3548*2.3548*0.00385
+_SQRT2 = numpy.sqrt(2.0)
+_SQRTPI = numpy.sqrt(numpy.pi)
+_SQRT2PI = numpy.sqrt(2.0 * numpy.pi)
+_TOSIGMA = 1.0 / (2.0 * numpy.sqrt(2.0 * numpy.log(2.0)))
+
+
+def _peakDerivatives(peaks, energy, hypermet, fwhmWeights, blocksize=32):
+    """
+    Derivatives of a sum of peaks (peak table of SpecfitFuns.fastahypermet
+    or SpecfitFuns.apvoigt) with respect to the energy and to the FWHM
+    of the peaks.
+
+    :param numpy.ndarray peaks: one row per peak
+    :param numpy.ndarray energy:
+    :param int hypermet: hypermet terms (0 for pseudo-Voigt peaks)
+    :param numpy.ndarray fwhmWeights: shape (nweights, npeaks)
+    :returns tuple: d/dE with the shape of energy, sum over the peaks of
+                    the weighted d/dFWHM with shape (nweights, len(energy))
+    """
+    dE = numpy.zeros(energy.shape, numpy.float64)
+    dW = numpy.zeros((len(fwhmWeights), energy.size), numpy.float64)
+    for i0 in range(0, len(peaks), blocksize):
+        block = peaks[i0:i0+blocksize]
+        area = block[:, 0:1]
+        fwhm = block[:, 2:3]
+        sigma = fwhm * _TOSIGMA
+        z0 = energy[numpy.newaxis, :] - block[:, 1:2]
+        zs = z0 / sigma
+        gauss0 = numpy.exp(-0.5 * zs * zs)
+        if hypermet:
+            dblockE = numpy.zeros(z0.shape, numpy.float64)
+            dsigma = numpy.zeros(z0.shape, numpy.float64)
+            height = area / (sigma * _SQRT2PI)
+            if hypermet & 1:
+                g = height * gauss0 * (0.5 * zs * zs < 100)
+                dblockE -= g * zs / sigma
+                dsigma += g * (zs * zs - 1.0) / sigma
+            for flag, col in [(2, 3), (4, 5)]:
+                if not hypermet & flag:
+                    continue
+                ratio = block[:, col:col+1]
+                slope = block[:, col+1:col+2]
+                valid = (ratio != 0) & (slope != 0)
+                slope = numpy.where(valid, slope, 1.0)
+                u = z0 / (_SQRT2 * sigma) + 0.5 * _SQRT2 * sigma / slope
+                arg = 0.5 * (sigma / slope)**2 + z0 / slope
+                mask = valid & (u < 10) & (numpy.abs(z0 / slope) <= 612)
+                arg = numpy.where(mask, arg, 0.0)
+                tail = 0.5 * SpecfitFuns.erfc(u) * numpy.exp(arg) * mask
+                c = area * ratio / slope
+                g = gauss0 * mask / (_SQRTPI * _SQRT2 * sigma)
+                dblockE += c * (tail / slope - g)
+                dsigma += c * (tail * sigma / (slope * slope) +
+                               g * (zs - sigma / slope))
+            if hypermet & 8:
+                step = block[:, 7:8] * height * (block[:, 7:8] != 0)
+                g = step * gauss0 / (_SQRTPI * _SQRT2 * sigma)
+                dblockE -= g
+                dsigma += g * zs - \
+                          step * 0.5 * SpecfitFuns.erfc(zs / _SQRT2) / sigma
+            dfwhm = dsigma * _TOSIGMA
+        else:
+            eta = block[:, 3:4]
+            # lorentzian term
+            d = fwhm + 4 * z0 * z0 / fwhm
+            lorentz = -eta * area * 2 / (numpy.pi * d * d)
+            dblockE = lorentz * 8 * z0 / fwhm
+            dfwhm = lorentz * (1 - 4 * z0 * z0 / (fwhm * fwhm))
+            # gaussian term
+            g = (1.0 - eta) * area / (sigma * _SQRT2PI) * gauss0 * (zs <= 35)
+            dblockE -= g * zs / sigma
+            dfwhm += g * (zs * zs - 1.0) / sigma * _TOSIGMA
+        dE += dblockE.sum(axis=0)
+        dW += numpy.dot(fwhmWeights[:, i0:i0+blocksize], dfwhm)
+    return dE, dW
+
+
 class McaTheory(object):
     def __init__(self, initdict=None, filelist=None, **kw):
         self.ydata0  = None
@@ -1230,17 +1309,8 @@ def __getselfzz(self):
             if len(anchorslist) == 0:
                 anchorslist = [0, len(ysmooth)-1]
             anchorslist.sort()
-            self.zz = 0.0 * ysmooth
-            lastAnchor = 0
             width = self.config['fit']['snipwidth']
-            for anchor in anchorslist:
-                if (anchor > lastAnchor) and (anchor < len(ysmooth)):
-                    self.zz[lastAnchor:anchor] =\
-                            SpecfitFuns.snip1d(ysmooth[lastAnchor:anchor], width, 0)
-                    lastAnchor = anchor
-            if lastAnchor < len(ysmooth):
-                self.zz[lastAnchor:] =\
-                        SpecfitFuns.snip1d(ysmooth[lastAnchor:], width, 0)
+            self.zz = SpecfitFuns.snipbackground(ysmooth, width, 0, anchorslist)
             self.zz.shape = n, 1
             self.laststripalgorithm  = self.config['fit']['stripalgorithm']
             self.lastsnipwidth       = self.config['fit']['snipwidth']
@@ -1453,14 +1523,75 @@ def mcatheory(self,param0,t0,hypermet=None,continuum=None,summing=None):
         gain = param[1]
         energy=zero + gain * x
         #print energy
-        noise= param[2] * param[2]
-        fano = param[3] * 2.3548*2.3548*0.00385
         #t=time.time()
+        PEAKSW = self.PEAKSW
+        FASTER = self.FASTER
+        self.__fillPeakTables(param, hypermet, PEAKSW)
+        if not FASTER:
+            print("not FASTER")
+            for i in range(len(PEAKSW)):
+                #if HYPERMET:
+                if hypermet:
+                    if i == 0:
+                        result = SpecfitFuns.ahypermet(PEAKSW[i],energy,hypermet)
+                    else:
+                        result += SpecfitFuns.ahypermet(PEAKSW[i],energy,hypermet)
+                else:
+                    if i == 0:
+                        result = SpecfitFuns.apvoigt(PEAKSW[i],energy)
+                    else:
+                        result += SpecfitFuns.apvoigt(PEAKSW[i],energy)
+        #print PARAMETERS[self.NGLOBAL+4]
+        #print self.PEAKS0NAMES[4]
+        #print PEAKSW[4]
+        #print "loop takes ",time.time()-t
+        #loop takes 0.006 seconds
+        #t=time.time()
+        if FASTER:
+            if len(PEAKSW[:]):
+                a=numpy.concatenate(PEAKSW[:])
+                #t=time.time()
+                #result = SpecfitFuns.agauss(a,energy)
+                #if HYPERMET:
+                if hypermet:
+                    result = SpecfitFuns.fastahypermet(a,energy,hypermet)
+                else:
+                    result = SpecfitFuns.apvoigt(a,energy)
+            else:
+                result = 0.0 * x
+            #print "eval = ",time.time()-t
+        #evaluation takes 0.058 seconds
+        #with less peaks 0.036
+        #with tabulated function 0.018
+        if continuum:
+            result += self.continuum(param,x)
+        if summing:
+          if 0:
+            pileup = numpy.arange(3*len(x))*0.0
+            sumfactor = param[4]
+            xmin=int(x[0])
+            offset = zero / gain
+            for i in range(len(result)):
+                pileup[i+xmin-offset:i+len(result)+xmin-i-offset] += sumfactor * result[i] *result[0:len(result)-i]
+            return result+pileup[0:len(result)]
+          else:
+            #summing takes 0.0047 seconds
+            xmin=int(x[0])
+            return result+param[4]*SpecfitFuns.pileup(result, xmin, zero, gain)
+        else:
+            return result
+
+    def __fillPeakTables(self, param, hypermet, PEAKSW):
+        """
+        Fill the peak tables (one per peak family) which are evaluated by
+        SpecfitFuns.fastahypermet or SpecfitFuns.apvoigt
+        """
+        gain = param[1]
+        noise= param[2] * param[2]
+        fano = param[3] * FANO_FACTOR
         PEAKS0 = self.PEAKS0
         PEAKS0ESCAPE = self.PEAKS0ESCAPE
-        PEAKSW = self.PEAKSW
         PARAMETERS = self.PARAMETERS
-        FASTER = self.FASTER
         for i in range(len(param[self.NGLOBAL:])):
             if self.ESCAPE:
                 #area = param[NGLOBAL+i]
@@ -1513,19 +1644,6 @@ def mcatheory(self,param0,t0,hypermet=None,continuum=None,summing=None):
                     PEAKSW[i] [r:,7] = 0.0
                 else:
                     PEAKSW[i] [:,3] = param[PARAMETERS.index('Eta Factor')]
-                if not FASTER:
-                    print("not FASTER")
-                    #if HYPERMET:
-                    if hypermet:
-                        if i == 0:
-                            result = SpecfitFuns.ahypermet(PEAKSW[i],energy,hypermet)
-                        else:
-                            result += SpecfitFuns.ahypermet(PEAKSW[i],energy,hypermet)
-                    else:
-                        if i == 0:
-                            result = SpecfitFuns.apvoigt(PEAKSW[i],energy)
-                        else:
-                            result += SpecfitFuns.apvoigt(PEAKSW[i],energy)
             else:
                 PEAKSW[i][:,0] = PEAKS0[i][:,0] * param[self.NGLOBAL+i] * gain
                 PEAKSW[i][:,1] = PEAKS0[i][:,1] * 1.0
@@ -1538,56 +1656,6 @@ def mcatheory(self,param0,t0,hypermet=None,continuum=None,summing=None):
                     PEAKSW[i] [:,7] = param[PARAMETERS.index('STEP HeightR')]
                 else:
                     PEAKSW[i] [:,3] = param[PARAMETERS.index('Eta Factor')]
-                if not FASTER:
-                    if hypermet:
-                        if i == 0:
-                            result = SpecfitFuns.ahypermet(PEAKSW[i],energy,hypermet)
-                        else:
-                            result += SpecfitFuns.ahypermet(PEAKSW[i],energy,hypermet)
-                    else:
-                        if i == 0:
-                            result = SpecfitFuns.apvoigt(PEAKSW[i],energy)
-                        else:
-                            result += SpecfitFuns.apvoigt(PEAKSW[i],energy)
-        #print PARAMETERS[self.NGLOBAL+4]
-        #print self.PEAKS0NAMES[4]
-        #print PEAKSW[4]
-        #print "loop takes ",time.time()-t
-        #loop takes 0.006 seconds
-        #t=time.time()
-        if FASTER:
-            if len(PEAKSW[:]):
-                a=numpy.concatenate(PEAKSW[:])
-                #t=time.time()
-                #result = SpecfitFuns.agauss(a,energy)
-                #if HYPERMET:
-                if hypermet:
-                    result = SpecfitFuns.fastahypermet(a,energy,hypermet)
-                else:
-                    result = SpecfitFuns.apvoigt(a,energy)
-            else:
-                result = 0.0 * x
-            #print "eval = ",time.time()-t
-        #evaluation takes 0.058 seconds
-        #with less peaks 0.036
-        #with tabulated function 0.018
-        if continuum:
-            result += self.continuum(param,x)
-        if summing:
-          if 0:
-            pileup = numpy.arange(3*len(x))*0.0
-            sumfactor = param[4]
-            xmin=int(x[0])
-            offset = zero / gain
-            for i in range(len(result)):
-                pileup[i+xmin-offset:i+len(result)+xmin-i-offset] += sumfactor * result[i] *result[0:len(result)-i]
-            return result+pileup[0:len(result)]
-          else:
-            #summing takes 0.0047 seconds
-            xmin=int(x[0])
-            return result+param[4]*SpecfitFuns.pileup(result, xmin, zero, gain)
-        else:
-            return result
 
     def continuum(self,param,x):
         #CONTINUUM_LIST = [None,'Constant','Linear','Parabolic','Linear Polynomial','Exp. Polynomial']
@@ -1811,6 +1879,100 @@ def analyticalDerivative(self, param0, index, t0):
             #print "f1,f2,delta = ",f1,f2,delta
             return (f1-f2) / (2.0 * delta)
 
+    def jacobian(self, param0, indices, t0):
+        """
+        jacobian(self, parameters, indices, x)
+        Derivatives of the fitting function f(parameters, x) respect to all
+        the parameters given by indices at the array of points x. It returns
+        an array of shape (len(indices), len(x)).
+
+        The peak tables are filled once for all the peak families and the
+        derivatives respect to the zero, gain, noise and fano parameters are
+        calculated in closed form instead of numerically. As for the peak
+        areas in analyticalDerivative, the pile-up contribution is neglected.
+        """
+        NGLOBAL = self.NGLOBAL
+        HYPERMET = self.__HYPERMET
+        param = numpy.array(param0, dtype=numpy.float64)
+        x = numpy.array(t0, dtype=numpy.float64)
+        energy = param[0] + param[1] * x
+        result = numpy.empty((len(indices), len(x)), numpy.float64)
+        globalRows = {}
+        if (not self.__SUM) and (param[1] != 0) and \
+           any(index < 4 for index in indices):
+            globalRows = self.__globalDerivatives(param, x, energy)
+        unitTables = None
+        for k, index in enumerate(indices):
+            if index > NGLOBAL - 1:
+                if unitTables is None:
+                    unitpar = param.copy()
+                    unitpar[NGLOBAL:] = 1.0
+                    unitTables = [table.copy() for table in self.PEAKSW]
+                    self.__fillPeakTables(unitpar, HYPERMET, unitTables)
+                result[k] = self.__evaluatePeaks(unitTables[index - NGLOBAL],
+                                                 energy, HYPERMET)
+            elif index in globalRows:
+                result[k] = globalRows[index]
+            else:
+                result[k] = self.analyticalDerivative(param, index, x)
+        return result
+
+    # model derivative protocol of Gefit.LeastSquaresFit
+    jacobian.batched = True
+
+    def __evaluatePeaks(self, table, energy, hypermet):
+        if hypermet:
+            if self.FASTER:
+                return SpecfitFuns.fastahypermet(table, energy, hypermet)
+            else:
+                return SpecfitFuns.ahypermet(table, energy, hypermet)
+        else:
+            return SpecfitFuns.apvoigt(table, energy)
+
+    def __globalDerivatives(self, param, x, energy):
+        """
+        Derivatives respect to the zero, gain, noise and fano parameters
+        without pile-up. Returns a dictionary indexed by parameter index,
+        empty when the closed form cannot be used.
+        """
+        HYPERMET = self.__HYPERMET
+        tables = [table.copy() for table in self.PEAKSW]
+        self.__fillPeakTables(param, HYPERMET, tables)
+        if len(tables):
+            peaks = numpy.concatenate(tables)
+        else:
+            peaks = numpy.zeros((0, 8 if HYPERMET else 4), numpy.float64)
+        fwhm = peaks[:, 2]
+        if numpy.any(fwhm <= 0):
+            return {}
+        peakEnergy = peaks[:, 1]
+        weights = numpy.zeros((2, len(peaks)), numpy.float64)
+        weights[0] = param[2] / fwhm
+        weights[1] = (peakEnergy > 0) * peakEnergy * FANO_FACTOR / (2 * fwhm)
+        if len(peaks):
+            peakSum = self.__evaluatePeaks(peaks, energy, HYPERMET)
+            dE, dW = _peakDerivatives(peaks, energy, HYPERMET, weights)
+        else:
+            peakSum = numpy.zeros(x.shape, numpy.float64)
+            dE = numpy.zeros(x.shape, numpy.float64)
+            dW = numpy.zeros((2, len(x)), numpy.float64)
+        result = {0: dE,
+                  1: peakSum / param[1] + x * dE,
+                  2: dW[0],
+                  3: dW[1]}
+        if self.__CONTINUUM in [CONTINUUM_LIST.index('Linear Polynomial'),
+                                CONTINUUM_LIST.index('Exp. Polynomial')]:
+            # the polynomial continuum is expressed as a function of energy
+            for index in [0, 1]:
+                delta = (param[index] + numpy.equal(param[index], 0.0)) * 0.00001
+                newpar = param.copy()
+                newpar[index] = param[index] + delta
+                f1 = self.continuum(newpar, x)
+                newpar[index] = param[index] - delta
+                f2 = self.continuum(newpar, x)
+                result[index] = result[index] + (f1 - f2) / (2.0 * delta)
+        return result
+
     def estimate(self):
         if self.__toBeConfigured:
             _logger.debug("CONFIGURING FROM ESTIMATION")
@@ -2185,7 +2347,7 @@ def startfit(self,digest=0, linear=None, currentIteration=None):
                                            constrains=self.codes,
                                            weightflag=self.config['fit']['fitweight'],
                                            maxiter=self.MAXITER,
-                                           model_deriv=self.analyticalDerivative,
+                                           model_deriv=self.jacobian,
                                            deltachi=self.config['fit']['deltachi'],
                                            fulloutput=1, linear=linear)
             if self.__SUM and linear:
@@ -2204,7 +2366,7 @@ def startfit(self,digest=0, linear=None, currentIteration=None):
                                            constrains=self.codes,
                                            weightflag=self.config['fit']['fitweight'],
                                            maxiter=self.MAXITER,
-                                           model_deriv=self.analyticalDerivative,
+                                           model_deriv=self.jacobian,
                                            deltachi=self.config['fit']['deltachi'],
                                            fulloutput=1, linear=linear)
         self.fittedpar=fitresult[0]
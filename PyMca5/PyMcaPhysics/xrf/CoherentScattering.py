@@ -33,6 +33,7 @@
 import os
 import numpy
 from PyMca5.PyMcaIO import ConfigDict
+from PyMca5.PyMcaMisc import DiskCache
 from PyMca5 import PyMcaDataDir
 
 dirmod = PyMcaDataDir.PYMCA_DATA_DIR
@@ -51,8 +52,13 @@
     if not os.path.exists(ffile):
         print("Cannot find file ", ffile)
         raise IOError("Cannot find file %s" % ffile)
-COEFFICIENTS = ConfigDict.ConfigDict()
-COEFFICIENTS.read(ffile)
+def _readCoefficients():
+    coefficients = ConfigDict.ConfigDict()
+    coefficients.read(ffile)
+    return coefficients
+
+COEFFICIENTS = DiskCache.cachedTables("atomsf", [ffile], _readCoefficients,
+                                      factory=ConfigDict.ConfigDict)
 KEVTOANG = 12.39852000
 R0 = 2.82E-13 #electron radius in cm
 
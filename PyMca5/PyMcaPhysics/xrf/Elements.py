@@ -37,11 +37,56 @@
 import re
 import weakref
 import types
+import threading
 from PyMca5.PyMcaIO import ConfigDict
 from . import CoherentScattering
 from . import IncoherentScattering
 from . import PyMcaEPDL97
 from PyMca5 import PyMcaDataDir
+from PyMca5.PyMcaMisc import DiskCache
+from PyMca5.PyMcaMisc.LRUCache import LRUCache, memoized
+
+# Results of getEscape, getMultilayerFluorescence and
+# getMaterialMassAttenuationCoefficients. Call memoCache.configure(directory=...)
+# to share them between sessions and memoCache.enabled = False to disable.
+memoCache = LRUCache(maxsize=4096, maxbytes=64 * 1024 * 1024)
+_updateParameters = None
+
+
+def _memoDependencies(*args, **kwargs):
+    """Everything the memoized results depend on besides the arguments:
+    the definitions of the materials they refer to, the parameters given
+    to updateDict and the PyMca version (for results stored on disk).
+    """
+    materials = {}
+    todo = list(args) + list(kwargs.values())
+    while todo:
+        obj = todo.pop()
+        if isinstance(obj, (list, tuple)):
+            todo.extend(obj)
+        elif isinstance(obj, dict):
+            todo.extend(obj.values())
+        elif isinstance(obj, str) and obj not in materials:
+            definition = Material.get(obj)
+            if definition is not None:
+                materials[obj] = definition
+                todo.append(definition.get('CompoundList'))
+    from PyMca5 import version
+    return version(), _updateParameters, materials
+
+
+# Below this number of energies the attenuation coefficients are
+# calculated faster than the key of the cache
+_MEMO_MIN_ENERGIES = 10
+
+
+def _memoAttenuation(compoundList0, fractionList0, energy0=None,
+                     massfractions=False):
+    """Only the mass fractions and the coefficients at many energies are
+    worth caching"""
+    if energy0 is None:
+        return True
+    return numpy.size(energy0) >= _MEMO_MIN_ENERGIES
 
 """
 Constant                     Symbol      2006 CODATA value          Relative uncertainty
@@ -726,6 +771,7 @@ def _getFluorescenceWeights(ele, energy, normalize = None, cascade = None):
                 w[i] /= cum
     return w
 
+@memoized(memoCache, key=_memoDependencies)
 def getEscape(matrix, energy, ethreshold=None, ithreshold=None, nthreshold = None,
                         alphain = None, cascade = None, fluorescencemode=None):
     """
@@ -1103,6 +1149,7 @@ def _getAttFilteredElementDict(elementsList,
                 i += 1
     return outputDict
 
+@memoized(memoCache, key=_memoDependencies)
 def getMultilayerFluorescence(multilayer0,
                               energyList,
                               layerList = None,
@@ -2311,6 +2358,7 @@ def getMaterialTransmission(compoundList0, fractionList0, energy0 = None,
 def getMaterialMassFractions(compoundList0, fractionList0):
     return getMaterialMassAttenuationCoefficients(compoundList0, fractionList0, None, massfractions=True)
 
+@memoized(memoCache, key=_memoDependencies, condition=_memoAttenuation)
 def getMaterialMassAttenuationCoefficients(compoundList0, fractionList0, energy0 = None,massfractions=False):
     """
     Usage:
@@ -2587,6 +2635,128 @@ def getElementComptonDifferentialCrossSection(ele, theta, energy, p1=None):
           raise ValueError("Unknown element %s" % ele)
     return (value * 6.022142E23)/ Element[ele]['mass']
 
+_xcomTables = None
+_XCOM_KEYS = ['energy', 'coherent', 'compton', 'photo', 'pair']
+
+
+def _getXcomFile(ele):
+    dirmod = PyMcaDataDir.PYMCA_DATA_DIR
+    #read xcom file
+    #print dirmod+"/"+ele+".mat"
+    xcomfile = os.path.join(dirmod, "attdata")
+    xcomfile = os.path.join(xcomfile, ele+".mat")
+    if not os.path.exists(xcomfile):
+        #freeze does bad things with the path ...
+        dirmod = os.path.dirname(dirmod)
+        xcomfile = os.path.join(dirmod, "attdata")
+        xcomfile = os.path.join(xcomfile, ele+".mat")
+        if dirmod.lower().endswith(".zip"):
+            dirmod = os.path.dirname(dirmod)
+            xcomfile = os.path.join(dirmod, "attdata")
+            xcomfile = os.path.join(xcomfile, ele+".mat")
+    return xcomfile
+
+
+def _readXcomFile(xcomfile):
+    """
+    Read a file generated by XCOM and return a dictionary with the
+    energy sorted cross sections (energy, coherent, compton, photo and pair)
+    """
+    f = open(xcomfile, 'r')
+    line=f.readline()
+    while (line.split('ENERGY')[0] == line):
+        line = f.readline()
+    xcom = {}
+    xcom['energy']   =[]
+    xcom['coherent'] =[]
+    xcom['compton']  =[]
+    xcom['photo']  =[]
+    xcom['pair']     =[]
+    line = f.readline()
+    while (line.split('COHERENT')[0] == line):
+        line = line.split()
+        for value in line:
+            xcom['energy'].append(float(value)*1000.)
+        line = f.readline()
+    xcom['energy']=numpy.array(xcom['energy'])
+    line = f.readline()
+    while (line.split('INCOHERENT')[0] == line):
+        line = line.split()
+        for value in line:
+            xcom['coherent'].append(float(value))
+        line = f.readline()
+    xcom['coherent']=numpy.array(xcom['coherent'])
+    line = f.readline()
+    while (line.split('PHOTO')[0] == line):
+        line = line.split()
+        for value in line:
+            xcom['compton'].append(float(value))
+        line = f.readline()
+    xcom['compton']=numpy.array(xcom['compton'])
+    line = f.readline()
+    while (line.split('PAIR')[0] == line):
+        line = line.split()
+        for value in line:
+            xcom['photo'].append(float(value))
+        line = f.readline()
+    line = f.readline()
+    while (line.split('PAIR')[0] == line):
+        line = line.split()
+        for value in line:
+            xcom['pair'].append(float(value))
+        line = f.readline()
+    i = 0
+    line = f.readline()
+    while (len(line)):
+        line = line.split()
+        for value in line:
+            xcom['pair'][i] += float(value)
+            i += 1
+        line = f.readline()
+    f.close()
+    if sys.version >= '3.0':
+        # next line gave problems under under windows
+        # just try numpy.argsort([1,1,1,1,1]) under linux and windows to see
+        # what I mean
+        # i1=numpy.argsort(xcom['energy']) did not work
+        # (uses quicksort and gives problems with Pb not passing tests)
+        i1=numpy.argsort(xcom['energy'], kind='mergesort')
+    else:
+        sset = map(None,xcom['energy'],range(len(xcom['energy'])))
+        sset.sort()
+        i1=numpy.array([x[1] for x in sset])
+    xcom['energy']=numpy.take(xcom['energy'],i1)
+    xcom['coherent']=numpy.take(xcom['coherent'],i1)
+    xcom['compton']=numpy.take(xcom['compton'],i1)
+    xcom['photo']=numpy.take(xcom['photo'],i1)
+    xcom['pair']=numpy.take(xcom['pair'],i1)
+    return xcom
+
+
+def _getXcomTables():
+    """
+    Cross sections of all the elements, read from a binary cache built
+    from the XCOM files when it is available.
+    """
+    global _xcomTables
+    if _xcomTables is None:
+        if DiskCache.defaultDirectory() is None:
+            # files parsed element by element on first use
+            _xcomTables = {}
+        else:
+            filenames = {}
+            for ele in ElementList:
+                xcomfile = _getXcomFile(ele)
+                if os.path.exists(xcomfile):
+                    filenames[ele] = xcomfile
+            def build():
+                return dict((ele, _readXcomFile(xcomfile))
+                            for ele, xcomfile in filenames.items())
+            _xcomTables = DiskCache.cachedTables("xcom",
+                                                 list(filenames.values()),
+                                                 build)
+    return _xcomTables
+
 def getelementmassattcoef(ele,energy=None):
     """
     Usage: getelementmassattcoef(element symbol, energy in kev)
@@ -2600,92 +2770,16 @@ def getelementmassattcoef(ele,energy=None):
             dict['total']      = [total cross section]
     """
     if 'xcom' not in Element[ele].keys():
-        dirmod = PyMcaDataDir.PYMCA_DATA_DIR
-        #read xcom file
-        #print dirmod+"/"+ele+".mat"
-        xcomfile = os.path.join(dirmod, "attdata")
-        xcomfile = os.path.join(xcomfile, ele+".mat")
-        if not os.path.exists(xcomfile):
-            #freeze does bad things with the path ...
-            dirmod = os.path.dirname(dirmod)
-            xcomfile = os.path.join(dirmod, "attdata")
-            xcomfile = os.path.join(xcomfile, ele+".mat")
-            if dirmod.lower().endswith(".zip"):
-                dirmod = os.path.dirname(dirmod)
-                xcomfile = os.path.join(dirmod, "attdata")
-                xcomfile = os.path.join(xcomfile, ele+".mat")
+        xcom = _getXcomTables().get(ele)
+        if xcom is None:
+            xcomfile = _getXcomFile(ele)
             if not os.path.exists(xcomfile):
                 print("Cannot find file ",xcomfile)
                 raise IOError("Cannot find %s" % xcomfile)
-        f = open(xcomfile, 'r')
-        line=f.readline()
-        while (line.split('ENERGY')[0] == line):
-            line = f.readline()
+            xcom = _readXcomFile(xcomfile)
         Element[ele]['xcom'] = {}
-        Element[ele]['xcom']['energy']   =[]
-        Element[ele]['xcom']['coherent'] =[]
-        Element[ele]['xcom']['compton']  =[]
-        Element[ele]['xcom']['photo']  =[]
-        Element[ele]['xcom']['pair']     =[]
-        Element[ele]['xcom']['total']    =[]
-        line = f.readline()
-        while (line.split('COHERENT')[0] == line):
-            line = line.split()
-            for value in line:
-                Element[ele]['xcom']['energy'].append(float(value)*1000.)
-            line = f.readline()
-        Element[ele]['xcom']['energy']=numpy.array(Element[ele]['xcom']['energy'])
-        line = f.readline()
-        while (line.split('INCOHERENT')[0] == line):
-            line = line.split()
-            for value in line:
-                Element[ele]['xcom']['coherent'].append(float(value))
-            line = f.readline()
-        Element[ele]['xcom']['coherent']=numpy.array(Element[ele]['xcom']['coherent'])
-        line = f.readline()
-        while (line.split('PHOTO')[0] == line):
-            line = line.split()
-            for value in line:
-                Element[ele]['xcom']['compton'].append(float(value))
-            line = f.readline()
-        Element[ele]['xcom']['compton']=numpy.array(Element[ele]['xcom']['compton'])
-        line = f.readline()
-        while (line.split('PAIR')[0] == line):
-            line = line.split()
-            for value in line:
-                Element[ele]['xcom']['photo'].append(float(value))
-            line = f.readline()
-        line = f.readline()
-        while (line.split('PAIR')[0] == line):
-            line = line.split()
-            for value in line:
-                Element[ele]['xcom']['pair'].append(float(value))
-            line = f.readline()
-        i = 0
-        line = f.readline()
-        while (len(line)):
-            line = line.split()
-            for value in line:
-                Element[ele]['xcom']['pair'][i] += float(value)
-                i += 1
-            line = f.readline()
-        f.close()
-        if sys.version >= '3.0':
-            # next line gave problems under under windows
-            # just try numpy.argsort([1,1,1,1,1]) under linux and windows to see
-            # what I mean
-            # i1=numpy.argsort(Element[ele]['xcom']['energy']) did not work
-            # (uses quicksort and gives problems with Pb not passing tests)
-            i1=numpy.argsort(Element[ele]['xcom']['energy'], kind='mergesort')
-        else:
-            sset = map(None,Element[ele]['xcom']['energy'],range(len(Element[ele]['xcom']['energy'])))
-            sset.sort()
-            i1=numpy.array([x[1] for x in sset])
-        Element[ele]['xcom']['energy']=numpy.take(Element[ele]['xcom']['energy'],i1)
-        Element[ele]['xcom']['coherent']=numpy.take(Element[ele]['xcom']['coherent'],i1)
-        Element[ele]['xcom']['compton']=numpy.take(Element[ele]['xcom']['compton'],i1)
-        Element[ele]['xcom']['photo']=numpy.take(Element[ele]['xcom']['photo'],i1)
-        Element[ele]['xcom']['pair']=numpy.take(Element[ele]['xcom']['pair'],i1)
+        for key in _XCOM_KEYS:
+            Element[ele]['xcom'][key] = numpy.array(xcom[key], copy=True)
         if Element[ele]['xcom']['coherent'][0] <= 0:
            Element[ele]['xcom']['coherent'][0] = Element[ele]['xcom']['coherent'][1] * 1.0
         try:
@@ -2695,6 +2789,7 @@ def getelementmassattcoef(ele,energy=None):
             Element[ele]['xcom']['photolog10']=numpy.log10(Element[ele]['xcom']['photo'])
         except Exception:
             raise ValueError("Problem calculating logaritm of %s.mat file data" % ele)
+        Element[ele]['xcom']['total'] = []
         for i in range(0,len(Element[ele]['xcom']['energy'])):
             Element[ele]['xcom']['total'].append(Element[ele]['xcom']['coherent'][i]+\
                                                  Element[ele]['xcom']['compton'] [i]+\
@@ -2953,12 +3048,115 @@ def _updateElementDict(symbol, dict, energy=None, minenergy=MINENERGY, minrate=0
     dict['buildparameters']['minrate']   = minrate
 
 def updateDict(energy=None, minenergy=MINENERGY, minrate=0.0010, cb=True):
+    global _updateParameters
+    _updateParameters = (energy, minenergy, minrate)
     for ele in ElementList:
-        _updateElementDict(ele, Element[ele], energy=energy, minenergy=minenergy, minrate=minrate)
+        Element[ele]._setRaysParameters(energy=energy, minenergy=minenergy,
+                                        minrate=minrate)
     if cb:
         _updateCallback()
     return
 
+
+_elementLock = threading.RLock()
+
+
+class _ElementDict(dict):
+    """
+    Dictionary of element data. The x-rays and their rates are calculated
+    on first access after a change of the parameters given to updateDict.
+    """
+    def __init__(self, symbol):
+        dict.__init__(self)
+        self._symbol = symbol
+        self._raysParameters = None
+        self._building = False
+
+    def _setRaysParameters(self, **kw):
+        with _elementLock:
+            # all the groups are created, even those without transitions
+            # and therefore not listed in 'rays'
+            for rays in ElementXrays:
+                for transition in dict.pop(self, rays, []):
+                    dict.pop(self, transition, None)
+            dict.pop(self, 'rays', None)
+            dict.pop(self, 'buildparameters', None)
+            self._raysParameters = kw
+
+    def _build(self):
+        if self._raysParameters is None:
+            return
+        with _elementLock:
+            if self._raysParameters is None or self._building:
+                return
+            self._building = True
+            try:
+                _updateElementDict(self._symbol, self, **self._raysParameters)
+                self._raysParameters = None
+            finally:
+                self._building = False
+
+    def __missing__(self, key):
+        if self._raysParameters is None:
+            raise KeyError(key)
+        self._build()
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        self._build()
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self._build()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._build()
+        return dict.__len__(self)
+
+    def __repr__(self):
+        self._build()
+        return dict.__repr__(self)
+
+    def __eq__(self, other):
+        self._build()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def keys(self):
+        self._build()
+        return dict.keys(self)
+
+    def values(self):
+        self._build()
+        return dict.values(self)
+
+    def items(self):
+        self._build()
+        return dict.items(self)
+
+    def get(self, key, default=None):
+        self._build()
+        return dict.get(self, key, default)
+
+    def copy(self):
+        self._build()
+        return dict.copy(self)
+
+    def __reduce__(self):
+        self._build()
+        return (_unpickleElementDict, (self._symbol, dict(self)))
+
+
+def _unpickleElementDict(symbol, ddict):
+    element = _ElementDict(symbol)
+    dict.update(element, ddict)
+    return element
+
 def _getMaterialDict():
     cDict = ConfigDict.ConfigDict()
     dirmod = PyMcaDataDir.PYMCA_DATA_DIR
@@ -3038,7 +3236,7 @@ def _updateCallback():
 Element={}
 for ele in ElementList:
     z = getz(ele)
-    Element[ele]={}
+    Element[ele]=_ElementDict(ele)
     Element[ele]['Z']       = z
     Element[ele]['name']    = ElementsInfo[z-1][4]
     Element[ele]['mass']    = ElementsInfo[z-1][5]
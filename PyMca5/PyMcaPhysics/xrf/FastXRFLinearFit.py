@@ -41,23 +41,47 @@
 import collections
 from . import ClassMcaTheory
 from . import ConcentrationsTool
+from . import MatrixCorrection
 from PyMca5.PyMcaMath.linalg import lstsq
 from PyMca5.PyMcaMath.fitting import Gefit
 from PyMca5.PyMcaMath.fitting import SpecfitFuns
 from PyMca5.PyMcaIO import ConfigDict
 from .XRFBatchFitOutput import OutputBuffer
 from PyMca5.PyMcaCore import McaStackView
+from PyMca5.PyMcaMisc import ExecutorUtils
+from PyMca5.PyMcaMisc import DiskCache
 
 _logger = logging.getLogger(__name__)
 
 
+# Change when the content of the cached linear models changes
+_MODEL_CACHE_VERSION = 1
+
+
 class FastXRFLinearFit(object):
-    def __init__(self, mcafit=None):
+    def __init__(self, mcafit=None, cachedir=None):
+        """
+        :param McaTheory mcafit:
+        :param str cachedir: directory where the linear models are cached
+                             (derivatives and SVD), no cache when None
+        """
         self._config = None
         if mcafit is None:
             self._mcaTheory = ClassMcaTheory.McaTheory()
         else:
             self._mcaTheory = mcafit
+        self.setModelCacheDirectory(cachedir)
+
+    def setModelCacheDirectory(self, cachedir=None):
+        """The linear model of a fit configuration, x-axis and fit range
+        is stored in this directory and reused by later fits.
+
+        :param str cachedir: no cache when None
+        """
+        if cachedir:
+            self._modelCache = DiskCache.DiskCache(cachedir)
+        else:
+            self._modelCache = None
 
     def setFitConfiguration(self, configuration):
         self._mcaTheory.setConfiguration(configuration)
@@ -73,7 +97,8 @@ def setFitConfigurationFile(self, ffile):
     def fitMultipleSpectra(self, x=None, y=None, xmin=None, xmax=None,
                            configuration=None, concentrations=False,
                            ysum=None, weight=None, refit=True, livetime=None,
-                           outbuffer=None, save=True, **outbufferinitargs):
+                           outbuffer=None, save=True, nworkers=None,
+                           executor=None, prefetch=None, **outbufferinitargs):
         """
         This method performs the actual fit. The y keyword is the only mandatory input argument.
 
@@ -83,13 +108,22 @@ def fitMultipleSpectra(self, x=None, y=None, xmin=None, xmax=None,
         :param xmax: upper limit of the fitting region
         :param ysum: sum spectrum
         :param weight: 0 Means no weight, 1 Use an average weight, 2 Individual weights (slow)
-        :param concentrations: 0 Means no calculation, 1 Calculate elemental concentrations
+        :param concentrations: 0 Means no calculation, 1 Calculate elemental concentrations,
+                               2 Calculate elemental concentrations correcting for the
+                               matrix composition of each pixel
         :param refit: if False, no check for negative results. Default is True.
         :param livetime: It will be used if not different from None and concentrations
                          are to be calculated by using fundamental parameters with
                          automatic time. The default is None.
         :param outbuffer:
         :param save: set to False to postpone saving the in-memory buffers
+        :param nworkers: number of workers fitting chunks of spectra in parallel.
+                         None or 1 means serial fitting, 0 means one worker per CPU.
+        :param executor: 'thread' (default), 'process' or an instance of
+                         concurrent.futures.Executor (not shut down afterwards)
+        :param prefetch: read the next chunk of spectra in a background thread
+                         while fitting the current one. By default only when
+                         y is not a numpy array (e.g. an HDF5 dataset).
         :return OutputBuffer: works like a dict
         """
         # Parse data
@@ -113,36 +147,57 @@ def fitMultipleSpectra(self, x=None, y=None, xmin=None, xmax=None,
                                                 nSpectra=nSpectra)
             outbuffer['configuration'] = configorg
 
-            # Sum spectrum
-            if ysum is None:
-                if weightPolicy == 1:
-                    # we need to calculate the sum spectrum
-                    # to derive the uncertainties
-                    sumover = 'all'
-                elif not concentrations:
-                    # one spectrum is enough
-                    sumover = 'first pixel'
-                else:
-                    sumover = 'first vector'
-                yref = self._fitReferenceSpectrum(data=data, mcaIndex=mcaIndex,
-                                                  sumover=sumover)
-            else:
-                yref = ysum
-
             # Get the basis of the linear models (i.e. derivative to peak areas)
             if xmin is None:
                 xmin = config['fit']['xmin']
             if xmax is None:
                 xmax = config['fit']['xmax']
             dtypeCalculcation = self._fitDtypeCalculation(data)
-            self._mcaTheory.setData(x=x, y=yref, xmin=xmin, xmax=xmax)
-            derivatives, freeNames, nFree, nFreeBkg = self._fitCreateModel(dtype=dtypeCalculcation)
+            modelKey = None
+            model = None
+            if self._modelCache is not None:
+                modelKey = DiskCache.hashKey(_MODEL_CACHE_VERSION, config, x,
+                                             xmin, xmax,
+                                             numpy.dtype(dtypeCalculcation).str)
+                if not concentrations:
+                    # the concentrations need the complete fit model
+                    model = self._fitLoadModel(modelKey)
 
-            # Background anchor points (if any)
-            anchorslist = self._fitBkgAnchorList(config=config)
-
-            # MCA trimming: [iXMin:iXMax]
-            iXMin, iXMax = self._fitMcaTrimInfo(x=x)
+            # Sum spectrum
+            if ysum is not None:
+                yref = ysum
+            elif weightPolicy == 1:
+                # we need to calculate the sum spectrum
+                # to derive the uncertainties
+                yref = self._fitReferenceSpectrum(data=data, mcaIndex=mcaIndex,
+                                                  sumover='all')
+            elif model is not None:
+                yref = None
+            elif not concentrations:
+                # one spectrum is enough
+                yref = self._fitReferenceSpectrum(data=data, mcaIndex=mcaIndex,
+                                                  sumover='first pixel')
+            else:
+                yref = self._fitReferenceSpectrum(data=data, mcaIndex=mcaIndex,
+                                                  sumover='first vector')
+
+            if model is None:
+                self._mcaTheory.setData(x=x, y=yref, xmin=xmin, xmax=xmax)
+                model = self._fitCreateModel(dtype=dtypeCalculcation)
+                # Background anchor points (if any)
+                model['anchorslist'] = self._fitBkgAnchorList(config=config)
+                # MCA trimming: [iXMin:iXMax]
+                model['iXMin'], model['iXMax'] = self._fitMcaTrimInfo(x=x)
+                model['xdata'] = self._mcaTheory.xdata0.flatten()
+                model['zero'], model['gain'] = self._mcaTheory.parameters[:2]
+                if modelKey is not None:
+                    self._fitSaveModel(modelKey, model)
+            derivatives = model['derivatives']
+            freeNames = model['freeNames']
+            nFree = len(freeNames)
+            nFreeBkg = model['nFreeBkg']
+            anchorslist = model['anchorslist']
+            iXMin, iXMax = model['iXMin'], model['iXMax']
             sliceChan = slice(iXMin, iXMax)
             nObs = iXMax-iXMin
 
@@ -162,6 +217,13 @@ def fitMultipleSpectra(self, x=None, y=None, xmin=None, xmax=None,
                 SVD = True
                 sigma_b = None
             lstsq_kwargs = {'svd': SVD, 'sigma_b': sigma_b, 'weight': weight}
+            svdKey = None
+            if modelKey is not None and weightPolicy != 2:
+                # the SVD of the (weighted) model is shared by all spectra
+                svdKey = DiskCache.hashKey(modelKey, weight, sigma_b)
+                lstsq_kwargs['last_svd'] = self._fitLoadSVD(svdKey)
+                if lstsq_kwargs['last_svd'] is not None:
+                    svdKey = None
 
             # Allocate output buffers
             stackShape = data.shape
@@ -194,8 +256,8 @@ def fitMultipleSpectra(self, x=None, y=None, xmin=None, xmax=None,
                 dataAxes = [(name, numpy.arange(n, dtype=dtypeResult), {})
                             for name, n in zip(dataAxesNames, stackShape)]
                 # MCA axis: use energy and add channels as extra (unused) axis
-                xdata = self._mcaTheory.xdata0.flatten()
-                zero, gain = self._mcaTheory.parameters[:2]
+                xdata = model['xdata']
+                zero, gain = model['zero'], model['gain']
                 xenergy = zero + gain*xdata
                 dataAxesNames[mcaIndex] = 'energy'
                 dataAxes[mcaIndex] = 'energy', xenergy.astype(dtypeResult), {'units': 'keV'}
@@ -217,6 +279,13 @@ def fitMultipleSpectra(self, x=None, y=None, xmin=None, xmax=None,
                                         groupAttrs=derivAttrs,
                                         memtype='ram')
                 _derivatives[:, iXMin:iXMax] = derivatives.T
+                ysumBuffer = outbuffer.allocateMemory('sum',
+                                        shape=(xdata.size,),
+                                        dtype=numpy.float64,
+                                        fill_value=numpy.nan,
+                                        dataAttrs=dataAttrs,
+                                        groupAttrs=derivAttrs,
+                                        memtype='ram')
 
             dataAttrs = {}
             if outbuffer.saveFOM:
@@ -256,35 +325,52 @@ def fitMultipleSpectra(self, x=None, y=None, xmin=None, xmax=None,
             else:
                 fitmodel = None
 
+            # Sum spectrum of the fitted channels (same pass as the fit)
+            ysumFit = numpy.zeros((nObs,), dtype=numpy.float64)
+            if prefetch is None:
+                prefetch = not isinstance(data, numpy.ndarray)
+
             _logger.debug("Configuration elapsed = %f", time.time() - t0)
             t0 = time.time()
 
-            # Fit all spectra
-            self._fitLstSqAll(data=data, sliceChan=sliceChan, mcaIndex=mcaIndex,
-                            derivatives=derivatives, fitmodel=fitmodel,
-                            results=results, uncertainties=uncertainties,
-                            config=config, anchorslist=anchorslist,
-                            lstsq_kwargs=lstsq_kwargs)
-
-            t = time.time() - t0
-            _logger.debug("First fit elapsed = %f", t)
-            if t > 0.:
-                _logger.debug("Spectra per second = %f",
-                              numpy.prod(imageShape)/float(t))
-            t0 = time.time()
+            with ExecutorUtils.executorContext(nworkers=nworkers,
+                                               executor=executor) as (pool, nPool):
+                # Fit all spectra
+                self._fitLstSqAll(data=data, sliceChan=sliceChan, mcaIndex=mcaIndex,
+                                derivatives=derivatives, fitmodel=fitmodel,
+                                results=results, uncertainties=uncertainties,
+                                config=config, anchorslist=anchorslist,
+                                lstsq_kwargs=lstsq_kwargs,
+                                executor=pool, nworkers=nPool,
+                                prefetch=prefetch, ysum=ysumFit)
+                if svdKey is not None and \
+                   lstsq_kwargs.get('last_svd', None) is not None:
+                    self._fitSaveSVD(svdKey, lstsq_kwargs['last_svd'])
+
+                if outbuffer.saveDataDiagnostics:
+                    ysumBuffer[iXMin:iXMax] = ysumFit
 
-            # Refit spectra with negative peak areas
-            if refit:
-                self._fitLstSqNegative(data=data, sliceChan=sliceChan, mcaIndex=mcaIndex,
-                            derivatives=derivatives, fitmodel=fitmodel,
-                            results=results, uncertainties=uncertainties,
-                            config=config, anchorslist=anchorslist,
-                            lstsq_kwargs=lstsq_kwargs, freeNames=freeNames,
-                            nFreeBkg=nFreeBkg, nFreeParameters=nFreeParameters)
                 t = time.time() - t0
-                _logger.debug("Fit of negative peaks elapsed = %f", t)
+                _logger.debug("First fit elapsed = %f", t)
+                if t > 0.:
+                    _logger.debug("Spectra per second = %f",
+                                  numpy.prod(imageShape)/float(t))
                 t0 = time.time()
 
+                # Refit spectra with negative peak areas
+                if refit:
+                    self._fitLstSqNegative(data=data, sliceChan=sliceChan, mcaIndex=mcaIndex,
+                                derivatives=derivatives, fitmodel=fitmodel,
+                                results=results, uncertainties=uncertainties,
+                                config=config, anchorslist=anchorslist,
+                                lstsq_kwargs=lstsq_kwargs, freeNames=freeNames,
+                                nFreeBkg=nFreeBkg, nFreeParameters=nFreeParameters,
+                                executor=pool, nworkers=nPool,
+                                prefetch=prefetch)
+                    t = time.time() - t0
+                    _logger.debug("Fit of negative peaks elapsed = %f", t)
+                    t0 = time.time()
+
             # Return results as a dictionary
             if outbuffer.saveData:
                 outbuffer.allocateMemory('data',
@@ -312,7 +398,10 @@ def fitMultipleSpectra(self, x=None, y=None, xmin=None, xmax=None,
                                              nFreeBkg=nFreeBkg,
                                              results=results,
                                              autotime=autotime,
-                                             liveTimeFactor=liveTimeFactor)
+                                             liveTimeFactor=liveTimeFactor,
+                                             matrixcorrection=concentrations == 2,
+                                             nworkers=nworkers,
+                                             executor=executor)
                 dataAttrs = {}  #{'units':'dimensionless'})
                 massfracAttrs = {'default': True}
                 outbuffer.allocateMemory('massfractions',
@@ -420,6 +509,11 @@ def _fitConfigure(self, configuration=None, concentrations=False,
         if strategy:
             raise RuntimeError("Strategies are incompatible with fast fit")
 
+        # reject the samples not supported by the matrix correction
+        # before fitting
+        if concentrations == 2:
+            MatrixCorrection._sampleDescription(config)
+
         # background
         if config['fit']['stripflag']:
             if config['fit']['stripalgorithm'] == 1:
@@ -477,12 +571,20 @@ def _fitReferenceSpectrum(self, data=None, mcaIndex=None, sumover='all'):
         """
         dtype = self._fitDtypeCalculation(data)
         if sumover == 'all':
-            nMca = 20, 'MB'
-            _logger.debug('Add spectra in chunks of {}'.format(nMca))
+            if isinstance(data, numpy.ndarray):
+                nMca = 20, 'MB'
+            else:
+                # Block size and alignment from the storage layout
+                nMca = 'auto'
             datastack = McaStackView.FullView(data, mcaAxis=mcaIndex, nMca=nMca)
+            _logger.debug('Add spectra in chunks of {}'.format(datastack.nMca))
             yref = numpy.zeros((data.shape[mcaIndex],), dtype)
-            for key, chunk in datastack.items():
-                yref += chunk.sum(axis=0, dtype=dtype)
+            chunkSums = (chunk.sum(axis=0, dtype=dtype)
+                         for key, chunk in datastack.items())
+            if not isinstance(data, numpy.ndarray):
+                chunkSums = ExecutorUtils.prefetch(chunkSums)
+            for chunkSum in chunkSums:
+                yref += chunkSum
         elif sumover == 'first vector':
             # Sum spectrum of the first row
             ndim = data.ndim
@@ -543,7 +645,55 @@ def _fitCreateModel(self, dtype=None):
             derivatives[:, idx] = deriv
             idx += 1
 
-        return derivatives, freeNames, nFree, nFreeBkg
+        return {'derivatives': derivatives, 'freeNames': freeNames,
+                'nFreeBkg': nFreeBkg}
+
+    def _fitLoadModel(self, key):
+        """Linear model from the cache (None when not cached)
+        """
+        ddict = self._modelCache.load("model_" + key)
+        if ddict is None:
+            _logger.debug("Linear model %s not cached", key)
+            return None
+        _logger.debug("Linear model %s taken from cache", key)
+        model = {'derivatives': ddict['derivatives'],
+                 'freeNames': ddict['freeNames'].tolist(),
+                 'nFreeBkg': int(ddict['nFreeBkg']),
+                 'iXMin': int(ddict['iXMin']),
+                 'iXMax': int(ddict['iXMax']),
+                 'xdata': ddict['xdata'],
+                 'zero': float(ddict['zero']),
+                 'gain': float(ddict['gain'])}
+        if ddict['anchorslist'].size or ddict['stripflag']:
+            model['anchorslist'] = ddict['anchorslist'].tolist()
+        else:
+            model['anchorslist'] = None
+        return model
+
+    def _fitSaveModel(self, key, model):
+        ddict = dict(model)
+        ddict['freeNames'] = numpy.array(model['freeNames'])
+        ddict['stripflag'] = model['anchorslist'] is not None
+        if model['anchorslist'] is None:
+            ddict['anchorslist'] = numpy.zeros((0,), dtype=int)
+        try:
+            self._modelCache.save("model_" + key, ddict)
+        except (IOError, OSError) as e:
+            _logger.warning("Cannot cache the linear model: %s", e)
+
+    def _fitLoadSVD(self, key):
+        ddict = self._modelCache.load("svd_" + key)
+        if ddict is None:
+            return None
+        _logger.debug("SVD of the linear model taken from cache")
+        return ddict['U'], ddict['s'], ddict['V']
+
+    def _fitSaveSVD(self, key, svd):
+        U, s, V = svd
+        try:
+            self._modelCache.save("svd_" + key, {'U': U, 's': s, 'V': V})
+        except (IOError, OSError) as e:
+            _logger.warning("Cannot cache the SVD of the linear model: %s", e)
 
     def _fitBkgAnchorList(self, config=None):
         """Get anchors for background subtraction
@@ -595,73 +745,158 @@ def _fitMcaTrimInfo(self, x=None):
                 iXMax = iXMax[0]
         return iXMin, iXMax+1
 
-    def _dataChunkIter(self, slicecls, data=None, fitmodel=None, **kwargs):
+    def _dataChunkIter(self, slicecls, data=None, prefetch=False, ysum=None,
+                       copy=False, **kwargs):
+        """
+        Chunks of spectra. The view buffer is reused, so chunks are copied
+        when they are used by another thread or process (prefetch or copy)
+        while the next chunk is being read.
+
+        :param array ysum: the sum of the spectra is added to it
+        :yields tuple: (idx, idxShape), nChan x nSpectra chunk
+        """
         dtype = self._fitDtypeResult(data)
-        datastack = slicecls(data, dtype=dtype,
-                             readonly=True, **kwargs)
-        chunkItems = datastack.items(keyType='select')
-        if fitmodel is not None:
-            modelstack = slicecls(fitmodel, dtype=dtype,
-                                  readonly=False, **kwargs)
-            modeliter = modelstack.items()
-            chunkItems = McaStackView.izipChunkItems(chunkItems, modeliter)
-        return chunkItems
+        datastack = slicecls(data, dtype=dtype, readonly=True, **kwargs)
+        copy = copy or prefetch
+
+        def chunks():
+            for key, chunk in datastack.items(keyType='select'):
+                if copy:
+                    chunk = chunk.copy()
+                chunk = chunk.T
+                if ysum is not None:
+                    ysum[()] += numpy.add.reduce(chunk, axis=1,
+                                                 dtype=numpy.float64)
+                yield key, chunk
+
+        if prefetch:
+            return ExecutorUtils.prefetch(chunks())
+        else:
+            return chunks()
+
+    def _fitChunkIter(self, slicecls, data=None, fitmodel=None, A=None,
+                      config=None, anchorslist=None, lstsq_kwargs=None,
+                      executor=None, nworkers=None, prefetch=False,
+                      ysum=None, **kwargs):
+        """
+        Fit chunks of spectra with the linear model A. The fit model (if any)
+        is written in fitmodel. With an executor, chunks are fitted in parallel
+        but still yielded in the same order as the serial fit.
+
+        :yields tuple: (idx, idxShape), lstsq result dictionary
+        """
+        if not config['fit']['stripflag']:
+            anchorslist = None
+        chunkItems = self._dataChunkIter(slicecls, data=data,
+                                         prefetch=prefetch, ysum=ysum,
+                                         copy=executor is not None,
+                                         **kwargs)
+        if fitmodel is None:
+            modelItems = None
+        else:
+            dtype = self._fitDtypeResult(data)
+            modelstack = slicecls(fitmodel, dtype=dtype, readonly=False,
+                                  **kwargs)
+            modelItems = modelstack.items()
+
+        if executor is None:
+            for key, chunk in chunkItems:
+                if modelItems is None:
+                    chunkModel = None
+                else:
+                    _, chunkModel = next(modelItems)
+                    chunkModel = chunkModel.T
+                ddict = _fitLstSqChunk(chunk, A, lstsq_kwargs,
+                                       config=config, anchorslist=anchorslist,
+                                       fitmodel=chunkModel)
+                lstsq_kwargs['last_svd'] = ddict.get('svd', None)
+                yield key, ddict
+            if modelItems is not None:
+                # write back the last chunk of the fit model
+                next(modelItems, None)
+            return
+
+        # Write the fit model back in chunk order
+        returnModel = True if modelItems is not None else None
+        pending = collections.deque()
+
+        def collect():
+            key, future = pending.popleft()
+            ddict = future.result()
+            if modelItems is not None:
+                _, chunkModel = next(modelItems)
+                chunkModel[()] = ddict.pop('model').T
+            return key, ddict
+
+        first = True
+        for key, chunk in chunkItems:
+            if first:
+                # The first chunk provides the SVD shared by all workers
+                first = False
+                ddict = _fitLstSqChunk(chunk, A, lstsq_kwargs,
+                                       config=config, anchorslist=anchorslist,
+                                       fitmodel=returnModel)
+                lstsq_kwargs['last_svd'] = ddict.get('svd', None)
+                future = ExecutorUtils.DoneFuture(ddict)
+            else:
+                future = executor.submit(_fitLstSqChunk, chunk, A,
+                                         lstsq_kwargs, config=config,
+                                         anchorslist=anchorslist,
+                                         fitmodel=returnModel,
+                                         svd=False)
+            pending.append((key, future))
+            if len(pending) > 2 * nworkers:
+                yield collect()
+        while pending:
+            yield collect()
+        if modelItems is not None:
+            # write back the last chunk of the fit model
+            next(modelItems, None)
 
     def _fitLstSqAll(self, data=None, sliceChan=None, mcaIndex=None,
                      derivatives=None, results=None, uncertainties=None,
                      fitmodel=None, config=None, anchorslist=None,
-                     lstsq_kwargs=None):
+                     lstsq_kwargs=None, executor=None, nworkers=None,
+                     prefetch=False, ysum=None):
         """
-        Fit all spectra
+        Fit all spectra (and add them to ysum when provided)
         """
         nChan, nFree = derivatives.shape
-        bkgsub = bool(config['fit']['stripflag'])
 
-        nMca = 1, 'MB'
+        # Block size and alignment from the storage layout (the fit model
+        # uses the same slicing)
+        nMca, nativeChunks = self._fitChunkPlan(data, mcaIndex=mcaIndex,
+                                                sliceChan=sliceChan)
         _logger.debug('Fit spectra in chunks of {}'.format(nMca))
-        chunkItems = self._dataChunkIter(McaStackView.FullView,
-                                         data=data,
-                                         fitmodel=fitmodel,
-                                         mcaSlice=sliceChan,
-                                         mcaAxis=mcaIndex,
-                                         nMca=nMca)
-        for chunk in chunkItems:
-            if fitmodel is None:
-                (idx, idxShape), chunk = chunk
-                chunkModel = None
-            else:
-                ((idx, idxShape), chunk), (_, chunkModel) = chunk
-                chunkModel = chunkModel.T
-            chunk = chunk.T
-
-            # Subtract background
-            if bkgsub:
-                self._fitBkgSubtract(chunk, config=config,
-                                     anchorslist=anchorslist,
-                                     fitmodel=chunkModel)
-
-            # Solve linear system of equations
-            ddict = lstsq(derivatives, chunk, digested_output=True,
-                          **lstsq_kwargs)
-            lstsq_kwargs['last_svd'] = ddict.get('svd', None)
-
+        chunkItems = self._fitChunkIter(McaStackView.FullView,
+                                        data=data,
+                                        fitmodel=fitmodel,
+                                        A=derivatives,
+                                        config=config,
+                                        anchorslist=anchorslist,
+                                        lstsq_kwargs=lstsq_kwargs,
+                                        executor=executor,
+                                        nworkers=nworkers,
+                                        prefetch=prefetch,
+                                        ysum=ysum,
+                                        nativeChunks=nativeChunks,
+                                        mcaSlice=sliceChan,
+                                        mcaAxis=mcaIndex,
+                                        nMca=nMca)
+        for (idx, idxShape), ddict in chunkItems:
             # Save results
             idx = (slice(None),) + idx
             idxShape = (nFree,) + idxShape
             results[idx] = ddict['parameters'].reshape(idxShape)
             uncertainties[idx] = ddict['uncertainties'].reshape(idxShape)
-            if chunkModel is not None:
-                if bkgsub:
-                    chunkModel += numpy.dot(derivatives, ddict['parameters'])
-                else:
-                    chunkModel[()] = numpy.dot(derivatives, ddict['parameters'])
 
     def _fitLstSqReduced(self, data=None, sliceChan=None, mcaIndex=None,
                          derivatives=None, results=None, uncertainties=None,
                          fitmodel=None, config=None, anchorslist=None,
                          lstsq_kwargs=None, mask=None,
                          skipNames=None, skipParams=None,
-                         nFreeParameters=None, nmin=None):
+                         nFreeParameters=None, nmin=None,
+                         executor=None, nworkers=None, prefetch=False):
         """
         Fit reduced number of spectra (mask) with a reduced model (skipped parameters will be set to zero)
         """
@@ -685,34 +920,21 @@ def _fitLstSqReduced(self, data=None, sliceChan=None, mcaIndex=None,
             lstsq_kwargs['last_svd'] = None
 
             # Fit all selected spectra in one chunk
-            bkgsub = bool(config['fit']['stripflag'])
-            chunkItems = self._dataChunkIter(McaStackView.MaskedView,
-                                             data=data,
-                                             fitmodel=fitmodel,
-                                             mask=mask,
-                                             mcaSlice=sliceChan,
-                                             mcaAxis=mcaIndex,
-                                             nMca=nMca)
-            for chunk in chunkItems:
-                if fitmodel is None:
-                    (idx, idxShape), chunk = chunk
-                    chunkModel = None
-                else:
-                    ((idx, idxShape), chunk), (_, chunkModel) = chunk
-                    chunkModel = chunkModel.T
-                chunk = chunk.T
-
-                # Subtract background
-                if bkgsub:
-                    self._fitBkgSubtract(chunk, config=config,
-                                         anchorslist=anchorslist,
-                                         fitmodel=chunkModel)
-
-                # Solve linear system of equations
-                ddict = lstsq(A, chunk, digested_output=True,
-                              **lstsq_kwargs)
-                lstsq_kwargs['last_svd'] = ddict.get('svd', None)
-
+            chunkItems = self._fitChunkIter(McaStackView.MaskedView,
+                                            data=data,
+                                            fitmodel=fitmodel,
+                                            A=A,
+                                            config=config,
+                                            anchorslist=anchorslist,
+                                            lstsq_kwargs=lstsq_kwargs,
+                                            executor=executor,
+                                            nworkers=nworkers,
+                                            prefetch=prefetch,
+                                            mask=mask,
+                                            mcaSlice=sliceChan,
+                                            mcaAxis=mcaIndex,
+                                            nMca=nMca)
+            for (idx, idxShape), ddict in chunkItems:
                 # Save results
                 iParam = 0
                 for iFree in range(nFreeOrg):
@@ -725,14 +947,19 @@ def _fitLstSqReduced(self, data=None, sliceChan=None, mcaIndex=None,
                         uncertainties[iFree][idx] = ddict['uncertainties'][iParam]\
                                                 .reshape(idxShape)
                         iParam += 1
-                if chunkModel is not None:
-                    if bkgsub:
-                        chunkModel += numpy.dot(A, ddict['parameters'])
-                    else:
-                        chunkModel[()] = numpy.dot(A, ddict['parameters'])
                 if nFreeParameters is not None:
                     nFreeParameters[idx] = nFree
 
+    def _fitChunkPlan(self, data, mcaIndex=None, sliceChan=None):
+        """Number of spectra fitted at once and the storage chunks to which
+        the blocks are aligned (None for numpy arrays)
+        """
+        if isinstance(data, numpy.ndarray):
+            return (1, 'MB'), None
+        return McaStackView.chunkPlan(data, mcaAxis=mcaIndex,
+                                      mcaSlice=sliceChan,
+                                      dtype=self._fitDtypeResult(data))
+
     @staticmethod
     def _fitDtypeResult(data):
         if data.dtype not in [numpy.float32, numpy.float64]:
@@ -755,26 +982,14 @@ def _fitDtypeCalculation(data):
     def _fitBkgSubtract(spectra, config=None, anchorslist=None, fitmodel=None):
         """Subtract brackground from data and add it to fit model
         """
-        for k in range(spectra.shape[1]):
-            # obtain the smoothed spectrum
-            background = SpecfitFuns.SavitskyGolay(spectra[:, k],
-                                    config['fit']['stripfilterwidth'])
-            lastAnchor = 0
-            for anchor in anchorslist:
-                if (anchor > lastAnchor) and (anchor < background.size):
-                    background[lastAnchor:anchor] =\
-                            SpecfitFuns.snip1d(background[lastAnchor:anchor],
-                                               config['fit']['snipwidth'],
-                                               0)
-                    lastAnchor = anchor
-            if lastAnchor < background.size:
-                background[lastAnchor:] =\
-                        SpecfitFuns.snip1d(background[lastAnchor:],
-                                           config['fit']['snipwidth'],
-                                           0)
-            spectra[:, k] -= background
-            if fitmodel is not None:
-                fitmodel[:, k] = background
+        # one spectrum per row for the background kernel
+        background = SpecfitFuns.snipbackground(spectra.T,
+                                                config['fit']['snipwidth'],
+                                                config['fit']['stripfilterwidth'],
+                                                anchorslist).T
+        spectra -= background
+        if fitmodel is not None:
+            fitmodel[()] = background
 
     def _fitLstSqNegative(self, data=None, freeNames=None, nFreeBkg=None,
                           results=None, **kwargs):
@@ -839,8 +1054,14 @@ def _fitLstSqNegative(self, data=None, freeNames=None, nFreeBkg=None,
             iIter += 1
 
     def _fitDeriveMassFractions(self, config=None, results=None, nFreeBkg=None,
-                                autotime=None, liveTimeFactor=None):
+                                autotime=None, liveTimeFactor=None,
+                                matrixcorrection=False, nworkers=None,
+                                executor=None):
         """Calculate concentrations from peak areas
+
+        The concentrations are proportional to the peak areas unless
+        `matrixcorrection` is set, in which case the absorption of each
+        pixel is calculated from its own composition.
         """
         # check if an internal reference is used and if it is set to auto
         cTool = ConcentrationsTool.ConcentrationsTool()
@@ -971,9 +1192,64 @@ def _fitDeriveMassFractions(self, config=None, results=None, nFreeBkg=None,
                             ((referenceArea/fitresult['result'][group]['fitarea']) *\
                             (concentrationsResult[layer]['mass fraction'][group]))
                         counter += 1
+        if matrixcorrection:
+            t0 = time.time()
+            if referenceElement in ["", None, "None"]:
+                referenceGroup = None
+            else:
+                referenceGroup = testGroup
+            table = MatrixCorrection.MatrixCorrectionTable(config, labels,
+                                                           reference=referenceGroup)
+            MatrixCorrection.correctMassFractions(table, massFractions,
+                                                  nworkers=nworkers,
+                                                  executor=executor)
+            _logger.debug("Matrix correction elapsed = %f", time.time() - t0)
         return labels, massFractions
 
 
+def _fitLstSqChunk(spectra, A, lstsq_kwargs, config=None, anchorslist=None,
+                   fitmodel=None, svd=True):
+    """
+    Fit a chunk of spectra with a linear model (module level so it can be
+    executed by a process pool)
+
+    :param array spectra: nChan x nSpectra (modified when subtracting the background)
+    :param array A: linear model nChan x nFree
+    :param dict lstsq_kwargs:
+    :param dict config: fit configuration
+    :param list anchorslist: background anchors (None: no background subtraction)
+    :param fitmodel: nChan x nSpectra buffer for the fit model, None or True to
+                     allocate it and return it in the result
+    :param bool svd: return the SVD of the (weighted) model when available
+    :returns dict: see lstsq
+    """
+    returnModel = fitmodel is True
+    if returnModel:
+        fitmodel = numpy.zeros_like(spectra)
+    bkgsub = anchorslist is not None
+
+    # Subtract background
+    if bkgsub:
+        FastXRFLinearFit._fitBkgSubtract(spectra, config=config,
+                                         anchorslist=anchorslist,
+                                         fitmodel=fitmodel)
+
+    # Solve linear system of equations
+    ddict = lstsq(A, spectra, digested_output=True, **lstsq_kwargs)
+
+    # Fit model
+    if fitmodel is not None:
+        if bkgsub:
+            fitmodel += numpy.dot(A, ddict['parameters'])
+        else:
+            fitmodel[()] = numpy.dot(A, ddict['parameters'])
+    if returnModel:
+        ddict['model'] = fitmodel
+    if not svd:
+        ddict.pop('svd', None)
+    return ddict
+
+
 def getFileListFromPattern(pattern, begin, end, increment=None):
     if type(begin) == type(1):
         begin = [begin]
@@ -1008,18 +1284,22 @@ def getFileListFromPattern(pattern, begin, end, increment=None):
     return fileList
 
 
-def prepareDataStack(fileList):
+def prepareDataStack(fileList, streaming=False):
+    """
+    :param list fileList: EDF files or one HDF5 dataset (file::path)
+    :param bool streaming: do not load an HDF5 dataset in memory but read
+                           it chunk by chunk while fitting
+    """
     if (not os.path.exists(fileList[0])) and \
         os.path.exists(fileList[0].split("::")[0]):
         # odo convention to get a dataset form an HDF5
         fname, dataPath = fileList[0].split("::")
         # compared to the ROI imaging tool, this way of reading puts data
         # into memory while with the ROI imaging tool, there is a check.
-        if 0:
-            import h5py
+        if streaming:
+            # the file stays open while the dataset is referenced
             h5 = h5py.File(fname, "r")
-            dataStack = h5[dataPath][:]
-            h5.close()
+            dataStack = h5[dataPath]
         else:
             from PyMca5.PyMcaIO import HDF5Stack1D
             # this way reads information associated to the dataset (if present)
@@ -1052,7 +1332,8 @@ def main():
                    'tif=', 'edf=', 'csv=', 'h5=', 'dat=',
                    'filepattern=', 'begin=', 'end=', 'increment=',
                    'outroot=', 'outentry=', 'outprocess=',
-                   'diagnostics=', 'debug=', 'overwrite=', 'multipage=']
+                   'diagnostics=', 'debug=', 'overwrite=', 'multipage=',
+                   'nworkers=', 'executor=', 'cachedir=', 'streaming=']
     try:
         opts, args = getopt.getopt(
                      sys.argv[1:],
@@ -1082,6 +1363,10 @@ def main():
     debug = 0
     overwrite = 1
     multipage = 0
+    nworkers = None
+    executor = None
+    cachedir = None
+    streaming = 0
     for opt, arg in opts:
         if opt == '--cfg':
             configurationFile = arg
@@ -1135,6 +1420,14 @@ def main():
             overwrite = int(arg)
         elif opt == '--multipage':
             multipage = int(arg)
+        elif opt == '--nworkers':
+            nworkers = int(arg)
+        elif opt == '--executor':
+            executor = arg
+        elif opt == '--cachedir':
+            cachedir = arg
+        elif opt == '--streaming':
+            streaming = int(arg)
 
     logging.basicConfig()
     if debug:
@@ -1153,7 +1446,7 @@ def main():
         refit = 0
         _logger.warning("--refit=%d taken as default" % refit)
     if len(fileList):
-        dataStack = prepareDataStack(fileList)
+        dataStack = prepareDataStack(fileList, streaming=streaming)
     else:
         print("OPTIONS:", longoptions)
         sys.exit(0)
@@ -1161,7 +1454,7 @@ def main():
         print("RESULTS WILL NOT BE SAVED: No output directory specified")
 
     t0 = time.time()
-    fastFit = FastXRFLinearFit()
+    fastFit = FastXRFLinearFit(cachedir=cachedir)
     fastFit.setFitConfigurationFile(configurationFile)
     print("Main configuring Elapsed = % s " % (time.time() - t0))
 
@@ -1182,7 +1475,9 @@ def main():
                                                 weight=weight,
                                                 refit=refit,
                                                 concentrations=concentrations,
-                                                outbuffer=outbuffer)
+                                                outbuffer=outbuffer,
+                                                nworkers=nworkers,
+                                                executor=executor)
         print("Total Elapsed = % s " % (time.time() - t0))
 
 
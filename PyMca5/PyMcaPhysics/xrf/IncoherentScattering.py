@@ -33,6 +33,7 @@
 import os
 import numpy
 from PyMca5.PyMcaIO import ConfigDict
+from PyMca5.PyMcaMisc import DiskCache
 from PyMca5 import PyMcaDataDir
 
 ElementList= ['H','He','Li','Be','B','C','N','O','F','Ne',
@@ -62,8 +63,13 @@
         print("Cannot find file ", ffile)
         raise IOError("Cannot find file %s" % ffile)
 
-COEFFICIENTS = ConfigDict.ConfigDict()
-COEFFICIENTS.read(ffile)
+def _readCoefficients():
+    coefficients = ConfigDict.ConfigDict()
+    coefficients.read(ffile)
+    return coefficients
+
+COEFFICIENTS = DiskCache.cachedTables("incoh", [ffile], _readCoefficients,
+                                      factory=ConfigDict.ConfigDict)
 xvalues = COEFFICIENTS['ISCADT']['XSVAL']
 svalues = numpy.reshape(COEFFICIENTS['ISCADT']['SCATF'], (100, len(xvalues)))
 #svalues = COEFFICIENTS['ISCADT']['SCATF']
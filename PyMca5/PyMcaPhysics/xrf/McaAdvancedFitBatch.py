@@ -33,7 +33,10 @@
 import sys
 import os
 import time
+import uuid
 import logging
+import threading
+import collections
 import numpy
 from . import ClassMcaTheory
 from PyMca5.PyMcaCore import SpecFileLayer
@@ -53,10 +56,14 @@
 from PyMca5.PyMcaIO import ConfigDict
 from . import ConcentrationsTool
 from .XRFBatchFitOutput import OutputBuffer
+from PyMca5.PyMcaMisc import ExecutorUtils
 
 
 _logger = logging.getLogger(__name__)
 
+# McaAdvancedFitBatch instance of each pool worker (thread or process)
+_poolWorkerLocal = threading.local()
+
 
 def getRootName(filelist=None):
     if filelist is None:
@@ -118,6 +125,7 @@ def __init__(self, initdict, filelist=None, outputdir=None,
                  mcaoffset=0, chunk=None,
                  selection=None, lock=None, nosave=None,
                  quiet=False, outbuffer=None,
+                 nworkers=None, executor='process',
                  **outbufferkwargs):
         """
         Range of filelist indices to be processed:
@@ -132,6 +140,14 @@ def __init__(self, initdict, filelist=None, outputdir=None,
 
             range(mcaoffset, nColumns, mcastep)
 
+        Spectra are fitted by `nworkers` workers (None or 1: serial,
+        0: one per CPU) when the fit does not produce FIT files and uses a
+        single configuration. Each worker keeps one configured McaTheory
+        instance and the results are stored in the output buffer of
+        this instance.
+
+        :param int nworkers:
+        :param executor: 'process', 'thread' or concurrent.futures.Executor
         """
         #for the time being the concentrations are bound to the .fit files
         #that is not necessary, but it will be correctly implemented in
@@ -157,6 +173,10 @@ def __init__(self, initdict, filelist=None, outputdir=None,
         self.mcaStep = mcastep
         self.mcaOffset = mcaoffset
         self.chunk = chunk
+        self.nworkers = nworkers
+        self.executor = executor
+        self._pool = None
+        self._digestData = False
 
         if isinstance(initdict, list):
             self.mcafit = ClassMcaTheory.McaTheory(initdict[mcaoffset])
@@ -265,6 +285,27 @@ def _processList(self):
         self.__stack = None
         self._fitlistfile = None
 
+        with ExecutorUtils.executorContext(self.nworkers,
+                                           self.executor) as (pool, nworkers):
+            if pool is not None and self._poolSupported():
+                self._pool = pool
+                self._poolWorkers = nworkers
+                # the workers reuse their fit instance during this call
+                self._poolToken = uuid.uuid4().hex
+            try:
+                self.__processFileList()
+            finally:
+                self._poolDrain()
+                self._pool = None
+
+        if self.counter:
+            # Finish list of FIT files
+            if not self.roiFit and self.fitFiles and \
+                self._fitlistfile is not None:
+                    self._fitlistfile.write(']\n')
+                    self._fitlistfile.close()
+
+    def __processFileList(self):
         # Loop over the files in filelist (1 file = 1 row in image)
         start = self.fileBeginOffset
         stop = len(self._filelist)-self.fileEndOffset
@@ -310,13 +351,6 @@ def _processList(self):
             # Needed for cleanup
             self.filehandle = None
 
-        if self.counter:
-            # Finish list of FIT files
-            if not self.roiFit and self.fitFiles and \
-                self._fitlistfile is not None:
-                    self._fitlistfile.write(']\n')
-                    self._fitlistfile.close()
-
     def getFileHandle(self, inputfile):
         try:
             self._HDF5 = False
@@ -658,16 +692,25 @@ def os_path_join(self, a, b):
     def __processOneMca(self,x,y,filename,key,info=None):
         if not self.__nrows:
             self.__nrows = len(self._filelist)
+        if self._pool is not None:
+            self._poolSubmit(x, y, filename, key, info)
+            return
+        if self.roiFit:
+            result = self.__roiOneMca(x,y)
+            concentrations = None
+        else:
+            result, concentrations = self.__fitOneMca(x,y,filename,key,info=info)
+        self.__storeOneMca(x, y, filename, info, result, concentrations)
+
+    def __storeOneMca(self, x, y, filename, info, result, concentrations):
         bOutput = self.outbuffer is not None and \
                   self.__ncols and self.__nrows
         if self.roiFit:
-            result = self.__roiOneMca(x,y)
             if bOutput and result is not None:
                 if not self.outbuffer.hasAllocatedMemory():
                     self._allocateMemoryRoiFit(result)
                 self._storeRoiFitResult(result)
         else:
-            result, concentrations = self.__fitOneMca(x,y,filename,key,info=info)
             if bOutput and result is not None:
                 result['ydata0'] = y
                 if not self.outbuffer.hasAllocatedMemory():
@@ -676,6 +719,9 @@ def __processOneMca(self,x,y,filename,key,info=None):
                         # the memory allocation crashes the program
                         _logger.error("Cannot allocate memory due to error on concentrations")
                     else:
+                        if self._pool is not None and self.outbuffer.diagnostics:
+                            # The fit range is taken from the data
+                            self._attemptMcaLoad(x, y, filename, info=info)
                         self._allocateMemoryFit(result, concentrations)
                         self._storeFitResult(result, concentrations)
                         _logger.info("Memory allocated")
@@ -683,6 +729,121 @@ def __processOneMca(self,x,y,filename,key,info=None):
                     self._storeFitResult(result, concentrations)
         self.counter += 1
 
+    _poolTaskSize = 32
+
+    def _poolSupported(self):
+        """Spectra can be fitted by pool workers
+        """
+        if self.fitFiles or len(self.__configList) > 1:
+            _logger.warning("FIT files and multiple configurations "
+                            "require fitting serially")
+            return False
+        return True
+
+    def _poolWorkerKwargs(self):
+        """Arguments to instantiate the McaAdvancedFitBatch of a pool worker
+        """
+        kwargs = {'initdict': self.__configList[0],
+                  'outputdir': self.outputdir,
+                  'roifit': self.roiFit,
+                  'roiwidth': self.roiWidth,
+                  'overwrite': self.overwrite,
+                  'concentrations': self._concentrations,
+                  'fitfiles': 0,
+                  'fitconcfile': 0,
+                  'fitimages': 0,
+                  'quiet': True}
+        digestData = False
+        if self.outbuffer is not None:
+            digestData = self.outbuffer.saveDataDiagnostics
+        return kwargs, digestData
+
+    def _poolSubmit(self, x, y, filename, key, info):
+        """Add a spectrum to the current task. A task consists of spectra
+        from the same image row.
+        """
+        # storing finished tasks while flushing moves the current position
+        row, col = self.__row, self.__col
+        batch = self._poolBatch
+        if batch:
+            if batch[-1][-2] != row or len(batch) >= self._poolTaskSize:
+                self._poolFlush()
+        self._poolBatch.append((x, y, filename, key, info, row, col))
+
+    def _poolFlush(self):
+        """Send the current task to the pool and store the results of
+        the oldest tasks when too many are pending.
+        """
+        if self._pool is None or not self._poolBatch:
+            return
+        mcaList = self._poolBatch
+        self._poolBatch = []
+        args = [mca[:5] for mca in mcaList]
+        kwargs, digestData = self._poolWorkerKwargs()
+        future = self._pool.submit(_poolFitMcaList, self._poolToken,
+                                   kwargs, digestData, args)
+        self._poolPending.append((mcaList, future))
+        while len(self._poolPending) > 2 * self._poolWorkers:
+            self._poolStoreNext()
+
+    def _poolStoreNext(self):
+        """Store the results of the oldest pending task. The position of
+        the spectrum being read is restored afterwards.
+        """
+        mcaList, future = self._poolPending.popleft()
+        position = self.__row, self.__col
+        try:
+            for mca, (result, concentrations) in zip(mcaList,
+                                                      future.result()):
+                x, y, filename, key, info, self.__row, self.__col = mca
+                if not self.roiFit:
+                    self._updateConcFile(concentrations, filename, key)
+                self.__storeOneMca(x, y, filename, info, result,
+                                   concentrations)
+        finally:
+            self.__row, self.__col = position
+
+    def _poolDrain(self):
+        """Store the results of all tasks
+        """
+        try:
+            self._poolFlush()
+            while self._poolPending:
+                self._poolStoreNext()
+        finally:
+            self._poolBatch = []
+            self._poolPending = collections.deque()
+
+    @property
+    def _pool(self):
+        return self.__pool
+
+    @_pool.setter
+    def _pool(self, value):
+        self.__pool = value
+        self._poolBatch = []
+        self._poolPending = collections.deque()
+
+    def _poolFitMca(self, x, y, filename, key, info):
+        """Fit one spectrum in a pool worker. The fit result is reduced
+        to what is stored in the output buffer.
+        """
+        if self.roiFit:
+            return self.__roiOneMca(x, y), None
+        result, concentrations = self.__fitOneMca(x, y, filename, key,
+                                                  info=info)
+        if result is not None:
+            groups = result['groups']
+            imagingResult = {'groups': groups, 'chisq': result['chisq']}
+            for group in groups:
+                imagingResult[group] = {'fitarea': result[group]['fitarea'],
+                                        'sigmaarea': result[group]['sigmaarea']}
+            for name in ('yfit', 'ydata'):
+                if name in result:
+                    imagingResult[name] = result[name]
+            result = imagingResult
+        return result, concentrations
+
     def __fitOneMca(self,x,y,filename,key,info=None):
         fitresult = None
         result = None
@@ -772,7 +933,7 @@ def _fitMca(self, filename):
         try:
             self.mcafit.estimate()
             # Avoid digest=1 when possible (slow but more detailed information)
-            digest = self.fitFiles or\
+            digest = self.fitFiles or self._digestData or\
                      (self._concentrations and (self.mcafit._fluoRates is None))
             if self.outbuffer is not None:
                 # TODO: we need a full digest although only yfit and ydata
@@ -1106,6 +1267,34 @@ def _storeRoiFitResult(self, result):
             output[i, self.__row, self.__col] = result[group][roi+' ROI']
 
 
+def _poolWorker(token, kwargs, digestData):
+    """McaAdvancedFitBatch instance of the current pool worker
+
+    :param str token: identifies the McaAdvancedFitBatch.processList call
+                      which submitted the task
+    :param dict kwargs: see McaAdvancedFitBatch._poolWorkerKwargs
+    :param bool digestData: the fitted spectrum is needed
+    """
+    worker = getattr(_poolWorkerLocal, 'worker', None)
+    if worker is None or _poolWorkerLocal.token != token:
+        worker = McaAdvancedFitBatch(**kwargs)
+        worker.mcafit.enableOptimizedLinearFit()
+        worker._digestData = digestData
+        _poolWorkerLocal.worker = worker
+        _poolWorkerLocal.token = token
+    return worker
+
+
+def _poolFitMcaList(token, kwargs, digestData, mcaList):
+    """Fit spectra in a pool worker
+
+    :param list mcaList: x, y, filename, key, info of each spectrum
+    :returns list: result and concentrations of each spectrum
+    """
+    worker = _poolWorker(token, kwargs, digestData)
+    return [worker._poolFitMca(*mca) for mca in mcaList]
+
+
 def main():
     import getopt
     options = 'f'
@@ -1113,7 +1302,7 @@ def main():
                    'roiwidth=', 'concentrations=', 'overwrite=',
                    'outroot=', 'outentry=', 'outprocess=',
                    'edf=', 'h5=', 'csv=', 'tif=', 'dat=',
-                   'diagnostics=', 'debug=', 'multipage=']
+                   'diagnostics=', 'debug=', 'multipage=', 'nworkers=']
     filelist = None
     cfg = None
     roifit = 0
@@ -1124,6 +1313,7 @@ def main():
     h5 = 1
     dat = 0
     multipage = 0
+    nworkers = None
     debug = 0
     outputDir = None
     concentrations = 0
@@ -1179,6 +1369,8 @@ def main():
             dat = int(arg)
         elif opt == '--multipage':
             multipage = int(arg)
+        elif opt == '--nworkers':
+            nworkers = int(arg)
 
     logging.basicConfig()
     if debug:
@@ -1211,7 +1403,8 @@ def main():
                                 roiwidth=roiwidth,
                                 concentrations=concentrations,
                                 outbuffer=outbuffer,
-                                overwrite=overwrite)
+                                overwrite=overwrite,
+                                nworkers=nworkers)
         b.processList()
         print("Total Elapsed = % s " % (time.time() - t0))
 
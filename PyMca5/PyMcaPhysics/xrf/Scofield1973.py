@@ -33,8 +33,17 @@
 import sys
 import os
 from PyMca5.PyMcaIO import ConfigDict
+from PyMca5.PyMcaMisc import DiskCache
 from PyMca5 import getDataFile
 
-dict = ConfigDict.ConfigDict()
+
+def _readDictFile():
+    ddict = ConfigDict.ConfigDict()
+    ddict.read(dictfile)
+    return ddict
+
 dictfile = getDataFile("Scofield1973.dict")
-dict.read(dictfile)
+# parsing the text file is slow, the element tables are cached in binary form
+# when PYMCA_CACHE_DIR is set
+dict = DiskCache.cachedTables("Scofield1973", [dictfile], _readDictFile,
+                              factory=ConfigDict.ConfigDict)
@@ -434,13 +434,11 @@ def calculateShiftsFFT(self, stack, reference, offsets=None, widths=None, crop=F
             offsets = [0.0, 0.0]
         if widths is None:
             widths = [reference.shape[0], reference.shape[1]]
-        fft2Function = numpy.fft.fft2
         if 1:
             DTYPE = numpy.float32
         else:
             DTYPE = numpy.float64
-        image2 = numpy.zeros((widths[0], widths[1]), dtype=DTYPE)
-        shape = image2.shape
+        shape = widths[0], widths[1]
 
         USE_APODIZATION_WINDOW = False
         apo = [10, 10]
@@ -453,37 +451,20 @@ def calculateShiftsFFT(self, stack, reference, offsets=None, widths=None, crop=F
         else:
             window = numpy.zeros((shape[0], shape[1]), dtype=DTYPE)
             window[apo[0]:shape[0] - apo[0], apo[1]:shape[1] - apo[1]] = 1
-        image2[:,:] = window * reference[offsets[0]:offsets[0]+widths[0],
-                                         offsets[1]:offsets[1]+widths[1]]
-        image2fft2 = fft2Function(image2)
         mcaIndex = stack.info.get('McaIndex')
-        shifts = numpy.zeros((data.shape[mcaIndex], 2), numpy.float64)
-        image1 = numpy.zeros(image2.shape, dtype=DTYPE)
-        total = float(data.shape[mcaIndex])
-        if mcaIndex == 0:
-            for i in range(data.shape[mcaIndex]):
-                image1[:,:] = window * data[i][offsets[0]:offsets[0]+widths[0],
-                                               offsets[1]:offsets[1]+widths[1]]
-
-                image1fft2 = fft2Function(image1)
-                shifts[i] = ImageRegistration.measure_offset_from_ffts(image2fft2,
-                                                                       image1fft2)
-                _logger.debug("Index = %d shift = %.4f, %.4f",
-                              i, shifts[i][0], shifts[i][1])
-                self._progress = (100 * i) / total
-        elif mcaIndex in [2, -1]:
-            for i in range(data.shape[mcaIndex]):
-                image1[:,:] = window * data[:,:,i][offsets[0]:offsets[0]+widths[0],
-                                               offsets[1]:offsets[1]+widths[1]]
-
-                image1fft2 = fft2Function(image1)
-                shifts[i] = ImageRegistration.measure_offset_from_ffts(image2fft2,
-                                                                       image1fft2)
-                _logger.debug("Index = %d shift = %.4f, %.4f",
-                              i, shifts[i][0], shifts[i][1])
-                self._progress = (100 * i) / total
-        else:
+        if mcaIndex not in [0, 2, -1]:
             raise IndexError("Only stacks of images or spectra supported. 1D index should be 0 or 2")
+        shifts = ImageRegistration.calculate_shifts(data,
+                                                    reference,
+                                                    imageAxis=mcaIndex,
+                                                    offsets=offsets,
+                                                    widths=widths,
+                                                    window=window,
+                                                    nworkers=0,
+                                                    callback=self._progressCallback)
+        for i in range(shifts.shape[0]):
+            _logger.debug("Index = %d shift = %.4f, %.4f",
+                          i, shifts[i][0], shifts[i][1])
         return shifts
 
     def _shiftFromFile(self):
@@ -638,14 +619,7 @@ def shiftStack(self, stack, shifts, crop=False, filename=None):
             shape = data[mcaIndex].shape
         else:
             shape = data.shape[0], data.shape[1]
-        d0_start, d0_end, d1_start, d1_end = \
-                  ImageRegistration.get_crop_indices(shape,
-                                                     shifts[:, 0],
-                                                     shifts[:, 1])
-        window = numpy.zeros(shape, numpy.float32)
-        window[d0_start:d0_end, d1_start:d1_end] = 1.0
         self._progress = 0.0
-        total = float(data.shape[mcaIndex])
         if filename is not None:
             hdf = self.__hdf5
             dataGroup = hdf['/entry_000/Data']
@@ -659,23 +633,18 @@ def shiftStack(self, stack, shifts, crop=False, filename=None):
                                                       name="data",
                                                       dtype=numpy.float32,
                                                       attributes=attributes)
-        for i in range(data.shape[mcaIndex]):
-            #tmpImage = ImageRegistration.shiftFFT(data[i], shifts[i])
-            if mcaIndex == 0:
-                tmpImage = ImageRegistration.shiftBilinear(data[i], shifts[i])
-                #tmpImage = ImageRegistration.shiftImage(data[i], -shifts[i], method="fft")
-                if filename is None:
-                    stack.data[i] = tmpImage * window
-                else:
-                    outputStack[i] = tmpImage * window
-            else:
-                tmpImage = ImageRegistration.shiftBilinear(data[:,:,i], shifts[i])
-                if filename is None:
-                    stack.data[:, :, i] = tmpImage * window
-                else:
-                    outputStack[i] = tmpImage * window
-            _logger.debug("Index %d bilinear shifted", i)
-            self._progress = (100 * i) / total
+        else:
+            outputStack = stack.data
+        ImageRegistration.shift_stack(data,
+                                      shifts,
+                                      imageAxis=mcaIndex,
+                                      output=outputStack,
+                                      method="pymca",
+                                      nworkers=0,
+                                      callback=self._progressCallback)
+
+    def _progressCallback(self, done, total):
+        self._progress = (100 * done) / float(total)
 
     def initializeHDF5File(self, fname):
         #for the time being overwriting
@@ -64,6 +64,7 @@
 from PyMca5.PyMcaGui.misc import CalculationThread
 
 from PyMca5.PyMcaGui.math.NNMAWindow import NNMAParametersDialog
+from PyMca5.PyMcaMath.mva import NNMAModule
 from PyMca5.PyMcaGui import StackPluginResultsWindow
 from PyMca5.PyMcaGui import PyMca_Icons
 
@@ -226,7 +227,8 @@ def actualCalculation(self):
 
         oldShape = stack.data.shape
         mcaIndex = stack.info.get('McaIndex')
-        if mcaIndex == 0:
+        if (mcaIndex == 0) and \
+           (ddict.get('function') not in NNMAModule.chunked_function_list):
             # image stack. We need a copy
             _logger.info("NNMAStackPlugin converting to stack of spectra")
             data = numpy.zeros(oldShape[1:] + oldShape[0:1], dtype=numpy.float32)
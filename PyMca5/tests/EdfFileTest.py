@@ -116,6 +116,144 @@ def testEdfFileReadWrite(self):
         edf =None
         gc.collect()
 
+    def testEdfFileMemmap(self):
+        self.assertTrue(self.fileClass is not None)
+        data = numpy.arange(10000).astype(numpy.int32)
+        data.shape = 100, 100
+        edf = self.fileClass(self.fname, 'wb+')
+        edf.WriteImage({'Title': "title"}, data, ByteOrder="HighByteFirst")
+        edf.WriteImage({'Title': "title2"}, data.astype(numpy.float64),
+                       Append=1)
+        edf = None
+
+        edf = self.fileClass(self.fname, 'rb', mmap=True)
+        for i, dtype in enumerate([">i4", "<f8"]):
+            readData = edf.GetData(i)
+            self.assertTrue(isinstance(readData, numpy.memmap))
+            self.assertEqual(readData.dtype, numpy.dtype(dtype))
+            self.assertFalse(readData.flags.writeable)
+            self.assertTrue(numpy.array_equal(readData, data))
+            region = edf.GetData(i, Pos=(20, 10), Size=(30, 0))
+            self.assertTrue(numpy.array_equal(region, data[10:, 20:50]))
+        # the default access reads the file in native byte order
+        edf = self.fileClass(self.fname, 'rb')
+        readData = edf.GetData(0)
+        self.assertFalse(isinstance(readData, numpy.memmap))
+        self.assertTrue(readData.dtype.isnative)
+        self.assertTrue(numpy.array_equal(readData, data))
+        edf = None
+        readData = None
+        region = None
+        gc.collect()
+
+    def testEdfStackMemmap(self):
+        from PyMca5.PyMcaIO import EDFStack
+        self.assertTrue(self.fileClass is not None)
+        tmpDir = tempfile.mkdtemp()
+        try:
+            data = numpy.arange(5 * 6 * 7, dtype=numpy.uint16)
+            data.shape = 5, 6, 7
+            filelist = []
+            for i in range(data.shape[0]):
+                fname = os.path.join(tmpDir, "image_%04d.edf" % i)
+                edf = self.fileClass(fname, 'wb+')
+                edf.WriteImage({}, data[i], ByteOrder="HighByteFirst")
+                edf = None
+                filelist.append(fname)
+            for imagestack in [False, True]:
+                stack = EDFStack.EDFStack(imagestack=imagestack)
+                stack.loadFileList(filelist)
+                reference = stack.data
+                stack = EDFStack.EDFStack(imagestack=imagestack, mmap=True)
+                stack.loadFileList(filelist)
+                virtual = stack.data
+                self.assertTrue(isinstance(virtual,
+                                           EDFStack.VirtualImageStack))
+                self.assertEqual(virtual.shape, reference.shape)
+                self.assertEqual(virtual.dtype, reference.dtype)
+                if imagestack:
+                    self.assertEqual(stack.info["McaIndex"], 0)
+                self.assertTrue(numpy.array_equal(numpy.asarray(virtual),
+                                                  reference))
+                for key in [(1,), (slice(1, 4), 2), (slice(None), 3, 4),
+                            (Ellipsis, 2), (slice(None, None, 2), slice(1, 5)),
+                            ([0, 3, 4], slice(None), 1),
+                            (2, [1, 3]), (slice(None), [1, 2], [3, 4])]:
+                    self.assertTrue(numpy.array_equal(virtual[key],
+                                                      reference[key]),
+                                    "Error slicing with %s" % (key,))
+                virtual.close()
+            stack = None
+            virtual = None
+        finally:
+            gc.collect()
+            for fname in os.listdir(tmpDir):
+                os.remove(os.path.join(tmpDir, fname))
+            os.rmdir(tmpDir)
+
+    def testStackParallelLoading(self):
+        from PyMca5.PyMcaIO import EDFStack
+        from PyMca5.PyMcaIO import TiffStack
+        from PyMca5.PyMcaIO import TiffIO
+        self.assertTrue(self.fileClass is not None)
+        tmpDir = tempfile.mkdtemp()
+        try:
+            data = numpy.arange(9 * 6 * 7, dtype=numpy.float32)
+            data.shape = 9, 6, 7
+            edflist = []
+            tiflist = []
+            for i in range(data.shape[0]):
+                fname = os.path.join(tmpDir, "image_%04d.edf" % i)
+                self.fileClass(fname, 'wb+').WriteImage({}, data[i])
+                edflist.append(fname)
+                fname = os.path.join(tmpDir, "image_%04d.tif" % i)
+                TiffIO.TiffIO(fname, mode="wb+").writeImage(data[i])
+                tiflist.append(fname)
+
+            class ProgressStack(object):
+                def onBegin(self, n):
+                    self.progress = []
+
+                def onProgress(self, n):
+                    self.progress.append(n)
+
+            class EdfProgressStack(ProgressStack, EDFStack.EDFStack):
+                pass
+
+            class TiffProgressStack(ProgressStack, TiffStack.TiffStack):
+                pass
+
+            for kw in [{"imagestack": True}, {"imagestack": False}]:
+                for fileindex in [0, 1]:
+                    results = []
+                    for nworkers in [1, 4]:
+                        stack = EdfProgressStack(nworkers=nworkers, **kw)
+                        stack.loadFileList(edflist, fileindex=fileindex)
+                        self.assertEqual(stack.progress,
+                                         list(range(1, len(edflist) + 1)))
+                        results.append(stack.data)
+                    self.assertTrue(numpy.array_equal(results[0], results[1]))
+                    if kw["imagestack"] or not fileindex:
+                        self.assertTrue(numpy.array_equal(results[0], data))
+                    else:
+                        self.assertTrue(numpy.array_equal(results[0],
+                                                data.transpose(1, 0, 2)))
+            for imagestack in [True, False]:
+                stack = TiffProgressStack(imagestack=imagestack, nworkers=4)
+                stack.loadFileList(tiflist)
+                self.assertEqual(stack.progress,
+                                 list(range(1, len(tiflist) + 1)))
+                if imagestack:
+                    self.assertTrue(numpy.array_equal(stack.data, data))
+                else:
+                    self.assertTrue(numpy.array_equal(stack.data,
+                                                data.transpose(1, 2, 0)))
+        finally:
+            gc.collect()
+            for fname in os.listdir(tmpDir):
+                os.remove(os.path.join(tmpDir, fname))
+            os.rmdir(tmpDir)
+
 def getSuite(auto=True):
     testSuite = unittest.TestSuite()
     if auto:
@@ -125,6 +263,9 @@ def getSuite(auto=True):
         # use a predefined order
         testSuite.addTest(testEdfFile("testEdfFileImport"))
         testSuite.addTest(testEdfFile("testEdfFileReadWrite"))
+        testSuite.addTest(testEdfFile("testEdfFileMemmap"))
+        testSuite.addTest(testEdfFile("testEdfStackMemmap"))
+        testSuite.addTest(testEdfFile("testStackParallelLoading"))
     return testSuite
 
 def test(auto=False):
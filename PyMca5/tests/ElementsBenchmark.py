@@ -0,0 +1,114 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Import and first use time of PyMca5.PyMcaPhysics.xrf.Elements without the
+binary data cache, when the cache is built and when it is reused:
+
+    python -m PyMca5.tests.ElementsBenchmark [repeats]
+"""
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+from PyMca5.tests import BenchmarkUtils
+
+_SCRIPT = """
+import time
+import numpy
+import PyMca5
+t0 = time.time()
+from PyMca5.PyMcaPhysics.xrf import Elements
+t1 = time.time()
+Elements.getMaterialMassAttenuationCoefficients(["Fe", "Cr", "Ni", "Mn"],
+                                                [0.7, 0.18, 0.1, 0.02],
+                                                [5.0, 10.0, 20.0])
+for ele in ["Fe", "Cr", "Ni", "Mn"]:
+    Elements.Element[ele]["rays"]
+    Elements.getPhotoWeight(ele, ["K", "L1", "L2", "L3"], 20.0)
+t2 = time.time()
+print("%f %f" % (t1 - t0, t2 - t1))
+"""
+
+
+def _run(cachedir):
+    env = dict(os.environ)
+    env["PYMCA_CACHE_DIR"] = cachedir
+    output = subprocess.check_output([sys.executable, "-c", _SCRIPT],
+                                     env=env, universal_newlines=True)
+    return [float(value) for value in output.split()[-2:]]
+
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def benchmark(repeats=5):
+    """
+    :param int repeats:
+    :returns list: (mode, import seconds, first use seconds)
+    """
+    results = []
+    cachedir = tempfile.mkdtemp()
+    try:
+        for mode in ["no cache", "cache build", "cache reuse"]:
+            timings = []
+            for i in range(repeats):
+                if mode == "no cache":
+                    timings.append(_run(""))
+                elif mode == "cache build":
+                    shutil.rmtree(cachedir, ignore_errors=True)
+                    timings.append(_run(cachedir))
+                else:
+                    timings.append(_run(cachedir))
+            results.append((mode,
+                            _median([t[0] for t in timings]),
+                            _median([t[1] for t in timings])))
+    finally:
+        shutil.rmtree(cachedir, ignore_errors=True)
+    return results
+
+
+def main(argv=None):
+    def rows(results):
+        t1 = results[0][1] + results[0][2]
+        return [(mode, timport, tuse, t1 / (timport + tuse))
+                for mode, timport, tuse in results]
+    BenchmarkUtils.main(benchmark, argv, [("repeats", 5)],
+                        "median of %(repeats)d processes",
+                        [("mode", "%12s"), ("import (s)", "%12.3f"),
+                         ("first use (s)", "%12.3f"), ("speedup", "%8.2f")],
+                        rows=rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -311,6 +311,200 @@ def testMaterialCompositionCalculation(self):
             self.assertTrue(abs(c1[key] - c2[key]) < 1.0e-7,
                             "Inconsistent calculation for element %s" % key)
 
+    def testDataCache(self):
+        import shutil
+        import tempfile
+        from PyMca5.PyMcaMisc import DiskCache
+        from PyMca5.PyMcaIO import ConfigDict
+        tables = {"Fe": {"energy": numpy.linspace(1., 10., 5),
+                         "JK": 7.5,
+                         "binding": {"K": 7.112, "L1": 0.8461}},
+                  "elementslist": {"elements": ["H", "He"],
+                                   "comment": "K shell"},
+                  "n": 3}
+        tmpDir = tempfile.mkdtemp()
+        oldCacheDir = os.environ.get("PYMCA_CACHE_DIR")
+        try:
+            # round trip
+            cache = DiskCache.DiskCache(tmpDir, prefix="test_")
+            cache.saveTables("key", tables)
+            loaded = cache.loadTables("key")
+            self.assertEqual(sorted(loaded.keys()), sorted(tables.keys()))
+            fe = loaded["Fe"]
+            self.assertTrue(numpy.array_equal(fe["energy"],
+                                              tables["Fe"]["energy"]))
+            self.assertEqual(fe["JK"], 7.5)
+            self.assertTrue(isinstance(fe["JK"], float))
+            self.assertEqual(fe["binding"], tables["Fe"]["binding"])
+            self.assertEqual(loaded["elementslist"], tables["elementslist"])
+            self.assertEqual(loaded["n"], 3)
+
+            # rebuilt when the source changes
+            source = os.path.join(tmpDir, "source.dat")
+            with open(source, "w") as f:
+                f.write("1")
+            nBuild = [0]
+            def build():
+                nBuild[0] += 1
+                return ConfigDict.ConfigDict(initdict=tables)
+            # disabled unless a directory is given
+            if oldCacheDir is not None:
+                del os.environ["PYMCA_CACHE_DIR"]
+            self.assertTrue(DiskCache.defaultDirectory() is None)
+            os.environ["PYMCA_CACHE_DIR"] = tmpDir
+            for i in range(2):
+                result = DiskCache.cachedTables("source", [source], build,
+                                        factory=ConfigDict.ConfigDict)
+                self.assertTrue(isinstance(result, ConfigDict.ConfigDict))
+                self.assertEqual(sorted(result.keys()), sorted(tables.keys()))
+            self.assertEqual(nBuild[0], 1)
+            with open(source, "w") as f:
+                f.write("2")
+            DiskCache.cachedTables("source", [source], build)
+            self.assertEqual(nBuild[0], 2)
+            os.environ["PYMCA_CACHE_DIR"] = ""
+            DiskCache.cachedTables("source", [source], build)
+            self.assertEqual(nBuild[0], 3)
+        finally:
+            if oldCacheDir is None:
+                del os.environ["PYMCA_CACHE_DIR"]
+            else:
+                os.environ["PYMCA_CACHE_DIR"] = oldCacheDir
+            shutil.rmtree(tmpDir)
+
+        # the cross sections from the cache are those of the files
+        for ele in ["H", "Fe", "Pb"]:
+            xcom = self._elements._readXcomFile(
+                                        self._elements._getXcomFile(ele))
+            cached = self._elements._getXcomTables().get(ele, xcom)
+            for key in xcom:
+                self.assertTrue(numpy.array_equal(xcom[key], cached[key]))
+
+    def testLazyElementDict(self):
+        Elements = self._elements
+        try:
+            Elements.updateDict(energy=15.0)
+            for ele in ["Fe", "Pb", "U"]:
+                expected = {}
+                Elements._updateElementDict(ele, expected, energy=15.0)
+                element = Elements.Element[ele]
+                for key in expected:
+                    self.assertEqual(element[key], expected[key])
+                self.assertEqual(element["buildparameters"]["energy"], 15.0)
+            # lines of the previous update are removed
+            Elements.updateDict(energy=7.0)
+            previous = expected
+            expected = {}
+            Elements._updateElementDict("U", expected, energy=7.0)
+            element = Elements.Element["U"]
+            removed = [key for key in previous if key not in expected]
+            self.assertTrue(len(removed) > 0)
+            for key in removed:
+                self.assertTrue(key not in element)
+            for key in expected:
+                self.assertEqual(element[key], expected[key])
+            # groups without transitions at low energy get them back
+            Elements.updateDict(energy=5.0)
+            self.assertEqual(Elements.Element["Pb"]["L xrays"], [])
+            Elements.updateDict(energy=20.0)
+            lines = Elements.Element["Pb"]["L xrays"]
+            expected = {}
+            Elements._updateElementDict("Pb", expected, energy=20.0)
+            self.assertTrue(len(expected["L xrays"]) > 0)
+            self.assertEqual(lines, expected["L xrays"])
+            self.assertEqual(Elements.Element["Pb"]["rays"], expected["rays"])
+        finally:
+            Elements.updateDict()
+
+    def testMemoization(self):
+        import tempfile
+        import shutil
+        from PyMca5.PyMcaMisc.LRUCache import LRUCache
+        Elements = self._elements
+        cache = Elements.memoCache
+        energies = numpy.linspace(2., 20., 50)
+        matrix = ["Steel_test", 1.0, 0.1]
+        thresholds = {"ethreshold": 0.020, "ithreshold": 1.0e-07,
+                      "nthreshold": 4}
+        directory = tempfile.mkdtemp()
+        try:
+            Elements.Material["Steel_test"] = \
+                {"CompoundList": ["Fe", "Cr", "Ni"],
+                 "CompoundFraction": [0.7, 0.2, 0.1],
+                 "Density": 8.0,
+                 "Thickness": 0.1,
+                 "Comment": "test"}
+            cache.enabled = False
+            mu = Elements.getMaterialMassAttenuationCoefficients(
+                            "Steel_test", 1.0, energies)
+            escape = Elements.getEscape(matrix, 15.0, **thresholds)
+            cache.enabled = True
+            cache.clear()
+            cache.resetCounters()
+            for i in range(2):
+                info = cache.info()
+                result = Elements.getMaterialMassAttenuationCoefficients(
+                            "Steel_test", 1.0, energies)
+                for key in mu:
+                    self.assertTrue(numpy.allclose(result[key], mu[key]))
+                self.assertEqual(Elements.getEscape(matrix, 15.0,
+                                                    **thresholds), escape)
+            # second pass: two hits and no miss
+            self.assertTrue(info["misses"] > 0)
+            self.assertEqual(cache.info()["misses"], info["misses"])
+            self.assertEqual(cache.info()["hits"], info["hits"] + 2)
+            # results are copies
+            result["total"][0] = -1.0
+            result = Elements.getMaterialMassAttenuationCoefficients(
+                            "Steel_test", 1.0, energies)
+            self.assertTrue(numpy.allclose(result["total"], mu["total"]))
+
+            # a change of the material definition is a miss
+            Elements.Material["Steel_test"]["CompoundList"] = ["Fe"]
+            Elements.Material["Steel_test"]["CompoundFraction"] = [1.0]
+            misses = cache.info()["misses"]
+            result = Elements.getMaterialMassAttenuationCoefficients(
+                            "Steel_test", 1.0, energies)
+            self.assertEqual(cache.info()["misses"], misses + 1)
+            self.assertFalse(numpy.allclose(result["total"], mu["total"]))
+
+            # eviction by number of entries and by size
+            lru = LRUCache(maxsize=3, maxbytes=1000)
+            for i in range(5):
+                lru.put(str(i), i)
+            self.assertEqual(len(lru), 3)
+            self.assertEqual(lru.get("0"), (False, None))
+            self.assertEqual(lru.get("4"), (True, 4))
+            lru.put("big", numpy.zeros(1000))
+            self.assertEqual(len(lru), 0)
+            self.assertEqual(lru.info()["evictions"], 6)
+
+            # calls at few energies are not cached
+            info = cache.info()
+            Elements.getMaterialMassAttenuationCoefficients("Steel_test",
+                                                            1.0, 10.0)
+            self.assertEqual(cache.info(), info)
+
+            # persistence
+            lru = LRUCache(directory=directory)
+            lru.put("a", {"a": [1, 2]})
+            self.assertEqual(len(os.listdir(directory)), 1)
+            lru = LRUCache(directory=directory)
+            lru.configure(maxsize=10)
+            self.assertEqual(lru.directory, directory)
+            self.assertEqual(lru.get("a"), (True, {"a": [1, 2]}))
+            self.assertEqual(lru.info()["diskhits"], 1)
+            self.assertEqual(lru.get("a"), (True, {"a": [1, 2]}))
+            self.assertEqual(lru.info()["hits"], 1)
+            lru.configure(directory="")
+            lru.clear()
+            self.assertEqual(lru.get("a"), (False, None))
+        finally:
+            del Elements.Material["Steel_test"]
+            cache.enabled = True
+            cache.clear()
+            shutil.rmtree(directory, ignore_errors=True)
+
 def getSuite(auto=True):
     testSuite = unittest.TestSuite()
     if auto:
@@ -323,6 +517,9 @@ def getSuite(auto=True):
         testSuite.addTest(testElements("testElementCrossSectionsCalculation"))
         testSuite.addTest(testElements("testMaterialCrossSectionsCalculation"))
         testSuite.addTest(testElements("testMaterialCompositionCalculation"))
+        testSuite.addTest(testElements("testDataCache"))
+        testSuite.addTest(testElements("testLazyElementDict"))
+        testSuite.addTest(testElements("testMemoization"))
     return testSuite
 
 def test(auto=False):
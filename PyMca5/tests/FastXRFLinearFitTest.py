@@ -38,6 +38,8 @@
 import shutil
 from PyMca5.tests import XrfData
 from PyMca5.PyMcaPhysics.xrf import FastXRFLinearFit
+from PyMca5.PyMcaPhysics.xrf import MatrixCorrection
+from PyMca5.PyMcaPhysics.xrf import Elements
 from PyMca5.PyMcaPhysics.xrf.XRFBatchFitOutput import OutputBuffer
 
 try:
@@ -149,6 +151,225 @@ def testCommand(self):
         h5.close()
         h5 = None
 
+    def testParallel(self):
+        # generate the data (several chunks with negative peak areas)
+        data, livetime = XrfData.generateXRFData(nRows=20, nColumns=30, same=False)
+        numpy.random.seed(0)
+        data = numpy.random.poisson(data).astype(numpy.int32)
+        configuration = XrfData.generateXRFConfig()
+        configuration["fit"]["stripalgorithm"] = 1
+        configuration["fit"]["stripflag"] = 1
+
+        fastFit = FastXRFLinearFit.FastXRFLinearFit()
+        fastFit.setFitConfiguration(configuration)
+
+        def fit(saveFit, **kwargs):
+            outbuffer = OutputBuffer(saveFit=saveFit, saveFOM=True, nosave=True)
+            return fastFit.fitMultipleSpectra(y=data, weight=0, refit=1,
+                                              outbuffer=outbuffer, **kwargs)
+
+        for saveFit in [True, False]:
+            keys = ["parameters", "uncertainties", "nFreeParameters"]
+            if saveFit:
+                keys.append("model")
+            expected = fit(saveFit)
+            for kwargs in [{"nworkers": 3},
+                           {"nworkers": 2, "executor": "process"}]:
+                result = fit(saveFit, **kwargs)
+                for key in keys:
+                    numpy.testing.assert_array_equal(result[key], expected[key],
+                                                     err_msg="%s %s" % (kwargs, key))
+
+    def testModelCache(self):
+        data, livetime = XrfData.generateXRFData(nRows=5, nColumns=10, same=False)
+        numpy.random.seed(0)
+        data = numpy.random.poisson(data).astype(numpy.int32)
+        configuration = XrfData.generateXRFConfig()
+        configuration["fit"]["stripalgorithm"] = 1
+        configuration["fit"]["stripflag"] = 1
+        cachedir = os.path.join(self.path, "cache")
+
+        def fit(fastFit, weight):
+            outbuffer = OutputBuffer(saveFit=True, saveFOM=True, nosave=True)
+            return fastFit.fitMultipleSpectra(y=data, weight=weight, refit=1,
+                                              outbuffer=outbuffer)
+
+        for weight in [0, 1]:
+            fastFit = FastXRFLinearFit.FastXRFLinearFit()
+            fastFit.setFitConfiguration(configuration)
+            expected = fit(fastFit, weight)
+
+            # first run creates the cache
+            fastFit = FastXRFLinearFit.FastXRFLinearFit(cachedir=cachedir)
+            fastFit.setFitConfiguration(configuration)
+            result = fit(fastFit, weight)
+            for key in ["parameters", "uncertainties", "model"]:
+                numpy.testing.assert_allclose(result[key], expected[key],
+                                              rtol=1e-10, err_msg=key)
+            self.assertTrue(len(os.listdir(cachedir)) >= 2)
+
+            # next runs do not build the linear model
+            fastFit = FastXRFLinearFit.FastXRFLinearFit(cachedir=cachedir)
+            fastFit.setFitConfiguration(configuration)
+
+            def noModel(*args, **kwargs):
+                raise RuntimeError("linear model should be cached")
+
+            fastFit._fitCreateModel = noModel
+            result = fit(fastFit, weight)
+            for key in ["parameters", "uncertainties", "model"]:
+                numpy.testing.assert_allclose(result[key], expected[key],
+                                              rtol=1e-10, err_msg=key)
+
+        # another fit range is another model
+        fastFit = FastXRFLinearFit.FastXRFLinearFit(cachedir=cachedir)
+        fastFit.setFitConfiguration(configuration)
+        nfiles = len(os.listdir(cachedir))
+        outbuffer = OutputBuffer(nosave=True)
+        fastFit.fitMultipleSpectra(y=data, weight=0, xmin=300,
+                                   outbuffer=outbuffer)
+        self.assertEqual(len(os.listdir(cachedir)), nfiles + 2)
+
+    @unittest.skipUnless(HAS_H5PY, "h5py not installed")
+    def testStreaming(self):
+        data, livetime = XrfData.generateXRFData(nRows=8, nColumns=10, same=False)
+        numpy.random.seed(0)
+        data = numpy.random.poisson(data).astype(numpy.int32)
+        configuration = XrfData.generateXRFConfig()
+        configuration["fit"]["stripalgorithm"] = 1
+        configuration["fit"]["stripflag"] = 1
+        fname = os.path.join(self.path, "stream.h5")
+        chunks = (1, 3, 4, data.shape[-1])
+        with h5py.File(fname, "w") as h5:
+            h5.create_dataset("data", data=data, chunks=chunks)
+
+        fastFit = FastXRFLinearFit.FastXRFLinearFit()
+        fastFit.setFitConfiguration(configuration)
+
+        def fit(y, **kwargs):
+            outbuffer = OutputBuffer(saveFit=True, saveFOM=True,
+                                     diagnostics=True, nosave=True)
+            return fastFit.fitMultipleSpectra(y=y, weight=0, refit=1,
+                                              outbuffer=outbuffer, **kwargs)
+
+        expected = fit(data, prefetch=False)
+        fitted = numpy.isfinite(expected["sum"][()])
+        numpy.testing.assert_allclose(expected["sum"][fitted],
+                                      data.sum(axis=(0, 1, 2))[fitted])
+        with h5py.File(fname, "r") as h5:
+            for kwargs in [{}, {"nworkers": 2}]:
+                result = fit(h5["data"], **kwargs)
+                for key in ["parameters", "uncertainties", "model", "sum"]:
+                    numpy.testing.assert_array_equal(result[key], expected[key],
+                                                     err_msg="%s %s" % (kwargs, key))
+        dataStack = FastXRFLinearFit.prepareDataStack([fname + "::/data"],
+                                                      streaming=True)
+        self.assertTrue(isinstance(dataStack, h5py.Dataset))
+        dataStack.file.close()
+
+    def testMatrixCorrection(self):
+        data, livetime = XrfData.generateXRFData(nRows=4, nColumns=5, same=False)
+        numpy.random.seed(0)
+        data = numpy.random.poisson(data).astype(numpy.int32)
+        configuration = XrfData.generateXRFConfig()
+        configuration["fit"]["stripalgorithm"] = 1
+        configuration["fit"]["stripflag"] = 1
+
+        for usematrix in [0, 1]:
+            configuration["concentrations"]["usematrix"] = usematrix
+            fastFit = FastXRFLinearFit.FastXRFLinearFit()
+            fastFit.setFitConfiguration(configuration)
+
+            def fit(concentrations, **kwargs):
+                outbuffer = OutputBuffer(nosave=True)
+                return fastFit.fitMultipleSpectra(y=data, weight=0, refit=1,
+                                                  concentrations=concentrations,
+                                                  outbuffer=outbuffer, **kwargs)
+
+            linear = fit(1)
+            corrected = fit(2)
+            self.assertEqual(linear.labels("massfractions"),
+                             corrected.labels("massfractions"))
+            wlin = linear["massfractions"]
+            wcor = corrected["massfractions"]
+            self.assertEqual(wlin.shape, wcor.shape)
+            self.assertTrue(numpy.isfinite(wcor).all())
+            self.assertFalse(numpy.allclose(wlin, wcor))
+
+            # the corrected composition explains the linear estimate
+            groups = linear.labels("massfractions")
+            reference = None
+            if usematrix:
+                reference = "Fe Ka"
+            table = MatrixCorrection.MatrixCorrectionTable(
+                        fastFit._mcaTheory.config, groups, reference=reference)
+            wcor = wcor.reshape(len(groups), -1)
+            factors = table.rateFactors(wcor)
+            if usematrix:
+                factors /= factors[table.reference]
+                numpy.testing.assert_allclose(wcor[table.reference],
+                                              wlin.reshape(len(groups), -1)[table.reference])
+            numpy.testing.assert_allclose(wcor * factors,
+                                          wlin.reshape(len(groups), -1),
+                                          rtol=1e-4)
+
+            result = fit(2, nworkers=2)
+            numpy.testing.assert_array_equal(result["massfractions"],
+                                             corrected["massfractions"])
+
+        # the lookup table reproduces the rates of another sample matrix
+        config = fastFit._mcaTheory.config
+        composition = Elements.getMaterialMassFractions(["SRM_1155"], [1.0])
+        other = dict(composition)
+        other["Pb"] = 0.2
+        other["Fe"] -= 0.2
+        Elements.Material["MatrixCorrectionTest"] = {
+            "Comment": "",
+            "CompoundList": list(other.keys()),
+            "CompoundFraction": list(other.values()),
+            "Density": 1.0,
+            "Thickness": 1.0}
+        sample = MatrixCorrection._sampleDescription(config)
+        rates = []
+        for material in ["SRM_1155", "MatrixCorrectionTest"]:
+            matrix = [material] + sample["matrix"][1:]
+            fluo = Elements.getMultilayerFluorescence([matrix], [16.0],
+                        alphain=sample["alphain"], alphaout=sample["alphaout"],
+                        attenuators=sample["attenuators"],
+                        beamfilters=sample["beamfilters"],
+                        detector=sample["detector"], cascade=True,
+                        elementsList=[[Elements.getz(g.split()[0])] + g.split()
+                                      for g in groups],
+                        forcepresent=1)
+            rates.append([fluo[g.split()[0]]["rates"][g.split()[1] + " xrays"]
+                          for g in groups])
+        rates = numpy.array(rates)
+        table = MatrixCorrection.MatrixCorrectionTable(config, groups)
+        for values, expected in [(composition, rates[0] / rates[0]),
+                                 (other, rates[1] / rates[0])]:
+            fractions = numpy.array([[values.get(g.split()[0], 0.0)]
+                                     for g in groups])
+            numpy.testing.assert_allclose(table.rateFactors(fractions)[:, 0],
+                                          expected, rtol=1e-10)
+        del Elements.Material["MatrixCorrectionTest"]
+
+        # unsupported samples are rejected before fitting
+        def noFit(*args, **kwargs):
+            raise AssertionError("Spectra fitted before checking the sample")
+        for index, value, message in [(1, "MULTILAYER", "single layer"),
+                                      (4, -45.0, "reflection geometry")]:
+            config = XrfData.generateXRFConfig()
+            config["fit"]["stripalgorithm"] = 1
+            config["attenuators"]["Matrix"][index] = value
+            config["multilayer"]["Layer0"] = [1, "SRM_1155", 1.0, 1.0]
+            fastFit = FastXRFLinearFit.FastXRFLinearFit()
+            fastFit.setFitConfiguration(config)
+            fastFit._fitLstSqAll = noFit
+            with self.assertRaises(ValueError) as context:
+                fit(2)
+            self.assertIn(message, str(context.exception))
+
+
 def getSuite(auto=True):
     testSuite = unittest.TestSuite()
     if auto:
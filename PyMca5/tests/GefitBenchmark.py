@@ -0,0 +1,251 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Micro-benchmark of the assembly of the normal equations in
+Gefit.ChisqAlphaBeta versus the previous implementation (one
+concatenate per free parameter) for a sum of gaussians:
+
+    python -m PyMca5.tests.GefitBenchmark [nPoints [nRepeat]]
+"""
+import numpy
+from PyMca5.tests import BenchmarkUtils
+from PyMca5.PyMcaMath.fitting import Gefit
+
+
+def legacyChisqAlphaBeta(model0, parameters, x,y,weight, constrains,model_deriv=None,linear=None):
+    if linear is None:linear=0
+    model = model0
+    #nr0, nc = data.shape
+    n_param = len(parameters)
+    n_free = 0
+    fitparam=[]
+    free_index=[]
+    noigno = []
+    derivfactor = []
+    for i in range(n_param):
+        if constrains[0] [i] != Gefit.CIGNORED:
+            noigno.append(i)
+        if constrains[0] [i] == Gefit.CFREE:
+            fitparam.append(parameters [i])
+            derivfactor.append(1.0)
+            free_index.append(i)
+            n_free += 1
+        elif constrains[0] [i] == Gefit.CPOSITIVE:
+            fitparam.append(abs(parameters[i]))
+            derivfactor.append(1.0)
+            #fitparam.append(numpy.sqrt(abs(parameters[i])))
+            #derivfactor.append(2.0*numpy.sqrt(abs(parameters[i])))
+            free_index.append(i)
+            n_free += 1
+        elif constrains[0] [i] == Gefit.CQUOTED:
+            pmax=max(constrains[1] [i],constrains[2] [i])
+            pmin=min(constrains[1] [i],constrains[2] [i])
+            if ((pmax-pmin) > 0) & \
+               (parameters[i] <= pmax) & \
+               (parameters[i] >= pmin):
+                A = 0.5 * (pmax + pmin)
+                B = 0.5 * (pmax - pmin)
+                if 1:
+                    fitparam.append(parameters[i])
+                    derivfactor.append(B*numpy.cos(numpy.arcsin((parameters[i] - A)/B)))
+                else:
+                    help0 = numpy.arcsin((parameters[i] - A)/B)
+                    fitparam.append(help0)
+                    derivfactor.append(B*numpy.cos(help0))
+                free_index.append(i)
+                n_free += 1
+            elif (pmax-pmin) > 0:
+                print("WARNING: Quoted parameter outside boundaries")
+                print("Initial value = %f" % parameters[i])
+                print("Limits are %f and %f" % (pmin, pmax))
+                print("Parameter will be kept at its starting value")
+    fitparam = numpy.array(fitparam, numpy.float64)
+    alpha = numpy.zeros((n_free, n_free),numpy.float64)
+    beta = numpy.zeros((1,n_free),numpy.float64)
+    delta = (fitparam + numpy.equal(fitparam,0.0)) * 0.00001
+    nr  = x.shape[0]
+    ##############
+    # Prior to each call to the function one has to re-calculate the
+    # parameters
+    pwork = parameters.__copy__()
+    for i in range(n_free):
+        pwork [free_index[i]] = fitparam [i]
+    newpar = Gefit.getparameters(pwork.tolist(),constrains)
+    newpar = numpy.take(newpar,noigno)
+    if n_free == 0:
+        raise ValueError("No free parameters to fit")
+    for i in range(n_free):
+        if model_deriv is None:
+            #pwork = parameters.__copy__()
+            pwork [free_index[i]] = fitparam [i] + delta [i]
+            newpar = Gefit.getparameters(pwork.tolist(),constrains)
+            newpar=numpy.take(newpar,noigno)
+            f1 = model(newpar, x)
+            pwork [free_index[i]] = fitparam [i] - delta [i]
+            newpar = Gefit.getparameters(pwork.tolist(),constrains)
+            newpar=numpy.take(newpar,noigno)
+            f2 = model(newpar, x)
+            help0 = (f1-f2) / (2.0 * delta [i])
+            help0 = help0 * derivfactor[i]
+            pwork [free_index[i]] = fitparam [i]
+            #removed I resize outside the loop:
+            #help0 = numpy.resize(help0,(1,nr))
+        else:
+            help0=model_deriv(pwork,free_index[i],x)
+            help0 = help0 * derivfactor[i]
+
+        if i == 0 :
+            deriv = help0
+        else:
+            deriv = numpy.concatenate((deriv,help0), 0)
+    #line added to resize outside the loop
+    deriv=numpy.resize(deriv,(n_free,nr))
+    if linear:
+        pseudobetahelp = weight * y
+    else:
+        newpar = Gefit.getparameters(pwork.tolist(),constrains)
+        newpar = numpy.take(newpar,noigno)
+        yfit = model(newpar, x)
+        deltay = y - yfit
+        help0 = weight * deltay
+    for i in range(n_free):
+        derivi = numpy.resize(deriv [i,:], (1,nr))
+        if linear:
+            if i==0:
+                beta = numpy.resize(numpy.sum((pseudobetahelp * derivi),1),(1,1))
+            else:
+                beta = numpy.concatenate((beta, numpy.resize(numpy.sum((pseudobetahelp * derivi),1),(1,1))), 1)
+        else:
+            help1 = numpy.resize(numpy.sum((help0 * derivi),1),(1,1))
+            if i == 0:
+                beta = help1
+            else:
+                beta = numpy.concatenate((beta, help1), 1)
+        help1 = numpy.inner(deriv,weight*derivi)
+        if i == 0:
+            alpha = help1
+        else:
+            alpha = numpy.concatenate((alpha, help1),1)
+    if linear:
+        #not used
+        chisq = 0.0
+    else:
+        chisq = (help0 * deltay).sum()
+    return chisq, alpha, beta, \
+           n_free, free_index, noigno, fitparam, derivfactor
+
+
+def gaussians(param, x):
+    """Linear background and gaussians (area, position, fwhm)
+    """
+    y = param[0] + param[1] * x
+    for area, pos, fwhm in numpy.reshape(param[2:], (-1, 3)):
+        sigma = fwhm / 2.3548200450309493
+        y = y + area / (sigma * 2.5066282746310002) * \
+            numpy.exp(-0.5 * ((x - pos) / sigma)**2)
+    return y
+
+
+def gaussiansDerivative(param, index, x):
+    """Derivative with respect to the area or background parameters
+    """
+    if index == 0:
+        return numpy.ones(x.shape)
+    elif index == 1:
+        return x * 1.0
+    area, pos, fwhm = param[2 + 3 * ((index - 2) // 3):][:3]
+    sigma = fwhm / 2.3548200450309493
+    return numpy.exp(-0.5 * ((x - pos) / sigma)**2) / \
+        (sigma * 2.5066282746310002)
+
+
+def gaussiansJacobian(param, indices, x):
+    return numpy.array([gaussiansDerivative(param, i, x) for i in indices])
+gaussiansJacobian.batched = True
+
+
+def benchmark(nPoints=2048, nRepeat=10, nPeaks=None):
+    """
+    :param int nPoints:
+    :param int nRepeat:
+    :param list nPeaks: number of gaussians (free areas) to be tested
+    :returns list: (nFree, legacy seconds, seconds, batched seconds)
+    """
+    if nPeaks is None:
+        nPeaks = [5, 20, 60, 120]
+    x = numpy.arange(nPoints, dtype=numpy.float64)
+    results = []
+    for n in nPeaks:
+        param = [10., 0.01]
+        for pos in numpy.linspace(0, nPoints, n + 2)[1:-1]:
+            param += [1000., pos, 10.]
+        param = numpy.array(param)
+        y = gaussians(param, x)
+        weight = 1. / numpy.maximum(y, 1)
+        # areas and background are free, positions and widths fixed
+        constrains = [[Gefit.CFREE] * 2 + [Gefit.CPOSITIVE, Gefit.CFIXED,
+                                           Gefit.CFIXED] * n,
+                      [0] * len(param), [0] * len(param)]
+        timings = [2 + n]
+        reference = None
+        for func, deriv in [(legacyChisqAlphaBeta, gaussiansDerivative),
+                            (Gefit.ChisqAlphaBeta, gaussiansDerivative),
+                            (Gefit.ChisqAlphaBeta, gaussiansJacobian)]:
+            with BenchmarkUtils.Timer() as timer:
+                for i in range(nRepeat):
+                    result = func(gaussians, param, x, y, weight, constrains,
+                                  model_deriv=deriv)
+            timings.append(timer.seconds / nRepeat)
+            if reference is None:
+                reference = result
+            else:
+                for a, b in zip(reference[:3], result[:3]):
+                    if not numpy.allclose(a, b):
+                        raise RuntimeError("Result differs from the "
+                                           "previous implementation")
+        results.append(tuple(timings))
+    return results
+
+
+def main(argv=None):
+    def rows(results):
+        return [(nFree, t0, t1, t2, t0 / min(t1, t2))
+                for nFree, t0, t1, t2 in results]
+    BenchmarkUtils.main(benchmark, argv, [("nPoints", 2048), ("nRepeat", 10)],
+                        "%(nPoints)d points, seconds per call",
+                        [("free", "%8d"), ("legacy", "%10.4f"),
+                         ("gemm", "%10.4f"), ("batched", "%10.4f"),
+                         ("speedup", "%8.2f")],
+                        rows=rows)
+
+
+if __name__ == "__main__":
+    main()
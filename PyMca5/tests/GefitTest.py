@@ -70,6 +70,55 @@ def testGefitLeastSquares(self):
         for i in range(len(originalParameters)):
             self.assertTrue(abs(fittedpar[i] - originalParameters[i]) < 0.01)
 
+    def gaussianPlusLinearBackgroundDerivative(self, param, index, t):
+        dummy = 2.3548200450309493 * (t - param[3])/ param[4]
+        gauss = numpy.exp(-0.5 * dummy * dummy)
+        if index == 0:
+            return numpy.ones(t.shape)
+        elif index == 1:
+            return t * 1.0
+        elif index == 2:
+            return gauss
+        elif index == 3:
+            return param[2] * gauss * dummy * 2.3548200450309493 / param[4]
+        else:
+            return param[2] * gauss * dummy * dummy / param[4]
+
+    def testGefitBatchedDerivative(self):
+        self.testGefitImport()
+        x = numpy.arange(500.)
+        originalParameters = numpy.array([10.5, 2, 1000.0, 200., 100],
+                                         numpy.float64)
+        fitFunction = self.gaussianPlusLinearBackground
+        y = fitFunction(originalParameters, x)
+        startingParameters = [0.0 ,1.0,900.0, 150., 90]
+        constrains = [[self.gefit.CFREE, self.gefit.CFREE,
+                       self.gefit.CPOSITIVE, self.gefit.CQUOTED,
+                       self.gefit.CFREE],
+                      [0, 0, 0, 100., 0],
+                      [0, 0, 0, 300., 0]]
+        derivative = self.gaussianPlusLinearBackgroundDerivative
+
+        def batchedDerivative(param, indices, t):
+            return numpy.array([derivative(param, i, t) for i in indices])
+        batchedDerivative.batched = True
+
+        results = []
+        for model_deriv in [None, derivative, batchedDerivative]:
+            result = self.gefit.LeastSquaresFit(fitFunction,
+                                                startingParameters,
+                                                xdata=x,
+                                                ydata=y,
+                                                constrains=constrains,
+                                                model_deriv=model_deriv)
+            fittedpar = result[0]
+            for i in range(len(originalParameters)):
+                self.assertTrue(abs(fittedpar[i] - originalParameters[i]) < 0.01)
+            results.append(result)
+        # batched and non-batched derivatives are identical
+        for a, b in zip(results[1], results[2]):
+            numpy.testing.assert_array_equal(a, b)
+
 def getSuite(auto=True):
     testSuite = unittest.TestSuite()
     if auto:
@@ -79,6 +128,7 @@ def getSuite(auto=True):
         # use a predefined order
         testSuite.addTest(testGefit("testGefitImport"))
         testSuite.addTest(testGefit("testGefitLeastSquares"))
+        testSuite.addTest(testGefit("testGefitBatchedDerivative"))
     return testSuite
 
 def test(auto=False):
@@ -0,0 +1,144 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Throughput of the stack registration of ImageRegistration (measure the
+shifts and write the aligned frames to an HDF5 file) compared to the frame
+by frame registration, in frames per second:
+
+    python -m PyMca5.tests.ImageRegistrationBenchmark [nFrames nRows nColumns]
+"""
+import os
+import shutil
+import tempfile
+import numpy
+import h5py
+from numpy.fft import fft2
+from PyMca5.tests import BenchmarkUtils
+from PyMca5.PyMcaMath import ImageRegistration
+
+
+def generateData(nFrames=200, nRows=256, nColumns=256, maxShift=10.0):
+    """
+    :returns tuple: stack (nFrames, nRows, nColumns), reference frame and
+                    applied shifts
+    """
+    numpy.random.seed(0)
+    y, x = numpy.mgrid[0:nRows, 0:nColumns]
+    reference = numpy.zeros((nRows, nColumns), dtype=numpy.float64)
+    for i in range(20):
+        y0, x0 = numpy.random.uniform(0, nRows), numpy.random.uniform(0, nColumns)
+        sigma = numpy.random.uniform(2, nRows / 10.)
+        reference += numpy.exp(-((y - y0) ** 2 + (x - x0) ** 2) / (2 * sigma ** 2))
+    shifts = numpy.random.uniform(-maxShift, maxShift, (nFrames, 2))
+    stack = ImageRegistration.shiftFFTStack(numpy.repeat(reference[None],
+                                                         nFrames, axis=0),
+                                            shifts)
+    stack += numpy.random.normal(0, 0.01, stack.shape)
+    return stack.astype(numpy.float32), reference, shifts
+
+
+def _frameByFrame(data, reference, output):
+    reference_fft2 = fft2(reference)
+    shifts = numpy.zeros((data.shape[0], 2))
+    for i in range(data.shape[0]):
+        shifts[i] = ImageRegistration.measure_offset_from_ffts(reference_fft2,
+                                                               fft2(data[i]))
+    d0_start, d0_end, d1_start, d1_end = \
+              ImageRegistration.get_crop_indices(reference.shape,
+                                                 shifts[:, 0], shifts[:, 1])
+    window = numpy.zeros(reference.shape, numpy.float32)
+    window[d0_start:d0_end, d1_start:d1_end] = 1.0
+    for i in range(data.shape[0]):
+        output[i] = ImageRegistration.shiftBilinear(data[i], shifts[i]) * window
+    return shifts
+
+
+def benchmark(nFrames=200, nRows=256, nColumns=256, workers=None):
+    """
+    :param int nFrames:
+    :param int nRows:
+    :param int nColumns:
+    :param list workers: number of workers to be tested
+    :returns list: (method, nworkers, seconds, frames/second, max. error)
+    """
+    stack, reference, applied = generateData(nFrames, nRows, nColumns)
+    if workers is None:
+        workers = BenchmarkUtils.workerCounts()
+    tmpDir = tempfile.mkdtemp(prefix="pymcaRegistration")
+    results = []
+    try:
+        with h5py.File(os.path.join(tmpDir, "input.h5"), "w") as h5:
+            h5.create_dataset("data", data=stack, chunks=(1, nRows, nColumns))
+        cases = [("frame by frame", None, 1)]
+        for method in ["fft", "pymca"]:
+            for nworkers in workers:
+                cases.append(("batched %s" % method, method, nworkers))
+        for i, (name, method, nworkers) in enumerate(cases):
+            fname = os.path.join(tmpDir, "output%d.h5" % i)
+            with h5py.File(os.path.join(tmpDir, "input.h5"), "r") as h5in, \
+                 h5py.File(fname, "w") as h5out:
+                data = h5in["data"]
+                with BenchmarkUtils.Timer() as timer:
+                    if method is None:
+                        output = h5out.create_dataset("data", shape=data.shape,
+                                                      dtype=numpy.float32,
+                                                      chunks=(1, nRows, nColumns))
+                        shifts = _frameByFrame(data, reference, output)
+                    else:
+                        shifts = h5out.create_dataset("shifts", shape=(nFrames, 2),
+                                                      dtype=numpy.float64)
+                        ImageRegistration.calculate_shifts(data, reference,
+                                                           shifts=shifts,
+                                                           nworkers=nworkers)
+                        shifts = shifts[()]
+                        ImageRegistration.shift_stack(data, shifts, output=h5out,
+                                                      method=method,
+                                                      nworkers=nworkers)
+                t = timer.seconds
+            error = numpy.abs(shifts - applied).max()
+            results.append((name, nworkers, t, nFrames / t, error))
+    finally:
+        shutil.rmtree(tmpDir)
+    return results
+
+
+def main(argv=None):
+    BenchmarkUtils.main(benchmark, argv,
+                        [("nFrames", 200), ("nRows", 256), ("nColumns", 256)],
+                        "%(nFrames)d frames of %(nRows)d x %(nColumns)d "
+                        "pixels",
+                        [("method", "%16s"), ("workers", "%8d"),
+                         ("seconds", "%10.3f"), ("frames/s", "%10.1f"),
+                         ("max. error", "%10.3f")])
+
+
+if __name__ == "__main__":
+    main()
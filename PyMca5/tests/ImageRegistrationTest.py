@@ -0,0 +1,161 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import unittest
+import sys
+import os
+import gc
+import tempfile
+import numpy
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+
+class testImageRegistration(unittest.TestCase):
+    def setUp(self):
+        from PyMca5.PyMcaMath import ImageRegistration
+        numpy.random.seed(0)
+        y, x = numpy.mgrid[0:64, 0:81]
+        self.reference = numpy.exp(-((y - 30) ** 2 + (x - 35) ** 2) / 50.) + \
+                         0.5 * numpy.exp(-((y - 20) ** 2 + (x - 55) ** 2) / 20.) + \
+                         0.05 * numpy.random.random((64, 81))
+        self.shifts = numpy.random.uniform(-5, 5, (13, 2))
+        self.stack = ImageRegistration.shiftFFTStack(
+                            numpy.repeat(self.reference[None], 13, axis=0),
+                            self.shifts)
+
+    def testCalculateShifts(self):
+        from PyMca5.PyMcaMath import ImageRegistration
+        expected = numpy.array([ImageRegistration.measure_offset(self.reference,
+                                                                 frame)
+                                for frame in self.stack])
+        self.assertTrue(numpy.abs(expected - self.shifts).max() < 0.5)
+        for nworkers in [None, 2]:
+            shifts = ImageRegistration.calculate_shifts(self.stack,
+                                                        self.reference,
+                                                        nImages=4,
+                                                        nworkers=nworkers)
+            self.assertTrue(numpy.allclose(shifts, expected))
+        # frames along the last dimension and region of interest
+        offsets, widths = [2, 3], [60, 70]
+        stack = numpy.ascontiguousarray(self.stack.transpose(1, 2, 0))
+        shifts = ImageRegistration.calculate_shifts(stack,
+                                                    self.reference,
+                                                    imageAxis=-1,
+                                                    offsets=offsets,
+                                                    widths=widths)
+        for i in range(stack.shape[-1]):
+            expected = ImageRegistration.measure_offset(
+                        self.reference[2:62, 3:73], stack[2:62, 3:73, i])
+            self.assertTrue(numpy.allclose(shifts[i], expected))
+
+    def testShiftStack(self):
+        from PyMca5.PyMcaMath import ImageRegistration
+        shifts = ImageRegistration.calculate_shifts(self.stack,
+                                                    self.reference)
+        d0_start, d0_end, d1_start, d1_end = \
+            ImageRegistration.get_crop_indices(self.reference.shape,
+                                               shifts[:, 0], shifts[:, 1])
+        mask = numpy.zeros(self.reference.shape)
+        mask[d0_start:d0_end, d1_start:d1_end] = 1
+        output = ImageRegistration.shift_stack(self.stack, shifts,
+                                               output=numpy.zeros_like(self.stack),
+                                               nImages=5, nworkers=2)
+        self.assertTrue(numpy.abs(output - self.reference * mask).max() < 0.1)
+        output = ImageRegistration.shift_stack(self.stack, shifts,
+                                               output=numpy.zeros_like(self.stack),
+                                               method="pymca")
+        for i in range(self.stack.shape[0]):
+            expected = ImageRegistration.shiftBilinear(self.stack[i],
+                                                       shifts[i]) * mask
+            self.assertTrue(numpy.allclose(output[i], expected))
+        # in place with the frames along the last dimension
+        stack = numpy.ascontiguousarray(self.stack.transpose(1, 2, 0))
+        ImageRegistration.shift_stack(stack, shifts, imageAxis=2,
+                                      method="pymca")
+        self.assertTrue(numpy.allclose(stack.transpose(2, 0, 1), output))
+
+    @unittest.skipIf(not HAS_H5PY, "skipped h5py missing")
+    def testRegistrationHdf5(self):
+        from PyMca5.PyMcaMath import ImageRegistration
+        expected = ImageRegistration.calculate_shifts(self.stack,
+                                                      self.reference)
+        aligned = ImageRegistration.shift_stack(self.stack, expected,
+                                                output=numpy.zeros_like(self.stack))
+        tmpDir = tempfile.mkdtemp(prefix="pymcaTmp")
+        fname = os.path.join(tmpDir, "registration.h5")
+        try:
+            with h5py.File(fname, "w") as h5:
+                h5["input"] = self.stack.transpose(1, 2, 0)
+                data = h5["input"]
+                shifts = h5.create_dataset("shifts", shape=(13, 2),
+                                           dtype=numpy.float64)
+                ImageRegistration.calculate_shifts(data, self.reference,
+                                                   imageAxis=2,
+                                                   shifts=shifts,
+                                                   nImages=3,
+                                                   nworkers=2)
+                self.assertTrue(numpy.allclose(shifts[()], expected))
+                group = h5.create_group("aligned")
+                output = ImageRegistration.shift_stack(data, shifts[()],
+                                                       imageAxis=2,
+                                                       output=group,
+                                                       nImages=3)
+                self.assertEqual(output.name, "/aligned/data")
+                self.assertEqual(output.shape, self.stack.shape)
+                self.assertTrue(numpy.allclose(output[()], aligned,
+                                               atol=1e-5))
+        finally:
+            gc.collect()
+            if os.path.exists(fname):
+                os.remove(fname)
+            os.rmdir(tmpDir)
+
+
+def getSuite(auto=True):
+    testSuite = unittest.TestSuite()
+    if auto:
+        testSuite.addTest(unittest.TestLoader().loadTestsFromTestCase(testImageRegistration))
+    else:
+        # use a predefined order
+        testSuite.addTest(testImageRegistration("testCalculateShifts"))
+        testSuite.addTest(testImageRegistration("testShiftStack"))
+        testSuite.addTest(testImageRegistration("testRegistrationHdf5"))
+    return testSuite
+
+def test(auto=False):
+    return unittest.TextTestRunner(verbosity=2).run(getSuite(auto=auto))
+
+if __name__ == '__main__':
+    result = test()
+    sys.exit(not result.wasSuccessful())
@@ -0,0 +1,136 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Speed, peak memory and accuracy of the K-means backends of KMeansModule
+compared to the mini-batch K-means reading a numpy array or an HDF5
+dataset in blocks:
+
+    python -m PyMca5.tests.KMeansBenchmark [nRows nColumns nChannels k]
+"""
+import os
+import shutil
+import itertools
+import tempfile
+import tracemalloc
+import numpy
+import h5py
+from PyMca5.tests import BenchmarkUtils
+from PyMca5.PyMcaMath.mva import KMeansModule
+
+
+def generateData(nRows=200, nColumns=200, nChannels=256, k=5):
+    """
+    :returns tuple: stack (nRows, nColumns, nChannels) of noisy mixtures
+                    and the dominant component of each pixel
+    """
+    numpy.random.seed(0)
+    x = numpy.arange(nChannels)
+    components = numpy.array([100 * numpy.exp(-0.5 * ((x - c) / 8.) ** 2)
+                              for c in numpy.linspace(20, nChannels - 20, k)])
+    truth = numpy.random.randint(0, k, (nRows, nColumns))
+    weights = 0.2 * numpy.random.random((nRows, nColumns, k))
+    weights[numpy.arange(nRows)[:, None], numpy.arange(nColumns), truth] = 1
+    stack = numpy.random.poisson(numpy.dot(weights, components) + 5)
+    return stack.astype(numpy.float64), truth
+
+
+def _accuracy(labels, truth, k):
+    labels = labels.reshape(-1)
+    truth = truth.reshape(-1)
+    confusion = numpy.zeros((k, k))
+    numpy.add.at(confusion, (truth, labels), 1)
+    best = max(confusion[numpy.arange(k), p].sum()
+               for p in itertools.permutations(range(k)))
+    return best / truth.size
+
+
+def _run(function):
+    tracemalloc.start()
+    with BenchmarkUtils.Timer() as timer:
+        labels = function()
+    t = timer.seconds
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return labels, t, peak
+
+
+def benchmark(nRows=200, nColumns=200, nChannels=256, k=5):
+    """
+    :returns list: (method, seconds, peak MB, accuracy)
+    """
+    stack, truth = generateData(nRows, nColumns, nChannels, k)
+    spectra = stack.reshape(-1, nChannels)
+    methods = []
+    if hasattr(KMeansModule, "_kmeans"):
+        methods.append("_kmeans")
+    try:
+        import sklearn
+        methods.append("sklearn")
+    except ImportError:
+        pass
+    results = []
+    for method in methods:
+        labels, t, peak = _run(lambda: KMeansModule.label(spectra, k,
+                                                          method=method))
+        results.append((method, t, peak / 1.0e6, _accuracy(labels, truth, k)))
+    labels, t, peak = _run(lambda: KMeansModule.miniBatchKMeans(stack, k,
+                                                    seed=0)["labels"])
+    results.append(("minibatch numpy", t, peak / 1.0e6,
+                    _accuracy(labels, truth, k)))
+    tmpDir = tempfile.mkdtemp(prefix="pymcaKMeans")
+    try:
+        fname = os.path.join(tmpDir, "stack.h5")
+        with h5py.File(fname, "w") as h5:
+            h5.create_dataset("data", data=stack,
+                              chunks=(1, nColumns, nChannels))
+        del stack, spectra
+        with h5py.File(fname, "r") as h5:
+            labels, t, peak = _run(lambda: KMeansModule.miniBatchKMeans(
+                                            h5["data"], k, seed=0)["labels"])
+        results.append(("minibatch hdf5", t, peak / 1.0e6,
+                        _accuracy(labels, truth, k)))
+    finally:
+        shutil.rmtree(tmpDir)
+    return results
+
+
+def main(argv=None):
+    BenchmarkUtils.main(benchmark, argv,
+                        [("nRows", 200), ("nColumns", 200),
+                         ("nChannels", 256), ("k", 5)],
+                        "%(nRows)d x %(nColumns)d spectra of %(nChannels)d "
+                        "channels, %(k)d clusters",
+                        [("method", "%16s"), ("seconds", "%10.3f"),
+                         ("peak MB", "%10.1f"), ("accuracy", "%10.3f")])
+
+
+if __name__ == "__main__":
+    main()
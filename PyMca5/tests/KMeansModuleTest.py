@@ -0,0 +1,117 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import unittest
+import sys
+import os
+import gc
+import tempfile
+import numpy
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+
+class testKMeansModule(unittest.TestCase):
+    def setUp(self):
+        numpy.random.seed(1)
+        self.k = 4
+        means = 100 * numpy.random.random((self.k, 64))
+        self.truth = numpy.random.randint(0, self.k, (50, 60))
+        self.stack = numpy.random.poisson(means[self.truth])\
+                     .astype(numpy.float64)
+        self.stack[3, 5, 7] = numpy.nan
+        self.truth[3, 5] = -1
+
+    def assertClusters(self, labels):
+        # same partition as the true one (up to a permutation of the labels)
+        labels = numpy.asarray(labels).reshape(self.truth.shape)
+        self.assertTrue(numpy.array_equal(labels < 0, self.truth < 0))
+        good = self.truth >= 0
+        pairs = set(zip(self.truth[good].tolist(), labels[good].tolist()))
+        self.assertEqual(len(pairs), self.k)
+        self.assertEqual(len(set(j for i, j in pairs)), self.k)
+
+    def testMiniBatchKMeans(self):
+        from PyMca5.PyMcaMath.mva import KMeansModule
+        result = KMeansModule.miniBatchKMeans(self.stack, self.k,
+                                              batch_size=256, seed=0)
+        self.assertClusters(result["labels"])
+        self.assertTrue(result["converged"])
+        self.assertEqual(result["means"].shape, (self.k, 64))
+        # features along the first dimension and parallel labelling
+        stack = numpy.ascontiguousarray(numpy.transpose(self.stack, (2, 0, 1)))
+        result = KMeansModule.miniBatchKMeans(stack, self.k, mcaAxis=0,
+                                              seed=0, nworkers=2)
+        self.assertClusters(result["labels"])
+        # through the generic entry point
+        labels = KMeansModule.label(self.stack.reshape(-1, 64), self.k,
+                                    method="minibatch")
+        self.assertClusters(labels)
+
+    @unittest.skipIf(not HAS_H5PY, "skipped h5py missing")
+    def testMiniBatchKMeansHdf5(self):
+        from PyMca5.PyMcaMath.mva import KMeansModule
+        expected = KMeansModule.miniBatchKMeans(self.stack, self.k, seed=0)
+        tmpDir = tempfile.mkdtemp(prefix="pymcaTmp")
+        fname = os.path.join(tmpDir, "kmeans.h5")
+        try:
+            with h5py.File(fname, "w") as h5:
+                h5.create_dataset("data", data=self.stack, chunks=(5, 6, 64))
+                result = KMeansModule.miniBatchKMeans(h5["data"], self.k,
+                                                      seed=0)
+            self.assertClusters(result["labels"])
+            self.assertTrue(numpy.allclose(result["means"],
+                                           expected["means"]))
+        finally:
+            gc.collect()
+            if os.path.exists(fname):
+                os.remove(fname)
+            os.rmdir(tmpDir)
+
+
+def getSuite(auto=True):
+    testSuite = unittest.TestSuite()
+    if auto:
+        testSuite.addTest(unittest.TestLoader().loadTestsFromTestCase(testKMeansModule))
+    else:
+        # use a predefined order
+        testSuite.addTest(testKMeansModule("testMiniBatchKMeans"))
+        testSuite.addTest(testKMeansModule("testMiniBatchKMeansHdf5"))
+    return testSuite
+
+def test(auto=False):
+    return unittest.TextTestRunner(verbosity=2).run(getSuite(auto=auto))
+
+if __name__ == '__main__':
+    result = test()
+    sys.exit(not result.wasSuccessful())
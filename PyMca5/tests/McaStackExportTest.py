@@ -181,6 +181,59 @@ def testSingleArrayExport(self):
         self.assertTrue(numpy.allclose(data, stackRead.data),
                 "Incorrect data readout")
 
+    @unittest.skipIf(not HAS_H5PY, "skipped h5py missing")
+    def testCompressedStackExport(self):
+        from PyMca5.PyMcaCore import DataObject
+        from PyMca5.PyMcaCore import McaStackExport
+        self._outputDir = tempfile.mkdtemp(prefix="pymcaTmp")
+        source = os.path.join(self._outputDir, "source.h5")
+        numpy.random.seed(0)
+        data = numpy.random.poisson(10, (260, 256, 16)).astype(numpy.int32)
+        live_time = numpy.random.random(260 * 256)
+        xpos = numpy.arange(260 * 256, dtype=numpy.float64)
+        with h5py.File(source, "w") as h5:
+            h5.create_dataset("data", data=data, chunks=(7, 9, 16))
+        for mcaIndex in [-1, 0]:
+            if mcaIndex == 0:
+                expected = numpy.ascontiguousarray(numpy.transpose(data,
+                                                                   (2, 0, 1)))
+            else:
+                expected = data
+            for compression, shuffle, nworkers in [(None, False, None),
+                                                   ("gzip", True, 2),
+                                                   ("gzip", False, None)]:
+                fileName = os.path.join(self._outputDir, "output.h5")
+                if os.path.exists(fileName):
+                    os.remove(fileName)
+                with h5py.File(source, "r") as h5:
+                    stack = DataObject.DataObject()
+                    if mcaIndex == 0:
+                        stack.data = expected
+                    else:
+                        # dynamically loaded stack
+                        stack.data = h5["data"]
+                    stack.info = {"McaIndex": mcaIndex,
+                                  "McaLiveTime": live_time,
+                                  "positioners": {"x": xpos, "z": 3.0}}
+                    McaStackExport.exportStackList(stack, fileName,
+                                                   compression=compression,
+                                                   shuffle=shuffle,
+                                                   nworkers=nworkers)
+                with h5py.File(fileName, "r") as h5:
+                    detector = h5["/stack/instrument/detector_00"]
+                    dataset = detector["data"]
+                    self.assertTrue(numpy.array_equal(dataset[()], expected))
+                    # whole spectra in each storage chunk
+                    self.assertEqual(dataset.chunks[mcaIndex], 16)
+                    self.assertEqual(dataset.compression, compression)
+                    self.assertEqual(dataset.shuffle, shuffle)
+                    self.assertTrue(numpy.array_equal(detector["live_time"][()],
+                                                      live_time))
+                    positioners = h5["/stack/instrument/positioners"]
+                    self.assertTrue(numpy.array_equal(positioners["x"][()],
+                                                      xpos))
+                    self.assertEqual(positioners["z"][()], 3.0)
+
 
 def getSuite(auto=True):
     testSuite = unittest.TestSuite()
@@ -191,6 +244,7 @@ def getSuite(auto=True):
         # use a predefined order
         testSuite.addTest(testMcaStackExport("testSingleStackExport"))
         testSuite.addTest(testMcaStackExport("testSingleArrayExport"))
+        testSuite.addTest(testMcaStackExport("testCompressedStackExport"))
     return testSuite
 
 def test(auto=False):
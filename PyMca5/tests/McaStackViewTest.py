@@ -111,6 +111,84 @@ def testfullChunkIndex(self):
                     lst2 = list(range(1, i+1))
                     self.assertEqual(lst1, lst2)
 
+    @unittest.skipIf(McaStackView is None,
+                     'PyMca5.PyMcaCore.McaStackView cannot be imported')
+    def testNativeChunkIndex(self):
+        shape = (7, 9, 5)
+        nativeChunks = (2, 4, 5)
+        data = numpy.zeros(shape, dtype=int)
+        for nChunksMax in range(1, 70):
+            data[()] = 0
+            result = McaStackView.fullChunkIndex(shape, nChunksMax,
+                                                 chunkAxes=(2,),
+                                                 nativeChunks=nativeChunks)
+            chunkIndex, chunkAxes, axesOrder, nBuffer = result
+            for i, (idxChunk, idxShape, nChunks) in enumerate(chunkIndex, 1):
+                data[idxChunk] += i
+                self.assertTrue(nChunks <= nBuffer)
+                # whole native chunks unless the axis is not split
+                for axis in (0, 1):
+                    start, stop, _ = idxChunk[axis].indices(shape[axis])
+                    if stop - start == shape[axis]:
+                        continue
+                    self.assertEqual(start % nativeChunks[axis], 0)
+                    if stop != shape[axis]:
+                        self.assertEqual(stop % nativeChunks[axis], 0)
+            # every spectrum is read once
+            self.assertEqual(len(numpy.unique(data)), i)
+            self.assertFalse((data == 0).any())
+
+    @unittest.skipIf(McaStackView is None,
+                     'PyMca5.PyMcaCore.McaStackView cannot be imported')
+    @unittest.skipIf(h5py is None, 'h5py is not installed')
+    def testChunkPlan(self):
+        shape = (20, 30, 64)
+        nativeChunks = (3, 7, 64)
+        data = numpy.arange(numpy.prod(shape), dtype=numpy.float32)
+        data = data.reshape(shape)
+        with self.h5Open('testChunkPlan') as f:
+            for compression in [None, 'gzip']:
+                name = 'data{}'.format(compression)
+                dset = f.create_dataset(name, data=data, chunks=nativeChunks,
+                                        compression=compression)
+                self.assertEqual(McaStackView.isCompressed(dset),
+                                 compression is not None)
+                nMca, chunks = McaStackView.chunkPlan(dset)
+                self.assertTrue(nMca >= 1)
+                self.assertEqual(chunks, nativeChunks)
+                # Misaligned blocks read storage chunks more than once
+                view = McaStackView.FullView(dset, nMca=50)
+                self.assertTrue(view.readAmplification > 1)
+                # Aligned blocks read every storage chunk once
+                for nMca in ['auto', 50]:
+                    view = McaStackView.FullView(dset, nMca=nMca,
+                                                 nativeChunks=True)
+                    self.assertEqual(view.readAmplification, 1)
+                    total = sum(chunk.sum(dtype=numpy.float64)
+                                for _, chunk in view.items())
+                    self.assertEqual(total, data.sum(dtype=numpy.float64))
+            # Native chunks which do not divide the data shape
+            dset = f.create_dataset('nondividing', chunks=nativeChunks,
+                                    data=numpy.zeros((20, 100, 64)),
+                                    compression='gzip')
+            for nMca in [1, 7, 21, 50, 300, (1, 'MB'), 'auto']:
+                view = McaStackView.FullView(dset, nMca=nMca,
+                                             nativeChunks=True)
+                self.assertEqual(view.readAmplification, 1, msg=nMca)
+            # Uncompressed partial chunk reads are allowed when an aligned
+            # block does not fit in memory
+            dset = f.create_dataset('large', data=data, chunks=shape)
+            nMca, chunks = McaStackView.chunkPlan(dset, minimal=(1, 'kb'),
+                                                  maximal=(1, 'kb'))
+            self.assertEqual(nMca, 4)
+            self.assertIsNone(chunks)
+            dset = f.create_dataset('largegzip', data=data, chunks=shape,
+                                    compression='gzip')
+            nMca, chunks = McaStackView.chunkPlan(dset, minimal=(1, 'kb'),
+                                                  maximal=(1, 'kb'))
+            self.assertEqual(chunks, shape)
+        self.assertEqual(McaStackView.chunkPlan(data)[1], None)
+
     def _chunkIndexAxes(self, shape, ndim):
         axes = set(range(ndim))
         for ndimChunk in range(ndim+1):
@@ -341,6 +419,8 @@ def getSuite(auto=True):
         # use a predefined order
         testSuite.addTest(testMcaStackView('testViewUtils'))
         testSuite.addTest(testMcaStackView('testfullChunkIndex'))
+        testSuite.addTest(testMcaStackView('testNativeChunkIndex'))
+        testSuite.addTest(testMcaStackView('testChunkPlan'))
         testSuite.addTest(testMcaStackView('testFullViewNumpy'))
         testSuite.addTest(testMcaStackView('testFullViewH5py'))
         testSuite.addTest(testMcaStackView('testMaskedChunkIndex'))
@@ -0,0 +1,150 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import unittest
+import sys
+import os
+import gc
+import tempfile
+import numpy
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+
+class testNNMAModule(unittest.TestCase):
+    def setUp(self):
+        numpy.random.seed(0)
+        x = numpy.arange(128.)
+        self.components = numpy.array([50 * numpy.exp(-0.5 * ((x - c) / 6.) ** 2)
+                                       for c in (30, 64, 100)])
+        self.weights = numpy.random.random((20, 25, 3))
+        self.stack = numpy.dot(self.weights, self.components)
+
+    def assertComponents(self, images, vectors, atol=0.05):
+        # each true component matches one NNMA component
+        vectors = vectors / numpy.linalg.norm(vectors, axis=1)[:, None]
+        components = self.components / \
+                     numpy.linalg.norm(self.components, axis=1)[:, None]
+        similarity = numpy.dot(vectors, components.T)
+        self.assertTrue(numpy.allclose(numpy.sort(similarity.max(axis=0)),
+                                       1, atol=atol))
+        self.assertTrue(numpy.all(images >= 0))
+        self.assertTrue(numpy.allclose(images.max(axis=(1, 2)), 1))
+
+    def testChunkedNMF(self):
+        from PyMca5.PyMcaMath.mva import NNMAModule
+        images, values, vectors = NNMAModule.chunkedNMF(self.stack, 3,
+                                                        eps=1.0e-6,
+                                                        maxcount=500,
+                                                        seed=0)
+        self.assertEqual(images.shape, (3, 20, 25))
+        self.assertEqual(vectors.shape, (3, 128))
+        self.assertTrue(numpy.all(numpy.diff(values) <= 0))
+        self.assertComponents(images, vectors)
+        reconstructed = numpy.dot(images.reshape(3, -1).T, vectors)
+        self.assertTrue(numpy.abs(reconstructed -
+                                  self.stack.reshape(-1, 128)).max() < 2.5)
+
+        # image stack, parallel blocks and the nnma entry point
+        class Stack(object):
+            pass
+        stack = Stack()
+        stack.data = numpy.ascontiguousarray(numpy.transpose(self.stack,
+                                                             (2, 0, 1)))
+        stack.info = {"McaIndex": 0}
+        images2, values2, vectors2 = NNMAModule.nnma(stack, 3, eps=1.0e-6,
+                                                     maxcount=500,
+                                                     function="ChunkedNMF")
+        self.assertComponents(images2, vectors2)
+
+        # spatial and spectral masks
+        mask = numpy.ones((20, 25), dtype=numpy.uint8)
+        mask[:5] = 0
+        spectralMask = numpy.ones((64,), dtype=numpy.uint8)
+        spectralMask[-4:] = 0
+        images, values, vectors = NNMAModule.chunkedNMF(self.stack, 3,
+                                                        binning=2,
+                                                        mask=mask,
+                                                        spectral_mask=spectralMask,
+                                                        eps=1.0e-6,
+                                                        maxcount=500,
+                                                        seed=0)
+        self.assertEqual(vectors.shape, (3, 64))
+        self.assertTrue(numpy.all(vectors[:, -4:] == 0))
+        self.assertTrue(numpy.all(images[:, :5] == 0))
+
+    @unittest.skipIf(not HAS_H5PY, "skipped h5py missing")
+    def testChunkedNMFHdf5(self):
+        from PyMca5.PyMcaMath.mva import NNMAModule
+        expected = NNMAModule.chunkedNMF(self.stack, 3, eps=1.0e-6,
+                                         maxcount=200, seed=0)
+        tmpDir = tempfile.mkdtemp(prefix="pymcaTmp")
+        fname = os.path.join(tmpDir, "nnma.h5")
+        try:
+            with h5py.File(fname, "w") as h5:
+                h5.create_dataset("data", data=self.stack, chunks=(4, 5, 128))
+                group = h5.create_group("nnma")
+                images, values, vectors = \
+                    NNMAModule.chunkedNMF(h5["data"], 3, eps=1.0e-6,
+                                          maxcount=200, seed=0, nworkers=2,
+                                          output=group)
+                self.assertEqual(images.name, "/nnma/images")
+                self.assertTrue(numpy.allclose(images[()], expected[0],
+                                               atol=1.0e-4))
+                self.assertTrue(numpy.allclose(group["values"][()],
+                                               expected[1], rtol=1.0e-4))
+                self.assertTrue(numpy.allclose(group["vectors"][()],
+                                               expected[2], rtol=1.0e-4))
+        finally:
+            gc.collect()
+            if os.path.exists(fname):
+                os.remove(fname)
+            os.rmdir(tmpDir)
+
+
+def getSuite(auto=True):
+    testSuite = unittest.TestSuite()
+    if auto:
+        testSuite.addTest(unittest.TestLoader().loadTestsFromTestCase(testNNMAModule))
+    else:
+        # use a predefined order
+        testSuite.addTest(testNNMAModule("testChunkedNMF"))
+        testSuite.addTest(testNNMAModule("testChunkedNMFHdf5"))
+    return testSuite
+
+def test(auto=False):
+    return unittest.TextTestRunner(verbosity=2).run(getSuite(auto=auto))
+
+if __name__ == '__main__':
+    result = test()
+    sys.exit(not result.wasSuccessful())
@@ -153,6 +153,17 @@ def testSlowRoiFitEdfMap(self):
         self._assertSlowFitMap('edf', roiwidth=100, outputdir='fitresulta')
         self._assertSlowGuiFitMap('edf', roiwidth=100, outputdir='fitresultb')
 
+    def testSlowPoolFitEdfMap(self):
+        self._assertSlowPoolFitMap('edf')
+
+    def testSlowPoolFitManyRowsEdfMap(self):
+        # more image rows than tasks in flight
+        info = self._generateData(typ='edf', nRows=12)
+        result1 = self._fitMap(info, outputdir='fitresults1')
+        result2 = self._fitMap(info, outputdir='fitresults2', nworkers=2,
+                               executor='thread')
+        self._assertEqualFitResults(result1, result2, rtol=0)
+
     @unittest.skipIf(numpy.version.version == '1.17.0', "skipped numpy issue 13715")
     def testSlowMultiFitEdfMap(self):
         self._assertSlowMultiFitMap('edf')
@@ -167,6 +178,9 @@ def testSlowRoiFitSpecMap(self):
         self._assertSlowFitMap('specmesh', roiwidth=100, outputdir='fitresulta')
         self._assertSlowGuiFitMap('specmesh', roiwidth=100, outputdir='fitresultb')
 
+    def testSlowPoolFitSpecMap(self):
+        self._assertSlowPoolFitMap('specmesh')
+
     @unittest.skipIf(numpy.version.version == '1.17.0', "skipped numpy issue 13715")
     def testSlowMultiFitSpecMap(self):
         self._assertSlowMultiFitMap('specmesh')
@@ -184,6 +198,10 @@ def testSlowRoiFitHdf5Map(self):
         self._assertSlowFitMap('hdf5', roiwidth=100, outputdir='fitresulta')
         self._assertSlowGuiFitMap('hdf5', roiwidth=100, outputdir='fitresultb')
 
+    @unittest.skipIf(not HAS_H5PY, "skipped h5py missing")
+    def testSlowPoolFitHdf5Map(self):
+        self._assertSlowPoolFitMap('hdf5')
+
     @unittest.skipIf(not HAS_H5PY, "skipped h5py missing")
     def testSlowMultiFitHdf5Map(self):
         self._assertSlowMultiFitMap('hdf5')
@@ -235,6 +253,22 @@ def _assertSlowMultiFitMap(self, typ, outputdir='fitresults', **kwargs):
                                outputdir=outputdir+'6', **kwargs)
         self._assertEqualFitResults(result2, result6, rtol=0)
 
+    def _assertSlowPoolFitMap(self, typ, outputdir='fitresults', **kwargs):
+        info = self._generateData(typ=typ)
+        # Compare serial vs. pool of workers
+        result1 = self._fitMap(info, outputdir=outputdir+'1', **kwargs)
+        result2 = self._fitMap(info, outputdir=outputdir+'2', nworkers=2,
+                               executor='thread', **kwargs)
+        self._assertEqualFitResults(result1, result2, rtol=0)
+        result3 = self._fitMap(info, outputdir=outputdir+'3', nworkers=2,
+                               executor='process', **kwargs)
+        self._assertEqualFitResults(result1, result3, rtol=0)
+        result4 = self._fitMap(info, outputdir=outputdir+'4', nworkers=2,
+                               roiwidth=100, **kwargs)
+        result5 = self._fitMap(info, outputdir=outputdir+'5',
+                               roiwidth=100, **kwargs)
+        self._assertEqualFitResults(result4, result5, rtol=0)
+
     def _assertSlowGuiFitMap(self, typ, outputdir='fitresults', **kwargs):
         from PyMca5.PyMcaGui.pymca.PyMcaBatch import ranAsBootstrap
         info = self._generateData(typ=typ)
@@ -290,9 +324,10 @@ def _fastFitMap(self, info, outputdir, legacy=False):
             FastXRFLinearFit.save(outbuffer, outputdir, csv=False)
         return self._fitResultFileName(None, outputdir, fast=True, legacy=legacy)
 
-    def _slowFitMap(self, info, outputdir, legacy=False, roiwidth=0):
+    def _slowFitMap(self, info, outputdir, legacy=False, roiwidth=0,
+                    nworkers=None, executor='process'):
         """
-        Single process slow fitting
+        Single process slow fitting (pool of workers when nworkers > 1)
         """
         if legacy:
             from PyMca5.PyMcaPhysics.xrf import LegacyMcaAdvancedFitBatch as McaAdvancedFitBatch
@@ -311,6 +346,8 @@ def _slowFitMap(self, info, outputdir, legacy=False, roiwidth=0):
             kwargs['edf'] = False
             kwargs['h5'] = False
             kwargs['diagnostics'] = True
+            kwargs['nworkers'] = nworkers
+            kwargs['executor'] = executor
         batch = McaAdvancedFitBatch.McaAdvancedFitBatch(info['cfgname'], **kwargs)
         batch.processList()
         return self._fitResultFileName(info['input'], outputdir,
@@ -388,10 +425,9 @@ def _fitResultFileName(self, filelist, outputdir, fast=False,
             rootname += '_{:04d}eVROI'.format(roiwidth)
         return os.path.join(outputdir, subdir, rootname+ext)
 
-    def _generateData(self, fast=False, typ='hdf5'):
+    def _generateData(self, fast=False, typ='hdf5', nRows=5):
         # Generate data (in memory + save in requested format)
         nDet = 1  # TODO: currently only works with 1 detector
-        nRows = 5
         nColumns = 4
         nTimes = 3
         filename = os.path.join(self.path, 'Map')
@@ -669,14 +705,18 @@ def getSuite(auto=True):
         testSuite.addTest(testPyMcaBatch("testFastFitEdfMap"))
         testSuite.addTest(testPyMcaBatch("testSlowFitEdfMap"))
         testSuite.addTest(testPyMcaBatch("testSlowRoiFitEdfMap"))
+        testSuite.addTest(testPyMcaBatch("testSlowPoolFitEdfMap"))
+        testSuite.addTest(testPyMcaBatch("testSlowPoolFitManyRowsEdfMap"))
         testSuite.addTest(testPyMcaBatch("testSlowMultiFitEdfMap"))
         testSuite.addTest(testPyMcaBatch("testFastFitHdf5Map"))
         testSuite.addTest(testPyMcaBatch("testSlowFitHdf5Map"))
         testSuite.addTest(testPyMcaBatch("testSlowRoiFitHdf5Map"))
+        testSuite.addTest(testPyMcaBatch("testSlowPoolFitHdf5Map"))
         testSuite.addTest(testPyMcaBatch("testSlowMultiFitHdf5Map"))
         testSuite.addTest(testPyMcaBatch("testFastFitSpecMap"))
         testSuite.addTest(testPyMcaBatch("testSlowFitSpecMap"))
         testSuite.addTest(testPyMcaBatch("testSlowRoiFitSpecMap"))
+        testSuite.addTest(testPyMcaBatch("testSlowPoolFitSpecMap"))
         testSuite.addTest(testPyMcaBatch("testSlowMultiFitSpecMap"))
     return testSuite
 
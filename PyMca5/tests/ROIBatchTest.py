@@ -114,7 +114,44 @@ def assertROIsumWithLegacy(self, datagen, **parameters):
         self.assertEqual(set(result1.keys()), set(result2.keys()))
         for k1, v1 in result1.items():
             v2 = result2[k1]
-            numpy.testing.assert_array_equal(v1, v2)
+            # sums of contiguous channels or cumulative sums instead of
+            # copies of the ROI channels: not bitwise identical
+            numpy.testing.assert_allclose(v1, v2, rtol=1e-12)
+
+    @unittest.skipIf(StackROIBatch is None,
+                     "cannot import PyMca5.PyMcaCore.StackROIBatch")
+    def testManyRois(self):
+        x, y, config, peakpos = generatePeakDataPositiveX()
+        numpy.random.seed(0)
+        y = y * numpy.random.uniform(0.5, 2, (5, 7, 1))
+        roidict = config["ROI"]["roidict"]
+        roilist = config["ROI"]["roilist"]
+        for i in range(40):
+            # overlapping ROIs: the cumulative sums are used
+            roi = "roi%d" % (i + 4)
+            roilist.append(roi)
+            roidict[roi] = {"from": 10.01 + 20 * i, "to": 90.01 + 20 * i,
+                            "type": "Channel"}
+        roilist.append("ICR")
+        roidict["ICR"] = {"from": x[0], "to": x[-1], "type": "Channel"}
+        legacy = LegacyStackROIBatch.StackROIBatch()
+        outputDict = legacy.batchROIMultipleSpectra(x=x, y=y,
+                                                    configuration=config,
+                                                    xAtMinMax=True, net=True)
+        expected = dict(zip(outputDict["names"], outputDict["images"]))
+        instance = StackROIBatch.StackROIBatch()
+        for kwargs in [{}, {"nworkers": 3}]:
+            outbuffer = instance.batchROIMultipleSpectra(x=x, y=y,
+                                                         configuration=config,
+                                                         xAtMinMax=True,
+                                                         net=True, save=False,
+                                                         **kwargs)
+            result = dict(zip(outbuffer.labels('roisum'), outbuffer['roisum']))
+            self.assertEqual(set(result.keys()), set(expected.keys()))
+            for name, image in expected.items():
+                numpy.testing.assert_allclose(result[name], image,
+                                              rtol=1e-10, atol=1e-6,
+                                              err_msg=name)
 
     def assertROIsum(self, datagen, legacy=False, **parameters):
         x, y, config, peakpos = datagen()
@@ -213,6 +250,7 @@ def getSuite(auto=True):
         # use a predefined order
         testSuite.addTest(testROIBatch("testPeakPositiveX"))
         testSuite.addTest(testROIBatch("testPeakNegativeX"))
+        testSuite.addTest(testROIBatch("testManyRois"))
     return testSuite
 
 
@@ -0,0 +1,208 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import unittest
+import sys
+import numpy
+
+
+def _referenceBackground(spectrum, snipWidth, sgWidth, anchorslist):
+    # one spectrum at a time as done before the batched kernel
+    from PyMca5.PyMcaMath.fitting import SpecfitFuns
+    background = SpecfitFuns.SavitskyGolay(spectrum, sgWidth)
+    lastAnchor = 0
+    for anchor in anchorslist:
+        if (anchor > lastAnchor) and (anchor < background.size):
+            background[lastAnchor:anchor] = \
+                SpecfitFuns.snip1d(background[lastAnchor:anchor], snipWidth, 0)
+            lastAnchor = anchor
+    if lastAnchor < background.size:
+        background[lastAnchor:] = \
+            SpecfitFuns.snip1d(background[lastAnchor:], snipWidth, 0)
+    return background
+
+
+class testSNIPModule(unittest.TestCase):
+    def setUp(self):
+        numpy.random.seed(0)
+        x = numpy.linspace(0, 20, 1024)
+        expected = 100 * numpy.abs(numpy.sin(x)) + 10 + x
+        self.spectra = numpy.random.poisson(expected,
+                                            size=(30, x.size)).astype(numpy.float64)
+
+    def testSnipBackground(self):
+        from PyMca5.PyMcaMath.fitting import SpecfitFuns
+        spectra = self.spectra
+        for anchorslist in [[0, spectra.shape[1] - 1], [100, 400, 800], []]:
+            for sgWidth in [0, 5, 10]:
+                expected = numpy.array([_referenceBackground(spectrum, 30, sgWidth,
+                                                             anchorslist)
+                                        for spectrum in spectra])
+                background = SpecfitFuns.snipbackground(spectra, 30, sgWidth,
+                                                        anchorslist)
+                self.assertTrue(numpy.array_equal(background, expected))
+                # (nChannels, nSpectra) block
+                background = SpecfitFuns.snipbackground(spectra.T.copy().T, 30,
+                                                        sgWidth,
+                                                        numpy.array(anchorslist))
+                self.assertTrue(numpy.array_equal(background, expected))
+        # single spectrum
+        background = SpecfitFuns.snipbackground(spectra[0], 30)
+        self.assertTrue(numpy.array_equal(background,
+                                          SpecfitFuns.snip1d(spectra[0], 30)))
+
+    def testSnip1DStack(self):
+        from PyMca5.PyMcaMath import SNIPModule
+        from PyMca5.PyMcaMath.fitting import SpecfitFuns
+        stack = self.spectra.reshape(5, 6, -1)
+        expected = stack.copy()
+        for i in range(5):
+            for j in range(6):
+                expected[i, j, 10:1000] = SpecfitFuns.snip1d(stack[i, j, 10:1000], 20, 1)
+        expected[:, :, :10] = 0
+        expected[:, :, 1000:] = 0
+        data = stack.copy()
+        SNIPModule.replaceStackWithSnip1DBackground(data, 20, roi_min=10,
+                                                    roi_max=1000, smoothing=1)
+        self.assertTrue(numpy.array_equal(data, expected))
+        data = stack.copy()
+        SNIPModule.subtractSnip1DBackgroundFromStack(data, 20, roi_min=10,
+                                                     roi_max=1000, smoothing=1)
+        expected[:, :, 10:1000] = stack[:, :, 10:1000] - expected[:, :, 10:1000]
+        self.assertTrue(numpy.array_equal(data, expected))
+
+    def testStackFilterHdf5(self):
+        try:
+            import h5py
+        except ImportError:
+            self.skipTest("h5py not available")
+        import os
+        import gc
+        import tempfile
+        from PyMca5.PyMcaCore import DataObject
+        from PyMca5.PyMcaMath import SNIPModule
+        from PyMca5.PyMcaMath import SGModule
+        from PyMca5.PyMcaMath.fitting import SpecfitFuns
+        stack = self.spectra.reshape(5, 6, -1)
+        tmpDir = tempfile.mkdtemp()
+        fname = os.path.join(tmpDir, "stack.h5")
+        try:
+            with h5py.File(fname, "w") as h5:
+                dset = h5.create_dataset("data", data=stack, chunks=(1, 3, 256))
+                for nworkers in [1, 2]:
+                    # SNIP 1D
+                    expected = stack.copy()
+                    SNIPModule.subtractSnip1DBackgroundFromStack(expected, 20,
+                                            roi_min=10, roi_max=1000)
+                    result = SNIPModule.subtractSnip1DBackgroundFromStack(dset,
+                                            20, roi_min=10, roi_max=1000,
+                                            output=h5.create_group("snip1d_%d" % nworkers),
+                                            nworkers=nworkers)
+                    self.assertTrue(isinstance(result, h5py.Dataset))
+                    self.assertTrue(numpy.array_equal(result[()], expected))
+                    self.assertTrue(numpy.array_equal(dset[()], stack))
+
+                    # without output the result lives in a temporary file
+                    # which is removed when the result is released
+                    result = SNIPModule.subtractSnip1DBackgroundFromStack(dset,
+                                            20, roi_min=10, roi_max=1000,
+                                            nworkers=nworkers)
+                    self.assertTrue(numpy.array_equal(result[()], expected))
+                    tmpName = result.file.filename
+                    self.assertTrue(os.path.exists(tmpName))
+                    del result
+                    gc.collect()
+                    self.assertFalse(os.path.exists(tmpName))
+
+                    # spectra along the first dimension of a stack object
+                    obj = DataObject.DataObject()
+                    obj.data = h5.create_dataset("transposed_%d" % nworkers,
+                                        data=stack.transpose(2, 0, 1).copy())
+                    obj.info["McaIndex"] = 0
+                    output = h5.create_dataset("replaced_%d" % nworkers,
+                                               shape=obj.data.shape,
+                                               dtype=numpy.float64)
+                    SNIPModule.replaceStackWithSnip1DBackground(obj, 20,
+                                            output=output, nworkers=nworkers)
+                    expected = stack.copy()
+                    SNIPModule.replaceStackWithSnip1DBackground(expected, 20)
+                    self.assertTrue(obj.data is output)
+                    self.assertTrue(numpy.array_equal(output[()],
+                                                expected.transpose(2, 0, 1)))
+
+                    # Savitzky-Golay
+                    output = numpy.zeros(stack.shape)
+                    SGModule.replaceStackWithSavitzkyGolay(dset, npoints=5,
+                                            degree=2, order=1, output=output,
+                                            nworkers=nworkers)
+                    coeff = SGModule.calc_coeff(5, 2, 1)
+                    for spectrum, filtered in zip(stack.reshape(-1, stack.shape[-1]),
+                                                  output.reshape(-1, stack.shape[-1])):
+                        expected = spectrum.copy()
+                        expected[5:-5] = numpy.convolve(spectrum, coeff,
+                                                        mode='valid')
+                        expected[:5] = expected[5]
+                        expected[-5:] = expected[-6]
+                        self.assertTrue(numpy.allclose(filtered, expected))
+
+                    # SNIP 2D
+                    output = numpy.zeros(stack.shape)
+                    SNIPModule.subtractSnip2DBackgroundFromStack(dset, 2,
+                                            index=2, output=output,
+                                            nworkers=nworkers)
+                    for i in range(stack.shape[2]):
+                        expected = stack[:, :, i] - \
+                                   SpecfitFuns.snip2d(stack[:, :, i], 2, 1)
+                        self.assertTrue(numpy.array_equal(output[:, :, i],
+                                                          expected))
+        finally:
+            gc.collect()
+            for name in os.listdir(tmpDir):
+                os.remove(os.path.join(tmpDir, name))
+            os.rmdir(tmpDir)
+
+
+def getSuite(auto=True):
+    testSuite = unittest.TestSuite()
+    if auto:
+        testSuite.addTest(unittest.TestLoader().loadTestsFromTestCase(testSNIPModule))
+    else:
+        # use a predefined order
+        testSuite.addTest(testSNIPModule("testSnipBackground"))
+        testSuite.addTest(testSNIPModule("testSnip1DStack"))
+        testSuite.addTest(testSNIPModule("testStackFilterHdf5"))
+    return testSuite
+
+def test(auto=False):
+    return unittest.TextTestRunner(verbosity=2).run(getSuite(auto=auto))
+
+if __name__ == '__main__':
+    result = test()
+    sys.exit(not result.wasSuccessful())
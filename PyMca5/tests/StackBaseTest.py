@@ -200,6 +200,63 @@ def testStackBaseStack2DDataHandling(self):
         dummyArray = None
         referenceData = None
 
+    def testStackBaseMaskedMca(self):
+        from PyMca5.PyMcaCore import StackBase
+        from PyMca5.PyMcaCore import McaStackReducer
+        nrows = 40
+        ncolumns = 30
+        nchannels = 64
+        numpy.random.seed(0)
+        referenceData = numpy.random.random((nrows, ncolumns, nchannels))
+        mask = numpy.zeros((nrows, ncolumns), numpy.uint8)
+        mask[5:32, 3:20] = 1
+        mask[10, 25] = 1
+        selected = mask > 0
+        maskedMca = referenceData[selected].sum(axis=0)
+        maskedMax = referenceData[selected].max(axis=0)
+        for mcaindex in [2, 0]:
+            if mcaindex == 0:
+                data = numpy.ascontiguousarray(
+                                    numpy.moveaxis(referenceData, -1, 0))
+            else:
+                data = referenceData
+            for stackData in [data, DummyArray(data)]:
+                stackBase = StackBase.StackBase()
+                stackBase.setStack(stackData, mcaindex=mcaindex)
+                stackBase.setSelectionMask(mask)
+                mcaDataObject = stackBase.calculateMcaDataObject()
+                self.assertTrue(numpy.allclose(mcaDataObject.y[0], maskedMca),
+                                "Incorrect mca from mask calculation")
+                mcaDataObject = stackBase.calculateMcaDataObject(mcamax=True)
+                self.assertTrue(numpy.allclose(mcaDataObject.y[0], maskedMax),
+                                "Incorrect maximum mca from mask calculation")
+
+        # partial results of unchanged blocks are reused
+        for nworkers in [None, 2]:
+            reducer = McaStackReducer.McaStackReducer(referenceData,
+                                                      blockSize=(30, 'kb'),
+                                                      nMca=7,
+                                                      nworkers=nworkers)
+            self.assertEqual(reducer.nBlocks, nrows // 2)
+            result = reducer.reduce(mask, mcamax=True, mean=True)
+            self.assertTrue(numpy.allclose(result["sum"], maskedMca))
+            self.assertTrue(numpy.allclose(result["max"], maskedMax))
+            self.assertTrue(numpy.allclose(result["mean"],
+                                           maskedMca / selected.sum()))
+            self.assertEqual(result["npixels"], selected.sum())
+            self.assertEqual(reducer.misses, reducer.nBlocks)
+            newMask = mask.copy()
+            newMask[36:, :] = 1
+            result = reducer.reduce(newMask)
+            self.assertEqual(reducer.misses, reducer.nBlocks + 2)
+            self.assertTrue(numpy.allclose(result["sum"],
+                            referenceData[newMask > 0].sum(axis=0)))
+            result = reducer.reduce(None, mcamax=True)
+            self.assertTrue(numpy.allclose(result["sum"],
+                                           referenceData.sum(axis=(0, 1))))
+            self.assertTrue(numpy.allclose(result["max"],
+                                           referenceData.max(axis=(0, 1))))
+
 def getSuite(auto=True):
     testSuite = unittest.TestSuite()
     if auto:
@@ -210,6 +267,7 @@ def getSuite(auto=True):
         testSuite.addTest(testStackBase("testStackBaseImport"))
         testSuite.addTest(testStackBase("testStackBaseStack1DDataHandling"))
         testSuite.addTest(testStackBase("testStackBaseStack2DDataHandling"))
+        testSuite.addTest(testStackBase("testStackBaseMaskedMca"))
     return testSuite
 
 def test(auto=False):
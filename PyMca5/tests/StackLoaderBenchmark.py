@@ -0,0 +1,126 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Throughput of the EDF and TIFF stack loaders versus the number of reading
+threads, on synthetic file series written in a temporary directory:
+
+    python -m PyMca5.tests.StackLoaderBenchmark [nFiles nRows nColumns [directory]]
+
+Use a directory on networked storage to see the effect of the latency.
+"""
+import os
+import shutil
+import tempfile
+import numpy
+from PyMca5.tests import BenchmarkUtils
+from PyMca5.PyMcaIO import EdfFile
+from PyMca5.PyMcaIO import EDFStack
+from PyMca5.PyMcaIO import TiffIO
+from PyMca5.PyMcaIO import TiffStack
+
+
+def writeFileSeries(directory, nFiles=200, nRows=100, nColumns=1024):
+    """
+    :returns dict: list of file names per format
+    """
+    numpy.random.seed(0)
+    filelists = {"EDF": [], "TIFF": []}
+    for i in range(nFiles):
+        image = numpy.random.poisson(10, (nRows, nColumns)).astype(numpy.float32)
+        fname = os.path.join(directory, "series_%04d.edf" % i)
+        EdfFile.EdfFile(fname, "wb+").WriteImage({}, image)
+        filelists["EDF"].append(fname)
+        fname = os.path.join(directory, "series_%04d.tif" % i)
+        TiffIO.TiffIO(fname, mode="wb+").writeImage(image)
+        filelists["TIFF"].append(fname)
+    return filelists
+
+
+def benchmark(nFiles=200, nRows=100, nColumns=1024, directory=None,
+              workers=None):
+    """
+    :param int nFiles:
+    :param int nRows:
+    :param int nColumns:
+    :param str directory: where the files are written (temporary directory
+                          by default)
+    :param list workers: number of threads to be tested
+    :returns list: (format, nworkers, seconds, files/second, MB/second)
+    """
+    if workers is None:
+        workers = [1, 2, 4, 8, 16]
+    tmpDir = tempfile.mkdtemp(dir=directory)
+    try:
+        filelists = writeFileSeries(tmpDir, nFiles=nFiles, nRows=nRows,
+                                    nColumns=nColumns)
+        results = []
+        for fmt, filelist in sorted(filelists.items()):
+            reference = None
+            for nworkers in workers:
+                with BenchmarkUtils.Timer() as timer:
+                    if fmt == "EDF":
+                        stack = EDFStack.EDFStack(filelist, nworkers=nworkers)
+                    else:
+                        stack = TiffStack.TiffStack(filelist, nworkers=nworkers)
+                t = timer.seconds
+                if reference is None:
+                    reference = stack.data
+                elif not numpy.array_equal(reference, stack.data):
+                    raise RuntimeError("Parallel result differs from serial result")
+                nbytes = stack.data.nbytes
+                results.append((fmt, nworkers, t, nFiles / t,
+                                nbytes / t / 1024.**2))
+                stack = None
+    finally:
+        shutil.rmtree(tmpDir, ignore_errors=True)
+    return results
+
+
+def main(argv=None):
+    def rows(results):
+        t1 = {}
+        table = []
+        for fmt, nworkers, t, rate, mbrate in results:
+            t1.setdefault(fmt, t)
+            table.append((fmt, nworkers, t, rate, mbrate, t1[fmt] / t))
+        return table
+    BenchmarkUtils.main(benchmark, argv,
+                        [("nFiles", 200), ("nRows", 100), ("nColumns", 1024),
+                         ("directory", None)],
+                        "%(nFiles)d files of %(nRows)d x %(nColumns)d float32",
+                        [("format", "%6s"), ("workers", "%8d"),
+                         ("seconds", "%10.3f"), ("files/s", "%10.1f"),
+                         ("MB/s", "%10.1f"), ("speedup", "%8.2f")],
+                        rows=rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import unittest
+import os
+import gc
+import tempfile
+import numpy
+
+
+def _packBits(data):
+    result = bytearray()
+    i = 0
+    while i < len(data):
+        # runs of repeated bytes followed by a literal block
+        n = 1
+        while (i + n < len(data)) and (n < 128) and \
+              (data[i + n] == data[i]):
+            n += 1
+        if n > 2:
+            result += bytes([257 - n, data[i]])
+            i += n
+            continue
+        block = data[i:i + 128]
+        result += bytes([len(block) - 1]) + block
+        i += len(block)
+    return bytes(result)
+
+
+def _lzwEncode(data):
+    result = bytearray()
+    state = [0, 0]
+
+    def emit(code, nbits):
+        state[0] = (state[0] << nbits) | code
+        state[1] += nbits
+        while state[1] >= 8:
+            state[1] -= 8
+            result.append((state[0] >> state[1]) & 0xff)
+
+    table = dict((bytes([i]), i) for i in range(256))
+    nextCode = 258
+    nbits = 9
+    emit(256, nbits)
+    w = b""
+    for c in data:
+        wc = w + bytes([c])
+        if wc in table:
+            w = wc
+            continue
+        emit(table[w], nbits)
+        table[wc] = nextCode
+        nextCode += 1
+        w = bytes([c])
+        if nextCode == 4093:
+            emit(256, nbits)
+            table = dict((bytes([i]), i) for i in range(256))
+            nextCode = 258
+            nbits = 9
+        elif nextCode > (1 << nbits) - 1:
+            nbits += 1
+    if w:
+        emit(table[w], nbits)
+    emit(257, nbits)
+    if state[1]:
+        result.append((state[0] << (8 - state[1])) & 0xff)
+    return bytes(result)
+
+
+def _writeTiff(fname, data, compression=1, predictor=1,
+               rowsPerStrip=None, tile=None):
+    """Write a little endian single image grayscale TIFF file"""
+    import struct
+    import zlib
+    encoders = {1: lambda x: x,
+                5: _lzwEncode,
+                8: zlib.compress,
+                32773: _packBits}
+    nRows, nColumns = data.shape
+    if tile is None:
+        if rowsPerStrip is None:
+            rowsPerStrip = nRows
+        blocks = [data[r:r + rowsPerStrip]
+                  for r in range(0, nRows, rowsPerStrip)]
+    else:
+        tileLength, tileWidth = tile
+        blocks = []
+        for r in range(0, nRows, tileLength):
+            for c in range(0, nColumns, tileWidth):
+                block = numpy.zeros(tile, dtype=data.dtype)
+                view = data[r:r + tileLength, c:c + tileWidth]
+                block[:view.shape[0], :view.shape[1]] = view
+                blocks.append(block)
+    segments = []
+    for block in blocks:
+        block = numpy.ascontiguousarray(block.astype(data.dtype.newbyteorder("<")))
+        if predictor == 2:
+            block = block.copy()
+            block[:, 1:] = numpy.diff(block, axis=1)
+        segments.append(encoders[compression](block.tobytes()))
+    if data.dtype.kind == "f":
+        sampleFormat = 3
+    elif data.dtype.kind == "i":
+        sampleFormat = 2
+    else:
+        sampleFormat = 1
+    offsets = []
+    offset = 8
+    for segment in segments:
+        offsets.append(offset)
+        offset += len(segment)
+    tags = [(256, 4, [nColumns]),
+            (257, 4, [nRows]),
+            (258, 3, [8 * data.dtype.itemsize]),
+            (259, 3, [compression]),
+            (262, 3, [1]),
+            (277, 3, [1]),
+            (317, 3, [predictor]),
+            (339, 3, [sampleFormat])]
+    if tile is None:
+        tags += [(273, 4, offsets),
+                 (278, 4, [rowsPerStrip]),
+                 (279, 4, [len(x) for x in segments])]
+    else:
+        tags += [(322, 4, [tile[1]]),
+                 (323, 4, [tile[0]]),
+                 (324, 4, offsets),
+                 (325, 4, [len(x) for x in segments])]
+    tags.sort()
+    # values not fitting in the entry are written after the directory
+    extra = offset + 2 + 12 * len(tags) + 4
+    ifd = struct.pack("<H", len(tags))
+    extraData = b""
+    for tag, fieldType, values in tags:
+        fmt = {3: "H", 4: "I"}[fieldType]
+        packed = struct.pack("<%d%s" % (len(values), fmt), *values)
+        if len(packed) <= 4:
+            ifd += struct.pack("<HHI", tag, fieldType, len(values)) + \
+                   packed + b"\x00" * (4 - len(packed))
+        else:
+            ifd += struct.pack("<HHII", tag, fieldType, len(values),
+                               extra + len(extraData))
+            extraData += packed
+    ifd += struct.pack("<I", 0)
+    with open(fname, "wb") as fd:
+        fd.write(b"II" + struct.pack("<HI", 42, offset))
+        for segment in segments:
+            fd.write(segment)
+        fd.write(ifd)
+        fd.write(extraData)
+
+
+class testTiffIO(unittest.TestCase):
+    def testTiffCompression(self):
+        from PyMca5.PyMcaIO import TiffIO
+        from PyMca5.PyMcaIO import TiffStack
+        tmpDir = tempfile.mkdtemp()
+        try:
+            numpy.random.seed(0)
+            data = numpy.random.randint(0, 50, (37, 45)).astype(numpy.uint16)
+            data[10:20] = 7
+            fdata = (data * 0.5).astype(numpy.float32)
+            cases = []
+            for compression in [1, 5, 8, 32773]:
+                for kw in [{}, {"rowsPerStrip": 8}, {"tile": (16, 32)}]:
+                    cases.append((data, compression, 1, kw))
+                cases.append((data, compression, 2, {"rowsPerStrip": 5}))
+                cases.append((fdata, compression, 1, {"tile": (16, 16)}))
+            for i, (image, compression, predictor, kw) in enumerate(cases):
+                fname = os.path.join(tmpDir, "image_%04d.tif" % i)
+                _writeTiff(fname, image, compression=compression,
+                           predictor=predictor, **kw)
+                tif = TiffIO.TiffIO(fname)
+                msg = "compression %d predictor %d %s" % \
+                      (compression, predictor, kw)
+                self.assertTrue(numpy.array_equal(tif.getImage(0), image),
+                                msg)
+                # only the rows requested are read
+                partial = tif.getData(0, rowMin=12, rowMax=21)
+                self.assertTrue(numpy.array_equal(partial[12:22],
+                                                  image[12:22]), msg)
+                tif = None
+
+            # parallel decoding of a large image
+            bigdata = numpy.arange(1024 * 1024, dtype=numpy.float64)
+            bigdata.shape = 1024, 1024
+            fname = os.path.join(tmpDir, "big.tif")
+            _writeTiff(fname, bigdata, compression=8, rowsPerStrip=64)
+            self.assertTrue(bigdata.nbytes >= TiffIO.PARALLEL_DECODE_SIZE)
+            tif = TiffIO.TiffIO(fname)
+            self.assertTrue(numpy.array_equal(tif.getImage(0), bigdata))
+
+            # the image cache is limited in bytes
+            tif = TiffIO.TiffIO(fname, cache_size=bigdata.nbytes - 1)
+            tif.getImage(0)
+            self.assertEqual(tif._imageDataCacheSize, 0)
+            tif = TiffIO.TiffIO(fname, cache_size=bigdata.nbytes)
+            tif.getImage(0)
+            self.assertEqual(tif._imageDataCacheSize, bigdata.nbytes)
+            tif = None
+
+            # a stack of compressed images
+            tiflist = []
+            for i in range(3):
+                fname = os.path.join(tmpDir, "stack_%04d.tif" % i)
+                _writeTiff(fname, data + i, compression=8, tile=(16, 16))
+                tiflist.append(fname)
+            stack = TiffStack.TiffStack(imagestack=True)
+            stack.loadFileList(tiflist)
+            for i in range(3):
+                self.assertTrue(numpy.array_equal(stack.data[i], data + i))
+            stack = None
+        finally:
+            gc.collect()
+            for fname in os.listdir(tmpDir):
+                os.remove(os.path.join(tmpDir, fname))
+            os.rmdir(tmpDir)
+
+
+def getSuite(auto=True):
+    testSuite = unittest.TestSuite()
+    if auto:
+        testSuite.addTest(\
+            unittest.TestLoader().loadTestsFromTestCase(testTiffIO))
+    else:
+        # use a predefined order
+        testSuite.addTest(testTiffIO("testTiffCompression"))
+    return testSuite
+
+def test(auto=False):
+    unittest.TextTestRunner(verbosity=2).run(getSuite(auto=auto))
+
+if __name__ == '__main__':
+    test()
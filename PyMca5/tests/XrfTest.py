@@ -546,6 +546,51 @@ def testStainlessSteelDataFit(self):
                 "Strategy: Element %s discrepancy too large %.1f %%" % \
                   (element.split()[0], delta))
 
+    def testMcaTheoryJacobian(self):
+        from PyMca5.PyMcaIO import specfilewrapper as specfile
+        from PyMca5.PyMcaPhysics.xrf import ClassMcaTheory
+        from PyMca5.PyMcaIO import ConfigDict
+
+        dataFile = os.path.join(self.dataDir, "Steel.spe")
+        sf = specfile.Specfile(dataFile)
+        y = sf[0].mca(1)
+        x = numpy.arange(y.size).astype(numpy.float64)
+        sf = None
+        configFile = os.path.join(self.dataDir, "Steel.cfg")
+        for hypermet in [1, 0]:
+            configuration = ConfigDict.ConfigDict()
+            configuration.read(configFile)
+            configuration["fit"]["hypermetflag"] = hypermet
+            configuration["fit"]["sumflag"] = 0
+            configuration["fit"]["escapeflag"] = 1
+            mcaFit = ClassMcaTheory.ClassMcaTheory()
+            configuration = mcaFit.configure(configuration)
+            # exact exponential to compare with numerical derivatives
+            mcaFit.FASTER = 0
+            mcaFit.setData(x, y,
+                           xmin=configuration["fit"]["xmin"],
+                           xmax=configuration["fit"]["xmax"])
+            mcaFit.estimate()
+            parameters = numpy.array(mcaFit.parameters, dtype=numpy.float64)
+            xw = mcaFit.datatofit[:, 0]
+            indices = list(range(len(parameters)))
+            self.assertTrue(mcaFit.jacobian.batched)
+            jacobian = mcaFit.jacobian(parameters, indices, xw)
+            self.assertEqual(jacobian.shape, (len(indices), len(xw)))
+            for index in indices:
+                if index < 4:
+                    expected = mcaFit.num_deriv(parameters, index, xw)
+                    atol = 1.0e-4 * numpy.abs(expected).max()
+                    rtol = 1.0e-4
+                else:
+                    expected = mcaFit.analyticalDerivative(parameters,
+                                                           index, xw)
+                    atol = 0
+                    rtol = 1.0e-10
+                numpy.testing.assert_allclose(jacobian[index], expected,
+                    rtol=rtol, atol=atol,
+                    err_msg="Derivative of %s" % mcaFit.PARAMETERS[index])
+
 def getSuite(auto=True):
     testSuite = unittest.TestSuite()
     if auto:
@@ -556,6 +601,7 @@ def getSuite(auto=True):
         testSuite.addTest(testXrf("testTrainingDataFilePresence"))
         testSuite.addTest(testXrf("testTrainingDataFit"))
         testSuite.addTest(testXrf("testStainlessSteelDataFit"))
+        testSuite.addTest(testXrf("testMcaTheoryJacobian"))
     return testSuite
 
 def test(auto=False):
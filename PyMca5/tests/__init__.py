@@ -35,6 +35,7 @@
 from PyMca5.tests.ConfigDictTest import test as testConfigDict
 from PyMca5.tests.DataTest import test as testDataTest
 from PyMca5.tests.EdfFileTest import test as testEdfFile
+from PyMca5.tests.TiffIOTest import test as testTiffIO
 from PyMca5.tests.ROIBatchTest import test as testROIBatch
 from PyMca5.tests.ElementsTest import test as testElements
 from PyMca5.tests.GefitTest import test as testGefit
@@ -46,6 +47,11 @@
 from PyMca5.tests.NexusUtilsTest import test as testNexusUtils
 from PyMca5.tests.StackInfoTest import test as testStackInfo
 from PyMca5.tests.FastXRFLinearFitTest import test as testFastXRFLinearFit
+from PyMca5.tests.SNIPModuleTest import test as testSNIPModule
+from PyMca5.tests.XASStackBatchTest import test as testXASStackBatch
+from PyMca5.tests.ImageRegistrationTest import test as testImageRegistration
+from PyMca5.tests.KMeansModuleTest import test as testKMeansModule
+from PyMca5.tests.NNMAModuleTest import test as testNNMAModule
 
 def testAll():
     from PyMca5.tests.TestAll import main as testAll
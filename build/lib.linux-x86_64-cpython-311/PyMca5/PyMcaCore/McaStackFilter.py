@@ -0,0 +1,275 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Apply a function to an MCA stack block by block.
+
+The stack is read in blocks of spectra (or of images), the blocks are
+processed (in parallel when requested) and the results are written either
+into the input array or into a new HDF5 dataset. Only a few blocks are in
+memory at any time, so dynamically loaded stacks which do not fit in memory
+can be processed too.
+"""
+import os
+import logging
+import tempfile
+import weakref
+import numpy
+from PyMca5.PyMcaCore import McaStackView
+from PyMca5.PyMcaMisc import ExecutorUtils
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+_logger = logging.getLogger(__name__)
+
+
+def createOutputDataset(data, group=None, name="data", dtype=None,
+                        compression=None):
+    """Create an HDF5 dataset with the shape (and the storage chunks) of
+    the input data.
+
+    :param data: input array (numpy.ndarray, h5py.Dataset, ...)
+    :param group: h5py.Group. When None, the dataset is created in a new
+                  temporary HDF5 file which is closed and removed when the
+                  returned dataset object is released.
+    :param str name: dataset name
+    :param dtype: float32 or float64 (depending on the input) by default
+    :param compression: see h5py.Group.create_dataset
+    :returns h5py.Dataset:
+    """
+    if h5py is None:
+        raise ImportError("h5py is needed to create an HDF5 dataset")
+    if dtype is None:
+        dtype = numpy.result_type(data.dtype, numpy.float32)
+    fname = None
+    if group is None:
+        fd, fname = tempfile.mkstemp(suffix=".h5", prefix="pymca")
+        os.close(fd)
+        _logger.info("Writing processed stack to %s", fname)
+        try:
+            group = h5py.File(fname, "w")
+        except Exception:
+            os.remove(fname)
+            raise
+    chunks = None
+    if not isinstance(data, numpy.ndarray):
+        chunks = getattr(data, "chunks", None)
+    if not chunks:
+        chunks = True
+    try:
+        dset = group.create_dataset(name, shape=data.shape, dtype=dtype,
+                                    chunks=chunks, compression=compression)
+    except Exception:
+        if fname is not None:
+            _removeTemporaryFile(group, fname)
+        raise
+    if fname is not None:
+        weakref.finalize(dset, _removeTemporaryFile, group, fname)
+    return dset
+
+
+def _removeTemporaryFile(h5file, fname):
+    """Close and delete a temporary HDF5 file (see createOutputDataset)
+    """
+    try:
+        h5file.close()
+    finally:
+        if os.path.exists(fname):
+            os.remove(fname)
+            _logger.debug("Removed temporary file %s", fname)
+
+
+def _prepareOutput(data, output):
+    if output is None:
+        output = createOutputDataset(data)
+    elif (h5py is not None) and isinstance(output, h5py.Group):
+        output = createOutputDataset(data, group=output)
+    if tuple(output.shape) != tuple(data.shape):
+        raise ValueError("Output shape %s does not match input shape %s" %
+                         (output.shape, data.shape))
+    return output
+
+
+def _applyFunction(args):
+    """Process one block (module level so it can be executed by a
+    process pool).
+
+    :param tuple args: function, key, block
+    :returns tuple: key, processed block
+    """
+    function, key, block = args
+    return key, function(block)
+
+
+def filterStack(data, function, mcaAxis=-1, output=None, nMca="auto",
+                nworkers=None, executor=None):
+    """Replace each block of spectra by the result of `function`.
+
+    :param array data: nD array (numpy.ndarray, h5py.Dataset or any
+                       array-like sliced like an h5py dataset)
+    :param callable function: takes a float64 array of spectra (one spectrum
+                              per row) which it can modify and returns the
+                              processed spectra with the same shape
+    :param int mcaAxis:
+    :param output: array with the shape of the input (use data itself to
+                   process in place) or h5py.Group in which a new dataset
+                   is created. A new HDF5 dataset in a temporary file when
+                   None, removed when the returned dataset is released (see
+                   createOutputDataset).
+    :param num or tuple or str nMca: block size (see McaStackView.ChunkedView)
+    :param int nworkers: None or 1 means serial, 0 means one per CPU
+    :param executor: 'thread' (default), 'process' or
+                     concurrent.futures.Executor
+    :returns: output
+    """
+    output = _prepareOutput(data, output)
+    ndim = len(data.shape)
+    mcaAxis = McaStackView.positive_index(mcaAxis, ndim)
+    transposeAxes = tuple(i for i in range(ndim) if i != mcaAxis) + \
+                    (mcaAxis,)
+    itransposeAxes = tuple(numpy.argsort(transposeAxes).tolist())
+    view = McaStackView.FullView(data, mcaAxis=mcaAxis, nMca=nMca,
+                                 dtype=numpy.float64)
+
+    def blocks():
+        # the view reuses its buffer
+        for key, chunk in view.items():
+            yield function, key, numpy.array(chunk, copy=True)
+
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor=executor) as \
+            (executor, nworkers):
+        for key, result in ExecutorUtils.orderedMap(_applyFunction, blocks(),
+                                                    executor=executor,
+                                                    nworkers=nworkers):
+            idx, idxShape = key
+            idxShape = tuple(idxShape[i] for i in transposeAxes)
+            output[idx] = numpy.transpose(result.reshape(idxShape),
+                                          itransposeAxes)
+    return output
+
+
+def filterImageStack(data, function, imageAxis=0, output=None, nImages=None,
+                     nworkers=None, executor=None):
+    """Replace each block of images by the result of `function`.
+
+    :param array data: 3D array (numpy.ndarray, h5py.Dataset or any
+                       array-like sliced like an h5py dataset)
+    :param callable function: takes a float64 array of images (images along
+                              the first dimension) which it can modify and
+                              returns the processed images with the same
+                              shape
+    :param int imageAxis: dimension indexing the images
+    :param output: see filterStack
+    :param int nImages: number of images per block (about 16 MB by default,
+                        aligned to the storage chunks)
+    :param int nworkers: None or 1 means serial, 0 means one per CPU
+    :param executor: 'thread' (default), 'process' or
+                     concurrent.futures.Executor
+    :returns: output
+    """
+    output = _prepareOutput(data, output)
+    ndim = len(data.shape)
+    imageAxis = McaStackView.positive_index(imageAxis, ndim)
+    nTotal = data.shape[imageAxis]
+    if nImages is None:
+        imageBytes = 8 * int(numpy.prod(data.shape)) // max(nTotal, 1)
+        nImages = max(McaStackView._nBytes((16, 'MB')) // max(imageBytes, 1),
+                      1)
+        chunks = None
+        if not isinstance(data, numpy.ndarray):
+            chunks = getattr(data, "chunks", None)
+        if chunks:
+            step = chunks[imageAxis]
+            nImages = max(nImages // step, 1) * step
+    transposeAxes = (imageAxis,) + \
+                    tuple(i for i in range(ndim) if i != imageAxis)
+    itransposeAxes = tuple(numpy.argsort(transposeAxes).tolist())
+
+    def blocks():
+        for i in range(0, nTotal, nImages):
+            idx = [slice(None)] * ndim
+            idx[imageAxis] = slice(i, min(i + nImages, nTotal))
+            idx = tuple(idx)
+            block = numpy.array(numpy.transpose(data[idx], transposeAxes),
+                                dtype=numpy.float64, copy=True)
+            yield function, idx, block
+
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor=executor) as \
+            (executor, nworkers):
+        for idx, result in ExecutorUtils.orderedMap(_applyFunction, blocks(),
+                                                    executor=executor,
+                                                    nworkers=nworkers):
+            output[idx] = numpy.transpose(result, itransposeAxes)
+    return output
+
+
+def filterStackObject(stack, function, mcaAxis=None, output=None,
+                      images=False, **kwargs):
+    """Process a stack with filterStack (or filterImageStack).
+
+    Numpy arrays are processed in place unless an output is given. Any
+    other data are written to a new HDF5 dataset, which replaces the data
+    of a stack object.
+
+    :param stack: array or object with the `data` and `info` attributes
+                  (e.g. DataObject)
+    :param callable function: see filterStack
+    :param int mcaAxis: MCA axis (image index axis when images=True).
+                        By default the 'McaIndex' of the stack info or
+                        the last axis.
+    :param output: see filterStack
+    :param bool images: process blocks of images instead of spectra
+    :param kwargs: see filterStack and filterImageStack
+    :returns: output
+    """
+    if hasattr(stack, "info") and hasattr(stack, "data"):
+        data = stack.data
+        if mcaAxis is None:
+            mcaAxis = stack.info.get("McaIndex", -1)
+    else:
+        data = stack
+    if mcaAxis is None:
+        mcaAxis = -1
+    if output is None and isinstance(data, numpy.ndarray):
+        output = data
+    if images:
+        output = filterImageStack(data, function, imageAxis=mcaAxis,
+                                  output=output, **kwargs)
+    else:
+        output = filterStack(data, function, mcaAxis=mcaAxis, output=output,
+                             **kwargs)
+    if (output is not data) and hasattr(stack, "data"):
+        stack.data = output
+    return output
@@ -0,0 +1,46 @@
+#/*##########################################################################
+# Copyright (C) 2004-2022 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V.A. Sole - ESRF"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+from PyMca5.PyMcaGui import PyMcaQt as qt
+from PyMca5.PyMcaGui.misc import CloseEventNotifyingWidget
+from PyMca5.PyMcaGui.misc import NumpyArrayTableWidget
+
+class HDF5DatasetTable(CloseEventNotifyingWidget.CloseEventNotifyingWidget):
+    def __init__(self, parent=None):
+        CloseEventNotifyingWidget.CloseEventNotifyingWidget.__init__(self,
+                                                                     parent)
+        self.mainLayout = qt.QVBoxLayout(self)
+        self.mainLayout.setContentsMargins(0, 0, 0, 0)
+        self.mainLayout.setSpacing(0)
+        self.arrayTableWidget =  NumpyArrayTableWidget.NumpyArrayTableWidget(self)
+        self.mainLayout.addWidget(self.arrayTableWidget)
+
+    def setDataset(self, dataset):
+        self.arrayTableWidget.setArrayData(dataset)
+
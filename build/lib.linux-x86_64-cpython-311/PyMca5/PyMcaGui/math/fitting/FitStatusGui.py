@@ -0,0 +1,72 @@
+#/*##########################################################################
+# Copyright (C) 2004-2014 V.A. Sole, European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF by the Software group.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V.A. Sole - ESRF Data Analysis"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+from PyMca5.PyMcaGui import PyMcaQt as qt
+
+QTVERSION = qt.qVersion()
+
+def uic_load_pixmap_FitActionsGui(name):
+    pix = qt.QPixmap()
+    if QTVERSION < '4.0.0':
+        m = qt.QMimeSourceFactory.defaultFactory().data(name)
+
+        if m:
+            qt.QImageDrag.decode(m,pix)
+
+    return pix
+
+class FitStatusGui(qt.QWidget):
+    def __init__(self,parent = None,name = None,fl = 0):
+        qt.QWidget.__init__(self,parent)
+
+        self.resize(535,47)
+
+        FitStatusGUILayout = qt.QHBoxLayout(self)
+        FitStatusGUILayout.setContentsMargins(11, 11, 11, 11)
+        FitStatusGUILayout.setSpacing(6)
+
+        self.StatusLabel = qt.QLabel(self)
+        self.StatusLabel.setText("Status:")
+        FitStatusGUILayout.addWidget(self.StatusLabel)
+
+        self.StatusLine = qt.QLineEdit(self)
+        self.StatusLine.setText("Ready")
+        self.StatusLine.setReadOnly(1)
+        FitStatusGUILayout.addWidget(self.StatusLine)
+
+        self.ChisqLabel = qt.QLabel(self)
+        self.ChisqLabel.setText("Chisq:")
+        FitStatusGUILayout.addWidget(self.ChisqLabel)
+
+        self.ChisqLine = qt.QLineEdit(self)
+        #self.ChisqLine.setSizePolicy(QSizePolicy(1,0,0,0,self.ChisqLine.sizePolicy().hasHeightForWidth()))
+        self.ChisqLine.setMaximumSize(qt.QSize(16000,32767))
+        self.ChisqLine.setText("")
+        self.ChisqLine.setReadOnly(1)
+        FitStatusGUILayout.addWidget(self.ChisqLine)
@@ -0,0 +1,93 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Read a series of files with a pool of threads.
+
+Reading a stack file by file is bound by the latency of the storage
+(networked file systems in particular). The files are decoded by several
+threads, each of them writing into its own part of the destination array,
+while the caller iterates over the results in file order (for progress
+reporting and any processing which depends on the file order).
+"""
+import os
+import logging
+import collections
+from PyMca5.PyMcaMisc import ExecutorUtils
+
+_logger = logging.getLogger(__name__)
+
+# Reading is I/O bound: more threads than CPUs hide the storage latency
+DEFAULT_NWORKERS = min(8, 2 * (os.cpu_count() or 1))
+
+
+def readFileSeries(filelist, readFile, nworkers=None, window=None):
+    """Call readFile(index, filename) for every file of the list.
+
+    The calls are executed by a pool of threads, with at most `window`
+    files being read at any time. readFile is expected to write the file
+    content into the destination itself (only touching the part of the
+    destination that belongs to that file).
+
+    :param list filelist: file names
+    :param callable readFile: function (index, filename) -> result
+    :param int nworkers: number of threads (None: DEFAULT_NWORKERS,
+                         1: read serially in the calling thread)
+    :param int window: maximal number of files in flight
+                       (default: 2 x nworkers)
+    :yields tuple: (index, result) in file order
+    """
+    if nworkers is None:
+        nworkers = DEFAULT_NWORKERS
+    nworkers = max(min(nworkers, len(filelist)), 1)
+    if window is None:
+        window = 2 * nworkers
+    window = max(window, nworkers)
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor="thread") as (executor, n):
+        if executor is None:
+            for index, filename in enumerate(filelist):
+                yield index, readFile(index, filename)
+            return
+        _logger.debug("Read %d files with %d threads", len(filelist), n)
+        pending = collections.deque()
+        try:
+            for index, filename in enumerate(filelist):
+                pending.append((index,
+                                executor.submit(readFile, index, filename)))
+                if len(pending) >= window:
+                    index, future = pending.popleft()
+                    yield index, future.result()
+            while pending:
+                index, future = pending.popleft()
+                yield index, future.result()
+        finally:
+            for index, future in pending:
+                future.cancel()
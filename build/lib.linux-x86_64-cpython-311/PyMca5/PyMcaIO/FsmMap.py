@@ -0,0 +1,91 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2019 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF by the Software group.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V.A. Sole - ESRF Data Analysis"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import os
+import sys
+import re
+import struct
+import numpy
+import copy
+import logging
+from PyMca5 import DataObject
+from .FsmReader import isFsmFile, parseFile
+
+
+_logger = logging.getLogger(__name__)
+
+SOURCE_TYPE = "EdfFileStack"
+
+class FsmMap(DataObject.DataObject):
+    '''
+    Class to read Perkin Elmenr .fsm files
+
+    It reads the spectra into a DataObject instance.
+    This class info member contains all the parsed information.
+    This class data member contains the map itself as a 3D array.
+    '''
+    def __init__(self, filename):
+        '''
+        Parameters:
+        -----------
+        filename : str
+            Name of the .fsm file.
+            It is expected to work with 1994 version FSM files
+        '''
+        DataObject.DataObject.__init__(self)
+        info, data = parseFile(filename)
+        self.sourceName = [filename]
+
+        #arrange as an EDF Stack
+        self.info = {}
+        self.data = data
+        shape = self.data.shape
+        for i in range(len(shape)):
+            key = 'Dim_%d' % (i + 1,)
+            self.info[key] = shape[i]
+        self.info["SourceType"] = SOURCE_TYPE
+        self.info["SourceName"] = self.sourceName
+        self.info["Title"] = info["Title"]
+        self.info["Size"] = data.shape[0] * data.shape[1]
+        self.info["FileIndex"] = 0
+        self.info["Channel0"] = 0.0
+        # scales
+        self.info["McaCalib"] = [info.get("zStart", 0.0),
+                                 info.get("zDelta", 1.0),
+                                 0.0] 
+        self.info["xScale"] = [info.get("xStart", 0.0),
+                               info.get("xDelta", 1.0),
+                               0.0]
+        self.info["yScale"] = [info.get("yStart", 0.0),
+                               info.get("yDelta", 1.0),
+                               0.0]
+        self.info['OmnicInfo'] = info
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2015 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF by the Software group.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V.A. Sole - ESRF Data Analysis"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+"""Setup script for the EDFFILE module distribution."""
+
+import sys
+import glob
+try:
+    import numpy
+except ImportError:
+    text  = "You must have numpy installed.\n"
+    text += "See http://sourceforge.net/project/showfiles.php?group_id=1369&package_id=175103\n"
+    raise ImportError, text
+
+from distutils.core import setup
+from distutils.extension import Extension
+
+sources = glob.glob('*.c')
+if sys.platform == "win32":
+    define_macros = [('WIN32',None)]
+else:
+    define_macros = []
+
+setup (
+        name         = "FastEdf",
+        version      = "2.0",
+        description  = "fit functions module",
+        author       = "BLISS Group",
+        author_email = "sole@esrf.fr",
+        url          = "http://www.esrf.fr/computing/bliss/",
+
+        # Description of the modules and packages in the distribution
+
+        #extra_path   = 'Pybliss',
+        ext_modules  = [
+                       Extension(
+                            name          = 'FastEdf',
+                            sources       = sources,
+                            define_macros = define_macros,
+                            include_dirs  = [numpy.get_include()]),
+       ],
+)
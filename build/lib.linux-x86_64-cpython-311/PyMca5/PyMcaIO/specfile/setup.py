@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2015 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF by the Software group.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V.A. Sole - ESRF Data Analysis"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__="""Setup script for the SPECFILE module distribution."""
+
+import os, sys, glob
+try:
+    import numpy
+except ImportError:
+    text  = "You must have numpy installed.\n"
+    text += "See http://sourceforge.net/project/showfiles.php?group_id=1369&package_id=175103\n"
+    raise ImportError(text)
+
+from distutils.core import setup
+from distutils.extension import Extension
+
+SPECFILE_USE_GNU_SOURCE = os.getenv("SPECFILE_USE_GNU_SOURCE")
+if SPECFILE_USE_GNU_SOURCE is None:
+    SPECFILE_USE_GNU_SOURCE = 0
+    if sys.platform.lower().startswith("linux"):
+        print("WARNING:")
+        print("A cleaner locale independent implementation")
+        print("may be achieved setting SPECFILE_USE_GNU_SOURCE to 1")
+        print("For instance running this script as:")
+        print("SPECFILE_USE_GNU_SOURCE=1 python setup.py build")
+else:
+    SPECFILE_USE_GNU_SOURCE = int(SPECFILE_USE_GNU_SOURCE)
+
+
+srcfiles = [ 'sfheader','sfinit','sflists','sfdata','sfindex',
+             'sflabel' ,'sfmca', 'sftools','locale_management','specfile_py']
+
+if sys.version >= '3.0':
+    srcfiles[-1] += '3'
+
+sources = []
+for ffile in srcfiles:
+  sources.append('src/'+ffile+'.c')
+
+if sys.platform == "win32":
+    define_macros = [('WIN32',None)]
+elif os.name.lower().startswith('posix'):
+    define_macros = [('SPECFILE_POSIX', None)]
+    #this one is more efficient but keeps the locale
+    #changed for longer time
+    #define_macros = [('PYMCA_POSIX', None)]
+    #the best choice is to have _GNU_SOURCE defined
+    #as a compilation flag because that allows the
+    #use of strtod_l
+    if SPECFILE_USE_GNU_SOURCE:
+        define_macros = [('_GNU_SOURCE', 1)]
+else:
+    define_macros = []
+setup (
+        name         = "specfile",
+        version      = "3.2",
+        description  = "module to read SPEC datafiles",
+        author       = "BLISS Group",
+        author_email = "rey@esrf.fr",
+        url          = "http://www.esrf.fr/computing/bliss/",
+        ext_modules  = [
+                       Extension(
+                            name          = 'specfile',
+                            sources       = sources,
+                            define_macros = define_macros,
+                            include_dirs  = ['include', numpy.get_include()],
+                       ),
+       ],
+)
@@ -0,0 +1,498 @@
+# coding: utf8
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "Jérôme Kieffer and V.Armando Solé"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__date__ = "20151002"
+__doc__ = """
+This is a python module to measure image offsets.
+
+Whole stacks are registered by `calculate_shifts` and aligned by
+`shift_stack`. Both read the stack in blocks of frames and process the
+blocks with batched FFTs, in parallel when requested.
+"""
+
+import os, time
+import logging
+import numpy
+from numpy.fft import fft2, ifft2, fftshift, ifftshift
+from PyMca5.PyMcaMisc import ExecutorUtils
+try:
+    import h5py
+except ImportError:
+    h5py = None
+PYMCA = False
+SCIPY = False
+try:
+    from PyMca5.PyMca import SpecfitFuns
+    PYMCA = True
+except ImportError:
+    try:
+        import scipy.ndimage.interpolation
+        SCIPY = True
+    except Exception:
+        print("Shift bilinear relaced by shiftFFT")
+
+_logger = logging.getLogger(__name__)
+
+# default size of the blocks of frames
+BLOCK_SIZE = 16 * 1024 * 1024
+
+def shiftFFT(img, shift):
+    """
+    Shift an array using FFTs
+    :param input: 2d numpy array
+    :param shift: 2-tuple of float
+    :return: shifted image
+
+    """
+    d0, d1 = img.shape
+    v0, v1 = shift
+    f0 = ifftshift(numpy.arange(-d0 // 2, d0 // 2))
+    f1 = ifftshift(numpy.arange(-d1 // 2, d1 // 2))
+    m1, m0 = numpy.meshgrid(f1, f0)
+    e0 = numpy.exp(-2j * numpy.pi * v0 * m0 / float(d0))
+    e1 = numpy.exp(-2j * numpy.pi * v1 * m1 / float(d1))
+    e = e0 * e1
+    out = ifft2(fft2(img) * e)
+    return abs(out)
+
+def shiftBilinear(img, shift):
+    """
+    Shift an array like  scipy.ndimage.interpolation.shift(input, shift, mode="wrap", order="infinity")
+    :param input: 2d numpy array
+    :param shift: 2-tuple of float
+    :return: shifted image
+
+    """
+    shape = img.shape
+    x = numpy.zeros((shape[0] * shape[1], 2), numpy.float64)
+    x[:,0] = shift[0] + numpy.outer(numpy.arange(shape[0]), numpy.ones(shape[1])).reshape(-1)
+    x[:,1] = shift[1] + numpy.outer(numpy.ones(shape[0]), numpy.arange(shape[1])).reshape(-1)
+    shifted = SpecfitFuns.interpol([numpy.arange(shape[0]),
+                                    numpy.arange(shape[1])], img, x)
+    shifted.shape = shape[0], shape[1]
+    return shifted
+
+def shiftImage(img, shift, method=None):
+    """
+    Shift an array like  scipy.ndimage.interpolation.shift(input, shift, mode="wrap", order="infinity")
+    :param input: 2d numpy array
+    :param shift: 2-tuple of float
+    :param method: string set to PYMCA, SCIPY or FFT. Default is to try the first of those that is possible.
+    :return: shifted image
+
+    """
+    if method is None:
+        if PYMCA:
+            return shiftBilinear(img, shift)
+        elif SCIPY:
+            return scipy.ndimage.interpolation.shift(img, shift, mode="wrap")
+        else:
+            return shiftFFT(img, shift)
+    elif method.lower() == "pymca":
+        return shiftBilinear(img, shift)
+    elif method.lower() == "scipy":
+        return scipy.ndimage.interpolation.shift(img, shift, mode="wrap")
+    else:
+        return shiftFFT(img, shift)
+
+def measure_offset(img1, img2, method="fft", withLog=False):
+    """
+    Measure the actual offset between 2 images. The first one is the reference. That means, if
+    the image to be shifted is the second one, the shift has to be multiplied byt -1.
+    :param img1: ndarray, first image
+    :param img2: ndarray, second image, same shape as img1
+    :param withLog: shall we return logs as well ? boolean
+    :return: tuple of floats with the offsets of the second respect to the first
+    """
+    method = str(method)
+    shape = img1.shape
+    assert img2.shape == shape
+    if 1:
+        #use numpy fftpack
+        if img1.dtype not in [numpy.float32, numpy.float64]:
+            i1f = fft2(img1.astype(numpy.float32))
+            i2f = fft2(img2.astype(numpy.float32))
+        else:
+            i1f = fft2(img1)
+            i2f = fft2(img2)
+        return measure_offset_from_ffts(i1f, i2f, withLog=withLog)
+
+def measure_offset_from_ffts(img0_fft2, img1_fft2, withLog=False):
+    """
+    Convenience method to measure the actual offset between 2 images taing their FFTs as inpuy
+    The first FFT one is the one of the reference. That means, if the image to be shifted is the
+    second one, the shift has to be multiplied byt -1.
+    :param img1: ndarray, FFT of first image
+    :param img2: ndarray, FFT of the second image, same shape as img1
+    :param withLog: shall we return logs as well ? boolean
+    :return: tuple of floats with the offsets of the second respect to the first
+    """
+    shape = img0_fft2.shape
+    logs = []
+    f0 = img0_fft2
+    f1 = img1_fft2
+    t0 = time.time()
+    absf0 = abs(f0)
+    absf1 = abs(f1)
+    if 0:
+        # one way to deal with zeros
+        if (absf0 < 1.0e-20).any() or (absf1 < 1.0e-20).any():
+            ofsset = [0.0, 0.0]
+            logs.append("MeasureOffset: empty or uniform image?")
+            if withLog:
+                return offset, logs
+            else:
+                return offset
+    else:
+        # this one seems better because numerator is expected to be zero
+        idx = absf0 < 1.0e-20
+        if idx.any():
+            absf0[idx] = 1.0
+        idx = absf1 < 1.0e-20
+        if idx.any():
+            absf1[idx] = 1.0
+    res = abs(fftshift(ifft2((f0 * f1.conjugate()) / (absf0 * absf1))))
+    t1 = time.time()
+    a0, a1 = numpy.unravel_index(numpy.argmax(res), shape)
+    resmax = res[a0, a1]
+    coarse_result =  (shape[0]//2 - a0, shape[1] // 2 - a1)
+    logs.append("ImageRegistration: coarse result : %d %d " % \
+                               (coarse_result[0], coarse_result[1]))
+    # refine a bit the position
+    w = 3
+    x0 = 0.0
+    x1 = 0.0
+    total = 0.0
+    a00 = int(max(a0-w, 0))
+    a01 = int(min(a0+w+1, shape[0]))
+    a10 = int(max(a1-w, 0))
+    a11 = int(min(a1+w+1, shape[1]))
+    if a00 == a01:
+        a01 = a00 + 1
+    if a10 == a11:
+        a11 = a10 + 1
+    for i in range(a00, a01):
+        for j in range(a10, a11):
+            if res[i, j] > 0.1 * resmax:
+                tmp = res[i, j]
+                x0 += i * tmp
+                x1 += j * tmp
+                total += tmp
+    offset = [shape[0]//2 - x0/total, shape[1] // 2 - x1/total]
+    logs.append("MeasureOffset: fine result of the centered image: %.3f %.3fs " % (offset[0], offset[1]))
+    t3 = time.time()
+    logs.append("Total execution time %.3fs" % (t3 - t0))
+    if withLog:
+        return offset, logs
+    else:
+        return offset
+
+def get_crop_indices(shape, shifts0, shifts1):
+    """
+    Get the indices of the valid region to be used when aligning a set of images
+    :param shitfs0: Shifts applied to the first dimension
+    :param shitfs1: Shifts applied to the second dimension
+    """
+    shifts0_min = numpy.min(shifts0)
+    shifts0_max = numpy.max(shifts0)
+    shifts1_min = numpy.min(shifts1)
+    shifts1_max = numpy.max(shifts1)
+
+    d0_start = int(numpy.ceil(shifts0_max))
+    d0_end = int(min(shape[0], numpy.floor(shape[0] + shifts0_min)))
+
+    d1_start = int(numpy.ceil(shifts1_max))
+    d1_end = int(min(shape[1], numpy.floor(shape[1] + shifts1_min)))
+    return d0_start, d0_end, d1_start, d1_end
+
+
+def shiftFFTStack(images, shifts):
+    """
+    Shift a stack of images using batched FFTs
+    :param images: 3d numpy array, images along the first dimension
+    :param shifts: array of shape (n, 2) with the shift of each image
+    :return: shifted images (same convention as shiftFFT)
+    """
+    images = numpy.asarray(images)
+    shifts = numpy.asarray(shifts, dtype=numpy.float64).reshape(-1, 2)
+    d0, d1 = images.shape[-2:]
+    f0 = numpy.fft.fftfreq(d0)
+    f1 = numpy.fft.fftfreq(d1)
+    e = numpy.exp(-2j * numpy.pi * \
+                  (shifts[:, 0, None, None] * f0[None, :, None] + \
+                   shifts[:, 1, None, None] * f1[None, None, :]))
+    out = ifft2(fft2(images, axes=(-2, -1)) * e, axes=(-2, -1))
+    return out.real
+
+def measure_offsets_from_ffts(img0_fft2, imgs_fft2, shape=None):
+    """
+    Vectorized version of measure_offset_from_ffts for a stack of images.
+    :param img0_fft2: ndarray, FFT of the reference image
+    :param imgs_fft2: ndarray, FFTs of the images along the first dimension
+    :param shape: shape of the images when the FFTs are calculated with
+                  numpy.fft.rfft2 (half of the work for real images)
+    :return: array of shape (n, 2) with the offsets of each image respect
+             to the reference
+    """
+    f0 = img0_fft2
+    f1 = imgs_fft2
+    n = f1.shape[0]
+    absf0 = abs(f0)
+    absf0[absf0 < 1.0e-20] = 1.0
+    absf1 = abs(f1)
+    absf1[absf1 < 1.0e-20] = 1.0
+    crossPower = (f0 * f1.conjugate()) / (absf0 * absf1)
+    if shape is None:
+        shape = f0.shape
+        res = ifft2(crossPower, axes=(-2, -1))
+    else:
+        shape = tuple(shape)
+        res = numpy.fft.irfft2(crossPower, s=shape, axes=(-2, -1))
+    res = abs(fftshift(res, axes=(-2, -1)))
+    flat = res.reshape(n, -1)
+    imax = numpy.argmax(flat, axis=1)
+    resmax = flat[numpy.arange(n), imax]
+    a0, a1 = numpy.unravel_index(imax, shape)
+    # refine a bit the position (weighted centroid of the peak)
+    w = 3
+    k = numpy.arange(-w, w + 1)
+    i = a0[:, None] + k
+    j = a1[:, None] + k
+    valid = ((i >= 0) & (i < shape[0]))[:, :, None] & \
+            ((j >= 0) & (j < shape[1]))[:, None, :]
+    patch = res[numpy.arange(n)[:, None, None],
+                numpy.clip(i, 0, shape[0] - 1)[:, :, None],
+                numpy.clip(j, 0, shape[1] - 1)[:, None, :]]
+    weights = numpy.where(valid & (patch > 0.1 * resmax[:, None, None]),
+                          patch, 0.0)
+    total = weights.sum(axis=(1, 2))
+    x0 = (weights * i[:, :, None]).sum(axis=(1, 2))
+    x1 = (weights * j[:, None, :]).sum(axis=(1, 2))
+    offsets = numpy.empty((n, 2), dtype=numpy.float64)
+    offsets[:, 0] = shape[0] // 2 - x0 / total
+    offsets[:, 1] = shape[1] // 2 - x1 / total
+    return offsets
+
+def _frameBlocks(data, imageAxis, nImages, region=None, dtype=numpy.float64):
+    """
+    Read a stack in blocks of frames
+    :param data: 3d array (numpy.ndarray, h5py.Dataset, ...)
+    :param imageAxis: dimension indexing the frames
+    :param nImages: number of frames per block
+    :param region: (offsets, widths) of the part of the frames to be read
+    :return: generator of (first frame, last frame + 1, frames), the frames
+             being along the first dimension of a new array
+    """
+    nTotal = data.shape[imageAxis]
+    frameAxes = [i for i in range(3) if i != imageAxis]
+    transposeAxes = (imageAxis,) + tuple(frameAxes)
+    idx = [slice(None)] * 3
+    if region is not None:
+        offsets, widths = region
+        for axis, offset, width in zip(frameAxes, offsets, widths):
+            idx[axis] = slice(offset, offset + width)
+    for i0 in range(0, nTotal, nImages):
+        i1 = min(i0 + nImages, nTotal)
+        idx[imageAxis] = slice(i0, i1)
+        block = numpy.transpose(data[tuple(idx)], transposeAxes)
+        yield i0, i1, numpy.array(block, dtype=dtype, copy=True)
+
+def _blockSize(data, imageAxis, nImages=None):
+    if nImages:
+        return int(nImages)
+    frameSize = int(numpy.prod(data.shape)) // max(data.shape[imageAxis], 1)
+    # complex FFTs dominate the memory footprint
+    nImages = max(BLOCK_SIZE // max(16 * frameSize, 1), 1)
+    chunks = None
+    if not isinstance(data, numpy.ndarray):
+        chunks = getattr(data, "chunks", None)
+    if chunks:
+        step = chunks[imageAxis]
+        nImages = max(nImages // step, 1) * step
+    return nImages
+
+def _registerBlock(args):
+    reference_fft2, window, i0, i1, block = args
+    if window is not None:
+        block *= window
+    return i0, i1, measure_offsets_from_ffts(reference_fft2,
+                                             numpy.fft.rfft2(block),
+                                             shape=block.shape[-2:])
+
+def calculate_shifts(data, reference, imageAxis=0, offsets=None, widths=None,
+                     window=None, shifts=None, nImages=None, nworkers=None,
+                     executor=None, callback=None):
+    """
+    Measure the offsets of all the frames of a stack respect to a reference
+    image. The FFT of the reference is calculated once and the frames are
+    processed in blocks with batched real FFTs.
+    :param data: 3d array (numpy.ndarray, h5py.Dataset, ...)
+    :param reference: 2d array, the reference image
+    :param imageAxis: dimension of data indexing the frames
+    :param offsets: first row and column of the region to be used (0, 0)
+    :param widths: number of rows and columns of the region (all)
+    :param window: apodization window with the shape of the region or None
+    :param shifts: array of shape (nFrames, 2) to be filled (h5py datasets
+                   are filled block by block). A new array if None.
+    :param nImages: number of frames per block (about 16 MB by default)
+    :param nworkers: None or 1 means serial, 0 means one per CPU
+    :param executor: 'thread' (default), 'process' or
+                     concurrent.futures.Executor
+    :param callback: called with the number of frames done and the total
+    :return: shifts as returned by measure_offset for each frame
+    """
+    if imageAxis < 0:
+        imageAxis += 3
+    frameShape = [data.shape[i] for i in range(3) if i != imageAxis]
+    if offsets is None:
+        offsets = [0, 0]
+    offsets = [int(x) for x in offsets]
+    if widths is None:
+        widths = [frameShape[0] - offsets[0], frameShape[1] - offsets[1]]
+    widths = [int(x) for x in widths]
+    nTotal = data.shape[imageAxis]
+    if shifts is None:
+        shifts = numpy.zeros((nTotal, 2), dtype=numpy.float64)
+    image = numpy.array(reference[offsets[0]:offsets[0] + widths[0],
+                                  offsets[1]:offsets[1] + widths[1]],
+                        dtype=numpy.float64)
+    if window is not None:
+        window = numpy.asarray(window, dtype=numpy.float64)
+        image *= window
+    reference_fft2 = numpy.fft.rfft2(image)
+    nImages = _blockSize(data, imageAxis, nImages)
+
+    def blocks():
+        for i0, i1, block in _frameBlocks(data, imageAxis, nImages,
+                                          region=(offsets, widths)):
+            yield reference_fft2, window, i0, i1, block
+
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor=executor) as \
+            (executor, nworkers):
+        for i0, i1, result in ExecutorUtils.orderedMap(_registerBlock,
+                                                       blocks(),
+                                                       executor=executor,
+                                                       nworkers=nworkers):
+            shifts[i0:i1] = result
+            _logger.debug("Frames %d to %d registered", i0, i1 - 1)
+            if callback is not None:
+                callback(i1, nTotal)
+    return shifts
+
+def _shiftBlock(args):
+    method, mask, i0, i1, block, shifts = args
+    if method == "fft":
+        # shiftBilinear convention
+        block = shiftFFTStack(block, -shifts)
+    else:
+        for i in range(block.shape[0]):
+            block[i] = shiftImage(block[i], shifts[i], method=method)
+    if mask is not None:
+        block *= mask
+    return i0, i1, block
+
+def shift_stack(data, shifts, imageAxis=0, output=None, method="fft",
+                crop=True, nImages=None, nworkers=None, executor=None,
+                callback=None):
+    """
+    Apply the shifts measured by calculate_shifts to all the frames of a
+    stack. The stack is read and written in blocks of frames, so stacks
+    larger than the available memory can be written to HDF5 files.
+    :param data: 3d array (numpy.ndarray, h5py.Dataset, ...)
+    :param shifts: array of shape (nFrames, 2)
+    :param imageAxis: dimension of data indexing the frames
+    :param output: array with the shape of data (use data itself to shift
+                   in place, the default) or with the frames along the first
+                   dimension, or h5py.Group in which a float32 dataset named
+                   "data" with the frames along the first dimension is
+                   created
+    :param method: "fft" (batched FFTs), "pymca" (bilinear) or "scipy"
+    :param crop: set to zero the region not covered by all the frames
+    :param nImages: number of frames per block (about 16 MB by default)
+    :param nworkers: None or 1 means serial, 0 means one per CPU
+    :param executor: 'thread' (default), 'process' or
+                     concurrent.futures.Executor
+    :param callback: called with the number of frames done and the total
+    :return: output
+    """
+    if imageAxis < 0:
+        imageAxis += 3
+    method = str(method).lower()
+    nTotal = data.shape[imageAxis]
+    frameAxes = [i for i in range(3) if i != imageAxis]
+    frameShape = tuple(data.shape[i] for i in frameAxes)
+    shifts = numpy.asarray(shifts, dtype=numpy.float64).reshape(nTotal, 2)
+    if output is None:
+        output = data
+    elif (h5py is not None) and isinstance(output, h5py.Group):
+        output = output.create_dataset("data",
+                                       shape=(nTotal,) + frameShape,
+                                       dtype=numpy.float32,
+                                       chunks=(1,) + frameShape)
+    if tuple(output.shape) == tuple(data.shape):
+        outputAxis = imageAxis
+    elif tuple(output.shape) == (nTotal,) + frameShape:
+        outputAxis = 0
+    else:
+        raise ValueError("Output shape %s does not match input shape %s" %
+                         (output.shape, data.shape))
+    if crop:
+        d0_start, d0_end, d1_start, d1_end = \
+                  get_crop_indices(frameShape, shifts[:, 0], shifts[:, 1])
+        mask = numpy.zeros(frameShape, numpy.float64)
+        mask[d0_start:d0_end, d1_start:d1_end] = 1.0
+    else:
+        mask = None
+    itransposeAxes = [1, 2]
+    itransposeAxes.insert(outputAxis, 0)
+    idx = [slice(None)] * 3
+    nImages = _blockSize(data, imageAxis, nImages)
+
+    def blocks():
+        for i0, i1, block in _frameBlocks(data, imageAxis, nImages):
+            yield method, mask, i0, i1, block, shifts[i0:i1]
+
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor=executor) as \
+            (executor, nworkers):
+        for i0, i1, result in ExecutorUtils.orderedMap(_shiftBlock,
+                                                       blocks(),
+                                                       executor=executor,
+                                                       nworkers=nworkers):
+            idx[outputAxis] = slice(i0, i1)
+            output[tuple(idx)] = numpy.transpose(result, itransposeAxes)
+            _logger.debug("Frames %d to %d shifted", i0, i1 - 1)
+            if callback is not None:
+                callback(i1, nTotal)
+    return output
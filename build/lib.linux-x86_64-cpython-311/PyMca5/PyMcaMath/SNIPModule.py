@@ -0,0 +1,189 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2019 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF by the Software group.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V.A. Sole - ESRF Data Analysis"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import functools
+import numpy
+from .fitting import SpecfitFuns
+from PyMca5.PyMcaCore import McaStackFilter
+
+snip1d = SpecfitFuns.snip1d
+snip2d = SpecfitFuns.snip2d
+snipbackground = SpecfitFuns.snipbackground
+
+
+def getSpectrumBackground(spectrum, width, roi_min=None, roi_max=None, smoothing=1):
+    if roi_min is None:
+        roi_min = 0
+    if roi_max is None:
+        roi_max = len(spectrum)
+    background = spectrum * 1
+    background[roi_min:roi_max] = snip1d(spectrum[roi_min:roi_max], width, smoothing)
+    return background
+
+getSnip1DBackground = getSpectrumBackground
+
+def _snip1DBackgroundBlock(spectra, width, roi_min, roi_max, smoothing,
+                           subtract=True):
+    """
+    Subtract or replace by the background a block of spectra
+
+    :param array spectra: 2D array with one spectrum per row
+    :returns array: spectra (modified in place)
+    """
+    if roi_min > 0:
+        spectra[:, 0:roi_min] = 0
+    spectra[:, roi_max:] = 0
+    block = spectra[:, roi_min:roi_max]
+    background = snipbackground(block, width, 0, None, smoothing)
+    if subtract:
+        block -= background
+    else:
+        block[()] = background
+    return spectra
+
+def _snip1DStack(stack, width, roi_min, roi_max, smoothing, subtract,
+                 output, nworkers, executor):
+    if hasattr(stack, "info") and hasattr(stack, "data"):
+        data = stack.data
+        mcaIndex = stack.info.get('McaIndex', -1)
+    else:
+        data = stack
+        mcaIndex = -1
+    if roi_min is None:
+        roi_min = 0
+    if roi_max is None:
+        roi_max = data.shape[mcaIndex]
+    function = functools.partial(_snip1DBackgroundBlock, width=width,
+                                 roi_min=roi_min, roi_max=roi_max,
+                                 smoothing=smoothing, subtract=subtract)
+    return McaStackFilter.filterStackObject(stack, function, mcaAxis=mcaIndex,
+                                            output=output, nworkers=nworkers,
+                                            executor=executor)
+
+def subtractSnip1DBackgroundFromStack(stack, width, roi_min=None, roi_max=None,  smoothing=1,
+                                      output=None, nworkers=None, executor=None):
+    """
+    Subtract the SNIP background from all the spectra of a stack.
+    Channels outside the region of interest are set to zero.
+
+    Numpy arrays are modified in place unless an output is given, other
+    arrays (e.g. HDF5 datasets) are processed in blocks and written to a
+    new HDF5 dataset which replaces the data of the stack object.
+
+    :param stack: array or object with the data and info attributes
+    :param output: array with the shape of the stack data (see
+                   McaStackFilter.filterStack)
+    :param int nworkers: None or 1 means serial, 0 means one per CPU
+    :param executor: 'thread' (default), 'process' or concurrent.futures.Executor
+    :returns: the processed data
+    """
+    return _snip1DStack(stack, width, roi_min, roi_max, smoothing, True,
+                        output, nworkers, executor)
+
+def replaceStackWithSnip1DBackground(stack, width, roi_min=None, roi_max=None,  smoothing=1,
+                                     output=None, nworkers=None, executor=None):
+    """
+    Replace all the spectra of a stack by their SNIP background.
+    See subtractSnip1DBackgroundFromStack for the parameters.
+    """
+    return _snip1DStack(stack, width, roi_min, roi_max, smoothing, False,
+                        output, nworkers, executor)
+
+
+def getImageBackground(image, width, roi_min=None, roi_max=None, smoothing=1):
+    if roi_min is None:
+        roi_min = (0, 0)
+    if roi_max is None:
+        roi_max = image.shape
+    background = image * 1
+    background[roi_min[0]:roi_max[0],roi_min[1]:roi_max[1]]=\
+             snip2d(image[roi_min[0]:roi_max[0],roi_min[1]:roi_max[1]],
+                    width,
+                    smoothing)
+    return background
+
+getSnip2DBackground = getImageBackground
+
+def _snip2DBackgroundBlock(images, width, roi_min, roi_max, smoothing):
+    """
+    Subtract the background from a block of images
+
+    :param array images: 3D array with the images along the first dimension
+    :returns array: images (modified in place)
+    """
+    shape = images.shape[1:]
+    if (roi_min[0] > 0) or (roi_min[1] > 0):
+        images[:, 0:roi_min[0], 0:roi_min[1]] = 0
+    if roi_max[0] < (shape[0]-1):
+        if roi_max[1] < (shape[1]-1):
+            images[:, roi_max[0]:, roi_max[1]:] = 0
+        else:
+            images[:, roi_max[0]:, :] = 0
+    else:
+        if roi_max[1] < (shape[1]-1):
+            images[:, :, roi_max[1]:] = 0
+    for image in images:
+        image[roi_min[0]:roi_max[0], roi_min[1]:roi_max[1]] -=\
+            snip2d(image[roi_min[0]:roi_max[0], roi_min[1]:roi_max[1]], width, smoothing)
+    return images
+
+def subtractSnip2DBackgroundFromStack(stack, width, roi_min=None, roi_max=None,  smoothing=1, index=None,
+                                      output=None, nworkers=None, executor=None):
+    """
+    index is the dimension used to index the images
+
+    Numpy arrays are modified in place unless an output is given, other
+    arrays are processed in blocks of images and written to a new HDF5
+    dataset (see subtractSnip1DBackgroundFromStack).
+    """
+    if hasattr(stack, "info") and hasattr(stack, "data"):
+        data = stack.data
+        if index is None:
+            index = stack.info.get('McaIndex', 0)
+    else:
+        data = stack
+    if index is None:
+        index = 2
+    if index not in [0, 1, 2]:
+        raise ValueError("Invalid image index %d" % index)
+
+    if roi_min is None:
+        roi_min = (0, 0)
+    if roi_max is None:
+        roi_max = tuple(data.shape[i] for i in range(3) if i != index)
+    function = functools.partial(_snip2DBackgroundBlock, width=width,
+                                 roi_min=roi_min, roi_max=roi_max,
+                                 smoothing=smoothing)
+    return McaStackFilter.filterStackObject(stack, function, mcaAxis=index,
+                                            output=output, images=True,
+                                            nworkers=nworkers,
+                                            executor=executor)
@@ -0,0 +1,612 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2021 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF by the Software group.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V.A. Sole - ESRF Data Analysis"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import sys
+import logging
+import time
+import numpy
+import numpy.linalg
+from PyMca5.PyMcaCore import McaStackView
+from PyMca5.PyMcaMisc import ExecutorUtils
+try:
+    # make a explicit import to warn about missing optimized libraries
+    import numpy.core._dotblas as dotblas
+except ImportError:
+    # _dotblas was removed in numpy 1.10
+    #print("WARNING: Not using BLAS/ATLAS, PCA calculation will be slower")
+    dotblas = numpy
+
+_logger = logging.getLogger(__name__)
+
+
+def getCovarianceMatrix(stack,
+                        index=None,
+                        binning=None,
+                        dtype=numpy.float64,
+                        force=True,
+                        center=True,
+                        weights=None,
+                        spatial_mask=None,
+                        nworkers=None):
+    """
+    Calculate the covariance matrix of input data (stack) array. The input array is to be
+    understood as a set of observables (spectra) taken at different instances (for instance
+    spatial coordinates).
+    
+    :param stack: Array of data. Dimension greater than one.
+    :type stack: Numpy ndarray.
+    :param index: Integer specifying the array dimension containing the "observables". Only the first
+    the first (index = 0) or the last dimension (index = -1 or index = (ndimensions - 1)) supported. 
+    :type index: Integer (default is -1 to indicate it is the last dimension of input array)
+    :param binning: Number of consecutive channels summed together. Trailing channels not filling
+    a complete bin are ignored.
+    :type binning: Positive integer (default 1)
+    :param dtype: Keyword indicating the data type of the returned covariance matrix.
+    :type dtype: A valid numpy data type (default numpy.float64)
+    :param force: Indicate how to calculate the covariance matrix:
+
+            - False : Perform the product data.T * data in one call 
+            - True  : Accumulate the means and the centered products of blocks of spectra
+                      read with McaStackView (smaller memory footprint)
+
+    :type force: Boolean (default True)
+    :param center: Indicate if the mean is to be subtracted from the observables.
+    :type center: Boolean (default True)
+    :param weights: Weight to be applied to each observable. It can therefore be used as a spectral mask
+    setting the weight to 0 on the values to ignore.
+    :type weights: Numpy ndarray of same size as the observables or None (default).
+    :spatial_mask: Array of size n where n is the number of measurement instances. In mapping
+    experiments, n would be equal to the number of pixels.
+    :type spatial_mask: Numpy array of unsigned bytes (numpy.uint8) or None (default).
+    :param nworkers: Number of threads processing the blocks when force is True.
+    :type nworkers: None or 1 means serial, 0 means one per CPU (default None)
+    :returns: The covMatrix, the average spectrum and the number of used pixels.
+    """
+    # the 1D mask = weights should correspond to the values, before or after
+    # sampling?  it could be handled as weights to be applied to the
+    # spectra. That would allow two uses, as mask and as weights, at
+    # the cost of a multiplication.
+
+    # the spatial_mask accounts for pixels to be considered. It allows
+    # to calculate the covariance matrix of a subset or to deal with
+    # non finite data (NaN, +inf, -inf, ...). The calling program
+    # should set the mask.
+
+    # recover the actual data to work with
+    if hasattr(stack, "info") and hasattr(stack, "data"):
+        #we are dealing with a PyMca data object
+        data = stack.data
+        if index is None:
+            index = stack.info.get("McaWindex", -1)
+    else:
+        data = stack
+
+    if index is None:
+        index = -1
+
+    oldShape = data.shape
+    if index not in [0, -1, len(oldShape) - 1]:
+        data = None
+        raise IndexError("1D index must be one of 0, -1 or %d" % len(oldShape))
+
+    if index < 0:
+        actualIndex = len(oldShape) + index
+    else:
+        actualIndex = index
+
+    # the number of spatial pixels
+    nPixels = 1
+    for i in range(len(oldShape)):
+        if i != actualIndex:
+            nPixels *= oldShape[i]
+
+    # the starting number of channels or of images
+    N = oldShape[actualIndex]
+
+    # our binning is spectral, in order not to affect the spatial resolution
+    if binning is None:
+        binning = 1
+    nChannels = int(N / binning)
+
+    if spatial_mask is not None:
+        cleanMask = numpy.asarray(spatial_mask[:]).reshape(nPixels) > 0
+        usedPixels = int(cleanMask.sum())
+    else:
+        cleanMask = None
+        usedPixels = nPixels
+
+    if weights is not None:
+        weights = numpy.asarray(weights, dtype=numpy.float64).reshape(-1)
+        if weights.size not in [N, nChannels]:
+            raise ValueError("Expected %d or %d weights, got %d" % \
+                             (N, nChannels, weights.size))
+    # end of checking part
+
+    if (not force)and isinstance(data, numpy.ndarray):
+        _logger.debug("Memory consuming calculation")
+        #make a direct calculation (memory cosuming)
+        #take a view to the data
+        dataView = data[:]
+        if index in [0]:
+            #reshape the view to allow the matrix multiplication
+            dataView.shape = -1, nPixels
+            dataView = _weightAndBin(dataView.T, weights, binning, nChannels)
+        else:
+            #the last index
+            dataView.shape = nPixels, -1
+            dataView = _weightAndBin(dataView, weights, binning, nChannels)
+        if numpy.may_share_memory(dataView, data):
+            # do not modify the input data
+            dataView = numpy.array(dataView, dtype=numpy.float64)
+        else:
+            dataView = numpy.asarray(dataView, dtype=numpy.float64)
+        if cleanMask is not None:
+            dataView[~cleanMask] = 0
+        sumSpectrum = dataView.sum(axis=0, dtype=numpy.float64)
+        #and return the standard covariance matrix as a matrix product
+        covMatrix = dotblas.dot(dataView.T, dataView )\
+            / float(usedPixels - 1)
+        if center:
+            averageMatrix = numpy.outer(sumSpectrum, sumSpectrum)\
+                / (usedPixels * (usedPixels - 1))
+            covMatrix -= averageMatrix
+            averageMatrix = None
+        return covMatrix.astype(dtype, copy=False), \
+               sumSpectrum / usedPixels, usedPixels
+
+    # we are dealing with dynamically loaded data
+    _logger.debug("DYNAMICALLY LOADED DATA")
+    data = _h5pyWorkaround(data, actualIndex)
+
+    # pairwise merge of the number of spectra, mean spectrum and centered
+    # Gram matrix of the blocks
+    merged = []
+    if cleanMask is not None:
+        cleanMask.shape = tuple(n for i, n in enumerate(oldShape)
+                                if i != actualIndex)
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor="thread") as \
+            (executor, nworkers):
+        arguments = ((block, cleanMask if cleanMask is None else cleanMask[idx],
+                      weights, binning, nChannels)
+                     for idx, block in _spectraBlocks(data, actualIndex))
+        for moments in ExecutorUtils.orderedMap(_blockMoments, arguments,
+                                                executor=executor,
+                                                nworkers=nworkers):
+            if not moments[0]:
+                continue
+            level = 0
+            while merged and merged[-1][0] == level:
+                moments = _mergeMoments(merged.pop()[1], moments)
+                level += 1
+            merged.append((level, moments))
+    if not merged:
+        raise ValueError("No spectra selected")
+    n, mean, covMatrix = merged.pop()[1]
+    while merged:
+        n, mean, covMatrix = _mergeMoments(merged.pop()[1],
+                                           (n, mean, covMatrix))
+    if not center:
+        covMatrix += n * numpy.outer(mean, mean)
+    # the n-1 is used both for the centered and non-centered cases
+    covMatrix /= usedPixels - 1
+    return covMatrix.astype(dtype, copy=False), mean, usedPixels
+
+
+def _weightAndBin(spectra, weights, binning, nChannels):
+    """
+    Apply the spectral weights and sum groups of binning channels.
+
+    :param array spectra: 2D array, one spectrum per row
+    :param array weights: None or weights of the original or of the
+                          binned channels
+    :returns array: nChannels binned spectra (a view when possible)
+    """
+    if (weights is not None) and (weights.size != nChannels):
+        # weights of the original channels
+        spectra = spectra * weights
+        weights = None
+    if binning > 1:
+        spectra = spectra[:, :nChannels * binning]\
+                  .reshape(spectra.shape[0], nChannels, binning)\
+                  .sum(axis=2, dtype=numpy.float64)
+    if weights is not None:
+        spectra = spectra * weights
+    return spectra
+
+
+def _h5pyWorkaround(data, actualIndex):
+    # workaround a problem with h5py
+    try:
+        if actualIndex in [0]:
+            testException = data[0:1]
+        else:
+            if len(data.shape) == 2:
+                testException = data[0:1, -1]
+            elif len(data.shape) == 3:
+                testException = data[0:1, 0:1, -1]
+    except AttributeError:
+        txt = "%s" % type(data)
+        if 'h5py' in txt:
+            _logger.warning("Implementing h5py workaround")
+            import h5py
+            data = h5py.Dataset(data.id)
+        else:
+            raise
+    return data
+
+
+def _spectraBlocks(data, mcaAxis):
+    """
+    Read the data in blocks of spectra aligned to the storage chunks.
+
+    :yields tuple: index of the block in the image dimensions,
+                   float64 spectra (one per row)
+    """
+    view = McaStackView.FullView(data, mcaAxis=mcaAxis, nMca="auto",
+                                 dtype=numpy.float64)
+    for (idx, shape), chunk in view.items(keyType="select"):
+        # the view reuses its buffer
+        yield idx, numpy.array(chunk, copy=True)
+
+
+def _blockPixels(idx, imageShape):
+    """
+    Indices of the spectra of a block in the flattened image.
+
+    :param tuple idx: slices of the block in the image dimensions
+    :param tuple imageShape:
+    :returns array:
+    """
+    pixels = [numpy.arange(*slc.indices(n))
+              for slc, n in zip(idx, imageShape)]
+    return numpy.ravel_multi_index(numpy.ix_(*pixels), imageShape).reshape(-1)
+
+
+def _blockMoments(args):
+    """
+    Number of spectra, mean spectrum and centered Gram matrix of a block.
+
+    :param tuple args: spectra, spatial mask of the block (or None),
+                       weights, binning, number of binned channels
+    :returns tuple: n, mean, (X - mean).T (X - mean)
+    """
+    block, mask, weights, binning, nChannels = args
+    if mask is not None:
+        mask = mask.reshape(-1)
+        if not mask.all():
+            block = block[mask]
+    block = _weightAndBin(block, weights, binning, nChannels)
+    n = block.shape[0]
+    if not n:
+        return 0, None, None
+    mean = block.sum(axis=0) / n
+    block = block - mean
+    return n, mean, dotblas.dot(block.T, block)
+
+
+def _projectBlock(args):
+    """
+    Scores of a block of spectra.
+
+    :param tuple args: index of the block, spectra, eigenvectors, binning,
+                       number of binned channels, None or (average,
+                       standard deviation)
+    :returns tuple: index of the block, scores (ncomponents, nSpectra)
+    """
+    idx, block, eigenvectors, binning, nChannels, normalization = args
+    block = _weightAndBin(block, None, binning, nChannels)
+    if normalization is not None:
+        block = (block - normalization[0]) / normalization[1]
+    return idx, dotblas.dot(eigenvectors, block.T)
+
+
+def _mergeMoments(a, b):
+    """
+    Merge the moments of two sets of spectra (Chan et al.).
+    """
+    na, meanA, gramA = a
+    nb, meanB, gramB = b
+    n = na + nb
+    delta = meanB - meanA
+    mean = meanA + delta * (nb / float(n))
+    gramA += gramB
+    gramA += numpy.outer(delta, delta) * (na * nb / float(n))
+    return n, mean, gramA
+
+
+def numpyPCA(stack, index=-1, ncomponents=10, binning=None,
+                center=True, scale=True, mask=None, spectral_mask=None, legacy=True, force=True,
+                nworkers=None):
+    _logger.debug("PCATools.numpyPCA")
+    _logger.debug("index = %d", index)
+    _logger.debug("center = %s", center)
+    _logger.debug("scale = %s", scale)
+    # recover the actual data to work with
+    if hasattr(stack, "info") and hasattr(stack, "data"):
+        #we are dealing with a PyMca data object
+        data = stack.data
+    else:
+        data = stack
+
+    oldShape = data.shape
+    if index not in [0, -1, len(oldShape) - 1]:
+        data = None
+        raise IndexError("1D index must be one of 0, -1 or %d, got %d" %\
+                             (len(oldShape) - 1, index))
+
+    if index < 0:
+        actualIndex = len(oldShape) + index
+    else:
+        actualIndex = index
+
+    data = _h5pyWorkaround(data, actualIndex)
+
+    # the number of spatial pixels
+    nPixels = 1
+    for i in range(len(oldShape)):
+        if i != actualIndex:
+            nPixels *= oldShape[i]
+
+    # the number of channels
+    nChannels = oldShape[actualIndex]
+    if binning is None:
+        binning = 1
+
+    N = int(nChannels / binning)
+
+    if ncomponents > N:
+        msg = "Requested %d components for a maximum of %d" % (ncomponents, N)
+        raise ValueError(msg)
+
+    cov, avgSpectrum, calculatedPixels = getCovarianceMatrix(stack,
+                                                             index=index,
+                                                             binning=binning,
+                                                             force=force,
+                                                             center=center,
+                                                             spatial_mask=mask,
+                                                             weights=spectral_mask,
+                                                             nworkers=nworkers)
+
+    # the total variance is the sum of the elements of the diagonal
+    totalVariance = numpy.array(numpy.diag(cov), copy=True)
+    standardDeviation = numpy.sqrt(totalVariance)
+    standardDeviation = standardDeviation + (standardDeviation == 0)
+    _logger.info("Total Variance = %s", totalVariance.sum())
+
+    normalizeToUnitStandardDeviation = scale
+    #option to normalize to unit standard deviation
+    if normalizeToUnitStandardDeviation:
+        for i in range(cov.shape[0]):
+            if totalVariance[i] > 0:
+                cov[i, :] /= numpy.sqrt(totalVariance[i])
+                cov[:, i] /= numpy.sqrt(totalVariance[i])
+
+    t0 = time.time()
+    totalVariance = numpy.diag(cov).sum()
+    evalues, evectors = numpy.linalg.eigh(cov)
+    # The total variance should also be the sum of all the eigenvalues
+    calculatedTotalVariance = evalues.sum()
+    if abs(totalVariance - calculatedTotalVariance) > \
+           (0.0001 * calculatedTotalVariance):
+        _logger.info("WARNING: Discrepancy on total variance")
+        _logger.info("Variance from covariance matrix = %s",
+                     totalVariance)
+        _logger.info("Variance from sum of eigenvalues = %s",
+                     calculatedTotalVariance)
+    _logger.debug("Eig elapsed = %s", time.time() - t0)
+    cov = None
+
+    dtype = numpy.float32
+    images = numpy.zeros((ncomponents, nPixels), dtype)
+    eigenvectors = numpy.zeros((ncomponents, N), dtype)
+    eigenvalues = numpy.zeros((ncomponents,), dtype)
+    # sort eigenvalues
+    if 1:
+        a = [(evalues[i], i) for i in range(len(evalues))]
+        a.sort()
+        a.reverse()
+        totalExplainedVariance = 0.0
+        for i0 in range(ncomponents):
+            i = a[i0][1]
+            eigenvalues[i0] = evalues[i]
+            partialExplainedVariance = 100. * evalues[i] / \
+                                       calculatedTotalVariance
+            _logger.info("PC%02d  Explained variance %.5f %% ",
+                         i0 + 1, partialExplainedVariance)
+            totalExplainedVariance += partialExplainedVariance
+            eigenvectors[i0, :] = evectors[:, i]
+            #print("NORMA = ", numpy.dot(evectors[:, i].T, evectors[:, i]))
+        _logger.info("Total explained variance = %.2f %% ",
+                     totalExplainedVariance)
+    else:
+        idx = numpy.argsort(evalues)
+        eigenvalues[:]  = evalues[idx]
+        eigenvectors[:, :] = evectors[:, idx].T
+
+    # figure out if eigenvectors are to be multiplied by -1
+    if avgSpectrum.sum() > 0:
+        for i0 in range(ncomponents):
+            if eigenvectors[i0].sum() < 0.0:
+                _logger.info("PC%02d multiplied by -1" % i0)
+                eigenvectors[i0] *= -1
+
+    # calculate the projections
+    # Subtracting the average and normalizing to standard deviation gives worse results.
+    # Versions 5.0.0 to 5.1.0 implemented that behavior as default.
+    # When dealing with the CH1777 test dataset the Sb signal was less contrasted against
+    # the Ca signal.
+    # Clearly the user should have control about subtracting the average or not and
+    # normalizing to the standard deviation or not.
+    subtractAndNormalize = False
+    if subtractAndNormalize:
+        normalization = avgSpectrum, standardDeviation
+    else:
+        normalization = None
+    imageShape = tuple(n for i, n in enumerate(oldShape) if i != actualIndex)
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor="thread") as \
+            (executor, nworkers):
+        arguments = ((idx, block, eigenvectors, binning, N, normalization)
+                     for idx, block in _spectraBlocks(data, actualIndex))
+        for idx, scores in ExecutorUtils.orderedMap(_projectBlock, arguments,
+                                                    executor=executor,
+                                                    nworkers=nworkers):
+            images[:, _blockPixels(idx, imageShape)] = scores
+    # reshape the images
+    images.shape = (ncomponents,) + imageShape
+    if legacy:
+        return images, eigenvalues, eigenvectors
+    else:
+        return {"scores": images,
+                "eigenvalues": eigenvalues,
+                "eigenvectors": eigenvectors,
+                "average": avgSpectrum,
+                "pixels": calculatedPixels,
+                "variance": calculatedTotalVariance,
+                "covariance":cov}
+
+
+def test():
+    x = numpy.array([[0.0,  2.0,  3.0],
+                     [3.0,  0.0, -1.0],
+                     [4.0, -4.0,  4.0],
+                     [4.0,  4.0,  4.0]])
+    shape0 = x.shape
+    print("x:")
+    print(x)
+    print("Numpy covariance matrix. It uses (n-1)")
+    print(numpy.cov(x.T))
+    avg = x.sum(axis=0).reshape(-1, 1) / x.shape[0]
+    print("Average = ", avg)
+    print("OPERATION")
+    print(numpy.dot((x.T - avg), (x.T - avg).T) / (x.shape[0] - 1))
+
+    print("PCATools.getCovarianceMatrix(x, force=True)")
+    x.shape = 1, shape0[0], shape0[1]
+    pymcaCov, pymcaAvg, nData = getCovarianceMatrix(x, force=True)
+    print("PyMca covariance matrix. It uses (n-1)")
+    print(pymcaCov)
+    print("Average = ", pymcaAvg)
+
+    print("PCATools.getCovarianceMatrix(x, force=True) using spatial_mask")
+    x.shape = 1, shape0[0], shape0[1]
+    dataSum = x.sum(axis=-1)
+    spatial_mask = numpy.isfinite(dataSum)
+    pymcaCov, pymcaAvg, nData = getCovarianceMatrix(x, force=True,
+                                                    spatial_mask=spatial_mask)
+    print("PyMca covariance matrix. It uses (n-1)")
+    print(pymcaCov)
+    print("Average = ", pymcaAvg)
+
+    print("PCATools.getCovarianceMatrix(x, force=False)")
+    x.shape = 1, shape0[0], shape0[1]
+    pymcaCov, pymcaAvg, nData = getCovarianceMatrix(x, force=False)
+    print("PyMca covariance matrix. It uses (n-1)")
+    print(pymcaCov)
+    print("Average = ", pymcaAvg)
+
+    print("PCATools.getCovarianceMatrix(x, force=False) using spatial_mask")
+    x.shape = 1, shape0[0], shape0[1]
+    y = numpy.zeros((2, shape0[0], shape0[1]))
+    y[0] = x[0]
+    y[1, :, :] = numpy.nan
+    dataSum = y.sum(axis=-1)
+    spatial_mask = numpy.isfinite(dataSum)
+    pymcaCov, pymcaAvg, nData = getCovarianceMatrix(y, force=False,
+                                                    spatial_mask=spatial_mask)
+    print("PyMca covariance matrix. It uses (n-1)")
+    print(pymcaCov)
+    print("Average = ", pymcaAvg)
+
+    print("PCATools.getCovarianceMatrix(x, force=True) using spatial_mask")
+    y[1, :, :] = numpy.nan
+    dataSum = y.sum(axis=-1)
+    spatial_mask = numpy.isfinite(dataSum)
+    pymcaCov, pymcaAvg, nData = getCovarianceMatrix(y, force=True,
+                                                    spatial_mask=spatial_mask)
+    print("PyMca covariance matrix. It uses (n-1)")
+    print(pymcaCov)
+    print("Average = ", pymcaAvg)
+
+    print("PCATools.getCovarianceMatrix(x)")
+    x.shape = shape0[0], 1, shape0[1]
+    pymcaCov, pymcaAvg, nData = getCovarianceMatrix(x)
+    print("PyMca covariance matrix. It uses (n-1)")
+    print(pymcaCov)
+    print("Average = ", pymcaAvg)
+
+    print("MDP")
+    import mdp
+    pca = mdp.nodes.PCANode(dtype=numpy.float64)
+    x.shape = shape0
+    pca.train(x)
+    # access to a protected member to prevent
+    # deletion of the covariance matrix when using
+    # stop_training.
+    pca._stop_training(debug=True)
+    print("MDP covariance matrix. It uses (n-1)")
+    print(pca.cov_mtx)
+    print("Average = ", pca.avg)
+
+    print("TEST AS IMAGES")
+    stack = numpy.zeros((shape0[-1], shape0[0], 1), numpy.float64)
+    for i in range(stack.shape[0]):
+        stack[i, :, 0] = x[:, i]
+    x = stack
+    print("PCATools.getCovarianceMatrix(x) force=True")
+    pymcaCov, pymcaAvg, nData = getCovarianceMatrix(x, index=0, force=True)
+    print("PyMca covariance matrix. It uses (n-1)")
+    print(pymcaCov)
+    print("Average = ", pymcaAvg)
+
+    print("PCATools.getCovarianceMatrix(x) force=True) use_spatialMask")
+    y = numpy.zeros((shape0[-1], shape0[0], 2), numpy.float64)
+    y[:, :, 0] = x[:, :, 0]
+    y[:, :, 1] = numpy.nan
+    dataSum = y.sum(axis=0)
+    spatial_mask = numpy.isfinite(dataSum)
+    pymcaCov, pymcaAvg, nData = getCovarianceMatrix(y, index=0, force=True,
+                                                    spatial_mask=spatial_mask)
+    print("PyMca covariance matrix. It uses (n-1)")
+    print(pymcaCov)
+    print("Average = ", pymcaAvg)
+
+    print("PCATools.getCovarianceMatrix(x), force=False")
+    pymcaCov, pymcaAvg, nData = getCovarianceMatrix(x, index=0, force=False)
+    print("PyMca covariance matrix. It uses (n-1)")
+    print(pymcaCov)
+    print("Average = ", pymcaAvg)
+
+
+if __name__ == "__main__":
+    test()
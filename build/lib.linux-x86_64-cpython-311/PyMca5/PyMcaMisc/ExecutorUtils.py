@@ -0,0 +1,176 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Helpers to process chunks of data with a pool of workers while keeping the
+results in the same order as a serial loop.
+"""
+import os
+import logging
+import threading
+import collections
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+from contextlib import contextmanager
+
+_logger = logging.getLogger(__name__)
+
+try:
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+except ImportError:
+    _logger.info("Cannot import concurrent.futures executors")
+    ThreadPoolExecutor = None
+    ProcessPoolExecutor = None
+
+
+@contextmanager
+def executorContext(nworkers=None, executor=None):
+    """Executor for processing chunks in parallel (None for serial processing)
+
+    :param int nworkers: None or 1 means serial, 0 means one per CPU
+    :param executor: 'thread', 'process' or concurrent.futures.Executor
+                     (an executor instance is not shut down afterwards)
+    :yields tuple: executor or None, number of workers
+    """
+    if nworkers == 0:
+        nworkers = os.cpu_count() or 1
+    if executor is None or isinstance(executor, str):
+        if not nworkers or nworkers < 2:
+            yield None, 1
+            return
+        if executor in (None, 'thread'):
+            cls = ThreadPoolExecutor
+        elif executor == 'process':
+            cls = ProcessPoolExecutor
+        else:
+            raise ValueError("Unknown executor type <%s>" % executor)
+        if cls is None:
+            _logger.warning("Parallel processing not supported: process serially")
+            yield None, 1
+            return
+        _logger.debug("Process chunks with %d %s workers", nworkers,
+                      executor or 'thread')
+        pool = cls(max_workers=nworkers)
+        try:
+            yield pool, nworkers
+        finally:
+            pool.shutdown()
+    else:
+        # executor managed by the caller
+        if not nworkers:
+            nworkers = getattr(executor, '_max_workers', None) or \
+                       os.cpu_count() or 1
+        yield executor, nworkers
+
+
+class DoneFuture(object):
+    """Result which is already available (mimics concurrent.futures.Future)
+    """
+
+    def __init__(self, result):
+        self._result = result
+
+    def result(self):
+        return self._result
+
+
+def orderedMap(func, iterable, executor=None, nworkers=1):
+    """Like `map` but the calls are executed by `executor` (serially when
+    None). At most 2 x nworkers calls are pending at any time and the
+    results are yielded in the order of `iterable`.
+
+    :param callable func: function taking one argument
+    :param iterable: arguments (copy buffers which are reused by the producer)
+    :param executor: concurrent.futures.Executor or None
+    :param int nworkers:
+    :yields: func(item) for each item
+    """
+    if executor is None:
+        for item in iterable:
+            yield func(item)
+        return
+    pending = collections.deque()
+    for item in iterable:
+        pending.append(executor.submit(func, item))
+        if len(pending) > 2 * nworkers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def prefetch(iterable, n=1):
+    """Iterate over `iterable` in a background thread which runs at most
+    `n` items ahead of the consumer (e.g. read the next chunk of data while
+    the current one is processed).
+
+    :param iterable: items are not modified after being produced
+                     (copy buffers which are reused by the producer)
+    :param int n: number of items produced in advance
+    :yields: items of iterable
+    """
+    items = queue.Queue(maxsize=max(n, 1))
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def producer():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+        except BaseException as e:
+            put((False, e))
+            return
+        put((True, done))
+
+    thread = threading.Thread(target=producer)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            success, item = items.get()
+            if not success:
+                raise item
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+        thread.join()
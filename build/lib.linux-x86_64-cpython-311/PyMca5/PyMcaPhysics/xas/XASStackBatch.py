@@ -0,0 +1,404 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2019 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF by the Software group.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V.A. Sole - ESRF Data Analysis"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Module to process a stack of absorption spectra.
+"""
+import os
+import numpy
+import h5py
+import posixpath
+import logging
+from PyMca5.PyMca import XASClass
+from PyMca5.PyMcaIO import ConfigDict
+from PyMca5.PyMcaMisc import ExecutorUtils
+import time
+
+
+_logger = logging.getLogger(__name__)
+
+
+class XASStackBatch(object):
+    # approximate number of spectra processed as a block
+    _blockSpectra = 1000
+
+    def __init__(self, analyzer=None):
+        if analyzer is None:
+            analyzer = XASClass.XASClass()
+        self._analyzer = analyzer
+
+    def setConfiguration(self, configuration):
+        if "XASParameters" in configuration:
+            self._analyzer.setConfiguration(configuration["XASParameters"])
+        else:
+            self._analyzer.setConfiguration(configuration)
+
+    def setConfigurationFile(self, ffile):
+        if not os.path.exists(ffile):
+            raise IOError("File <%s> does not exists" % ffile)
+        configuration = ConfigDict.ConfigDict()
+        configuration.read(ffile)
+        self.setConfiguration(configuration)
+
+    def processMultipleSpectra(self, x, y,
+                               xmin=None,
+                               xmax=None,
+                               configuration=None,
+                               ysum=None,
+                               weight=None,
+                               mask=None,
+                               directory=None,
+                               name=None,
+                               entry=None,
+                               nworkers=None,
+                               executor=None,
+                               compression=None):
+        """
+        This method performs the actual work.
+
+        The spectra are processed in blocks of rows. The Fourier transforms
+        of a block are calculated at once and each block is written to the
+        (chunked) output datasets in a single operation.
+
+        :param x: 1D array containing the x axis (usually the channels) of the spectra.
+        :param y: 3D array containing the spectra as [nrows, ncolumns, nchannels]
+        :param weight: 0 Means no weight, 1 Use an average weight, 2 Individual weights (slow)
+        :param int nworkers: number of blocks processed in parallel
+                             (None or 1: serial, 0: one per CPU)
+        :param executor: 'process' (default), 'thread' or
+                         concurrent.futures.Executor (not shut down afterwards)
+        :param compression: compression of the output datasets (e.g. "gzip")
+        :return: A dictionary with the results as keys.
+        """
+
+        t0 = time.time()
+        if configuration is not None:
+            self._analyzer.setConfiguration(configuration)
+
+        # read the current configuration
+        config = self._analyzer.getConfiguration()
+
+        #
+        if weight is None:
+            # dictated by the current configuration
+            pass
+        else:
+            _logger.warning("WARNING: weight not handled yet")
+        weightPolicy = 0 # no weight
+        #weightPolicy = 1 # use average weight from the sum spectrum
+        #weightPolicy = 2 # individual pixel weights (slow)
+        if hasattr(x, "value"):
+            # hdf5 dataset
+            x = x[()]
+
+        if hasattr(y, "info") and hasattr(y, "data"):
+            data = y.data
+            mcaIndex = y.info.get("McaIndex", -1)
+        else:
+            data = y
+            mcaIndex = -1
+
+        if len(data.shape) != 3:
+            txt = "For the time being only three dimensional arrays supported"
+            raise IndexError(txt)
+        if mcaIndex not in [-1, 2]:
+            txt = "For the time being only mca arrays supported"
+            raise IndexError(txt)
+        firstSpectrum = None
+        if ysum is not None:
+            firstSpectrum = ysum
+        if weightPolicy:
+            # if the cumulated spectrum is present it should be better
+            nRows = data.shape[0]
+            nColumns = data.shape[1]
+            nPixels =  nRows * nColumns
+            if ysum is not None:
+                firstSpectrum = ysum
+            elif weightPolicy == 1:
+                # we need to calculate the sum spectrum to derive the uncertainties
+                totalSpectra = data.shape[0] * data.shape[1]
+                jStep = min(5000, data.shape[1])
+                ysum = numpy.zeros((data.shape[mcaIndex],), numpy.float64)
+                for i in range(0, data.shape[0]):
+                    if i == 0:
+                        chunk = numpy.zeros((data.shape[0], jStep), numpy.float64)
+                    jStart = 0
+                    while jStart < data.shape[1]:
+                        jEnd = min(jStart + jStep, data.shape[1])
+                        ysum += data[i, jStart:jEnd, :].sum(axis=0, dtype=numpy.float64)
+                        jStart = jEnd
+                firstSpectrum = ysum
+            else:
+                firstSpectrum = data[0, :, :].sum(axis=0, dtype=numpy.float64)
+
+        if firstSpectrum is None:
+            firstSpectrum = data[0, 0, :]
+        # TODO: Check if only one X and it is well behaved in order to
+        # avoid unnecessary calculation on each spectrum
+        self._analyzer.setSpectrum(x, firstSpectrum)
+        # initialize the output arrays
+        ddict = self._analyzer.processSpectrum()
+
+        # initialize the arrays from the first results
+        entry0 = "PyMcaResults"
+        usedEnergy = ddict["Energy"]
+        usedMu = ddict["Mu"]
+        normalizedIdx = (ddict["NormalizedEnergy"] >= ddict["NormalizedPlotMin"]) & \
+              (ddict["NormalizedEnergy"] <= ddict["NormalizedPlotMax"])
+        normalizedSpectrumX = ddict["NormalizedEnergy"][normalizedIdx]
+        normalizedSpectrumY = ddict["NormalizedMu"][normalizedIdx]
+        exafsIdx = (ddict["EXAFSKValues"] >= ddict["KMin"]) & \
+                   (ddict["EXAFSKValues"] <= ddict["KMax"])
+        exafsSpectrumX = ddict["EXAFSKValues"][exafsIdx]
+        exafsSpectrumY = ddict["EXAFSNormalized"][exafsIdx]
+        xFT = ddict["FT"]["FTRadius"]
+        yFT = ddict["FT"]["FTIntensity"]
+
+        if directory is None:
+            directory = os.getcwd()
+        if name is None:
+            name = "XAS_Result"
+        fname = os.path.join(directory, name)
+        if entry is None:
+            entry = posixpath.join("xas_analysis")
+        else:
+            entry = posixpath.join(entry, "xas_analysis")
+        if not fname.endswith(".h5"):
+            fname = fname + ".h5"
+        out = h5py.File(fname, "w")
+        e0Path = posixpath.join(entry, "edge")
+        jumpPath = posixpath.join(entry, "jump")
+        spectrumXPath = posixpath.join(entry, "spectrum", "energy")
+        spectrumYPath = posixpath.join(entry, "spectrum", "mu")
+        normalizedXPath = posixpath.join(entry, "normalized", "energy")
+        normalizedYPath = posixpath.join(entry, "normalized", "mu")
+        exafsXPath = posixpath.join(entry, "exafs", "k")
+        exafsYPath = posixpath.join(entry, "exafs", "signal")
+        ftXPath = posixpath.join(entry, "FT", "Radius")
+        ftYPath = posixpath.join(entry, "FT", "Intensity")
+        ftImaginaryPath = posixpath.join(entry, "FT", "Imaginary")
+
+        iXMin = 0
+        iXMax = data.shape[-1] - 1
+        e0 = out.require_dataset(e0Path,
+                                 shape=data.shape[:-1],
+                                 dtype=numpy.float32,
+                                 chunks=True,
+                                 compression=compression)
+        jump = out.require_dataset(jumpPath,
+                                   shape=data.shape[:-1],
+                                   dtype=numpy.float32,
+                                   chunks=True,
+                                   compression=compression)
+        shape = list(data.shape[:-1]) + [usedEnergy.size]
+        spectrumX = out.require_dataset(spectrumXPath,
+                                   shape=[usedEnergy.size],
+                                   dtype=numpy.float32,
+                                   chunks=True,
+                                   compression=compression)
+        spectrumY = out.require_dataset(spectrumYPath,
+                                   shape=shape,
+                                   dtype=numpy.float32,
+                                   chunks=True,
+                                   compression=compression)
+        shape = list(data.shape[:-1]) + [normalizedSpectrumX.size]
+        normalizedX = out.require_dataset(normalizedXPath,
+                                   shape=[normalizedSpectrumX.size],
+                                   dtype=numpy.float32,
+                                   chunks=True,
+                                   compression=compression)
+        normalizedY = out.require_dataset(normalizedYPath,
+                                   shape=shape,
+                                   dtype=numpy.float32,
+                                   chunks=True,
+                                   compression=compression)
+        shape = list(data.shape[:-1]) + [exafsSpectrumX.size]
+        exafsX = out.require_dataset(exafsXPath,
+                                     shape=[exafsSpectrumX.size],
+                                     dtype=numpy.float32,
+                                     chunks=True,
+                                     compression=compression)
+        exafsY = out.require_dataset(exafsYPath,
+                                     shape=shape,
+                                     dtype=numpy.float32,
+                                     chunks=True,
+                                     compression=compression)
+        shape = list(data.shape[:-1]) + [xFT.size]
+        ftX = out.require_dataset(ftXPath,
+                                     shape=[xFT.size],
+                                     dtype=numpy.float32,
+                                     chunks=True,
+                                     compression=compression)
+        ftY = out.require_dataset(ftYPath,
+                                     shape=shape,
+                                     dtype=numpy.float32,
+                                     chunks=True,
+                                     compression=compression)
+        ftImaginary = out.require_dataset(ftImaginaryPath,
+                                     shape=shape,
+                                     dtype=numpy.float32,
+                                     chunks=True,
+                                     compression=compression)
+        spectrumX[:] = ddict["Energy"]
+        normalizedX[:] = ddict["NormalizedEnergy"][normalizedIdx]
+        exafsX[:] = ddict["EXAFSKValues"][exafsIdx]
+        ftX[:] = ddict["FT"]["FTRadius"]
+
+        t0 = time.time()
+        totalSpectra = data.shape[0] * data.shape[1]
+        rowStep = max(1, self._blockSpectra // data.shape[1])
+        if executor is None:
+            # the processing of a spectrum is mostly python code
+            executor = "process"
+
+        def blocks():
+            for i in range(0, data.shape[0], rowStep):
+                iEnd = min(i + rowStep, data.shape[0])
+                if mask is None:
+                    blockMask = None
+                else:
+                    blockMask = numpy.array(mask[i:iEnd], copy=True)
+                spectra = numpy.array(data[i:iEnd, :, iXMin:iXMax+1],
+                                      dtype=numpy.float64, copy=True)
+                yield (config, x, spectra, blockMask,
+                       normalizedIdx, exafsIdx)
+
+        processedSpectra = 0
+        i = 0
+        with ExecutorUtils.executorContext(nworkers=nworkers,
+                                           executor=executor) as (executor, nworkers):
+            for result in ExecutorUtils.orderedMap(_processBlock, blocks(),
+                                                   executor=executor,
+                                                   nworkers=nworkers):
+                iEnd = i + result["Rows"]
+                processedSpectra += result["Processed"]
+                if not result["Processed"]:
+                    # all spectra masked
+                    i = iEnd
+                    continue
+                spectrumY[i:iEnd] = result["Mu"]
+                e0[i:iEnd] = result["Edge"]
+                jump[i:iEnd] = result["Jump"]
+                normalizedY[i:iEnd] = result["NormalizedMu"]
+                exafsY[i:iEnd] = result["EXAFSNormalized"]
+                ftY[i:iEnd] = result["FTIntensity"]
+                ftImaginary[i:iEnd] = result["FTImaginary"]
+                i = iEnd
+        outputDict = {}
+        outputDict["names"] = ["Jump", "Edge"]
+        output = numpy.zeros((2, e0.shape[0], e0.shape[1]), dtype = e0.dtype)
+        output[0, :] = jump[()]
+        output[1, :] = e0[()]
+        outputDict["images"] = output
+        out.flush()
+        out.close()
+
+        t = time.time() - t0
+        if t > 0:
+            _logger.info("Processed %d spectra in %.2f s (%.1f spectra/s)",
+                         processedSpectra, t, processedSpectra / t)
+        outputDict["elapsed"] = t
+        outputDict["spectra"] = processedSpectra
+        return outputDict
+
+
+def _processBlock(args):
+    """
+    Process a block of spectra (module level so it can be executed by a
+    process pool).
+
+    :param tuple args: configuration, x, spectra (nRows, nColumns, nChannels),
+                       mask (nRows, nColumns) or None, normalizedIdx, exafsIdx
+    :return dict: output arrays of the block, number of rows and number
+                  of processed spectra
+    """
+    config, x, spectra, mask, normalizedIdx, exafsIdx = args
+    analyzer = XASClass.XASClass()
+    analyzer.setConfiguration(config)
+    ftConfig = analyzer.getConfiguration()["FT"]
+    shape = spectra.shape[:2]
+    nSpectra = shape[0] * shape[1]
+    spectra = spectra.reshape(nSpectra, -1)
+    if mask is None:
+        indices = range(nSpectra)
+    else:
+        indices = numpy.nonzero(mask.reshape(-1))[0]
+    result = {}
+    signals = None
+    # the post edge of spectra with the same edge energy is fitted at once
+    processed = analyzer.processMultipleSpectra(x, spectra[indices],
+                                                fourierTransform=False)
+    for n, (spectrumIndex, ddict) in enumerate(zip(indices, processed)):
+        if signals is None:
+            signals = numpy.zeros((len(indices),
+                                   ddict["FT"]["InterpolatedSignal"].size))
+            for key, size in [("Mu", ddict["Mu"].size),
+                              ("NormalizedMu", normalizedIdx.sum()),
+                              ("EXAFSNormalized", exafsIdx.sum())]:
+                result[key] = numpy.zeros((nSpectra, size), numpy.float32)
+            result["Edge"] = numpy.zeros((nSpectra,), numpy.float32)
+            result["Jump"] = numpy.zeros((nSpectra,), numpy.float32)
+        result["Mu"][spectrumIndex] = ddict["Mu"]
+        result["Edge"][spectrumIndex] = ddict["Edge"]
+        result["Jump"][spectrumIndex] = ddict["Jump"]
+        result["NormalizedMu"][spectrumIndex] = ddict["NormalizedMu"][normalizedIdx]
+        result["EXAFSNormalized"][spectrumIndex] = ddict["EXAFSNormalized"][exafsIdx]
+        signals[n] = ddict["FT"]["InterpolatedSignal"]
+    if signals is None:
+        # all spectra masked
+        return {"Rows": shape[0], "Processed": 0}
+    fourier = XASClass.getFTMultiple(signals,
+                                     npoints=ftConfig["Points"],
+                                     rrange=ftConfig["Range"],
+                                     kstep=ftConfig["KStep"])
+    for key, column in [("FTIntensity", 1), ("FTImaginary", 3)]:
+        result[key] = numpy.zeros((nSpectra, fourier.shape[1]), numpy.float32)
+        result[key][indices] = fourier[:, :, column]
+    for key in result:
+        result[key] = result[key].reshape(shape + result[key].shape[1:])
+    result["Rows"] = shape[0]
+    result["Processed"] = len(indices)
+    return result
+
+if __name__ == "__main__":
+    _logger.setLevel(logging.DEBUG)
+    analyzer = XASClass.XASClass()
+    instance = XASStackBatch(analyzer=analyzer)
+    configurationFile = "test.ini"
+    dataFile = h5py.File("testdata.h5", "r")
+    for entry in dataFile:
+        data = dataFile[entry]["data"]
+        energy = dataFile[entry]["energy"]
+        break
+    instance.setConfigurationFile(configurationFile)
+    instance.processMultipleSpectra(energy, data)
+    dataFile.close()
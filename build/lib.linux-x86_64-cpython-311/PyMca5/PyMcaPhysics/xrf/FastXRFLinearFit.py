@@ -0,0 +1,1486 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V.A. Sole - ESRF"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Module to perform a fast linear fit on a stack of fluorescence spectra.
+"""
+import os
+import numpy
+import logging
+import time
+import h5py
+import collections
+from . import ClassMcaTheory
+from . import ConcentrationsTool
+from . import MatrixCorrection
+from PyMca5.PyMcaMath.linalg import lstsq
+from PyMca5.PyMcaMath.fitting import Gefit
+from PyMca5.PyMcaMath.fitting import SpecfitFuns
+from PyMca5.PyMcaIO import ConfigDict
+from .XRFBatchFitOutput import OutputBuffer
+from PyMca5.PyMcaCore import McaStackView
+from PyMca5.PyMcaMisc import ExecutorUtils
+from PyMca5.PyMcaMisc import DiskCache
+
+_logger = logging.getLogger(__name__)
+
+
+# Change when the content of the cached linear models changes
+_MODEL_CACHE_VERSION = 1
+
+
+class FastXRFLinearFit(object):
+    def __init__(self, mcafit=None, cachedir=None):
+        """
+        :param McaTheory mcafit:
+        :param str cachedir: directory where the linear models are cached
+                             (derivatives and SVD), no cache when None
+        """
+        self._config = None
+        if mcafit is None:
+            self._mcaTheory = ClassMcaTheory.McaTheory()
+        else:
+            self._mcaTheory = mcafit
+        self.setModelCacheDirectory(cachedir)
+
+    def setModelCacheDirectory(self, cachedir=None):
+        """The linear model of a fit configuration, x-axis and fit range
+        is stored in this directory and reused by later fits.
+
+        :param str cachedir: no cache when None
+        """
+        if cachedir:
+            self._modelCache = DiskCache.DiskCache(cachedir)
+        else:
+            self._modelCache = None
+
+    def setFitConfiguration(self, configuration):
+        self._mcaTheory.setConfiguration(configuration)
+        self._config = self._mcaTheory.getConfiguration()
+
+    def setFitConfigurationFile(self, ffile):
+        if not os.path.exists(ffile.split('::')[0]):
+            raise IOError("File <%s> does not exists" % ffile)
+        configuration = ConfigDict.ConfigDict()
+        configuration.read(ffile)
+        self.setFitConfiguration(configuration)
+
+    def fitMultipleSpectra(self, x=None, y=None, xmin=None, xmax=None,
+                           configuration=None, concentrations=False,
+                           ysum=None, weight=None, refit=True, livetime=None,
+                           outbuffer=None, save=True, nworkers=None,
+                           executor=None, prefetch=None, **outbufferinitargs):
+        """
+        This method performs the actual fit. The y keyword is the only mandatory input argument.
+
+        :param x: 1D array containing the x axis (usually the channels) of the spectra.
+        :param y: nD array containing the spectra
+        :param xmin: lower limit of the fitting region
+        :param xmax: upper limit of the fitting region
+        :param ysum: sum spectrum
+        :param weight: 0 Means no weight, 1 Use an average weight, 2 Individual weights (slow)
+        :param concentrations: 0 Means no calculation, 1 Calculate elemental concentrations,
+                               2 Calculate elemental concentrations correcting for the
+                               matrix composition of each pixel
+        :param refit: if False, no check for negative results. Default is True.
+        :param livetime: It will be used if not different from None and concentrations
+                         are to be calculated by using fundamental parameters with
+                         automatic time. The default is None.
+        :param outbuffer:
+        :param save: set to False to postpone saving the in-memory buffers
+        :param nworkers: number of workers fitting chunks of spectra in parallel.
+                         None or 1 means serial fitting, 0 means one worker per CPU.
+        :param executor: 'thread' (default), 'process' or an instance of
+                         concurrent.futures.Executor (not shut down afterwards)
+        :param prefetch: read the next chunk of spectra in a background thread
+                         while fitting the current one. By default only when
+                         y is not a numpy array (e.g. an HDF5 dataset).
+        :return OutputBuffer: works like a dict
+        """
+        # Parse data
+        x, data, mcaIndex, livetime = self._fitParseData(x=x, y=y,
+                                                         livetime=livetime)
+
+        # Calculation needs buffer for memory allocation (memory or H5)
+        if outbuffer is None:
+            outbuffer = OutputBuffer(**outbufferinitargs)
+        with outbuffer.Context(save=save):
+            t0 = time.time()
+
+            # Configure fit
+            nSpectra = data.size // data.shape[mcaIndex]
+            configorg, config, weight, weightPolicy, \
+            autotime, liveTimeFactor = self._fitConfigure(
+                                                configuration=configuration,
+                                                concentrations=concentrations,
+                                                livetime=livetime,
+                                                weight=weight,
+                                                nSpectra=nSpectra)
+            outbuffer['configuration'] = configorg
+
+            # Get the basis of the linear models (i.e. derivative to peak areas)
+            if xmin is None:
+                xmin = config['fit']['xmin']
+            if xmax is None:
+                xmax = config['fit']['xmax']
+            dtypeCalculcation = self._fitDtypeCalculation(data)
+            modelKey = None
+            model = None
+            if self._modelCache is not None:
+                modelKey = DiskCache.hashKey(_MODEL_CACHE_VERSION, config, x,
+                                             xmin, xmax,
+                                             numpy.dtype(dtypeCalculcation).str)
+                if not concentrations:
+                    # the concentrations need the complete fit model
+                    model = self._fitLoadModel(modelKey)
+
+            # Sum spectrum
+            if ysum is not None:
+                yref = ysum
+            elif weightPolicy == 1:
+                # we need to calculate the sum spectrum
+                # to derive the uncertainties
+                yref = self._fitReferenceSpectrum(data=data, mcaIndex=mcaIndex,
+                                                  sumover='all')
+            elif model is not None:
+                yref = None
+            elif not concentrations:
+                # one spectrum is enough
+                yref = self._fitReferenceSpectrum(data=data, mcaIndex=mcaIndex,
+                                                  sumover='first pixel')
+            else:
+                yref = self._fitReferenceSpectrum(data=data, mcaIndex=mcaIndex,
+                                                  sumover='first vector')
+
+            if model is None:
+                self._mcaTheory.setData(x=x, y=yref, xmin=xmin, xmax=xmax)
+                model = self._fitCreateModel(dtype=dtypeCalculcation)
+                # Background anchor points (if any)
+                model['anchorslist'] = self._fitBkgAnchorList(config=config)
+                # MCA trimming: [iXMin:iXMax]
+                model['iXMin'], model['iXMax'] = self._fitMcaTrimInfo(x=x)
+                model['xdata'] = self._mcaTheory.xdata0.flatten()
+                model['zero'], model['gain'] = self._mcaTheory.parameters[:2]
+                if modelKey is not None:
+                    self._fitSaveModel(modelKey, model)
+            derivatives = model['derivatives']
+            freeNames = model['freeNames']
+            nFree = len(freeNames)
+            nFreeBkg = model['nFreeBkg']
+            anchorslist = model['anchorslist']
+            iXMin, iXMax = model['iXMin'], model['iXMax']
+            sliceChan = slice(iXMin, iXMax)
+            nObs = iXMax-iXMin
+
+            # Least-squares parameters
+            if weightPolicy == 2:
+                # Individual spectrum weights (assumed Poisson)
+                SVD = False
+                sigma_b = None
+            elif weightPolicy == 1:
+                # Average weight from sum spectrum (assume Poisson)
+                # the +1 is to prevent misbehavior due to weights less than 1.0
+                sigma_b = 1 + numpy.sqrt(yref[sliceChan])/nSpectra
+                sigma_b = sigma_b.reshape(-1, 1)
+                SVD = True
+            else:
+                # No weights
+                SVD = True
+                sigma_b = None
+            lstsq_kwargs = {'svd': SVD, 'sigma_b': sigma_b, 'weight': weight}
+            svdKey = None
+            if modelKey is not None and weightPolicy != 2:
+                # the SVD of the (weighted) model is shared by all spectra
+                svdKey = DiskCache.hashKey(modelKey, weight, sigma_b)
+                lstsq_kwargs['last_svd'] = self._fitLoadSVD(svdKey)
+                if lstsq_kwargs['last_svd'] is not None:
+                    svdKey = None
+
+            # Allocate output buffers
+            stackShape = data.shape
+            imageShape = list(stackShape)
+            imageShape.pop(mcaIndex)
+            imageShape = tuple(imageShape)
+            paramShape = (nFree,) + imageShape
+            dtypeResult = self._fitDtypeResult(data)
+            dataAttrs = {}  #{'units':'counts'})
+            paramAttrs = {'errors': 'uncertainties',
+                          'default': not concentrations}
+            results = outbuffer.allocateMemory('parameters',
+                                                shape=paramShape,
+                                                dtype=dtypeResult,
+                                                labels=freeNames,
+                                                dataAttrs=dataAttrs,
+                                                groupAttrs=paramAttrs,
+                                                memtype='ram')
+            uncertainties = outbuffer.allocateMemory('uncertainties',
+                                                shape=paramShape,
+                                                dtype=dtypeResult,
+                                                labels=freeNames,
+                                                dataAttrs=dataAttrs,
+                                                groupAttrs=None,
+                                                memtype='ram')
+            fitAttrs = {}
+            if outbuffer.saveDataDiagnostics:
+                # Generic axes
+                dataAxesNames = ['dim{}'.format(i) for i in range(data.ndim)]
+                dataAxes = [(name, numpy.arange(n, dtype=dtypeResult), {})
+                            for name, n in zip(dataAxesNames, stackShape)]
+                # MCA axis: use energy and add channels as extra (unused) axis
+                xdata = model['xdata']
+                zero, gain = model['zero'], model['gain']
+                xenergy = zero + gain*xdata
+                dataAxesNames[mcaIndex] = 'energy'
+                dataAxes[mcaIndex] = 'energy', xenergy.astype(dtypeResult), {'units': 'keV'}
+                dataAxes.append(('channels', xdata.astype(numpy.float32), {}))
+                fitAttrs['axes'] = dataAxes
+                fitAttrs['axesused'] = dataAxesNames
+
+            if outbuffer.saveDataDiagnostics:
+                derivAttrs = {}
+                derivAttrs['axes'] = [('energy', xenergy.astype(dtypeResult), {'units': 'keV'}),
+                                      ('channels', xdata.astype(numpy.float32), {})]
+                derivAttrs['axesused'] = ["energy"]
+                _derivatives = outbuffer.allocateMemory('derivatives',
+                                        shape=(nFree, xdata.size),
+                                        dtype=derivatives.dtype,
+                                        fill_value=numpy.nan,
+                                        labels=freeNames,
+                                        dataAttrs=dataAttrs,
+                                        groupAttrs=derivAttrs,
+                                        memtype='ram')
+                _derivatives[:, iXMin:iXMax] = derivatives.T
+                ysumBuffer = outbuffer.allocateMemory('sum',
+                                        shape=(xdata.size,),
+                                        dtype=numpy.float64,
+                                        fill_value=numpy.nan,
+                                        dataAttrs=dataAttrs,
+                                        groupAttrs=derivAttrs,
+                                        memtype='ram')
+
+            dataAttrs = {}
+            if outbuffer.saveFOM:
+                nFreeParameters = outbuffer.allocateMemory('nFreeParameters',
+                                                           group='diagnostics',
+                                                           shape=imageShape,
+                                                           fill_value=nFree,
+                                                           dtype=numpy.int32,
+                                                           dataAttrs=dataAttrs,
+                                                           groupAttrs=None,
+                                                           memtype='ram')
+                nObservations = outbuffer.allocateMemory('nObservations',
+                                                         group='diagnostics',
+                                                         shape=imageShape,
+                                                         fill_value=nObs,
+                                                         dtype=numpy.int32,
+                                                         dataAttrs=dataAttrs,
+                                                         groupAttrs=None,
+                                                         memtype='ram')
+            else:
+                nFreeParameters = None
+            if outbuffer.saveFit:
+                fitmodel = outbuffer.allocateMemory('model',
+                                                    group='fit',
+                                                    shape=stackShape,
+                                                    dtype=dtypeResult,
+                                                    chunks=True,
+                                                    fill_value=0,
+                                                    dataAttrs=dataAttrs,
+                                                    groupAttrs=fitAttrs,
+                                                    memtype='hdf5')
+                idx = [slice(None)]*fitmodel.ndim
+                idx[mcaIndex] = slice(0, iXMin)
+                fitmodel[tuple(idx)] = numpy.nan
+                idx[mcaIndex] = slice(iXMax, None)
+                fitmodel[tuple(idx)] = numpy.nan
+            else:
+                fitmodel = None
+
+            # Sum spectrum of the fitted channels (same pass as the fit)
+            ysumFit = numpy.zeros((nObs,), dtype=numpy.float64)
+            if prefetch is None:
+                prefetch = not isinstance(data, numpy.ndarray)
+
+            _logger.debug("Configuration elapsed = %f", time.time() - t0)
+            t0 = time.time()
+
+            with ExecutorUtils.executorContext(nworkers=nworkers,
+                                               executor=executor) as (pool, nPool):
+                # Fit all spectra
+                self._fitLstSqAll(data=data, sliceChan=sliceChan, mcaIndex=mcaIndex,
+                                derivatives=derivatives, fitmodel=fitmodel,
+                                results=results, uncertainties=uncertainties,
+                                config=config, anchorslist=anchorslist,
+                                lstsq_kwargs=lstsq_kwargs,
+                                executor=pool, nworkers=nPool,
+                                prefetch=prefetch, ysum=ysumFit)
+                if svdKey is not None and \
+                   lstsq_kwargs.get('last_svd', None) is not None:
+                    self._fitSaveSVD(svdKey, lstsq_kwargs['last_svd'])
+
+                if outbuffer.saveDataDiagnostics:
+                    ysumBuffer[iXMin:iXMax] = ysumFit
+
+                t = time.time() - t0
+                _logger.debug("First fit elapsed = %f", t)
+                if t > 0.:
+                    _logger.debug("Spectra per second = %f",
+                                  numpy.prod(imageShape)/float(t))
+                t0 = time.time()
+
+                # Refit spectra with negative peak areas
+                if refit:
+                    self._fitLstSqNegative(data=data, sliceChan=sliceChan, mcaIndex=mcaIndex,
+                                derivatives=derivatives, fitmodel=fitmodel,
+                                results=results, uncertainties=uncertainties,
+                                config=config, anchorslist=anchorslist,
+                                lstsq_kwargs=lstsq_kwargs, freeNames=freeNames,
+                                nFreeBkg=nFreeBkg, nFreeParameters=nFreeParameters,
+                                executor=pool, nworkers=nPool,
+                                prefetch=prefetch)
+                    t = time.time() - t0
+                    _logger.debug("Fit of negative peaks elapsed = %f", t)
+                    t0 = time.time()
+
+            # Return results as a dictionary
+            if outbuffer.saveData:
+                outbuffer.allocateMemory('data',
+                                     group='fit',
+                                     data=data,
+                                     dtype=dtypeResult,
+                                     chunks=True,
+                                     dataAttrs=dataAttrs,
+                                     groupAttrs=fitAttrs,
+                                     memtype='hdf5')
+            if outbuffer.saveResiduals:
+                residuals = outbuffer.allocateMemory('residuals',
+                                                 group='fit',
+                                                 data=data,
+                                                 dtype=dtypeResult,
+                                                 chunks=True,
+                                                 dataAttrs=dataAttrs,
+                                                 groupAttrs=fitAttrs,
+                                                 memtype='hdf5')
+                residuals[()] -= fitmodel
+
+            if concentrations:
+                t0 = time.time()
+                labels, concentrations = self._fitDeriveMassFractions(config=config,
+                                             nFreeBkg=nFreeBkg,
+                                             results=results,
+                                             autotime=autotime,
+                                             liveTimeFactor=liveTimeFactor,
+                                             matrixcorrection=concentrations == 2,
+                                             nworkers=nworkers,
+                                             executor=executor)
+                dataAttrs = {}  #{'units':'dimensionless'})
+                massfracAttrs = {'default': True}
+                outbuffer.allocateMemory('massfractions',
+                                         data=concentrations,
+                                         labels=labels,
+                                         dataAttrs=dataAttrs,
+                                         groupAttrs=massfracAttrs,
+                                         memtype='ram')
+                t = time.time() - t0
+                _logger.debug("Calculation of concentrations elapsed = %f", t)
+            return outbuffer
+
+    @staticmethod
+    def _fitParseData(x=None, y=None, livetime=None):
+        """Parse the input data (MCA and livetime)
+        """
+        # Extract counts
+        if y is None:
+            raise RuntimeError("y keyword argument is mandatory!")
+        if hasattr(y, "info") and hasattr(y, "data"):
+            data = y.data
+            mcaIndex = y.info.get("McaIndex", -1)
+        else:
+            data = y
+            mcaIndex = -1
+
+        # Extract channels
+        if x is None:
+            if hasattr(y, "info") and hasattr(y, "x"):
+                x = y.x[0]
+        if livetime is None:
+            if hasattr(y, "info"):
+                if "McaLiveTime" in y.info:
+                    livetime = y.info["McaLiveTime"]
+
+        # At least 2D
+        ndim = data.ndim
+        if ndim == 0:
+            shape = (1, 1)
+        elif ndim == 1:
+            shape = (1, data.size)
+        else:
+            shape = None
+        if shape is not None:
+            data = data.reshape(shape)
+            if livetime is not None:
+                livetime = livetime.reshape(shape)
+
+        return x, data, mcaIndex, livetime
+
+    def _fitConfigure(self, configuration=None, concentrations=False,
+                      livetime=None, weight=None, nSpectra=None):
+        """Prepare configuration for fitting
+        """
+        if configuration is not None:
+            self._mcaTheory.setConfiguration(configuration)
+        elif self._config is None:
+            raise ValueError("Fit configuration missing")
+        else:
+            _logger.debug("Setting default configuration")
+            self._mcaTheory.setConfiguration(self._config)
+        # read the current configuration
+        # it is a copy, we can modify it at will
+        configorg = self._mcaTheory.getConfiguration()
+        config = self._mcaTheory.getConfiguration()
+        toReconfigure = False
+
+        # if concentrations and use times, it needs to be reconfigured
+        # without using times and correct later on. If the concentrations
+        # are to be calculated from internal standard there is no need to
+        # raise an exception either.
+        autotime = 0
+        liveTimeFactor = 1.0
+        if not concentrations:
+            # ignore any time information to prevent unnecessary errors when
+            # setting the fitting data whithout the time information
+            if config['concentrations'].get("useautotime", 0):
+                config['concentrations']["useautotime"] = 0
+                toReconfigure = True
+        elif config["concentrations"]["usematrix"]:
+            if config['concentrations'].get("useautotime", 0):
+                config['concentrations']["useautotime"] = 0
+                toReconfigure = True
+        else:
+            # we are calculating concentrations from fundamental parameters
+            autotime = config['concentrations'].get("useautotime", 0)
+            if autotime:
+                if livetime is None:
+                    txt = "Automatic time requested but no time information provided"
+                    raise RuntimeError(txt)
+                elif numpy.isscalar(livetime):
+                    liveTimeFactor = \
+                        float(config['concentrations']["time"]) / livetime
+                elif livetime.size == nSpectra:
+                    liveTimeFactor = \
+                        float(config['concentrations']["time"]) / livetime
+                else:
+                    raise RuntimeError(
+                        "Number of live times not equal number of spectra")
+                config['concentrations']["useautotime"] = 0
+                toReconfigure = True
+
+        # use of strategies is not supported for the time being
+        strategy = config['fit'].get('strategyflag', 0)
+        if strategy:
+            raise RuntimeError("Strategies are incompatible with fast fit")
+
+        # reject the samples not supported by the matrix correction
+        # before fitting
+        if concentrations == 2:
+            MatrixCorrection._sampleDescription(config)
+
+        # background
+        if config['fit']['stripflag']:
+            if config['fit']['stripalgorithm'] == 1:
+                _logger.debug("SNIP")
+            else:
+                raise RuntimeError("Please use the faster SNIP background")
+
+        if weight is None:
+            # dictated by the file
+            weight = config['fit']['fitweight']
+            if weight:
+                # individual pixel weights (slow)
+                weightPolicy = 2
+            else:
+                # No weight
+                weightPolicy = 0
+        elif weight == 1:
+            # use average weight from the sum spectrum
+            weightPolicy = 1
+            if not config['fit']['fitweight']:
+                config['fit']['fitweight'] = 1
+                toReconfigure = True
+        elif weight == 2:
+            # individual pixel weights (slow)
+            weightPolicy = 2
+            if not config['fit']['fitweight']:
+                config['fit']['fitweight'] = 1
+                toReconfigure = True
+            weight = 1
+        else:
+            # No weight
+            weightPolicy = 0
+            if config['fit']['fitweight']:
+                config['fit']['fitweight'] = 0
+                toReconfigure = True
+            weight = 0
+
+        if not config['fit']['linearfitflag']:
+            # make sure we force a linear fit
+            config['fit']['linearfitflag'] = 1
+            toReconfigure = True
+
+        if toReconfigure:
+            # we must configure again the fit
+            self._mcaTheory.setConfiguration(config)
+
+        # make sure we calculate the matrix of the contributions
+        self._mcaTheory.enableOptimizedLinearFit()
+
+        return configorg, config, weight, weightPolicy, \
+               autotime, liveTimeFactor
+
+    def _fitReferenceSpectrum(self, data=None, mcaIndex=None, sumover='all'):
+        """Get sum spectrum
+        """
+        dtype = self._fitDtypeCalculation(data)
+        if sumover == 'all':
+            if isinstance(data, numpy.ndarray):
+                nMca = 20, 'MB'
+            else:
+                # Block size and alignment from the storage layout
+                nMca = 'auto'
+            datastack = McaStackView.FullView(data, mcaAxis=mcaIndex, nMca=nMca)
+            _logger.debug('Add spectra in chunks of {}'.format(datastack.nMca))
+            yref = numpy.zeros((data.shape[mcaIndex],), dtype)
+            chunkSums = (chunk.sum(axis=0, dtype=dtype)
+                         for key, chunk in datastack.items())
+            if not isinstance(data, numpy.ndarray):
+                chunkSums = ExecutorUtils.prefetch(chunkSums)
+            for chunkSum in chunkSums:
+                yref += chunkSum
+        elif sumover == 'first vector':
+            # Sum spectrum of the first row
+            ndim = data.ndim
+            idx = [0]*ndim
+            while mcaIndex < 0:
+                mcaIndex += ndim
+            idx[mcaIndex] = slice(None)
+            for axis in range(data.ndim-1, -1, -1):
+                if idx[axis] != slice(None):
+                    idx[axis] = slice(None)
+                    break
+            axis = int(axis > mcaIndex)
+            yref = data[tuple(idx)].sum(axis=axis, dtype=dtype)
+        else:
+            # First spectrum
+            idx = [0]*data.ndim
+            idx[mcaIndex] = slice(None)
+            yref = data[tuple(idx)].astype(dtype)
+        return yref
+
+    def _fitCreateModel(self, dtype=None):
+        """Get linear model for fitting
+        """
+        # Initialize the derivatives
+        self._mcaTheory.estimate()
+
+        # now we can get the derivatives respect to the free parameters
+        # These are the "derivatives" respect to the peaks
+        # linearMatrix = self._mcaTheory.linearMatrix
+
+        # but we are still missing the derivatives from the background
+        nFree = 0
+        freeNames = []
+        nFreeBkg = 0
+        for iParam, param in enumerate(self._mcaTheory.PARAMETERS):
+            if self._mcaTheory.codes[0][iParam] != ClassMcaTheory.Gefit.CFIXED:
+                nFree += 1
+                freeNames.append(param)
+                if iParam < self._mcaTheory.NGLOBAL:
+                    nFreeBkg += 1
+        if nFree == 0:
+            txt = "No free parameters to be fitted!\n"
+            txt += "No peaks inside fitting region?"
+            raise ValueError(txt)
+
+        # build the matrix of derivatives
+        derivatives = None
+        idx = 0
+        for iParam, param in enumerate(self._mcaTheory.PARAMETERS):
+            if self._mcaTheory.codes[0][iParam] == ClassMcaTheory.Gefit.CFIXED:
+                continue
+            deriv = self._mcaTheory.linearMcaTheoryDerivative(self._mcaTheory.parameters,
+                                                              iParam,
+                                                              self._mcaTheory.xdata)
+            deriv.shape = -1
+            if derivatives is None:
+                derivatives = numpy.zeros((deriv.shape[0], nFree), dtype=dtype)
+            derivatives[:, idx] = deriv
+            idx += 1
+
+        return {'derivatives': derivatives, 'freeNames': freeNames,
+                'nFreeBkg': nFreeBkg}
+
+    def _fitLoadModel(self, key):
+        """Linear model from the cache (None when not cached)
+        """
+        ddict = self._modelCache.load("model_" + key)
+        if ddict is None:
+            _logger.debug("Linear model %s not cached", key)
+            return None
+        _logger.debug("Linear model %s taken from cache", key)
+        model = {'derivatives': ddict['derivatives'],
+                 'freeNames': ddict['freeNames'].tolist(),
+                 'nFreeBkg': int(ddict['nFreeBkg']),
+                 'iXMin': int(ddict['iXMin']),
+                 'iXMax': int(ddict['iXMax']),
+                 'xdata': ddict['xdata'],
+                 'zero': float(ddict['zero']),
+                 'gain': float(ddict['gain'])}
+        if ddict['anchorslist'].size or ddict['stripflag']:
+            model['anchorslist'] = ddict['anchorslist'].tolist()
+        else:
+            model['anchorslist'] = None
+        return model
+
+    def _fitSaveModel(self, key, model):
+        ddict = dict(model)
+        ddict['freeNames'] = numpy.array(model['freeNames'])
+        ddict['stripflag'] = model['anchorslist'] is not None
+        if model['anchorslist'] is None:
+            ddict['anchorslist'] = numpy.zeros((0,), dtype=int)
+        try:
+            self._modelCache.save("model_" + key, ddict)
+        except (IOError, OSError) as e:
+            _logger.warning("Cannot cache the linear model: %s", e)
+
+    def _fitLoadSVD(self, key):
+        ddict = self._modelCache.load("svd_" + key)
+        if ddict is None:
+            return None
+        _logger.debug("SVD of the linear model taken from cache")
+        return ddict['U'], ddict['s'], ddict['V']
+
+    def _fitSaveSVD(self, key, svd):
+        U, s, V = svd
+        try:
+            self._modelCache.save("svd_" + key, {'U': U, 's': s, 'V': V})
+        except (IOError, OSError) as e:
+            _logger.warning("Cannot cache the SVD of the linear model: %s", e)
+
+    def _fitBkgAnchorList(self, config=None):
+        """Get anchors for background subtraction
+        """
+        xdata = self._mcaTheory.xdata  # trimmed
+        if config['fit']['stripflag']:
+            anchorslist = []
+            if config['fit']['stripanchorsflag']:
+                if config['fit']['stripanchorslist'] is not None:
+                    ravelled = numpy.ravel(xdata)
+                    for channel in config['fit']['stripanchorslist']:
+                        if channel <= ravelled[0]:
+                            continue
+                        index = numpy.nonzero(ravelled >= channel)[0]
+                        if len(index):
+                            index = min(index)
+                            if index > 0:
+                                anchorslist.append(index)
+            if len(anchorslist) == 0:
+                anchorslist = [0, self._mcaTheory.ydata.size - 1]
+            anchorslist.sort()
+        else:
+            anchorslist = None
+        return anchorslist
+
+    def _fitMcaTrimInfo(self, x=None):
+        """Start and end channels for MCA trimming
+        """
+        xdata = self._mcaTheory.xdata
+
+        # find the indices to be used for selecting the appropriate data
+        # if the original x data were not ordered we have a problem
+        # TODO: check for original ordering.
+        if x is None:
+            # we have an enumerated channels axis
+            iXMin = xdata[0]
+            iXMax = xdata[-1]
+        else:
+            iXMin = numpy.nonzero(x <= xdata[0])[0][-1]
+            iXMax = numpy.nonzero(x >= xdata[-1])[0][0]
+        # numpy 1.11.0 returns an array on previous expression
+        # and then complains about a future deprecation warning
+        # because of using an array and not an scalar in the selection
+        if hasattr(iXMin, "shape"):
+            if len(iXMin.shape):
+                iXMin = iXMin[0]
+        if hasattr(iXMax, "shape"):
+            if len(iXMax.shape):
+                iXMax = iXMax[0]
+        return iXMin, iXMax+1
+
+    def _dataChunkIter(self, slicecls, data=None, prefetch=False, ysum=None,
+                       copy=False, **kwargs):
+        """
+        Chunks of spectra. The view buffer is reused, so chunks are copied
+        when they are used by another thread or process (prefetch or copy)
+        while the next chunk is being read.
+
+        :param array ysum: the sum of the spectra is added to it
+        :yields tuple: (idx, idxShape), nChan x nSpectra chunk
+        """
+        dtype = self._fitDtypeResult(data)
+        datastack = slicecls(data, dtype=dtype, readonly=True, **kwargs)
+        copy = copy or prefetch
+
+        def chunks():
+            for key, chunk in datastack.items(keyType='select'):
+                if copy:
+                    chunk = chunk.copy()
+                chunk = chunk.T
+                if ysum is not None:
+                    ysum[()] += numpy.add.reduce(chunk, axis=1,
+                                                 dtype=numpy.float64)
+                yield key, chunk
+
+        if prefetch:
+            return ExecutorUtils.prefetch(chunks())
+        else:
+            return chunks()
+
+    def _fitChunkIter(self, slicecls, data=None, fitmodel=None, A=None,
+                      config=None, anchorslist=None, lstsq_kwargs=None,
+                      executor=None, nworkers=None, prefetch=False,
+                      ysum=None, **kwargs):
+        """
+        Fit chunks of spectra with the linear model A. The fit model (if any)
+        is written in fitmodel. With an executor, chunks are fitted in parallel
+        but still yielded in the same order as the serial fit.
+
+        :yields tuple: (idx, idxShape), lstsq result dictionary
+        """
+        if not config['fit']['stripflag']:
+            anchorslist = None
+        chunkItems = self._dataChunkIter(slicecls, data=data,
+                                         prefetch=prefetch, ysum=ysum,
+                                         copy=executor is not None,
+                                         **kwargs)
+        if fitmodel is None:
+            modelItems = None
+        else:
+            dtype = self._fitDtypeResult(data)
+            modelstack = slicecls(fitmodel, dtype=dtype, readonly=False,
+                                  **kwargs)
+            modelItems = modelstack.items()
+
+        if executor is None:
+            for key, chunk in chunkItems:
+                if modelItems is None:
+                    chunkModel = None
+                else:
+                    _, chunkModel = next(modelItems)
+                    chunkModel = chunkModel.T
+                ddict = _fitLstSqChunk(chunk, A, lstsq_kwargs,
+                                       config=config, anchorslist=anchorslist,
+                                       fitmodel=chunkModel)
+                lstsq_kwargs['last_svd'] = ddict.get('svd', None)
+                yield key, ddict
+            if modelItems is not None:
+                # write back the last chunk of the fit model
+                next(modelItems, None)
+            return
+
+        # Write the fit model back in chunk order
+        returnModel = True if modelItems is not None else None
+        pending = collections.deque()
+
+        def collect():
+            key, future = pending.popleft()
+            ddict = future.result()
+            if modelItems is not None:
+                _, chunkModel = next(modelItems)
+                chunkModel[()] = ddict.pop('model').T
+            return key, ddict
+
+        first = True
+        for key, chunk in chunkItems:
+            if first:
+                # The first chunk provides the SVD shared by all workers
+                first = False
+                ddict = _fitLstSqChunk(chunk, A, lstsq_kwargs,
+                                       config=config, anchorslist=anchorslist,
+                                       fitmodel=returnModel)
+                lstsq_kwargs['last_svd'] = ddict.get('svd', None)
+                future = ExecutorUtils.DoneFuture(ddict)
+            else:
+                future = executor.submit(_fitLstSqChunk, chunk, A,
+                                         lstsq_kwargs, config=config,
+                                         anchorslist=anchorslist,
+                                         fitmodel=returnModel,
+                                         svd=False)
+            pending.append((key, future))
+            if len(pending) > 2 * nworkers:
+                yield collect()
+        while pending:
+            yield collect()
+        if modelItems is not None:
+            # write back the last chunk of the fit model
+            next(modelItems, None)
+
+    def _fitLstSqAll(self, data=None, sliceChan=None, mcaIndex=None,
+                     derivatives=None, results=None, uncertainties=None,
+                     fitmodel=None, config=None, anchorslist=None,
+                     lstsq_kwargs=None, executor=None, nworkers=None,
+                     prefetch=False, ysum=None):
+        """
+        Fit all spectra (and add them to ysum when provided)
+        """
+        nChan, nFree = derivatives.shape
+
+        # Block size and alignment from the storage layout (the fit model
+        # uses the same slicing)
+        nMca, nativeChunks = self._fitChunkPlan(data, mcaIndex=mcaIndex,
+                                                sliceChan=sliceChan)
+        _logger.debug('Fit spectra in chunks of {}'.format(nMca))
+        chunkItems = self._fitChunkIter(McaStackView.FullView,
+                                        data=data,
+                                        fitmodel=fitmodel,
+                                        A=derivatives,
+                                        config=config,
+                                        anchorslist=anchorslist,
+                                        lstsq_kwargs=lstsq_kwargs,
+                                        executor=executor,
+                                        nworkers=nworkers,
+                                        prefetch=prefetch,
+                                        ysum=ysum,
+                                        nativeChunks=nativeChunks,
+                                        mcaSlice=sliceChan,
+                                        mcaAxis=mcaIndex,
+                                        nMca=nMca)
+        for (idx, idxShape), ddict in chunkItems:
+            # Save results
+            idx = (slice(None),) + idx
+            idxShape = (nFree,) + idxShape
+            results[idx] = ddict['parameters'].reshape(idxShape)
+            uncertainties[idx] = ddict['uncertainties'].reshape(idxShape)
+
+    def _fitLstSqReduced(self, data=None, sliceChan=None, mcaIndex=None,
+                         derivatives=None, results=None, uncertainties=None,
+                         fitmodel=None, config=None, anchorslist=None,
+                         lstsq_kwargs=None, mask=None,
+                         skipNames=None, skipParams=None,
+                         nFreeParameters=None, nmin=None,
+                         executor=None, nworkers=None, prefetch=False):
+        """
+        Fit reduced number of spectra (mask) with a reduced model (skipped parameters will be set to zero)
+        """
+        npixels = int(mask.sum())
+        nMca = 1, 'MB'
+        if npixels < nmin:
+            _logger.debug("Not worth refitting #%d pixels", npixels)
+            for iFree, name in zip(skipParams, skipNames):
+                results[iFree][mask] = 0.0
+                uncertainties[iFree][mask] = 0.0
+                _logger.debug("%d pixels of parameter %s set to zero",
+                              npixels, name)
+            if nFreeParameters is not None:
+                nFreeParameters[mask] = 0
+        else:
+            _logger.debug("Refitting #{} spectra in chunks of {}".format(npixels, nMca))
+            nChan, nFreeOrg = derivatives.shape
+            idxFree = [i for i in range(nFreeOrg) if i not in skipParams]
+            nFree = len(idxFree)
+            A = derivatives[:, idxFree]
+            lstsq_kwargs['last_svd'] = None
+
+            # Fit all selected spectra in one chunk
+            chunkItems = self._fitChunkIter(McaStackView.MaskedView,
+                                            data=data,
+                                            fitmodel=fitmodel,
+                                            A=A,
+                                            config=config,
+                                            anchorslist=anchorslist,
+                                            lstsq_kwargs=lstsq_kwargs,
+                                            executor=executor,
+                                            nworkers=nworkers,
+                                            prefetch=prefetch,
+                                            mask=mask,
+                                            mcaSlice=sliceChan,
+                                            mcaAxis=mcaIndex,
+                                            nMca=nMca)
+            for (idx, idxShape), ddict in chunkItems:
+                # Save results
+                iParam = 0
+                for iFree in range(nFreeOrg):
+                    if iFree in skipParams:
+                        results[iFree][idx] = 0.0
+                        uncertainties[iFree][idx] = 0.0
+                    else:
+                        results[iFree][idx] = ddict['parameters'][iParam]\
+                                                .reshape(idxShape)
+                        uncertainties[iFree][idx] = ddict['uncertainties'][iParam]\
+                                                .reshape(idxShape)
+                        iParam += 1
+                if nFreeParameters is not None:
+                    nFreeParameters[idx] = nFree
+
+    def _fitChunkPlan(self, data, mcaIndex=None, sliceChan=None):
+        """Number of spectra fitted at once and the storage chunks to which
+        the blocks are aligned (None for numpy arrays)
+        """
+        if isinstance(data, numpy.ndarray):
+            return (1, 'MB'), None
+        return McaStackView.chunkPlan(data, mcaAxis=mcaIndex,
+                                      mcaSlice=sliceChan,
+                                      dtype=self._fitDtypeResult(data))
+
+    @staticmethod
+    def _fitDtypeResult(data):
+        if data.dtype not in [numpy.float32, numpy.float64]:
+            if hasattr(data, "itemsize"):
+                if data.itemsize < 5:
+                    return numpy.float32
+            elif hasattr(data, "nbytes"):
+                if (data.nbytes / data.size) < 5:
+                    return numpy.float32
+            return numpy.float64
+        else:
+            return data.dtype
+
+    @staticmethod
+    def _fitDtypeCalculation(data):
+        # TODO: always 64bit?
+        return numpy.float64
+
+    @staticmethod
+    def _fitBkgSubtract(spectra, config=None, anchorslist=None, fitmodel=None):
+        """Subtract brackground from data and add it to fit model
+        """
+        # one spectrum per row for the background kernel
+        background = SpecfitFuns.snipbackground(spectra.T,
+                                                config['fit']['snipwidth'],
+                                                config['fit']['stripfilterwidth'],
+                                                anchorslist).T
+        spectra -= background
+        if fitmodel is not None:
+            fitmodel[()] = background
+
+    def _fitLstSqNegative(self, data=None, freeNames=None, nFreeBkg=None,
+                          results=None, **kwargs):
+        """Refit pixels with negative peak areas (remove the parameters from the model)
+        """
+        nFree = len(freeNames)
+        iIter = 1
+        nIter = 2 * (nFree - nFreeBkg) + iIter
+        negativePresent = True
+        while negativePresent:
+            # Pixels with negative peak areas
+            negList = []
+            for iFree in range(nFreeBkg, nFree):
+                negMask = results[iFree] < 0
+                nNeg = negMask.sum()
+                if nNeg > 0:
+                    negList.append((nNeg, iFree, negMask))
+
+            # No refit needed when no negative peak areas
+            if not negList:
+                negativePresent = False
+                continue
+
+            # Set negative peak areas to zero when
+            # the maximal iterations is reached
+            if iIter > nIter:
+                for nNeg, iFree, negMask in negList:
+                    results[iFree][negMask] = 0.0
+                    _logger.warning("%d pixels of parameter %s forced to zero",
+                                    nNeg, freeNames[iFree])
+                continue
+
+            # Bad pixels: use peak area with the most negative values
+            negList.sort()
+            negList.reverse()
+            badParameters = []
+            badParameters.append(negList[0][1])
+            badMask = negList[0][2]
+
+            # Combine with masks of all other peak areas
+            # (unless none of them has negative pixels)
+            # This is done to prevent endless loops:
+            # if two or more parameters have common negative pixels
+            # and one of them remains negative when forcing other one to zero
+            for iFree, (nNeg, iFree, negMask) in enumerate(negList):
+                if iFree not in badParameters and nNeg:
+                    combMask = badMask & negMask
+                    if combMask.sum():
+                        badParameters.append(iFree)
+                        badMask = combMask
+
+            # Fit with a reduced model (skipped parameters are fixed at zero)
+            badNames = [freeNames[iFree] for iFree in badParameters]
+            nmin = 0.0025 * badMask.size
+            _logger.debug("Refit iteration #{}. Fixed to zero: {}"
+                          .format(iIter, badNames))
+            self._fitLstSqReduced(data=data, mask=badMask,
+                                  skipParams=badParameters,
+                                  skipNames=badNames,
+                                  results=results,
+                                  nmin=nmin, **kwargs)
+            iIter += 1
+
+    def _fitDeriveMassFractions(self, config=None, results=None, nFreeBkg=None,
+                                autotime=None, liveTimeFactor=None,
+                                matrixcorrection=False, nworkers=None,
+                                executor=None):
+        """Calculate concentrations from peak areas
+
+        The concentrations are proportional to the peak areas unless
+        `matrixcorrection` is set, in which case the absorption of each
+        pixel is calculated from its own composition.
+        """
+        # check if an internal reference is used and if it is set to auto
+        cTool = ConcentrationsTool.ConcentrationsTool()
+        cToolConf = cTool.configure()
+        cToolConf.update(config['concentrations'])
+
+        fitreference = False
+        if config['concentrations']['usematrix']:
+            _logger.debug("USING MATRIX")
+            if config['concentrations']['reference'].upper() == "AUTO":
+                fitreference = True
+        elif autotime:
+            # we have to calculate with the time in the configuration
+            # and correct later on
+            cToolConf["autotime"] = 0
+
+        fitresult = {}
+        if fitreference:
+            # we have to fit the "reference" spectrum just to get the reference element
+            mcafitresult = self._mcaTheory.startfit(digest=0, linear=True)
+            # if one of the elements has zero area this cannot be made directly
+            fitresult['result'] = self._mcaTheory.imagingDigestResult()
+            fitresult['result']['config'] = config
+            concentrationsResult, addInfo = cTool.processFitResult(config=cToolConf,
+                                                fitresult=fitresult,
+                                                elementsfrommatrix=False,
+                                                fluorates=self._mcaTheory._fluoRates,
+                                                addinfo=True)
+            # and we have to make sure that all the areas are positive
+            for group in fitresult['result']['groups']:
+                if fitresult['result'][group]['fitarea'] <= 0.0:
+                    # give a tiny area
+                    fitresult['result'][group]['fitarea'] = 1.0e-6
+            config['concentrations']['reference'] = addInfo['ReferenceElement']
+        else:
+            fitresult['result'] = {}
+            fitresult['result']['config'] = config
+            fitresult['result']['groups'] = []
+            idx = 0
+            for iParam, param in enumerate(self._mcaTheory.PARAMETERS):
+                if self._mcaTheory.codes[0][iParam] == Gefit.CFIXED:
+                    continue
+                if iParam < self._mcaTheory.NGLOBAL:
+                    # background
+                    pass
+                else:
+                    fitresult['result']['groups'].append(param)
+                    fitresult['result'][param] = {}
+                    # we are just interested on the factor to be applied to the area to get the
+                    # concentrations
+                    fitresult['result'][param]['fitarea'] = 1.0
+                    fitresult['result'][param]['sigmaarea'] = 1.0
+                idx += 1
+        concentrationsResult, addInfo = cTool.processFitResult(config=cToolConf,
+                                                fitresult=fitresult,
+                                                elementsfrommatrix=False,
+                                                fluorates=self._mcaTheory._fluoRates,
+                                                addinfo=True)
+        nValues = 1
+        if len(concentrationsResult['layerlist']) > 1:
+            nValues += len(concentrationsResult['layerlist'])
+        nElements = len(list(concentrationsResult['mass fraction'].keys()))
+        massShape = list(results.shape)
+        massShape[0] = nValues * nElements
+        massFractions = numpy.zeros(massShape, dtype=results.dtype)
+
+        referenceElement = addInfo['ReferenceElement']
+        referenceTransitions = addInfo['ReferenceTransitions']
+        _logger.debug("Reference <%s>  transition <%s>",
+                      referenceElement, referenceTransitions)
+        labels = []
+        if referenceElement in ["", None, "None"]:
+            _logger.debug("No reference")
+            counter = 0
+            for i, group in enumerate(fitresult['result']['groups']):
+                if group.lower().startswith("scatter"):
+                    _logger.debug("skept %s", group)
+                    continue
+                labels.append(group)
+                if counter == 0:
+                    if hasattr(liveTimeFactor, "shape"):
+                        liveTimeFactor.shape = results[nFreeBkg+i].shape
+                massFractions[counter] = liveTimeFactor * \
+                    results[nFreeBkg+i] * \
+                    (concentrationsResult['mass fraction'][group] / \
+                        fitresult['result'][group]['fitarea'])
+                counter += 1
+                if len(concentrationsResult['layerlist']) > 1:
+                    for layer in concentrationsResult['layerlist']:
+                        labels.append((group, layer))
+                        massFractions[counter] = liveTimeFactor * \
+                                results[nFreeBkg+i] * \
+                                (concentrationsResult[layer]['mass fraction'][group] / \
+                                    fitresult['result'][group]['fitarea'])
+                        counter += 1
+        else:
+            _logger.debug("With reference")
+            idx = None
+            testGroup = referenceElement+ " " + referenceTransitions.split()[0]
+            for i, group in enumerate(fitresult['result']['groups']):
+                if group == testGroup:
+                    idx = i
+            if idx is None:
+                raise ValueError("Invalid reference:  <%s> <%s>" %\
+                                    (referenceElement, referenceTransitions))
+
+            group = fitresult['result']['groups'][idx]
+            referenceArea = fitresult['result'][group]['fitarea']
+            referenceConcentrations = concentrationsResult['mass fraction'][group]
+            goodIdx = results[nFreeBkg+idx] > 0
+            massFractions[idx] = referenceConcentrations
+            counter = 0
+            for i, group in enumerate(fitresult['result']['groups']):
+                if group.lower().startswith("scatter"):
+                    _logger.debug("skept %s", group)
+                    continue
+                labels.append(group)
+                goodI = results[nFreeBkg+i] > 0
+                tmp = results[nFreeBkg+idx][goodI]
+                massFractions[counter][goodI] = (results[nFreeBkg+i][goodI]/(tmp + (tmp == 0))) *\
+                            ((referenceArea/fitresult['result'][group]['fitarea']) *\
+                            (concentrationsResult['mass fraction'][group]))
+                counter += 1
+                if len(concentrationsResult['layerlist']) > 1:
+                    for layer in concentrationsResult['layerlist']:
+                        labels.append((group, layer))
+                        massFractions[counter][goodI] = (results[nFreeBkg+i][goodI]/(tmp + (tmp == 0))) *\
+                            ((referenceArea/fitresult['result'][group]['fitarea']) *\
+                            (concentrationsResult[layer]['mass fraction'][group]))
+                        counter += 1
+        if matrixcorrection:
+            t0 = time.time()
+            if referenceElement in ["", None, "None"]:
+                referenceGroup = None
+            else:
+                referenceGroup = testGroup
+            table = MatrixCorrection.MatrixCorrectionTable(config, labels,
+                                                           reference=referenceGroup)
+            MatrixCorrection.correctMassFractions(table, massFractions,
+                                                  nworkers=nworkers,
+                                                  executor=executor)
+            _logger.debug("Matrix correction elapsed = %f", time.time() - t0)
+        return labels, massFractions
+
+
+def _fitLstSqChunk(spectra, A, lstsq_kwargs, config=None, anchorslist=None,
+                   fitmodel=None, svd=True):
+    """
+    Fit a chunk of spectra with a linear model (module level so it can be
+    executed by a process pool)
+
+    :param array spectra: nChan x nSpectra (modified when subtracting the background)
+    :param array A: linear model nChan x nFree
+    :param dict lstsq_kwargs:
+    :param dict config: fit configuration
+    :param list anchorslist: background anchors (None: no background subtraction)
+    :param fitmodel: nChan x nSpectra buffer for the fit model, None or True to
+                     allocate it and return it in the result
+    :param bool svd: return the SVD of the (weighted) model when available
+    :returns dict: see lstsq
+    """
+    returnModel = fitmodel is True
+    if returnModel:
+        fitmodel = numpy.zeros_like(spectra)
+    bkgsub = anchorslist is not None
+
+    # Subtract background
+    if bkgsub:
+        FastXRFLinearFit._fitBkgSubtract(spectra, config=config,
+                                         anchorslist=anchorslist,
+                                         fitmodel=fitmodel)
+
+    # Solve linear system of equations
+    ddict = lstsq(A, spectra, digested_output=True, **lstsq_kwargs)
+
+    # Fit model
+    if fitmodel is not None:
+        if bkgsub:
+            fitmodel += numpy.dot(A, ddict['parameters'])
+        else:
+            fitmodel[()] = numpy.dot(A, ddict['parameters'])
+    if returnModel:
+        ddict['model'] = fitmodel
+    if not svd:
+        ddict.pop('svd', None)
+    return ddict
+
+
+def getFileListFromPattern(pattern, begin, end, increment=None):
+    if type(begin) == type(1):
+        begin = [begin]
+    if type(end) == type(1):
+        end = [end]
+    if len(begin) != len(end):
+        raise ValueError(\
+            "Begin list and end list do not have same length")
+    if increment is None:
+        increment = [1] * len(begin)
+    elif type(increment) == type(1):
+        increment = [increment]
+    if len(increment) != len(begin):
+        raise ValueError(
+            "Increment list and begin list do not have same length")
+    fileList = []
+    if len(begin) == 1:
+        for j in range(begin[0], end[0] + increment[0], increment[0]):
+            fileList.append(pattern % (j))
+    elif len(begin) == 2:
+        for j in range(begin[0], end[0] + increment[0], increment[0]):
+            for k in range(begin[1], end[1] + increment[1], increment[1]):
+                fileList.append(pattern % (j, k))
+    elif len(begin) == 3:
+        raise ValueError("Cannot handle three indices yet.")
+        for j in range(begin[0], end[0] + increment[0], increment[0]):
+            for k in range(begin[1], end[1] + increment[1], increment[1]):
+                for l in range(begin[2], end[2] + increment[2], increment[2]):
+                    fileList.append(pattern % (j, k, l))
+    else:
+        raise ValueError("Cannot handle more than three indices.")
+    return fileList
+
+
+def prepareDataStack(fileList, streaming=False):
+    """
+    :param list fileList: EDF files or one HDF5 dataset (file::path)
+    :param bool streaming: do not load an HDF5 dataset in memory but read
+                           it chunk by chunk while fitting
+    """
+    if (not os.path.exists(fileList[0])) and \
+        os.path.exists(fileList[0].split("::")[0]):
+        # odo convention to get a dataset form an HDF5
+        fname, dataPath = fileList[0].split("::")
+        # compared to the ROI imaging tool, this way of reading puts data
+        # into memory while with the ROI imaging tool, there is a check.
+        if streaming:
+            # the file stays open while the dataset is referenced
+            h5 = h5py.File(fname, "r")
+            dataStack = h5[dataPath]
+        else:
+            from PyMca5.PyMcaIO import HDF5Stack1D
+            # this way reads information associated to the dataset (if present)
+            if dataPath.startswith("/"):
+                pathItems = dataPath[1:].split("/")
+            else:
+                pathItems = dataPath.split("/")
+            if len(pathItems) > 1:
+                scanlist = ["/" + pathItems[0]]
+                selection = {"y":"/" + "/".join(pathItems[1:])}
+            else:
+                selection = {"y":dataPath}
+                scanlist = None
+            print(selection)
+            print("scanlist = ", scanlist)
+            dataStack = HDF5Stack1D.HDF5Stack1D([fname],
+                                                selection,
+                                                scanlist=scanlist)
+    else:
+        from PyMca5.PyMca import EDFStack
+        dataStack = EDFStack.EDFStack(fileList, dtype=numpy.float32)
+    return dataStack
+
+
+def main():
+    import sys
+    import getopt
+    options     = ''
+    longoptions = ['cfg=', 'outdir=', 'concentrations=', 'weight=', 'refit=',
+                   'tif=', 'edf=', 'csv=', 'h5=', 'dat=',
+                   'filepattern=', 'begin=', 'end=', 'increment=',
+                   'outroot=', 'outentry=', 'outprocess=',
+                   'diagnostics=', 'debug=', 'overwrite=', 'multipage=',
+                   'nworkers=', 'executor=', 'cachedir=', 'streaming=']
+    try:
+        opts, args = getopt.getopt(
+                     sys.argv[1:],
+                     options,
+                     longoptions)
+    except Exception:
+        print(sys.exc_info()[1])
+        sys.exit(1)
+    outputDir = None
+    outputRoot = ""
+    fileEntry = ""
+    fileProcess = ""
+    refit = None
+    filepattern = None
+    begin = None
+    end = None
+    increment = None
+    backend = None
+    weight = 0
+    tif = 0
+    edf = 0
+    csv = 0
+    h5 = 1
+    dat = 0
+    concentrations = 0
+    diagnostics = 0
+    debug = 0
+    overwrite = 1
+    multipage = 0
+    nworkers = None
+    executor = None
+    cachedir = None
+    streaming = 0
+    for opt, arg in opts:
+        if opt == '--cfg':
+            configurationFile = arg
+        elif opt == '--begin':
+            if "," in arg:
+                begin = [int(x) for x in arg.split(",")]
+            else:
+                begin = [int(arg)]
+        elif opt == '--end':
+            if "," in arg:
+                end = [int(x) for x in arg.split(",")]
+            else:
+                end = int(arg)
+        elif opt == '--increment':
+            if "," in arg:
+                increment = [int(x) for x in arg.split(",")]
+            else:
+                increment = int(arg)
+        elif opt == '--filepattern':
+            filepattern = arg.replace('"', '')
+            filepattern = filepattern.replace("'", "")
+        elif opt == '--outdir':
+            outputDir = arg
+        elif opt == '--weight':
+            weight = int(arg)
+        elif opt == '--refit':
+            refit = int(arg)
+        elif opt == '--concentrations':
+            concentrations = int(arg)
+        elif opt == '--diagnostics':
+            diagnostics = int(arg)
+        elif opt == '--outroot':
+            outputRoot = arg
+        elif opt == '--outentry':
+            fileEntry = arg
+        elif opt == '--outprocess':
+            fileProcess = arg
+        elif opt in ('--tif', '--tiff'):
+            tif = int(arg)
+        elif opt == '--edf':
+            edf = int(arg)
+        elif opt == '--csv':
+            csv = int(arg)
+        elif opt == '--h5':
+            h5 = int(arg)
+        elif opt == '--dat':
+            dat = int(arg)
+        elif opt == '--debug':
+            debug = int(arg)
+        elif opt == '--overwrite':
+            overwrite = int(arg)
+        elif opt == '--multipage':
+            multipage = int(arg)
+        elif opt == '--nworkers':
+            nworkers = int(arg)
+        elif opt == '--executor':
+            executor = arg
+        elif opt == '--cachedir':
+            cachedir = arg
+        elif opt == '--streaming':
+            streaming = int(arg)
+
+    logging.basicConfig()
+    if debug:
+        _logger.setLevel(logging.DEBUG)
+    else:
+        _logger.setLevel(logging.INFO)
+    if filepattern is not None:
+        if (begin is None) or (end is None):
+            raise ValueError(\
+                "A file pattern needs at least a set of begin and end indices")
+    if filepattern is not None:
+        fileList = getFileListFromPattern(filepattern, begin, end, increment=increment)
+    else:
+        fileList = args
+    if refit is None:
+        refit = 0
+        _logger.warning("--refit=%d taken as default" % refit)
+    if len(fileList):
+        dataStack = prepareDataStack(fileList, streaming=streaming)
+    else:
+        print("OPTIONS:", longoptions)
+        sys.exit(0)
+    if outputDir is None:
+        print("RESULTS WILL NOT BE SAVED: No output directory specified")
+
+    t0 = time.time()
+    fastFit = FastXRFLinearFit(cachedir=cachedir)
+    fastFit.setFitConfigurationFile(configurationFile)
+    print("Main configuring Elapsed = % s " % (time.time() - t0))
+
+    outbuffer = OutputBuffer(outputDir=outputDir,
+                             outputRoot=outputRoot,
+                             fileEntry=fileEntry,
+                             fileProcess=fileProcess,
+                             diagnostics=diagnostics,
+                             tif=tif, edf=edf, csv=csv,
+                             h5=h5, dat=dat,
+                             multipage=multipage,
+                             overwrite=overwrite)
+
+    from PyMca5.PyMcaMisc import ProfilingUtils
+    with ProfilingUtils.profile(memory=debug, time=debug):
+        with outbuffer.saveContext():
+            outbuffer = fastFit.fitMultipleSpectra(y=dataStack,
+                                                weight=weight,
+                                                refit=refit,
+                                                concentrations=concentrations,
+                                                outbuffer=outbuffer,
+                                                nworkers=nworkers,
+                                                executor=executor)
+        print("Total Elapsed = % s " % (time.time() - t0))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,326 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Per-pixel matrix correction of the mass fractions obtained by scaling the
+peak areas of a map with a single fundamental parameters calculation.
+
+The fluorescence rates of the fitted lines are calculated once for the
+configured (single layer) sample matrix, one excitation energy at a time.
+The mass attenuation coefficients of every fitted element and of the rest
+of the matrix are tabulated at the excitation and at the line energies.
+Attenuation is linear in the mass fractions, so the self-absorption term
+of any pixel composition is obtained from that table with a matrix product
+and the matrix correction of all pixels is iterated simultaneously.
+"""
+import logging
+import numpy
+from . import Elements
+from PyMca5.PyMcaMisc import ExecutorUtils
+
+_logger = logging.getLogger(__name__)
+
+
+def _sampleDescription(config):
+    """Matrix, geometry and attenuators of a fit configuration
+
+    :param dict config: fit configuration
+    :returns dict:
+    """
+    ddict = {'matrix': None,
+             'attenuators': [],
+             'funnyfilters': [],
+             'beamfilters': [],
+             'userattenuators': [],
+             'detector': None}
+    for name, attenuator in config['attenuators'].items():
+        if not attenuator[0]:
+            continue
+        if name.upper() == "MATRIX":
+            ddict['matrix'] = attenuator[1:4]
+            ddict['alphain'] = attenuator[4]
+            ddict['alphaout'] = attenuator[5]
+        elif name.upper() == "DETECTOR":
+            ddict['detector'] = attenuator[1:]
+        elif name.upper()[:-1] == "BEAMFILTER":
+            ddict['beamfilters'].append(attenuator[1:])
+        elif len(attenuator) > 4 and abs(attenuator[4] - 1.0) > 1.0e-10:
+            ddict['funnyfilters'].append(attenuator[1:])
+        else:
+            ddict['attenuators'].append(attenuator[1:])
+    for userattenuator in config.get('userattenuators', {}).values():
+        if userattenuator["use"]:
+            ddict['userattenuators'].append(userattenuator)
+    matrix = ddict['matrix']
+    if matrix is None:
+        raise ValueError("Invalid or undefined sample matrix")
+    if matrix[0].upper() == "MULTILAYER":
+        raise ValueError("Per-pixel matrix correction needs a single layer matrix")
+    if not Elements.isValidMaterial(matrix[0]):
+        raise ValueError("Material %s is not defined" % matrix[0])
+    if ddict['alphain'] <= 0.0 or ddict['alphaout'] <= 0.0:
+        raise ValueError("Per-pixel matrix correction needs reflection geometry")
+    return ddict
+
+
+def _excitationEnergies(config):
+    """Enabled excitation energies and their normalized weights
+
+    :param dict config: fit configuration
+    :returns tuple: energies, weights
+    """
+    energyList = config['fit']['energy']
+    if energyList is None:
+        raise ValueError("Invalid energy")
+    if not isinstance(energyList, list):
+        energyList = [energyList]
+        flagList = [1]
+        weightList = [1.0]
+    else:
+        flagList = config['fit']['energyflag']
+        weightList = config['fit']['energyweight']
+    energies = []
+    weights = []
+    for energy, flag, weight in zip(energyList, flagList, weightList):
+        if flag and weight > 0.0:
+            energies.append(float(energy))
+            weights.append(float(weight))
+    if not energies:
+        raise ValueError("No valid excitation energy")
+    weights = numpy.array(weights)
+    return numpy.array(energies), weights / weights.sum()
+
+
+class MatrixCorrectionTable(object):
+    def __init__(self, config, groups, reference=None):
+        """Tabulate the factors needed to correct the mass fractions of the
+        peak groups for the actual composition of each pixel.
+
+        :param dict config: fit configuration
+        :param list groups: peak groups (e.g. "Fe K") of the mass fractions
+        :param str reference: group with a fixed mass fraction (internal
+                              standard) or None when the flux is known
+        """
+        sample = _sampleDescription(config)
+        matrix = sample['matrix']
+        energies, weights = _excitationEnergies(config)
+        self.groups = list(groups)
+        self.reference = None
+        if reference is not None:
+            self.reference = self.groups.index(reference)
+
+        # Peak groups and their elements
+        peaks = []
+        self.elements = []
+        for group in self.groups:
+            ele, transitions = group.split()[:2]
+            peaks.append([Elements.getz(ele), ele, transitions])
+            if ele not in self.elements:
+                self.elements.append(ele)
+
+        # Fluorescence rates of all lines for the configured matrix,
+        # one excitation energy at a time
+        lineGroup = []
+        lineExcitation = []
+        lineEnergy = []
+        lineRate = []
+        for iEnergy, (energy, weight) in enumerate(zip(energies, weights)):
+            fluo = Elements.getMultilayerFluorescence([matrix * 1],
+                                [energy],
+                                weightList=[1.0],
+                                flagList=[1],
+                                fulloutput=0,
+                                attenuators=sample['attenuators'] * 1,
+                                alphain=sample['alphain'],
+                                alphaout=sample['alphaout'],
+                                elementsList=[peak * 1 for peak in peaks],
+                                cascade=True,
+                                detector=sample['detector'],
+                                funnyfilters=sample['funnyfilters'] * 1,
+                                beamfilters=sample['beamfilters'] * 1,
+                                forcepresent=1,
+                                userattenuators=sample['userattenuators'] * 1)
+            for iGroup, (z, ele, transitions) in enumerate(peaks):
+                for line in fluo.get(ele, {}).get(transitions + " xrays", []):
+                    rate = fluo[ele][line]['rate'] * weight
+                    if rate > 0.0:
+                        lineGroup.append(iGroup)
+                        lineExcitation.append(iEnergy)
+                        lineEnergy.append(fluo[ele][line]['energy'])
+                        lineRate.append(rate)
+        lineGroup = numpy.array(lineGroup, dtype=int)
+        lineRate = numpy.array(lineRate, dtype=numpy.float64)
+        nLines = len(lineRate)
+        nGroups = len(self.groups)
+
+        # Rest of the matrix: the elements which are not fitted
+        composition = Elements.getMaterialMassFractions([matrix[0]], [1.0])
+        balance = [ele for ele in composition if ele not in self.elements]
+        if not balance:
+            balance = list(composition.keys())
+        balanceFractions = numpy.array([composition[ele] for ele in balance])
+        balanceFractions /= balanceFractions.sum()
+        self.composition = numpy.array([composition.get(ele, 0.0)
+                                        for ele in self.elements] + [0.0])
+        self.composition[-1] = max(1.0 - self.composition[:-1].sum(), 0.0)
+
+        # Lookup table of the self-absorption exponent per unit of mass
+        # fraction: one row per element plus one for the rest of the matrix
+        sinAlphaIn = numpy.sin(numpy.radians(sample['alphain']))
+        sinAlphaOut = numpy.sin(numpy.radians(sample['alphaout']))
+        allEnergies = numpy.concatenate([energies, lineEnergy])
+        self.chiTable = numpy.zeros((len(self.elements) + 1, nLines))
+        for i, ele in enumerate(self.elements + [None]):
+            if ele is None:
+                mu = Elements.getMaterialMassAttenuationCoefficients(
+                                balance, list(balanceFractions), allEnergies)
+            else:
+                mu = Elements.getMaterialMassAttenuationCoefficients(
+                                ele, 1.0, allEnergies)
+            mu = numpy.array(mu['total'], dtype=numpy.float64)
+            self.chiTable[i] = mu[lineExcitation] / sinAlphaIn + \
+                               mu[len(energies):] / sinAlphaOut
+        self.massThickness = matrix[1] * matrix[2]
+        chi0 = numpy.dot(self.composition, self.chiTable)
+        self.selfAbsorption0 = self._selfAbsorption(chi0)
+
+        # Relative contribution of each line to its group
+        self.lineWeights = numpy.zeros((nGroups, nLines))
+        self.lineWeights[lineGroup, numpy.arange(nLines)] = lineRate
+        groupRate = self.lineWeights.sum(axis=1)
+        self.noLines = groupRate <= 0.0
+        groupRate[self.noLines] = 1.0
+        self.lineWeights /= groupRate[:, None]
+
+        # The most intense group of each element gives its mass fraction
+        self.elementGroups = []
+        for ele in self.elements:
+            candidates = [i for i, (z, e, t) in enumerate(peaks) if e == ele]
+            rates = [groupRate[i] * (not self.noLines[i]) for i in candidates]
+            self.elementGroups.append(candidates[int(numpy.argmax(rates))])
+        _logger.debug("Matrix correction table of %d lines and %d elements",
+                      nLines, len(self.elements))
+
+    def _selfAbsorption(self, chi):
+        if self.massThickness > 0.0:
+            return -numpy.expm1(-chi * self.massThickness) / chi
+        else:
+            return 1.0 / chi
+
+    def pixelComposition(self, massFractions):
+        """
+        :param array massFractions: nGroups x nPixels
+        :returns array: (nElements + 1) x nPixels, the last row being the
+                        rest of the matrix
+        """
+        fractions = numpy.clip(massFractions[self.elementGroups], 0.0, 1.0)
+        total = fractions.sum(axis=0)
+        over = total > 1.0
+        fractions[:, over] /= total[over]
+        total[over] = 1.0
+        return numpy.vstack([fractions, 1.0 - total[None, :]])
+
+    def rateFactors(self, massFractions):
+        """Fluorescence rates of the groups for the pixel compositions
+        relative to the configured matrix
+
+        :param array massFractions: nGroups x nPixels
+        :returns array: nGroups x nPixels
+        """
+        chi = numpy.dot(self.chiTable.T, self.pixelComposition(massFractions))
+        relative = self._selfAbsorption(chi) / self.selfAbsorption0[:, None]
+        factors = numpy.dot(self.lineWeights, relative)
+        factors[self.noLines] = 1.0
+        return factors
+
+    def correct(self, massFractions, maxiter=20, tol=1.0e-5):
+        """Iterate the matrix correction of a block of pixels
+
+        :param array massFractions: nGroups x nPixels obtained with the
+                                    configured matrix
+        :param int maxiter: maximal number of iterations
+        :param float tol: relative change of the correction to stop
+        :returns array: corrected mass fractions
+        """
+        massFractions = numpy.asarray(massFractions, dtype=numpy.float64)
+        corrected = massFractions
+        correction = numpy.ones_like(massFractions)
+        for i in range(maxiter):
+            factors = self.rateFactors(corrected)
+            newCorrection = 1.0 / factors
+            if self.reference is not None:
+                newCorrection *= factors[self.reference]
+            delta = numpy.abs(newCorrection - correction).max(initial=0.0)
+            correction = newCorrection
+            corrected = massFractions * correction
+            if delta < tol:
+                break
+        else:
+            _logger.debug("Matrix correction not converged (%g)", delta)
+        return corrected
+
+
+def _correctBlock(args):
+    table, block, kw = args
+    return table.correct(block, **kw)
+
+
+def correctMassFractions(table, massFractions, blockSize=4096,
+                         nworkers=None, executor=None, **kw):
+    """Correct the mass fractions of all pixels (in-place) in blocks of
+    pixels which are processed in parallel
+
+    :param MatrixCorrectionTable table:
+    :param array massFractions: nGroups x ... (image dimensions)
+    :param int blockSize: number of pixels per block
+    :param int nworkers: None or 1 means serial, 0 means one per CPU
+    :param executor: 'thread' (default), 'process' or concurrent.futures.Executor
+    :param **kw: see `MatrixCorrectionTable.correct`
+    :returns array: massFractions
+    """
+    nGroups = massFractions.shape[0]
+    if nGroups != len(table.groups):
+        raise ValueError("Expected the mass fractions of %d groups" %
+                         len(table.groups))
+    flat = massFractions.reshape(nGroups, -1)
+    nPixels = flat.shape[1]
+    slices = [slice(i, min(i + blockSize, nPixels))
+              for i in range(0, nPixels, blockSize)]
+    blocks = ((table, flat[:, sl], kw) for sl in slices)
+    with ExecutorUtils.executorContext(nworkers=nworkers,
+                                       executor=executor) as (executor, nworkers):
+        for sl, block in zip(slices,
+                             ExecutorUtils.orderedMap(_correctBlock, blocks,
+                                                      executor=executor,
+                                                      nworkers=nworkers)):
+            flat[:, sl] = block
+    if not numpy.shares_memory(flat, massFractions):
+        massFractions[()] = flat.reshape(massFractions.shape)
+    return massFractions
@@ -0,0 +1,138 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Command line, timing and report helpers shared by the *Benchmark modules.
+
+A benchmark module defines benchmark(**kwargs) returning a list of result
+tuples and a main(argv=None) calling BenchmarkUtils.main with the default
+arguments, the title and the columns of the report.
+"""
+import os
+import re
+import sys
+import time
+
+
+class Timer(object):
+    """Context manager measuring the elapsed wall time
+
+    with Timer() as timer:
+        ...
+    timer.seconds
+    """
+
+    def __enter__(self):
+        self.seconds = None
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.seconds = time.perf_counter() - self._t0
+
+
+def workerCounts(maximum=None):
+    """Powers of two up to the number of CPU's (included)
+
+    :param int maximum: number of CPU's by default
+    :returns list:
+    """
+    if maximum is None:
+        maximum = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= maximum:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != maximum:
+        workers.append(maximum)
+    return workers
+
+
+def parseArguments(argv, defaults):
+    """Positional command line arguments
+
+    :param list argv: sys.argv[1:] when None
+    :param list defaults: (name, default value) in the order of the
+                          arguments. The arguments are converted to the
+                          type of their default value (str when None).
+    :returns dict:
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if len(argv) > len(defaults):
+        raise ValueError("Expected at most %d arguments: %s" %
+                         (len(defaults),
+                          " ".join(name for name, _ in defaults)))
+    kwargs = dict(defaults)
+    for (name, default), value in zip(defaults, argv):
+        if default is None:
+            kwargs[name] = value
+        else:
+            kwargs[name] = type(default)(value)
+    return kwargs
+
+
+def printTable(title, columns, rows):
+    """
+    :param str title:
+    :param list columns: (header, format) of each column, the width of
+                         the column is taken from the format
+    :param list rows: tuples of values
+    """
+    print(title)
+    headers = []
+    for header, fmt in columns:
+        width = re.match(r"%-?(\d*)", fmt).group(1)
+        headers.append("%" + width + "s")
+    print(" ".join(headers) % tuple(header for header, _ in columns))
+    fmt = " ".join(fmt for _, fmt in columns)
+    for row in rows:
+        print(fmt % tuple(row))
+
+
+def main(benchmark, argv, defaults, title, columns, rows=None):
+    """Run a benchmark with the command line arguments and print its results
+
+    :param callable benchmark: called with the parsed arguments
+    :param list argv: sys.argv[1:] when None
+    :param list defaults: see parseArguments
+    :param str title: formatted with the parsed arguments
+    :param list columns: see printTable
+    :param callable rows: optional conversion of the results in the rows
+                          of the report
+    :returns list: results of the benchmark
+    """
+    kwargs = parseArguments(argv, defaults)
+    results = benchmark(**kwargs)
+    if rows is None:
+        table = results
+    else:
+        table = rows(results)
+    printTable(title % kwargs, columns, table)
+    return results
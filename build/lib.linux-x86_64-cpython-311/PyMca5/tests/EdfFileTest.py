@@ -0,0 +1,275 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V. Armando Sole - ESRF"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import unittest
+import sys
+import os
+import gc
+import tempfile
+import numpy
+
+class testEdfFile(unittest.TestCase):
+    def setUp(self):
+        """
+        import the EdfFile module
+        """
+        tmpFile = tempfile.mkstemp(text=False)
+        os.close(tmpFile[0])
+        self.fname = tmpFile[1]
+        try:
+            from PyMca5.PyMcaIO.EdfFile import EdfFile
+            self.fileClass = EdfFile
+        except Exception:
+            self.fileClass = None
+
+    def tearDown(self):
+        """clean up any possible files"""
+        gc.collect()
+        if self.fileClass is not None:
+            if os.path.exists(self.fname):
+                os.remove(self.fname)
+
+    def testEdfFileImport(self):
+        #"""Test successful import"""
+        self.assertTrue(self.fileClass is not None)
+
+    def testEdfFileReadWrite(self):
+        # create a file
+        self.assertTrue(self.fileClass is not None)
+        data = numpy.arange(10000).astype(numpy.int32)
+        data.shape = 100, 100
+        edf = self.fileClass(self.fname, 'wb+')
+        edf.WriteImage({'Title': "title",
+                        'key': 'key'}, data)
+        edf = None
+
+        # read it
+        edf = self.fileClass(self.fname, 'rb')
+        # the number of images
+        nImages = edf.GetNumImages()
+        self.assertEqual(nImages, 1)
+        # the header information
+        header = edf.GetHeader(0)
+        self.assertEqual(header['Title'], "title")
+        self.assertEqual(header['key'], "key")
+
+        #the data information
+        readData = edf.GetData(0)
+        self.assertEqual(readData.dtype, numpy.int32,
+                         'Read type %s instead of %s' %\
+                        (readData.dtype, numpy.int32))
+        self.assertEqual(readData[10,20], data[10,20])
+        self.assertEqual(readData[20,10], data[20,10])
+        edf =None
+
+        # add a second Image
+        edf = self.fileClass(self.fname, 'rb+')
+        edf.WriteImage({'Title': "title2", 'key': 'key2'},
+                       data.astype(numpy.float32), Append=1)
+        edf = None
+
+        # read it
+        edf = self.fileClass(self.fname, 'rb')
+        # the number of images
+        nImages = edf.GetNumImages()
+        self.assertEqual(nImages, 2)
+
+        # the header information
+        header = edf.GetHeader(1)
+        self.assertEqual(header['Title'], "title2")
+        self.assertEqual(header['key'], "key2")
+
+        # the data information
+        readData = edf.GetData(1)
+        self.assertEqual(readData.dtype, numpy.float32)
+        self.assertTrue(abs(readData[10,20]-data[10,20]) < 0.00001)
+        self.assertTrue(abs(readData[20,10]-data[20,10]) < 0.00001)
+        edf =None
+        gc.collect()
+
+    def testEdfFileMemmap(self):
+        self.assertTrue(self.fileClass is not None)
+        data = numpy.arange(10000).astype(numpy.int32)
+        data.shape = 100, 100
+        edf = self.fileClass(self.fname, 'wb+')
+        edf.WriteImage({'Title': "title"}, data, ByteOrder="HighByteFirst")
+        edf.WriteImage({'Title': "title2"}, data.astype(numpy.float64),
+                       Append=1)
+        edf = None
+
+        edf = self.fileClass(self.fname, 'rb', mmap=True)
+        for i, dtype in enumerate([">i4", "<f8"]):
+            readData = edf.GetData(i)
+            self.assertTrue(isinstance(readData, numpy.memmap))
+            self.assertEqual(readData.dtype, numpy.dtype(dtype))
+            self.assertFalse(readData.flags.writeable)
+            self.assertTrue(numpy.array_equal(readData, data))
+            region = edf.GetData(i, Pos=(20, 10), Size=(30, 0))
+            self.assertTrue(numpy.array_equal(region, data[10:, 20:50]))
+        # the default access reads the file in native byte order
+        edf = self.fileClass(self.fname, 'rb')
+        readData = edf.GetData(0)
+        self.assertFalse(isinstance(readData, numpy.memmap))
+        self.assertTrue(readData.dtype.isnative)
+        self.assertTrue(numpy.array_equal(readData, data))
+        edf = None
+        readData = None
+        region = None
+        gc.collect()
+
+    def testEdfStackMemmap(self):
+        from PyMca5.PyMcaIO import EDFStack
+        self.assertTrue(self.fileClass is not None)
+        tmpDir = tempfile.mkdtemp()
+        try:
+            data = numpy.arange(5 * 6 * 7, dtype=numpy.uint16)
+            data.shape = 5, 6, 7
+            filelist = []
+            for i in range(data.shape[0]):
+                fname = os.path.join(tmpDir, "image_%04d.edf" % i)
+                edf = self.fileClass(fname, 'wb+')
+                edf.WriteImage({}, data[i], ByteOrder="HighByteFirst")
+                edf = None
+                filelist.append(fname)
+            for imagestack in [False, True]:
+                stack = EDFStack.EDFStack(imagestack=imagestack)
+                stack.loadFileList(filelist)
+                reference = stack.data
+                stack = EDFStack.EDFStack(imagestack=imagestack, mmap=True)
+                stack.loadFileList(filelist)
+                virtual = stack.data
+                self.assertTrue(isinstance(virtual,
+                                           EDFStack.VirtualImageStack))
+                self.assertEqual(virtual.shape, reference.shape)
+                self.assertEqual(virtual.dtype, reference.dtype)
+                if imagestack:
+                    self.assertEqual(stack.info["McaIndex"], 0)
+                self.assertTrue(numpy.array_equal(numpy.asarray(virtual),
+                                                  reference))
+                for key in [(1,), (slice(1, 4), 2), (slice(None), 3, 4),
+                            (Ellipsis, 2), (slice(None, None, 2), slice(1, 5)),
+                            ([0, 3, 4], slice(None), 1),
+                            (2, [1, 3]), (slice(None), [1, 2], [3, 4])]:
+                    self.assertTrue(numpy.array_equal(virtual[key],
+                                                      reference[key]),
+                                    "Error slicing with %s" % (key,))
+                virtual.close()
+            stack = None
+            virtual = None
+        finally:
+            gc.collect()
+            for fname in os.listdir(tmpDir):
+                os.remove(os.path.join(tmpDir, fname))
+            os.rmdir(tmpDir)
+
+    def testStackParallelLoading(self):
+        from PyMca5.PyMcaIO import EDFStack
+        from PyMca5.PyMcaIO import TiffStack
+        from PyMca5.PyMcaIO import TiffIO
+        self.assertTrue(self.fileClass is not None)
+        tmpDir = tempfile.mkdtemp()
+        try:
+            data = numpy.arange(9 * 6 * 7, dtype=numpy.float32)
+            data.shape = 9, 6, 7
+            edflist = []
+            tiflist = []
+            for i in range(data.shape[0]):
+                fname = os.path.join(tmpDir, "image_%04d.edf" % i)
+                self.fileClass(fname, 'wb+').WriteImage({}, data[i])
+                edflist.append(fname)
+                fname = os.path.join(tmpDir, "image_%04d.tif" % i)
+                TiffIO.TiffIO(fname, mode="wb+").writeImage(data[i])
+                tiflist.append(fname)
+
+            class ProgressStack(object):
+                def onBegin(self, n):
+                    self.progress = []
+
+                def onProgress(self, n):
+                    self.progress.append(n)
+
+            class EdfProgressStack(ProgressStack, EDFStack.EDFStack):
+                pass
+
+            class TiffProgressStack(ProgressStack, TiffStack.TiffStack):
+                pass
+
+            for kw in [{"imagestack": True}, {"imagestack": False}]:
+                for fileindex in [0, 1]:
+                    results = []
+                    for nworkers in [1, 4]:
+                        stack = EdfProgressStack(nworkers=nworkers, **kw)
+                        stack.loadFileList(edflist, fileindex=fileindex)
+                        self.assertEqual(stack.progress,
+                                         list(range(1, len(edflist) + 1)))
+                        results.append(stack.data)
+                    self.assertTrue(numpy.array_equal(results[0], results[1]))
+                    if kw["imagestack"] or not fileindex:
+                        self.assertTrue(numpy.array_equal(results[0], data))
+                    else:
+                        self.assertTrue(numpy.array_equal(results[0],
+                                                data.transpose(1, 0, 2)))
+            for imagestack in [True, False]:
+                stack = TiffProgressStack(imagestack=imagestack, nworkers=4)
+                stack.loadFileList(tiflist)
+                self.assertEqual(stack.progress,
+                                 list(range(1, len(tiflist) + 1)))
+                if imagestack:
+                    self.assertTrue(numpy.array_equal(stack.data, data))
+                else:
+                    self.assertTrue(numpy.array_equal(stack.data,
+                                                data.transpose(1, 2, 0)))
+        finally:
+            gc.collect()
+            for fname in os.listdir(tmpDir):
+                os.remove(os.path.join(tmpDir, fname))
+            os.rmdir(tmpDir)
+
+def getSuite(auto=True):
+    testSuite = unittest.TestSuite()
+    if auto:
+        testSuite.addTest(\
+            unittest.TestLoader().loadTestsFromTestCase(testEdfFile))
+    else:
+        # use a predefined order
+        testSuite.addTest(testEdfFile("testEdfFileImport"))
+        testSuite.addTest(testEdfFile("testEdfFileReadWrite"))
+        testSuite.addTest(testEdfFile("testEdfFileMemmap"))
+        testSuite.addTest(testEdfFile("testEdfStackMemmap"))
+        testSuite.addTest(testEdfFile("testStackParallelLoading"))
+    return testSuite
+
+def test(auto=False):
+    unittest.TextTestRunner(verbosity=2).run(getSuite(auto=auto))
+
+if __name__ == '__main__':
+    test()
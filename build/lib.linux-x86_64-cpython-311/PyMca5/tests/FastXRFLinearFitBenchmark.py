@@ -0,0 +1,100 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Scaling benchmark of FastXRFLinearFit.fitMultipleSpectra versus the number
+of workers:
+
+    python -m PyMca5.tests.FastXRFLinearFitBenchmark [nRows nColumns [executor]]
+"""
+import numpy
+from PyMca5.tests import BenchmarkUtils
+from PyMca5.tests import XrfData
+from PyMca5.PyMcaPhysics.xrf import FastXRFLinearFit
+from PyMca5.PyMcaPhysics.xrf.XRFBatchFitOutput import OutputBuffer
+
+
+def benchmark(nRows=100, nColumns=100, executor="thread", workers=None,
+              stripflag=1, refit=1):
+    """
+    :param int nRows:
+    :param int nColumns:
+    :param str executor: 'thread' or 'process'
+    :param list workers: number of workers to be tested
+    :returns list: (nworkers, seconds, spectra/second)
+    """
+    data, livetime = XrfData.generateXRFData(nRows=nRows, nColumns=nColumns,
+                                             same=False)
+    numpy.random.seed(0)
+    data = numpy.random.poisson(data).astype(numpy.int32)
+    configuration = XrfData.generateXRFConfig()
+    configuration["fit"]["stripalgorithm"] = 1
+    configuration["fit"]["stripflag"] = stripflag
+
+    fastFit = FastXRFLinearFit.FastXRFLinearFit()
+    fastFit.setFitConfiguration(configuration)
+    if workers is None:
+        workers = BenchmarkUtils.workerCounts()
+
+    nSpectra = data.size // data.shape[-1]
+    results = []
+    reference = None
+    for nworkers in workers:
+        outbuffer = OutputBuffer(nosave=True)
+        with BenchmarkUtils.Timer() as timer:
+            outbuffer = fastFit.fitMultipleSpectra(y=data, weight=0, refit=refit,
+                                                   outbuffer=outbuffer,
+                                                   nworkers=nworkers,
+                                                   executor=executor)
+        t = timer.seconds
+        if reference is None:
+            reference = outbuffer["parameters"]
+        elif not numpy.array_equal(reference, outbuffer["parameters"]):
+            raise RuntimeError("Parallel result differs from serial result")
+        results.append((nworkers, t, nSpectra / t))
+    return results
+
+
+def main(argv=None):
+    def rows(results):
+        t1 = results[0][1]
+        return [(nworkers, t, rate, t1 / t) for nworkers, t, rate in results]
+    BenchmarkUtils.main(benchmark, argv,
+                        [("nRows", 100), ("nColumns", 100),
+                         ("executor", "thread")],
+                        "%(nRows)d x %(nColumns)d spectra, "
+                        "%(executor)s executor",
+                        [("workers", "%8d"), ("seconds", "%10.3f"),
+                         ("spectra/s", "%14.1f"), ("speedup", "%8.2f")],
+                        rows=rows)
+
+
+if __name__ == "__main__":
+    main()
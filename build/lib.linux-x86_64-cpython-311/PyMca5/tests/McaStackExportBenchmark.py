@@ -0,0 +1,111 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Throughput (MB/s of uncompressed data) and file size of
+McaStackExport.exportStack with several storage options, for a stack
+dynamically loaded from an HDF5 file:
+
+    python -m PyMca5.tests.McaStackExportBenchmark [nRows nColumns nChannels]
+"""
+import os
+import shutil
+import tempfile
+import numpy
+import h5py
+from PyMca5.tests import BenchmarkUtils
+from PyMca5.PyMcaCore import McaStackExport
+
+
+def generateData(nRows=100, nColumns=100, nChannels=2048):
+    """
+    :returns numpy.ndarray: XRF like stack of counts
+    """
+    numpy.random.seed(0)
+    x = numpy.arange(nChannels)
+    spectrum = 5 + 50 * numpy.exp(-0.5 * ((x - 0.3 * nChannels) / 10.) ** 2) + \
+               20 * numpy.exp(-0.5 * ((x - 0.6 * nChannels) / 12.) ** 2)
+    scale = numpy.random.uniform(0.5, 1.5, (nRows, nColumns, 1))
+    return numpy.random.poisson(scale * spectrum).astype(numpy.int32)
+
+
+def benchmark(nRows=100, nColumns=100, nChannels=2048, workers=None):
+    """
+    :param list workers: number of compressing threads to be tested
+    :returns list: (description, seconds, MB/s, file size in MB)
+    """
+    data = generateData(nRows, nColumns, nChannels)
+    if workers is None:
+        ncpu = os.cpu_count() or 1
+        workers = sorted(set([1, ncpu]))
+    cases = [("contiguous", dict(chunks=False)),
+             ("chunked", dict())]
+    for level in [1, 4]:
+        for nworkers in workers:
+            cases.append(("gzip %d shuffle, %d thread(s)" % (level, nworkers),
+                          dict(compression="gzip", compression_opts=level,
+                               shuffle=True, nworkers=nworkers)))
+    tmpDir = tempfile.mkdtemp(prefix="pymcaExport")
+    results = []
+    try:
+        source = os.path.join(tmpDir, "source.h5")
+        with h5py.File(source, "w") as h5:
+            h5.create_dataset("data", data=data,
+                              chunks=(1, nColumns, nChannels))
+        mbytes = data.nbytes / (1024. * 1024.)
+        del data
+        for i, (name, options) in enumerate(cases):
+            fileName = os.path.join(tmpDir, "output%d.h5" % i)
+            with h5py.File(source, "r") as h5, \
+                 h5py.File(fileName, "w") as output:
+                with BenchmarkUtils.Timer() as timer:
+                    McaStackExport.exportStack(h5["data"], output, "/detector",
+                                               **options)
+                    output.flush()
+                t = timer.seconds
+            size = os.path.getsize(fileName) / (1024. * 1024.)
+            results.append((name, t, mbytes / t, size))
+    finally:
+        shutil.rmtree(tmpDir)
+    return results
+
+
+def main(argv=None):
+    BenchmarkUtils.main(benchmark, argv,
+                        [("nRows", 100), ("nColumns", 100),
+                         ("nChannels", 2048)],
+                        "%(nRows)d x %(nColumns)d spectra of %(nChannels)d "
+                        "channels",
+                        [("storage", "%30s"), ("seconds", "%10.3f"),
+                         ("MB/s", "%10.1f"), ("size MB", "%10.1f")])
+
+
+if __name__ == "__main__":
+    main()
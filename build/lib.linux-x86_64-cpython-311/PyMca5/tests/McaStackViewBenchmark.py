@@ -0,0 +1,117 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Read throughput of McaStackView.FullView on chunked and compressed HDF5
+datasets: fixed block sizes versus the block size and storage chunk
+alignment of McaStackView.chunkPlan:
+
+    python -m PyMca5.tests.McaStackViewBenchmark [nRows nColumns nChannels]
+"""
+import os
+import shutil
+import tempfile
+import numpy
+import h5py
+from PyMca5.tests import BenchmarkUtils
+from PyMca5.PyMcaCore import McaStackView
+
+
+def benchmark(nRows=100, nColumns=200, nChannels=1024, chunks=None,
+              compressions=(None, "gzip"), settings=None):
+    """
+    :param int nRows:
+    :param int nColumns:
+    :param int nChannels:
+    :param tuple chunks: storage chunk shape
+    :param list compressions:
+    :param list settings: (nMca, nativeChunks) of the views to be tested
+    :returns list: (compression, nMca, aligned, spectra per block,
+                    amplification, seconds, MB/s)
+    """
+    shape = nRows, nColumns, nChannels
+    if chunks is None:
+        chunks = 4, 16, nChannels
+    if settings is None:
+        settings = [((1, "MB"), None), ((2, "MB"), None),
+                    ((1, "MB"), True), ("auto", None)]
+    numpy.random.seed(0)
+    data = numpy.random.poisson(10, size=shape).astype(numpy.float32)
+    nbytes = data.nbytes
+    path = tempfile.mkdtemp(prefix="pymca")
+    results = []
+    try:
+        filename = os.path.join(path, "stack.h5")
+        with h5py.File(filename, mode="w") as f:
+            for compression in compressions:
+                f.create_dataset(str(compression), data=data, chunks=chunks,
+                                 compression=compression)
+        del data
+        for compression in compressions:
+            for nMca, nativeChunks in settings:
+                with h5py.File(filename, mode="r") as f:
+                    dset = f[str(compression)]
+                    view = McaStackView.FullView(dset, nMca=nMca,
+                                                 nativeChunks=nativeChunks)
+                    with BenchmarkUtils.Timer() as timer:
+                        for _, chunk in view.items():
+                            chunk.sum()
+                    t = timer.seconds
+                    results.append((compression, nMca,
+                                    view.nativeChunks is not None,
+                                    view.nMca, view.readAmplification,
+                                    t, nbytes / 1024.**2 / t))
+    finally:
+        shutil.rmtree(path)
+    return results
+
+
+def main(argv=None):
+    def rows(results):
+        table = []
+        for row in results:
+            nMca = row[1]
+            if not isinstance(nMca, str):
+                nMca = "%d%s" % nMca
+            table.append(row[:1] + (nMca,) + row[2:])
+        return table
+    BenchmarkUtils.main(benchmark, argv,
+                        [("nRows", 100), ("nColumns", 200),
+                         ("nChannels", 1024)],
+                        "%(nRows)d x %(nColumns)d x %(nChannels)d stack",
+                        [("compression", "%12s"), ("nMca", "%10s"),
+                         ("aligned", "%8s"), ("spectra", "%10d"),
+                         ("amplification", "%14.2f"), ("seconds", "%10.3f"),
+                         ("MB/s", "%10.1f")],
+                        rows=rows)
+
+
+if __name__ == "__main__":
+    main()
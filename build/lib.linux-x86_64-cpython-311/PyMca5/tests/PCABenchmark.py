@@ -0,0 +1,111 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+__doc__ = """
+Accuracy and speed of the randomized PCA compared to the covariance
+(numpyPCA) and Lanczos PCA methods:
+
+    python -m PyMca5.tests.PCABenchmark [nRows nColumns nChannels [ncomponents]]
+
+The accuracy is given with respect to the covariance method as the maximal
+relative error of the eigenvalues and the maximal value of 1 - |cos| of the
+angles between the eigenvectors.
+"""
+import numpy
+from PyMca5.tests import BenchmarkUtils
+from PyMca5.PyMcaMath.mva import PCAModule
+
+
+def generateData(nRows=100, nColumns=100, nChannels=1024, nSpectra=8):
+    """
+    Poisson noise on mixtures of gaussian spectra
+
+    :returns array: (nRows, nColumns, nChannels) float32
+    """
+    numpy.random.seed(0)
+    channels = numpy.arange(nChannels, dtype=numpy.float64)
+    centers = numpy.linspace(0.1, 0.9, nSpectra) * nChannels
+    spectra = numpy.array([numpy.exp(-0.5 * ((channels - c) /
+                                             (0.01 * nChannels))**2)
+                           for c in centers])
+    abundances = numpy.random.random((nRows * nColumns, nSpectra)) * \
+                 (100. / numpy.arange(1, nSpectra + 1))
+    data = numpy.random.poisson(numpy.dot(abundances, spectra) + 2)
+    return data.astype(numpy.float32).reshape(nRows, nColumns, nChannels)
+
+
+def benchmark(nRows=100, nColumns=100, nChannels=1024, ncomponents=8):
+    """
+    :returns list: (method, seconds, eigenvalue error, eigenvector error)
+    """
+    data = generateData(nRows, nColumns, nChannels, nSpectra=ncomponents)
+    methods = [("numpyPCA", PCAModule.numpyCovariancePCA, {}),
+               ("randomizedPCA", PCAModule.randomizedPCA, {"seed": 0}),
+               ("lanczosPCA", PCAModule.lanczosPCA, {})]
+    results = []
+    reference = None
+    for name, function, kw in methods:
+        # lanczosPCA modifies the shape of the input array
+        stack = data.copy()
+        with BenchmarkUtils.Timer() as timer:
+            images, eigenvalues, eigenvectors = function(stack,
+                                                         ncomponents=ncomponents,
+                                                         index=-1, **kw)
+        t = timer.seconds
+        # lanczosPCA can return more eigenvalues than requested
+        eigenvalues = numpy.asarray(eigenvalues,
+                                    dtype=numpy.float64)[:ncomponents]
+        eigenvectors = numpy.asarray(eigenvectors, dtype=numpy.float64)
+        eigenvectors = eigenvectors / numpy.sqrt((eigenvectors**2)
+                                                 .sum(axis=1))[:, None]
+        if reference is None:
+            reference = eigenvalues, eigenvectors
+        # lanczosPCA does not divide by the number of spectra
+        scale = reference[0][0] / eigenvalues[0]
+        valueError = numpy.abs(eigenvalues * scale - reference[0]).max() / \
+                     reference[0][-1]
+        cosines = numpy.abs((eigenvectors * reference[1]).sum(axis=1))
+        results.append((name, t, valueError, (1 - cosines).max()))
+    return results
+
+
+def main(argv=None):
+    BenchmarkUtils.main(benchmark, argv,
+                        [("nRows", 100), ("nColumns", 100),
+                         ("nChannels", 1024), ("ncomponents", 8)],
+                        "%(nRows)d x %(nColumns)d spectra of %(nChannels)d "
+                        "channels, %(ncomponents)d components",
+                        [("method", "%14s"), ("seconds", "%10.3f"),
+                         ("eigenvalues", "%14.2e"),
+                         ("eigenvectors", "%14.2e")])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V. Armando Sole - ESRF"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import unittest
+import numpy
+import numpy.linalg
+try:
+    import mdp
+    MDP = True
+except Exception:
+    # MDP can give very weird errors
+    MDP = False
+
+class testPCATools(unittest.TestCase):
+    def testPCAToolsImport(self):
+        from PyMca5.PyMcaMath.mva import PCATools
+
+    def testPCAToolsCovariance(self):
+        from PyMca5.PyMcaMath.mva.PCATools import getCovarianceMatrix
+        x = numpy.array([[0.0,  2.0,  3.0],
+                         [3.0,  0.0, -1.0],
+                         [4.0, -4.0,  4.0],
+                         [4.0,  4.0,  4.0]])
+        nSpectra = x.shape[0]
+
+        # test just multiplication
+        tmpArray = numpy.dot(x.T, x)
+        for force in [True, False]:
+            pymcaCov, pymcaAvg, nData = getCovarianceMatrix(x,
+                                                            force=force,
+                                                            center=False)
+            self.assertTrue(numpy.allclose(tmpArray, pymcaCov * (nData - 1)))
+
+        # calculate covariance using numpy
+        numpyCov = numpy.cov(x.T)
+        numpyAvg = x.sum(axis=0).reshape(-1, 1) / nSpectra
+        tmpArray = x.T - numpyAvg
+        numpyCov2 = numpy.dot(tmpArray, tmpArray.T) / nSpectra
+        numpyAvg = numpyAvg.reshape(1, -1)
+
+        # calculate covariance using PCATools and 2D stack
+        # directly and dynamically loading data
+        for force in [False, True]:
+            pymcaCov, pymcaAvg, nData = getCovarianceMatrix(x,
+                                                            force=force,
+                                                            center=True)
+
+            self.assertTrue(numpy.allclose(numpyCov, pymcaCov))
+            self.assertTrue(numpy.allclose(numpyAvg, pymcaAvg))
+            self.assertTrue(nData == nSpectra)
+
+        # calculate covariance using PCATools and 3D stack
+        # directly and dynamically loading data
+        x.shape = 2, 2, -1
+        for force in [False, True]:
+            pymcaCov, pymcaAvg, nData = getCovarianceMatrix(x,
+                                                            force=force,
+                                                            center=True)
+
+            self.assertTrue(numpy.allclose(numpyCov, pymcaCov))
+            self.assertTrue(numpy.allclose(numpyAvg, pymcaAvg))
+            self.assertTrue(nData == nSpectra)
+
+    def testPCAToolsPCA(self):
+        from PyMca5.PyMcaMath.mva.PCATools import numpyPCA
+        x = numpy.array([[0.0,  2.0,  3.0],
+                         [3.0,  0.0, -1.0],
+                         [4.0, -4.0,  4.0],
+                         [4.0,  4.0,  4.0]])
+
+        # that corresponds to 4 spectra of 3 channels
+        nSpectra = x.shape[0]
+
+        # calculate eigenvalues and eigenvectors with numpy
+        tmpArray = numpy.dot(x.T, x)/(nSpectra - 1)
+        numpyEigenvalues, numpyEigenvectors = numpy.linalg.eigh(tmpArray)
+
+        # sort from higher to lower
+        idx = list(range(numpyEigenvalues.shape[0]-1, -1 , -1))
+        numpyEigenvalues = numpy.take(numpyEigenvalues, idx)
+        numpyEigenvectors = numpyEigenvectors[:, ::-1].T
+
+        # now use PyMca
+        # centering has to be false to obtain the same results
+        ncomp = x.shape[1]
+        for force in [True, False]:
+            images, eigenvalues, eigenvectors = numpyPCA(x,
+                                                         ncomponents=ncomp,
+                                                         force=force,
+                                                         center=False,
+                                                         scale=False)
+            self.assertTrue(numpy.allclose(eigenvalues, numpyEigenvalues))
+            for i in range(ncomp):
+                if (eigenvectors[i,0] >= 0 and numpyEigenvectors[i,0] >=0) or\
+                   (eigenvectors[i,0] <= 0 and numpyEigenvectors[i,0] <=0):
+                    # both same sign
+                    self.assertTrue(numpy.allclose(eigenvectors[i],
+                                                   numpyEigenvectors[i]))
+                else:
+                    self.assertTrue(numpy.allclose(-eigenvectors[i],
+                                                   numpyEigenvectors[i]))
+
+        # test with a different shape
+        x.shape = 2, 2, -1
+        ncomp = 3
+        for force in [True, False]:
+            images, eigenvalues, eigenvectors = numpyPCA(x,
+                                                         ncomponents=ncomp,
+                                                         force=force,
+                                                         center=False,
+                                                         scale=False)
+            self.assertTrue(numpy.allclose(eigenvalues, numpyEigenvalues))
+            for i in range(ncomp):
+                if (eigenvectors[i,0] >= 0 and numpyEigenvectors[i,0] >=0) or\
+                   (eigenvectors[i,0] <= 0 and numpyEigenvectors[i,0] <=0):
+                    # both same sign
+                    self.assertTrue(numpy.allclose(eigenvectors[i],
+                                                   numpyEigenvectors[i]))
+                else:
+                    self.assertTrue(numpy.allclose(-eigenvectors[i],
+                                                   numpyEigenvectors[i]))
+
+    def testPCAToolsBlockedCovariance(self):
+        from PyMca5.PyMcaMath.mva.PCATools import getCovarianceMatrix
+        from PyMca5.PyMcaMath.mva.PCATools import numpyPCA
+        try:
+            import h5py
+        except ImportError:
+            h5py = None
+        import os
+        import gc
+        import tempfile
+        numpy.random.seed(0)
+        stack = numpy.random.poisson(100., size=(13, 17, 41))\
+                     .astype(numpy.float32)
+        stack += numpy.arange(41, dtype=numpy.float32)
+        mask = numpy.random.random((13, 17)) > 0.3
+        weights = numpy.random.random(41)
+        spectra = stack.reshape(-1, 41).astype(numpy.float64)
+
+        def reference(binning, spatial_mask, spectral_weights, center):
+            x = spectra
+            if spatial_mask is not None:
+                x = x[spatial_mask.reshape(-1)]
+            if spectral_weights is not None:
+                x = x * spectral_weights
+            n = 41 // binning
+            x = x[:, :n * binning].reshape(-1, n, binning).sum(axis=2)
+            if center:
+                return numpy.cov(x.T), x.mean(axis=0)
+            return numpy.dot(x.T, x) / (x.shape[0] - 1), x.mean(axis=0)
+
+        tmpDir = tempfile.mkdtemp()
+        try:
+            inputs = [(stack, -1), (numpy.ascontiguousarray(stack.transpose(2, 0, 1)), 0)]
+            if h5py is not None:
+                fname = os.path.join(tmpDir, "stack.h5")
+                h5 = h5py.File(fname, "w")
+                inputs.append((h5.create_dataset("data", data=stack,
+                                                 chunks=(4, 5, 41)), -1))
+                inputs.append((h5.create_dataset("images",
+                                                 data=stack.transpose(2, 0, 1),
+                                                 chunks=(41, 4, 5)), 0))
+            for data, index in inputs:
+                for binning in [1, 3]:
+                    for spatial_mask in [None, mask]:
+                        for spectral_weights in [None, weights]:
+                            for center in [True, False]:
+                                expectedCov, expectedAvg = reference(binning,
+                                                                spatial_mask,
+                                                                spectral_weights,
+                                                                center)
+                                for force, nworkers in [(True, 1), (True, 3),
+                                                        (False, None)]:
+                                    cov, avg, n = getCovarianceMatrix(data,
+                                                index=index, binning=binning,
+                                                force=force, center=center,
+                                                weights=spectral_weights,
+                                                spatial_mask=spatial_mask,
+                                                nworkers=nworkers)
+                                    self.assertTrue(numpy.allclose(cov, expectedCov))
+                                    self.assertTrue(numpy.allclose(avg, expectedAvg))
+                                    if spatial_mask is None:
+                                        self.assertEqual(n, spectra.shape[0])
+                                    else:
+                                        self.assertEqual(n, spatial_mask.sum())
+                # the scores are calculated with the binned spectra
+                images, eigenvalues, eigenvectors = numpyPCA(data, index=index,
+                                                        ncomponents=3,
+                                                        binning=3,
+                                                        scale=False,
+                                                        nworkers=2)
+                self.assertEqual(images.shape, (3, 13, 17))
+                binned = spectra[:, :39].reshape(-1, 13, 3).sum(axis=2)
+                expected = numpy.dot(eigenvectors.astype(numpy.float64),
+                                     binned.T).reshape(3, 13, 17)
+                self.assertTrue(numpy.allclose(images, expected, rtol=1e-5))
+        finally:
+            data = None
+            inputs = None
+            if h5py is not None:
+                h5.close()
+            gc.collect()
+            for name in os.listdir(tmpDir):
+                os.remove(os.path.join(tmpDir, name))
+            os.rmdir(tmpDir)
+
+    def testRandomizedPCA(self):
+        from PyMca5.PyMcaMath.mva import PCAModule
+        numpy.random.seed(1)
+        channels = numpy.arange(256.)
+        components = numpy.array([numpy.exp(-0.5 * ((channels - c) / 6.)**2)
+                                  for c in [40, 90, 130, 180, 220]])
+        abundances = numpy.random.random((20 * 30, 5)) * [100, 50, 30, 20, 10]
+        data = numpy.random.poisson(numpy.dot(abundances, components) + 5)\
+                    .astype(numpy.float32).reshape(20, 30, 256)
+        mask = numpy.random.random((20, 30)) > 0.2
+        for binning, spatial_mask in [(1, None), (2, mask)]:
+            kw = {"ncomponents": 5, "binning": binning, "mask": spatial_mask,
+                  "legacy": False, "index": -1}
+            expected = PCAModule.numpyCovariancePCA(data, **kw)
+            for nworkers in [None, 2]:
+                result = PCAModule.randomizedPCA(data, seed=0,
+                                                 nworkers=nworkers, **kw)
+                # the last component is close to the noise level
+                self.assertTrue(numpy.allclose(result["eigenvalues"],
+                                               expected["eigenvalues"],
+                                               rtol=1e-2))
+                for v1, v2 in zip(result["eigenvectors"],
+                                  expected["eigenvectors"]):
+                    self.assertTrue(abs(numpy.dot(v1, v2)) > 0.99)
+                self.assertTrue(numpy.allclose(result["average"],
+                                               expected["average"]))
+                self.assertEqual(result["pixels"], expected["pixels"])
+                self.assertEqual(result["scores"].shape, (5, 20, 30))
+                self.assertTrue(numpy.allclose(result["scores"][0],
+                                               expected["scores"][0],
+                                               rtol=1e-3))
+
+    if MDP:
+        def testPCAToolsMDP(self):
+            from PyMca5.PyMcaMath.mva.PCATools import getCovarianceMatrix, numpyPCA
+            x = numpy.array([[0.0,  2.0,  3.0],
+                             [3.0,  0.0, -1.0],
+                             [4.0, -4.0,  4.0],
+                             [4.0,  4.0,  4.0]])
+
+            # use mdp
+            pcaNode = mdp.nodes.PCANode()
+            pcaNode.train(x)
+            pcaNode.stop_training()
+            pcaEigenvectors = pcaNode.v.T
+
+            # and compare with PyMca
+            ncomp = x.shape[1]
+            for force in [True, False]:
+                images, eigenvalues, eigenvectors = numpyPCA(x,
+                                                        ncomponents=ncomp,
+                                                        force=force,
+                                                        center=True,
+                                                        scale=False)
+
+                # the eigenvalues must be the same
+                self.assertTrue(numpy.allclose(eigenvalues, pcaNode.d))
+                # the eigenvectors can be multiplied by -1
+                for i in range(ncomp):
+                    if (eigenvectors[i,0] >= 0 and pcaEigenvectors[i,0] >=0) or\
+                       (eigenvectors[i,0] <= 0 and pcaEigenvectors[i,0] <=0):
+                        # both same sign
+                        self.assertTrue(numpy.allclose(eigenvectors[i],
+                                                       pcaEigenvectors[i]))
+                    else:
+                        self.assertTrue(numpy.allclose(-eigenvectors[i],
+                                                       pcaEigenvectors[i]))
+
+def getSuite(auto=True):
+    testSuite = unittest.TestSuite()
+    if auto:
+        testSuite.addTest(\
+            unittest.TestLoader().loadTestsFromTestCase(testPCATools))
+    else:
+        # use a predefined order
+        testSuite.addTest(testPCATools("testPCAToolsImport"))
+        testSuite.addTest(testPCATools("testPCAToolsCovariance"))
+        testSuite.addTest(testPCATools("testPCAToolsPCA"))
+        testSuite.addTest(testPCATools("testPCAToolsBlockedCovariance"))
+        testSuite.addTest(testPCATools("testRandomizedPCA"))
+        if MDP:
+            testSuite.addTest(testPCATools("testPCAToolsMDP"))
+    return testSuite
+
+def test(auto=False):
+    unittest.TextTestRunner(verbosity=2).run(getSuite(auto=auto))
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,75 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2004-2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__author__ = "V. Armando Sole - ESRF"
+__contact__ = "sole@esrf.fr"
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import unittest
+import os
+import sys
+import glob
+import unittest
+
+def getSuite(auto=True):
+    pythonFiles = glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))
+    sys.path.insert(0, os.path.dirname(__file__))
+    testSuite = unittest.TestSuite()
+    for fname in pythonFiles:
+        if os.path.basename(fname) in ["__init__.py", "TestAll.py"]:
+            continue
+        modName = os.path.splitext(os.path.basename(fname))[0]
+        try:
+            module = __import__(modName)
+        except ImportError:
+            print("Failed to import %s" % fname)
+            continue
+        if hasattr(module, "getSuite"):
+            testSuite.addTest(module.getSuite(auto))
+    return testSuite
+
+def main(auto=True):
+    return unittest.TextTestRunner(verbosity=2).run(getSuite(auto=auto))
+
+if __name__ == '__main__':
+    os.environ["HDF5_USE_FILE_LOCKING"] = "FALSE"
+    if len(sys.argv) > 1:
+        auto = False
+    else:
+        auto = True
+    try:
+        from PyMca5.PyMcaGui import PyMcaQt as qt
+        app = qt.QApplication([])
+    except Exception:
+        # if GUI tests are requested they will crash somewhere else
+        pass
+    result = main(auto)
+    ret = not result.wasSuccessful()
+    # make sure there is no remaining QApplication handle
+    app = None
+    sys.exit(ret)
@@ -0,0 +1,225 @@
+#/*##########################################################################
+#
+# The PyMca X-Ray Fluorescence Toolkit
+#
+# Copyright (c) 2023 European Synchrotron Radiation Facility
+#
+# This file is part of the PyMca X-ray Fluorescence Toolkit developed at
+# the ESRF.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#############################################################################*/
+__license__ = "MIT"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import numpy
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+
+class testXASStackBatch(unittest.TestCase):
+    def setUp(self):
+        from PyMca5.PyMcaIO import specfilewrapper as specfile
+        from PyMca5.PyMcaDataDir import PYMCA_DATA_DIR
+        self.path = tempfile.mkdtemp(prefix="pymca")
+        scan = specfile.Specfile(os.path.join(PYMCA_DATA_DIR,
+                                              "EXAFS_Ge.dat"))[0]
+        data = scan.data()
+        self.energy = data[0, :]
+        mu = data[1, :]
+        numpy.random.seed(0)
+        scale = numpy.random.uniform(0.5, 2.0, (4, 5, 1))
+        self.stack = mu[None, None, :] * scale + \
+                     numpy.random.normal(0, 0.001, scale.shape[:2] + mu.shape)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testFourierTransform(self):
+        from PyMca5.PyMcaPhysics.xas import XASClass
+        k = numpy.linspace(0, 14, 500)
+        signals = numpy.sin(numpy.outer([2., 3., 4.], k)) * numpy.exp(-k / 5.)
+        wweights = XASClass.getFTWindowWeights(k)
+        interpolated = [XASClass.getFTSignal(k, signal, kstep=0.04,
+                                             wweights=wweights)[1]
+                        for signal in signals]
+        fourier = XASClass.getFTMultiple(interpolated, kstep=0.04)
+        for signal, result in zip(signals, fourier):
+            expected = XASClass.getFT(k, signal, kstep=0.04, wweights=wweights)
+            self.assertTrue(numpy.allclose(result, expected["Set"]))
+
+    def testPostEdgeMultiple(self):
+        from PyMca5.PyMcaPhysics.xas import XASClass
+        k = numpy.linspace(-3, 16, 700)
+        numpy.random.seed(1)
+        mu = 1 - numpy.exp(-numpy.abs(k) / 3.)
+        mu = mu[None, :] + numpy.random.normal(0, 0.01, (10, k.size))
+        for kwargs in [{"kmin": 2, "kmax": 14},
+                       {"kmin": 2, "kmax": 14, "polDegree": [3, 2, 2, 3],
+                        "knots": [5, 8, 11]},
+                       {"kmin": 0, "kmax": 12, "polDegree": [2]}]:
+            fit, xNodes, yNodes = XASClass.postEdgeMultiple(k, mu, full=True,
+                                                            **kwargs)
+            self.assertEqual(fit.shape, mu.shape)
+            for i in range(mu.shape[0]):
+                expected, x, y = XASClass.postEdge0(k, mu[i], kwargs["kmin"],
+                                         kwargs["kmax"],
+                                         kwargs.get("polDegree", [3, 3, 3]),
+                                         knots=kwargs.get("knots"), full=True)
+                self.assertTrue(numpy.allclose(fit[i], expected[:, 1]))
+                self.assertTrue(numpy.array_equal(xNodes, x))
+                self.assertTrue(numpy.allclose(yNodes[i], y))
+
+        # same k values: the fitting operator is calculated once
+        analyzer = XASClass.XASClass()
+        ddict = analyzer.postEdgeMultiple(k, mu)
+        for i in range(mu.shape[0]):
+            expected = analyzer.postEdge(k, mu[i])
+            self.assertTrue(numpy.allclose(ddict["PostEdgeB"][i],
+                                           expected["PostEdgeB"]))
+
+        # the operator cache is shared by threads
+        from concurrent.futures import ThreadPoolExecutor
+        kmaxList = numpy.linspace(10, 15, 4 * XASClass._POST_EDGE_CACHE_SIZE)
+        expected = [XASClass.postEdgeMultiple(k, mu, kmin=2, kmax=kmax)
+                    for kmax in kmaxList]
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(
+                lambda kmax: XASClass.postEdgeMultiple(k, mu, kmin=2,
+                                                       kmax=kmax),
+                numpy.tile(kmaxList, 4)))
+        for i, result in enumerate(results):
+            self.assertTrue(numpy.array_equal(result,
+                                              expected[i % len(kmaxList)]))
+
+    @unittest.skipUnless(HAS_H5PY, "h5py not installed")
+    def testBlocks(self):
+        from PyMca5.PyMcaPhysics.xas import XASClass
+        from PyMca5.PyMcaPhysics.xas import XASStackBatch
+        mask = numpy.ones(self.stack.shape[:2], dtype=numpy.uint8)
+        mask[1, 2] = 0
+        mask[3] = 0
+
+        # spectrum by spectrum
+        analyzer = XASClass.XASClass()
+        expected = {}
+        for key in ["Edge", "Jump", "Mu", "NormalizedMu", "EXAFSNormalized",
+                    "FTIntensity"]:
+            expected[key] = []
+        for i, j in zip(*numpy.nonzero(mask)):
+            analyzer.setSpectrum(self.energy, self.stack[i, j])
+            ddict = analyzer.processSpectrum()
+            for key in ["Edge", "Jump", "Mu", "NormalizedMu",
+                        "EXAFSNormalized"]:
+                expected[key].append(ddict[key])
+            expected["FTIntensity"].append(ddict["FT"]["FTIntensity"])
+
+        instance = XASStackBatch.XASStackBatch()
+        instance._blockSpectra = 7
+        for kwargs in [{}, {"nworkers": 2},
+                       {"nworkers": 2, "executor": "thread",
+                        "compression": "gzip"}]:
+            result = instance.processMultipleSpectra(self.energy, self.stack,
+                                                     mask=mask,
+                                                     directory=self.path,
+                                                     name="xas",
+                                                     **kwargs)
+            self.assertEqual(result["names"], ["Jump", "Edge"])
+            self.assertEqual(result["spectra"], mask.sum())
+            images = result["images"]
+            self.assertTrue((images[:, mask == 0] == 0).all())
+            self.assertTrue(numpy.allclose(images[1][mask == 1],
+                                           expected["Edge"]))
+            self.assertTrue(numpy.allclose(images[0][mask == 1],
+                                           expected["Jump"]))
+            with h5py.File(os.path.join(self.path, "xas.h5"), "r") as h5:
+                group = h5["xas_analysis"]
+                self.assertIsNotNone(group["spectrum/mu"].chunks)
+                self.assertTrue(numpy.allclose(group["spectrum/mu"][()][mask == 1],
+                                               expected["Mu"]))
+                self.assertTrue(numpy.allclose(group["FT/Intensity"][()][mask == 1],
+                                               expected["FTIntensity"],
+                                               atol=1e-6))
+
+    @unittest.skipUnless(HAS_H5PY, "h5py not installed")
+    def testFixedEdge(self):
+        from PyMca5.PyMcaPhysics.xas import XASClass
+        from PyMca5.PyMcaPhysics.xas import XASStackBatch
+        analyzer = XASClass.XASClass()
+        analyzer.setSpectrum(self.energy, self.stack[0, 0])
+        edge = analyzer.processSpectrum()["Edge"]
+        config = analyzer.getConfiguration()
+        config["Normalization"]["E0Method"] = "Manual"
+        config["Normalization"]["E0Value"] = edge
+        analyzer.setConfiguration(config)
+
+        # all the spectra share the k values: the post edge is fitted at once
+        spectra = self.stack.reshape(-1, self.energy.size)
+        results = analyzer.processMultipleSpectra(self.energy, spectra)
+        self.assertEqual(len(results), spectra.shape[0])
+        for spectrum, ddict in zip(spectra, results):
+            analyzer.setSpectrum(self.energy, spectrum)
+            expected = analyzer.processSpectrum()
+            self.assertEqual(ddict["Edge"], edge)
+            for key in ["PostEdgeB", "KnotsY", "EXAFSNormalized"]:
+                self.assertTrue(numpy.allclose(ddict[key], expected[key]))
+            self.assertTrue(numpy.allclose(ddict["FT"]["FTIntensity"],
+                                           expected["FT"]["FTIntensity"]))
+
+        instance = XASStackBatch.XASStackBatch(analyzer)
+        instance._blockSpectra = 7
+        result = instance.processMultipleSpectra(self.energy, self.stack,
+                                                 directory=self.path,
+                                                 name="xas")
+        self.assertTrue(numpy.allclose(result["images"][1], edge))
+        with h5py.File(os.path.join(self.path, "xas.h5"), "r") as h5:
+            intensity = h5["xas_analysis/FT/Intensity"][()]
+            for i, ddict in enumerate(results):
+                self.assertTrue(numpy.allclose(intensity.reshape(
+                                    spectra.shape[0], -1)[i],
+                                    ddict["FT"]["FTIntensity"], atol=1e-6))
+
+
+def getSuite(auto=True):
+    testSuite = unittest.TestSuite()
+    if auto:
+        testSuite.addTest(unittest.TestLoader().loadTestsFromTestCase(testXASStackBatch))
+    else:
+        # use a predefined order
+        testSuite.addTest(testXASStackBatch("testFourierTransform"))
+        testSuite.addTest(testXASStackBatch("testPostEdgeMultiple"))
+        testSuite.addTest(testXASStackBatch("testBlocks"))
+        testSuite.addTest(testXASStackBatch("testFixedEdge"))
+    return testSuite
+
+def test(auto=False):
+    return unittest.TextTestRunner(verbosity=2).run(getSuite(auto=auto))
+
+if __name__ == '__main__':
+    result = test()
+    sys.exit(not result.wasSuccessful())